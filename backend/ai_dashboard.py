@@ -4,10 +4,10 @@ Uses OpenAI GPT-4o-mini for AI-powered analysis, falls back gracefully when unav
 """
 
 import hashlib
-import json
 import logging
 
 from ai_research import is_openai_available
+from serialization import dumps, loads
 
 logger = logging.getLogger(__name__)
 
@@ -20,26 +20,26 @@ async def gather_dashboard_context(db) -> dict:
     ctx = {}
 
     # Step 1: Organization
-    org_rows = await db.execute_fetchall("SELECT * FROM organization LIMIT 1")
+    org_rows = await db.execute_fetchall("SELECT * FROM organization WHERE id = ?", (db.org_id,))
     ctx["organization"] = dict(org_rows[0]) if org_rows else {}
 
     # Step 1: Ops efficiency
-    ops_rows = await db.execute_fetchall("SELECT * FROM ops_efficiency ORDER BY period DESC")
+    ops_rows = await db.execute_fetchall("SELECT * FROM ops_efficiency WHERE org_id = ? ORDER BY period DESC", (db.org_id,))
     ctx["ops_metrics"] = [dict(r) for r in ops_rows]
 
     # Step 1: Revenue splits
     rev_rows = await db.execute_fetchall(
         "SELECT rs.*, bu.name as business_unit_name FROM revenue_splits rs "
-        "LEFT JOIN business_units bu ON rs.business_unit_id = bu.id ORDER BY rs.period"
+        "LEFT JOIN business_units bu ON rs.business_unit_id = bu.id WHERE rs.org_id = ? ORDER BY rs.period", (db.org_id,)
     )
     ctx["revenue_trends"] = [dict(r) for r in rev_rows]
 
     # Step 1: Competitors
-    comp_rows = await db.execute_fetchall("SELECT * FROM competitors ORDER BY name")
+    comp_rows = await db.execute_fetchall("SELECT * FROM competitors WHERE org_id = ? ORDER BY name", (db.org_id,))
     ctx["competitors"] = [dict(r) for r in comp_rows]
 
     # Step 1: Business units
-    bu_rows = await db.execute_fetchall("SELECT * FROM business_units ORDER BY name")
+    bu_rows = await db.execute_fetchall("SELECT * FROM business_units WHERE org_id = ? ORDER BY name", (db.org_id,))
     ctx["business_units"] = [dict(r) for r in bu_rows]
 
     # Step 2: Value streams with metrics
@@ -47,7 +47,7 @@ async def gather_dashboard_context(db) -> dict:
         vs_rows = await db.execute_fetchall(
             "SELECT vs.*, vsm.total_lead_time_hours, vsm.total_process_time_hours, "
             "vsm.total_wait_time_hours, vsm.flow_efficiency, vsm.bottleneck_step "
-            "FROM value_streams vs LEFT JOIN value_stream_metrics vsm ON vs.id = vsm.value_stream_id"
+            "FROM value_streams vs LEFT JOIN value_stream_metrics vsm ON vs.id = vsm.value_stream_id WHERE vs.org_id = ?", (db.org_id,)
         )
         ctx["value_streams"] = [dict(r) for r in vs_rows]
     except Exception:
@@ -55,81 +55,81 @@ async def gather_dashboard_context(db) -> dict:
 
     # Step 2: Value stream levers
     try:
-        lever_rows = await db.execute_fetchall("SELECT * FROM value_stream_levers ORDER BY lever_type")
+        lever_rows = await db.execute_fetchall("SELECT * FROM value_stream_levers WHERE org_id = ? ORDER BY lever_type", (db.org_id,))
         ctx["levers"] = [dict(r) for r in lever_rows]
     except Exception:
         ctx["levers"] = []
 
     # Step 3: SWOT entries
     try:
-        swot_rows = await db.execute_fetchall("SELECT * FROM swot_entries ORDER BY category")
+        swot_rows = await db.execute_fetchall("SELECT * FROM swot_entries WHERE org_id = ? ORDER BY category", (db.org_id,))
         ctx["swot_entries"] = [dict(r) for r in swot_rows]
     except Exception:
         ctx["swot_entries"] = []
 
     # Step 3: TOWS actions
     try:
-        tows_rows = await db.execute_fetchall("SELECT * FROM tows_actions ORDER BY strategy_type")
+        tows_rows = await db.execute_fetchall("SELECT * FROM tows_actions WHERE org_id = ? ORDER BY strategy_type", (db.org_id,))
         ctx["tows_actions"] = [dict(r) for r in tows_rows]
     except Exception:
         ctx["tows_actions"] = []
 
     # Step 4: Strategies + OKRs + Key Results
     try:
-        strat_rows = await db.execute_fetchall("SELECT * FROM strategies ORDER BY layer, id")
+        strat_rows = await db.execute_fetchall("SELECT * FROM strategies WHERE org_id = ? ORDER BY layer, id", (db.org_id,))
         ctx["strategies"] = [dict(r) for r in strat_rows]
     except Exception:
         ctx["strategies"] = []
 
     try:
-        okr_rows = await db.execute_fetchall("SELECT * FROM strategic_okrs ORDER BY id")
+        okr_rows = await db.execute_fetchall("SELECT * FROM strategic_okrs WHERE org_id = ? ORDER BY id", (db.org_id,))
         ctx["strategic_okrs"] = [dict(r) for r in okr_rows]
     except Exception:
         ctx["strategic_okrs"] = []
 
     try:
-        kr_rows = await db.execute_fetchall("SELECT * FROM strategic_key_results ORDER BY id")
+        kr_rows = await db.execute_fetchall("SELECT * FROM strategic_key_results WHERE org_id = ? ORDER BY id", (db.org_id,))
         ctx["key_results"] = [dict(r) for r in kr_rows]
     except Exception:
         ctx["key_results"] = []
 
     # Step 5: Initiatives
     try:
-        init_rows = await db.execute_fetchall("SELECT * FROM initiatives ORDER BY rice_score DESC")
+        init_rows = await db.execute_fetchall("SELECT * FROM initiatives WHERE org_id = ? ORDER BY rice_score DESC", (db.org_id,))
         ctx["initiatives"] = [dict(r) for r in init_rows]
     except Exception:
         ctx["initiatives"] = []
 
     # Step 6: Epics
     try:
-        epic_rows = await db.execute_fetchall("SELECT * FROM epics ORDER BY id")
+        epic_rows = await db.execute_fetchall("SELECT * FROM epics WHERE org_id = ? ORDER BY id", (db.org_id,))
         ctx["epics"] = [dict(r) for r in epic_rows]
     except Exception:
         ctx["epics"] = []
 
     # Step 7: Features
     try:
-        feat_rows = await db.execute_fetchall("SELECT * FROM features ORDER BY id")
+        feat_rows = await db.execute_fetchall("SELECT * FROM features WHERE org_id = ? ORDER BY id", (db.org_id,))
         ctx["features"] = [dict(r) for r in feat_rows]
     except Exception:
         ctx["features"] = []
 
     # Review gates
     try:
-        gate_rows = await db.execute_fetchall("SELECT * FROM review_gates ORDER BY step, gate_number")
+        gate_rows = await db.execute_fetchall("SELECT * FROM review_gates WHERE org_id = ? ORDER BY step_number, gate_number", (db.org_id,))
         ctx["review_gates"] = [dict(r) for r in gate_rows]
     except Exception:
         ctx["review_gates"] = []
 
     # RAG: Include relevant document context when in live mode
     try:
-        from rag_engine import build_rag_context, is_live_mode
+        from rag_engine import build_rag_context, context_query, is_live_mode
         if await is_live_mode(db):
             org_name = ctx["organization"].get("name", "")
             industry = ctx["organization"].get("industry", "")
             org_id = ctx["organization"].get("id")
-            query = f"{org_name} {industry} business performance financial analysis transformation"
-            rag_text = await build_rag_context(db, query, org_id=org_id, top_k=6)
+            query = context_query("dashboard", org_name=org_name, industry=industry)
+            rag_text = await build_rag_context(db, org_id=org_id, **query)
             if rag_text:
                 ctx["rag_context"] = rag_text
     except Exception:
@@ -143,7 +143,7 @@ async def gather_dashboard_context(db) -> dict:
 
 def _compute_data_hash(data) -> str:
     """MD5 hash of input data for cache key."""
-    raw = json.dumps(data, sort_keys=True, default=str)
+    raw = dumps(data, sort_keys=True)
     return hashlib.md5(raw.encode()).hexdigest()
 
 
@@ -152,13 +152,13 @@ async def _get_cached_analysis(db, analysis_type: str, input_hash: str) -> dict
     try:
         row = await db.execute_fetchone(
             "SELECT result_json FROM ai_analysis_cache "
-            "WHERE analysis_type = ? AND input_hash = ? "
+            "WHERE org_id = ? AND analysis_type = ? AND input_hash = ? "
             "AND (expires_at IS NULL OR expires_at > CURRENT_TIMESTAMP) "
             "ORDER BY created_at DESC LIMIT 1",
-            (analysis_type, input_hash),
+            (db.org_id, analysis_type, input_hash),
         )
         if row:
-            return json.loads(row["result_json"])
+            return loads(row["result_json"])
     except Exception:
         pass
     return None
@@ -170,9 +170,9 @@ async def _cache_analysis(db, analysis_type: str, input_hash: str, result: dict)
     try:
         expires = (datetime.utcnow() + timedelta(hours=24)).isoformat()
         await db.execute(
-            "INSERT INTO ai_analysis_cache (analysis_type, input_hash, result_json, expires_at) "
-            "VALUES (?, ?, ?, ?)",
-            (analysis_type, input_hash, json.dumps(result, default=str), expires),
+            "INSERT INTO ai_analysis_cache (org_id, analysis_type, input_hash, result_json, expires_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (db.org_id, analysis_type, input_hash, dumps(result), expires),
         )
         await db.commit()
     except Exception:
@@ -305,10 +305,10 @@ async def ai_financial_analysis(org, ops_metrics, competitors, revenue_trends) -
 
         user_prompt = (
             "Analyze the following organization's financial performance:\n\n"
-            f"Organization: {json.dumps(org, default=str)}\n\n"
-            f"Operational Metrics: {json.dumps(ops_metrics[:15], default=str)}\n\n"
-            f"Competitors: {json.dumps(competitors[:6], default=str)}\n\n"
-            f"Revenue Trends: {json.dumps(revenue_trends[:12], default=str)}\n"
+            f"Organization: {dumps(org)}\n\n"
+            f"Operational Metrics: {dumps(ops_metrics[:15])}\n\n"
+            f"Competitors: {dumps(competitors[:6])}\n\n"
+            f"Revenue Trends: {dumps(revenue_trends[:12])}\n"
         )
 
         client = AsyncOpenAI()
@@ -324,7 +324,7 @@ async def ai_financial_analysis(org, ops_metrics, competitors, revenue_trends) -
         )
 
         content = response.choices[0].message.content
-        result = json.loads(content)
+        result = loads(content)
 
         # Validate structure
         for cat in ["strengths", "weaknesses", "opportunities", "threats"]:
@@ -411,7 +411,7 @@ async def ai_discover_competitors(org_name, industry, existing_competitors) -> d
         )
 
         content = response.choices[0].message.content
-        result = json.loads(content)
+        result = loads(content)
 
         # Validate
         if "discovered_competitors" not in result or not isinstance(result["discovered_competitors"], list):
@@ -482,8 +482,8 @@ async def ai_trend_analysis(revenue_trends, ops_metrics, org_name) -> dict | Non
 
         user_prompt = (
             f"Organization: {org_name}\n\n"
-            f"Revenue Data: {json.dumps(revenue_trends[:15], default=str)}\n\n"
-            f"Operational Metrics: {json.dumps(ops_metrics[:15], default=str)}\n"
+            f"Revenue Data: {dumps(revenue_trends[:15])}\n\n"
+            f"Operational Metrics: {dumps(ops_metrics[:15])}\n"
         )
 
         client = AsyncOpenAI()
@@ -499,7 +499,7 @@ async def ai_trend_analysis(revenue_trends, ops_metrics, org_name) -> dict | Non
         )
 
         content = response.choices[0].message.content
-        result = json.loads(content)
+        result = loads(content)
 
         # Validate revenue_trend
         rt = result.get("revenue_trend", {})
@@ -567,10 +567,10 @@ async def ai_anomaly_detection(org_data, ops_metrics, competitors, revenue_trend
         )
 
         user_prompt = (
-            f"Organization: {json.dumps(org_data, default=str)}\n\n"
-            f"Operational Metrics: {json.dumps(ops_metrics[:15], default=str)}\n\n"
-            f"Competitors: {json.dumps(competitors[:6], default=str)}\n\n"
-            f"Revenue Trends: {json.dumps(revenue_trends[:12], default=str)}\n"
+            f"Organization: {dumps(org_data)}\n\n"
+            f"Operational Metrics: {dumps(ops_metrics[:15])}\n\n"
+            f"Competitors: {dumps(competitors[:6])}\n\n"
+            f"Revenue Trends: {dumps(revenue_trends[:12])}\n"
         )
 
         client = AsyncOpenAI()
@@ -586,7 +586,7 @@ async def ai_anomaly_detection(org_data, ops_metrics, competitors, revenue_trend
         )
 
         content = response.choices[0].message.content
-        result = json.loads(content)
+        result = loads(content)
 
         # Validate
         if "anomalies" not in result or not isinstance(result["anomalies"], list):
@@ -655,11 +655,11 @@ async def ai_executive_summary(org_data, ops_metrics, competitors, revenue_trend
         )
 
         user_prompt = (
-            f"Organization: {json.dumps(org_data, default=str)}\n\n"
-            f"Metrics: {json.dumps(ops_metrics[:15], default=str)}\n\n"
-            f"Competitors: {json.dumps(competitors[:6], default=str)}\n\n"
-            f"Revenue: {json.dumps(revenue_trends[:12], default=str)}\n\n"
-            f"SWOT: {json.dumps(swot[:20], default=str)}\n"
+            f"Organization: {dumps(org_data)}\n\n"
+            f"Metrics: {dumps(ops_metrics[:15])}\n\n"
+            f"Competitors: {dumps(competitors[:6])}\n\n"
+            f"Revenue: {dumps(revenue_trends[:12])}\n\n"
+            f"SWOT: {dumps(swot[:20])}\n"
         )
 
         client = AsyncOpenAI()
@@ -675,7 +675,7 @@ async def ai_executive_summary(org_data, ops_metrics, competitors, revenue_trend
         )
 
         content = response.choices[0].message.content
-        result = json.loads(content)
+        result = loads(content)
 
         # Validate
         result.setdefault("headline", "Executive Summary")
@@ -734,9 +734,9 @@ async def ai_data_enrichment_suggestions(org_data, industry, existing_data_summa
         )
 
         user_prompt = (
-            f"Organization: {json.dumps(org_data, default=str)}\n"
+            f"Organization: {dumps(org_data)}\n"
             f"Industry: {industry}\n\n"
-            f"Existing Data Summary: {json.dumps(existing_data_summary, default=str)}\n"
+            f"Existing Data Summary: {dumps(existing_data_summary)}\n"
         )
 
         client = AsyncOpenAI()
@@ -752,7 +752,7 @@ async def ai_data_enrichment_suggestions(org_data, industry, existing_data_summa
         )
 
         content = response.choices[0].message.content
-        result = json.loads(content)
+        result = loads(content)
 
         # Validate
         if "missing_metrics" not in result or not isinstance(result["missing_metrics"], list):
@@ -841,7 +841,7 @@ async def ai_transformation_health(all_step_data: dict) -> dict | None:
         )
 
         content = response.choices[0].message.content
-        result = json.loads(content)
+        result = loads(content)
 
         # Validate
         try:
@@ -936,7 +936,7 @@ async def ai_natural_language_query(question: str, all_data_context: dict) -> di
         )
 
         content = response.choices[0].message.content
-        result = json.loads(content)
+        result = loads(content)
 
         # Validate
         result.setdefault("answer", "Unable to determine from available data.")
@@ -961,8 +961,13 @@ async def ai_natural_language_query(question: str, all_data_context: dict) -> di
 # ─── Function 9: AI What-If Scenario ─────────────────────────────────────────
 
 
-async def ai_whatif_scenario(scenario_params: dict, org_data, competitors, revenue_trends) -> dict | None:
-    """Model what-if scenarios with downstream impact analysis. Returns None on failure."""
+async def ai_whatif_scenario(scenario_params: dict, org_data, competitors, revenue_trends,
+                             simulation: dict | None = None) -> dict | None:
+    """Model what-if scenarios with downstream impact analysis. Returns None on failure.
+
+    When `simulation` (from scenario_engine) is given, the LLM only narrates those
+    computed numbers and the financial figures in the result are taken from it.
+    """
     if not is_openai_available():
         return None
 
@@ -994,11 +999,17 @@ async def ai_whatif_scenario(scenario_params: dict, org_data, competitors, reven
         )
 
         user_prompt = (
-            f"Scenario: {json.dumps(scenario_params, default=str)}\n\n"
-            f"Organization: {json.dumps(org_data, default=str)}\n\n"
-            f"Competitors: {json.dumps(competitors[:6], default=str)}\n\n"
-            f"Revenue: {json.dumps(revenue_trends[:12], default=str)}\n"
+            f"Scenario: {dumps(scenario_params)}\n\n"
+            f"Organization: {dumps(org_data)}\n\n"
+            f"Competitors: {dumps(competitors[:6])}\n\n"
+            f"Revenue: {dumps(revenue_trends[:12])}\n"
         )
+        if simulation:
+            system_prompt += (
+                "- A Monte Carlo simulation has already computed the financial impact. Treat its "
+                "percentile bands as authoritative: narrate and interpret them, never invent other figures\n"
+            )
+            user_prompt += f"\nSimulation results: {dumps(simulation)}\n"
 
         client = AsyncOpenAI()
         response = await client.chat.completions.create(
@@ -1013,7 +1024,7 @@ async def ai_whatif_scenario(scenario_params: dict, org_data, competitors, reven
         )
 
         content = response.choices[0].message.content
-        result = json.loads(content)
+        result = loads(content)
 
         # Validate
         result.setdefault("scenario_summary", "")
@@ -1044,6 +1055,12 @@ async def ai_whatif_scenario(scenario_params: dict, org_data, competitors, reven
             if o.get("probability") not in ("high", "medium", "low"):
                 o["probability"] = "medium"
 
+        if simulation:
+            fi = ia.get("financial_impact") or {}
+            fi["revenue_change_pct"] = simulation["revenue_change_pct"]["p50"]
+            fi["margin_impact_pct"] = simulation["margin_impact_pct"]["p50"]
+            ia["financial_impact"] = fi
+
         result.setdefault("downstream_effects", {"on_strategies": "", "on_initiatives": "", "on_value_streams": ""})
         result.setdefault("recommendation", "")
         if result.get("confidence") not in ("high", "medium", "low"):
@@ -1092,11 +1109,11 @@ async def ai_generate_report(org_data, ops_metrics, competitors, revenue_trends,
         )
 
         user_prompt = (
-            f"Organization: {json.dumps(org_data, default=str)}\n\n"
-            f"Metrics: {json.dumps(ops_metrics[:15], default=str)}\n\n"
-            f"Competitors: {json.dumps(competitors[:6], default=str)}\n\n"
-            f"Revenue: {json.dumps(revenue_trends[:12], default=str)}\n\n"
-            f"SWOT: {json.dumps(swot[:20], default=str)}\n"
+            f"Organization: {dumps(org_data)}\n\n"
+            f"Metrics: {dumps(ops_metrics[:15])}\n\n"
+            f"Competitors: {dumps(competitors[:6])}\n\n"
+            f"Revenue: {dumps(revenue_trends[:12])}\n\n"
+            f"SWOT: {dumps(swot[:20])}\n"
         )
 
         client = AsyncOpenAI()
@@ -1112,7 +1129,7 @@ async def ai_generate_report(org_data, ops_metrics, competitors, revenue_trends,
         )
 
         content = response.choices[0].message.content
-        result = json.loads(content)
+        result = loads(content)
 
         # Validate
         result.setdefault("report_title", "Transformation Report")
@@ -4,11 +4,11 @@ Chains Steps 1→7 sequentially, with AI-powered generation for each step.
 """
 
 import asyncio
-import json
 import logging
 import traceback
 
 from ai_research import is_openai_available
+from serialization import dumps, loads
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +32,13 @@ GATE_NAMES = {
     7: "Feature Backlog Review",
 }
 
+# rag_engine.CONTEXT_QUERIES a run's gatherers use: once per run (Steps 3-7 and the v2
+# enhancements, via gather_full_context and gather_initiative_context) and once per value
+# stream segment (Step 2's pull_from_sources). The dashboard and competitor_operations
+# queries belong to endpoints the run never calls.
+RUN_CONTEXT_QUERIES = ("full_context", "initiatives")
+SEGMENT_CONTEXT_QUERIES = ("value_stream",)
+
 
 async def generate_all_steps(run_id: int, org_id: int, db):
     """Main orchestrator — runs Steps 1-7 sequentially, updates generation_runs progress."""
@@ -41,21 +48,21 @@ async def generate_all_steps(run_id: int, org_id: int, db):
     steps_failed = []
 
     async def _update_run(status, step, message, error=None):
-        conn = await get_db_connection()
+        conn = await get_db_connection(org_id=org_id)
         try:
             completed_at = "CURRENT_TIMESTAMP" if status in ("completed", "failed", "partial") else None
             if completed_at:
                 await conn.execute(
                     "UPDATE generation_runs SET status=?, current_step=?, steps_completed=?, "
                     "steps_failed=?, message=?, error_message=?, completed_at=CURRENT_TIMESTAMP WHERE id=?",
-                    [status, step, json.dumps(steps_completed), json.dumps(steps_failed),
+                    [status, step, dumps(steps_completed), dumps(steps_failed),
                      message, error, run_id],
                 )
             else:
                 await conn.execute(
                     "UPDATE generation_runs SET status=?, current_step=?, steps_completed=?, "
                     "steps_failed=?, message=?, error_message=? WHERE id=?",
-                    [status, step, json.dumps(steps_completed), json.dumps(steps_failed),
+                    [status, step, dumps(steps_completed), dumps(steps_failed),
                      message, error, run_id],
                 )
             await conn.commit()
@@ -87,10 +94,13 @@ async def generate_all_steps(run_id: int, org_id: int, db):
             steps_failed.append(2)
             await _update_run("running", 2, f"Step 2 failed: {e}", str(e))
 
+        # Step 2 normally prefetched these along with its segments; if it didn't run, batch them now
+        await _prefetch_rag_contexts(db, org_id)
+
         # --- Step 3: SWOT & TOWS ---
         await _update_run("running", 3, "Generating SWOT analysis & TOWS actions...")
         try:
-            bu_rows = await db.execute_fetchall("SELECT id FROM business_units LIMIT 1")
+            bu_rows = await db.execute_fetchall("SELECT id FROM business_units WHERE org_id = ? LIMIT 1", (db.org_id,))
             if bu_rows:
                 bu_id = bu_rows[0]["id"]
                 from routers.step3_swot_tows import auto_generate as step3_auto
@@ -113,7 +123,7 @@ async def generate_all_steps(run_id: int, org_id: int, db):
             from routers.step4_strategy_okrs import auto_generate_strategies as step4_auto
             result = await step4_auto(db)
             # Auto-approve all strategies so Step 5 can use them
-            await db.execute("UPDATE strategies SET approved = 1")
+            await db.execute("UPDATE strategies SET approved = 1 WHERE org_id = ?", (db.org_id,))
             await db.commit()
             steps_completed.append(4)
             s_count = result.get("strategies", 0)
@@ -202,6 +212,68 @@ async def generate_all_steps(run_id: int, org_id: int, db):
         await _update_run("failed", 0, f"Orchestrator error: {e}", str(e))
 
 
+async def run_generation_job(db, payload: dict) -> dict:
+    """Job queue handler (kind "generate_all") for one generation_runs row."""
+    from database import get_db_connection
+
+    run_id = payload["run_id"]
+    try:
+        await generate_all_steps(run_id, db.org_id, db)
+    except (Exception, asyncio.CancelledError) as e:
+        cancelled = isinstance(e, asyncio.CancelledError)
+        attempt, max_attempts = payload.get("_attempt", 1), payload.get("_max_attempts", 1)
+        if not cancelled:
+            logger.error("Orchestrator crashed (attempt %s/%s): %s", attempt, max_attempts, e)
+        # The job's own connection may be mid-statement; record the outcome on a fresh one
+        conn = await get_db_connection(org_id=db.org_id)
+        try:
+            if not cancelled and attempt < max_attempts:
+                # The queue will retry this job, so the run stays running until its last attempt
+                await conn.execute(
+                    "UPDATE generation_runs SET status='running', message=?, error_message=? "
+                    "WHERE id=? AND org_id=?",
+                    [f"Attempt {attempt}/{max_attempts} crashed, retrying...", str(e), run_id, db.org_id],
+                )
+            else:
+                await conn.execute(
+                    "UPDATE generation_runs SET status='failed', message=?, error_message=?, "
+                    "completed_at=CURRENT_TIMESTAMP WHERE id=? AND org_id=?",
+                    ["Cancelled" if cancelled else f"Crashed: {e}", None if cancelled else str(e), run_id, db.org_id],
+                )
+            await conn.commit()
+        finally:
+            await conn.close()
+        raise
+
+    row = await db.execute_fetchone(
+        "SELECT status, message FROM generation_runs WHERE id = ? AND org_id = ?", [run_id, db.org_id]
+    )
+    return {"run_id": run_id, **(dict(row) if row else {})}
+
+
+async def _prefetch_rag_contexts(db, org_id: int, segments: list[str] = ()):
+    """Retrieve every RAG query the run will make in one batch (live mode only): the
+    run-wide RUN_CONTEXT_QUERIES plus SEGMENT_CONTEXT_QUERIES for each value stream segment.
+    Queries already prefetched this run are skipped; a failure just leaves them unbatched."""
+    from rag_engine import context_query, is_live_mode, prefetch_contexts
+
+    try:
+        if not await is_live_mode(db):
+            return
+        org = await db.execute_fetchone("SELECT name, industry FROM organization WHERE id = ?", [org_id])
+        if not org:
+            return
+        fields = {"org_name": org["name"], "industry": org["industry"]}
+        specs = [context_query(name, **fields) for name in RUN_CONTEXT_QUERIES]
+        specs += [
+            context_query(name, segment=segment, **fields)
+            for name in SEGMENT_CONTEXT_QUERIES for segment in segments
+        ]
+        await prefetch_contexts(db, specs, org_id=org_id)
+    except Exception as e:
+        logger.warning("RAG prefetch skipped: %s", e)
+
+
 # ─────────────────────────────────────────────────
 # Step 1: AI-powered business data generation
 # ─────────────────────────────────────────────────
@@ -228,7 +300,7 @@ async def _run_step1(org_id: int, db):
         logger.info("API ingestion not available, falling back to AI: %s", e)
 
     # Check if any data already exists
-    bu_count = await db.execute_fetchone("SELECT COUNT(*) as c FROM business_units")
+    bu_count = await db.execute_fetchone("SELECT COUNT(*) as c FROM business_units WHERE org_id = ?", (db.org_id,))
     if bu_count and bu_count["c"] > 0:
         return {"summary": "Existing data preserved"}
 
@@ -284,19 +356,19 @@ Rules:
         temperature=0.7,
     )
 
-    data = json.loads(response.choices[0].message.content)
+    data = loads(response.choices[0].message.content)
 
     # Insert business units
     bu_map = {}
     for bu in data.get("business_units", []):
         name = bu.get("name", org_name)
-        existing = await db.execute_fetchall("SELECT id FROM business_units WHERE name = ?", [name])
+        existing = await db.execute_fetchall("SELECT id FROM business_units WHERE org_id = ? AND name = ?", [db.org_id, name])
         if existing:
             bu_map[name] = existing[0]["id"]
         else:
             cursor = await db.execute(
-                "INSERT INTO business_units (name, description) VALUES (?, ?)",
-                [name, bu.get("description", "")],
+                "INSERT INTO business_units (org_id, name, description) VALUES (?, ?, ?)",
+                [db.org_id, name, bu.get("description", "")],
             )
             bu_map[name] = cursor.lastrowid
 
@@ -311,8 +383,8 @@ Rules:
         if revenue is None:
             continue
         await db.execute(
-            "INSERT INTO revenue_splits (business_unit_id, dimension, dimension_value, revenue, period) VALUES (?, ?, ?, ?, ?)",
-            [bu_id, rs.get("dimension", "product"), rs.get("dimension_value", "Total Revenue"),
+            "INSERT INTO revenue_splits (org_id, business_unit_id, dimension, dimension_value, revenue, period) VALUES (?, ?, ?, ?, ?, ?)",
+            [db.org_id, bu_id, rs.get("dimension", "product"), rs.get("dimension_value", "Total Revenue"),
              float(revenue), rs.get("period", "2024")],
         )
         rev_count += 1
@@ -325,8 +397,8 @@ Rules:
         if not bu_id or not m.get("metric_name"):
             continue
         await db.execute(
-            "INSERT INTO ops_efficiency (business_unit_id, metric_name, metric_value, period) VALUES (?, ?, ?, ?)",
-            [bu_id, m["metric_name"], float(m.get("metric_value", 0)), m.get("period", "TTM")],
+            "INSERT INTO ops_efficiency (org_id, business_unit_id, metric_name, metric_value, period) VALUES (?, ?, ?, ?, ?)",
+            [db.org_id, bu_id, m["metric_name"], float(m.get("metric_value", 0)), m.get("period", "TTM")],
         )
         ops_count += 1
 
@@ -336,11 +408,11 @@ Rules:
         name = c.get("name")
         if not name:
             continue
-        existing = await db.execute_fetchall("SELECT id FROM competitors WHERE name = ?", [name])
+        existing = await db.execute_fetchall("SELECT id FROM competitors WHERE org_id = ? AND name = ?", [db.org_id, name])
         if not existing:
             await db.execute(
-                "INSERT INTO competitors (name, strengths, weaknesses, data_source) VALUES (?, ?, ?, ?)",
-                [name, c.get("strengths"), c.get("weaknesses"), "AI-generated"],
+                "INSERT INTO competitors (org_id, name, strengths, weaknesses, data_source) VALUES (?, ?, ?, ?, ?)",
+                [db.org_id, name, c.get("strengths"), c.get("weaknesses"), "AI-generated"],
             )
             comp_count += 1
 
@@ -352,31 +424,31 @@ async def _generate_step1_template(org_name: str, industry: str, db) -> dict:
     """Template fallback for Step 1 generation."""
     # Create a single business unit
     cursor = await db.execute(
-        "INSERT INTO business_units (name, description) VALUES (?, ?)",
-        [org_name, f"Primary business unit for {org_name}"],
+        "INSERT INTO business_units (org_id, name, description) VALUES (?, ?, ?)",
+        [db.org_id, org_name, f"Primary business unit for {org_name}"],
     )
     bu_id = cursor.lastrowid
 
     # Add template revenue
     for year, rev in [("2023", 50000000), ("2024", 55000000), ("2025", 60000000)]:
         await db.execute(
-            "INSERT INTO revenue_splits (business_unit_id, dimension, dimension_value, revenue, period) VALUES (?, ?, ?, ?, ?)",
-            [bu_id, "product", "Total Revenue", rev, year],
+            "INSERT INTO revenue_splits (org_id, business_unit_id, dimension, dimension_value, revenue, period) VALUES (?, ?, ?, ?, ?, ?)",
+            [db.org_id, bu_id, "product", "Total Revenue", rev, year],
         )
 
     # Add template metrics
     for name, value in [("Net Profit Margin", 0.12), ("Operating Margin", 0.18),
                         ("Return on Equity (ROE)", 0.15), ("Return on Assets (ROA)", 0.08)]:
         await db.execute(
-            "INSERT INTO ops_efficiency (business_unit_id, metric_name, metric_value, period) VALUES (?, ?, ?, ?)",
-            [bu_id, name, value, "TTM"],
+            "INSERT INTO ops_efficiency (org_id, business_unit_id, metric_name, metric_value, period) VALUES (?, ?, ?, ?, ?)",
+            [db.org_id, bu_id, name, value, "TTM"],
         )
 
     # Add template competitors
     for comp in [f"{industry} Leader Co", f"{industry} Challenger Inc"]:
         await db.execute(
-            "INSERT INTO competitors (name, data_source) VALUES (?, ?)",
-            [comp, "Template"],
+            "INSERT INTO competitors (org_id, name, data_source) VALUES (?, ?, ?)",
+            [db.org_id, comp, "Template"],
         )
 
     await db.commit()
@@ -398,12 +470,12 @@ async def _run_step2(org_id: int, db):
     industry = org["industry"]
 
     # Check if value streams already exist
-    vs_count = await db.execute_fetchone("SELECT COUNT(*) as c FROM value_streams")
+    vs_count = await db.execute_fetchone("SELECT COUNT(*) as c FROM value_streams WHERE org_id = ?", (db.org_id,))
     if vs_count and vs_count["c"] > 0:
         return {"summary": "Existing value streams preserved"}
 
     # Get first business unit
-    bu_rows = await db.execute_fetchall("SELECT id FROM business_units LIMIT 1")
+    bu_rows = await db.execute_fetchall("SELECT id FROM business_units WHERE org_id = ? LIMIT 1", (db.org_id,))
     if not bu_rows:
         raise ValueError("No business units found — Step 1 must run first")
     bu_id = bu_rows[0]["id"]
@@ -411,6 +483,10 @@ async def _run_step2(org_id: int, db):
     # Determine value stream names
     segment_names = await _determine_value_stream_names(org_name, industry)
 
+    # pull_from_sources adds RAG context to its OpenAI research; batch every segment's query
+    # with the run-wide ones
+    await _prefetch_rag_contexts(db, org_id, segments=segment_names if is_openai_available() else ())
+
     # Generate each value stream using pull-sources logic
     total_steps = 0
     for segment_name in segment_names:
@@ -461,7 +537,7 @@ async def _determine_value_stream_names(org_name: str, industry: str) -> list[st
                 max_tokens=500,
                 temperature=0.7,
             )
-            data = json.loads(response.choices[0].message.content)
+            data = loads(response.choices[0].message.content)
             names = data.get("value_streams", [])
             if names and len(names) >= 2:
                 return names[:4]
@@ -483,15 +559,15 @@ async def _determine_value_stream_names(org_name: str, industry: str) -> list[st
 async def _generate_teams(db):
     """Create teams based on the strategies and initiatives context."""
     # Check if teams already exist
-    team_count = await db.execute_fetchone("SELECT COUNT(*) as c FROM teams")
+    team_count = await db.execute_fetchone("SELECT COUNT(*) as c FROM teams WHERE org_id = ?", (db.org_id,))
     if team_count and team_count["c"] > 0:
         return  # Teams already exist
 
     if is_openai_available():
         try:
             # Gather context for AI team generation
-            strategies = await db.execute_fetchall("SELECT name, layer, description FROM strategies LIMIT 10")
-            initiatives = await db.execute_fetchall("SELECT name, description FROM initiatives LIMIT 15")
+            strategies = await db.execute_fetchall("SELECT name, layer, description FROM strategies WHERE org_id = ? LIMIT 10", (db.org_id,))
+            initiatives = await db.execute_fetchall("SELECT name, description FROM initiatives WHERE org_id = ? LIMIT 15", (db.org_id,))
 
             strat_text = "\n".join(f"- [{dict(s)['layer']}] {dict(s)['name']}" for s in strategies)
             init_text = "\n".join(f"- {dict(i)['name']}" for i in initiatives)
@@ -513,18 +589,18 @@ async def _generate_teams(db):
                 max_tokens=500,
                 temperature=0.7,
             )
-            data = json.loads(response.choices[0].message.content)
+            data = loads(response.choices[0].message.content)
             teams = data.get("teams", [])
 
             for team in teams:
                 name = team.get("name")
                 if not name:
                     continue
-                existing = await db.execute_fetchall("SELECT id FROM teams WHERE name = ?", [name])
+                existing = await db.execute_fetchall("SELECT id FROM teams WHERE org_id = ? AND name = ?", [db.org_id, name])
                 if not existing:
                     await db.execute(
-                        "INSERT INTO teams (name, capacity) VALUES (?, ?)",
-                        [name, team.get("capacity", 8)],
+                        "INSERT INTO teams (org_id, name, capacity) VALUES (?, ?, ?)",
+                        [db.org_id, name, team.get("capacity", 8)],
                     )
             await db.commit()
             return
@@ -540,9 +616,9 @@ async def _generate_teams(db):
         ("Customer Experience", 6),
     ]
     for name, capacity in default_teams:
-        existing = await db.execute_fetchall("SELECT id FROM teams WHERE name = ?", [name])
+        existing = await db.execute_fetchall("SELECT id FROM teams WHERE org_id = ? AND name = ?", [db.org_id, name])
         if not existing:
-            await db.execute("INSERT INTO teams (name, capacity) VALUES (?, ?)", [name, capacity])
+            await db.execute("INSERT INTO teams (org_id, name, capacity) VALUES (?, ?, ?)", [db.org_id, name, capacity])
     await db.commit()
 
 
@@ -554,13 +630,13 @@ async def _create_review_gates(db):
     """Create 7 review gates (one per step), all pending."""
     for step_num in range(1, 8):
         existing = await db.execute_fetchall(
-            "SELECT id FROM review_gates WHERE step_number = ? AND gate_number = 1",
-            [step_num],
+            "SELECT id FROM review_gates WHERE org_id = ? AND step_number = ? AND gate_number = 1",
+            [db.org_id, step_num],
         )
         if not existing:
             await db.execute(
-                "INSERT INTO review_gates (step_number, gate_number, gate_name, status) VALUES (?, 1, ?, 'pending')",
-                [step_num, GATE_NAMES.get(step_num, f"Step {step_num} Review")],
+                "INSERT INTO review_gates (org_id, step_number, gate_number, gate_name, status) VALUES (?, ?, 1, ?, 'pending')",
+                [db.org_id, step_num, GATE_NAMES.get(step_num, f"Step {step_num} Review")],
             )
     await db.commit()
 
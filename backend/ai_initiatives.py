@@ -20,58 +20,58 @@ async def gather_initiative_context(db) -> dict:
     ctx = {}
 
     # Organization info
-    org_rows = await db.execute_fetchall("SELECT * FROM organization LIMIT 1")
+    org_rows = await db.execute_fetchall("SELECT * FROM organization WHERE id = ?", (db.org_id,))
     ctx["organization"] = dict(org_rows[0]) if org_rows else {}
 
     org_name = ctx["organization"].get("name", "")
     industry = ctx["organization"].get("industry", "")
 
     # Financial metrics
-    ops_rows = await db.execute_fetchall("SELECT * FROM ops_efficiency ORDER BY period DESC")
+    ops_rows = await db.execute_fetchall("SELECT * FROM ops_efficiency WHERE org_id = ? ORDER BY period DESC", (db.org_id,))
     ctx["financial_metrics"] = [dict(r) for r in ops_rows]
 
     # Revenue trends
-    rev_rows = await db.execute_fetchall("SELECT * FROM revenue_splits ORDER BY period")
+    rev_rows = await db.execute_fetchall("SELECT * FROM revenue_splits WHERE org_id = ? ORDER BY period", (db.org_id,))
     ctx["revenue_trends"] = [dict(r) for r in rev_rows]
 
     # Competitors
-    comp_rows = await db.execute_fetchall("SELECT * FROM competitors ORDER BY name")
+    comp_rows = await db.execute_fetchall("SELECT * FROM competitors WHERE org_id = ? ORDER BY name", (db.org_id,))
     ctx["competitors"] = [dict(r) for r in comp_rows]
 
     # Value streams with metrics and benchmarks
     vs_rows = await db.execute_fetchall(
         "SELECT vs.*, vsm.total_lead_time_hours, vsm.total_process_time_hours, "
         "vsm.total_wait_time_hours, vsm.flow_efficiency, vsm.bottleneck_step, vsm.bottleneck_reason "
-        "FROM value_streams vs LEFT JOIN value_stream_metrics vsm ON vs.id = vsm.value_stream_id"
+        "FROM value_streams vs LEFT JOIN value_stream_metrics vsm ON vs.id = vsm.value_stream_id WHERE vs.org_id = ?", (db.org_id,)
     )
     ctx["value_streams"] = [dict(r) for r in vs_rows]
 
     for vs in ctx["value_streams"]:
         bench_rows = await db.execute_fetchall(
-            "SELECT * FROM value_stream_benchmarks WHERE value_stream_id = ?", (vs["id"],)
+            "SELECT * FROM value_stream_benchmarks WHERE org_id = ? AND value_stream_id = ?", (db.org_id, vs["id"])
         )
         vs["benchmarks"] = [dict(r) for r in bench_rows]
 
     # High-impact levers
     lever_rows = await db.execute_fetchall(
-        "SELECT * FROM value_stream_levers WHERE impact_estimate = 'high' ORDER BY lever_type"
+        "SELECT * FROM value_stream_levers WHERE org_id = ? AND impact_estimate = 'high' ORDER BY lever_type", (db.org_id,)
     )
     ctx["high_impact_levers"] = [dict(r) for r in lever_rows]
 
     # SWOT entries with severity/confidence
     swot_rows = await db.execute_fetchall(
-        "SELECT * FROM swot_entries ORDER BY category"
+        "SELECT * FROM swot_entries WHERE org_id = ? ORDER BY category", (db.org_id,)
     )
     ctx["swot_entries"] = [dict(r) for r in swot_rows]
 
     # TOWS actions with impact scores
     tows_rows = await db.execute_fetchall(
-        "SELECT * FROM tows_actions ORDER BY strategy_type, priority DESC"
+        "SELECT * FROM tows_actions WHERE org_id = ? ORDER BY strategy_type, priority DESC", (db.org_id,)
     )
     ctx["tows_actions"] = [dict(r) for r in tows_rows]
 
     # User strategy inputs
-    input_rows = await db.execute_fetchall("SELECT * FROM strategy_inputs ORDER BY input_type")
+    input_rows = await db.execute_fetchall("SELECT * FROM strategy_inputs WHERE org_id = ? ORDER BY input_type", (db.org_id,))
     inputs_by_type = {}
     for inp in input_rows:
         inp_dict = dict(inp)
@@ -83,19 +83,19 @@ async def gather_initiative_context(db) -> dict:
 
     # Approved strategies with OKRs and key results
     strat_rows = await db.execute_fetchall(
-        "SELECT * FROM strategies WHERE approved = 1 ORDER BY layer, id"
+        "SELECT * FROM strategies WHERE org_id = ? AND approved = 1 ORDER BY layer, id", (db.org_id,)
     )
     strategies = []
     for s in strat_rows:
         s_dict = dict(s)
         okr_rows = await db.execute_fetchall(
-            "SELECT * FROM strategic_okrs WHERE strategy_id = ?", (s_dict["id"],)
+            "SELECT * FROM strategic_okrs WHERE org_id = ? AND strategy_id = ?", (db.org_id, s_dict["id"])
         )
         s_dict["okrs"] = []
         for okr in okr_rows:
             okr_dict = dict(okr)
             kr_rows = await db.execute_fetchall(
-                "SELECT * FROM strategic_key_results WHERE okr_id = ?", (okr_dict["id"],)
+                "SELECT * FROM strategic_key_results WHERE org_id = ? AND okr_id = ?", (db.org_id, okr_dict["id"])
             )
             okr_dict["key_results"] = [dict(kr) for kr in kr_rows]
             s_dict["okrs"].append(okr_dict)
@@ -105,20 +105,20 @@ async def gather_initiative_context(db) -> dict:
     # Existing initiatives (for deduplication in epic generation)
     init_rows = await db.execute_fetchall(
         "SELECT i.*, s.layer as strategy_layer, s.name as strategy_name "
-        "FROM initiatives i LEFT JOIN strategies s ON i.strategy_id = s.id "
-        "ORDER BY i.id"
+        "FROM initiatives i LEFT JOIN strategies s ON i.strategy_id = s.id WHERE i.org_id = ? "
+        "ORDER BY i.id", (db.org_id,)
     )
     ctx["existing_initiatives"] = [dict(r) for r in init_rows]
 
     # Existing epics (for deduplication in feature generation)
     epic_rows = await db.execute_fetchall(
         "SELECT e.*, i.name as initiative_name "
-        "FROM epics e JOIN initiatives i ON e.initiative_id = i.id ORDER BY e.id"
+        "FROM epics e JOIN initiatives i ON e.initiative_id = i.id WHERE e.org_id = ? ORDER BY e.id", (db.org_id,)
     )
     ctx["existing_epics"] = [dict(r) for r in epic_rows]
 
     # Existing teams (for team recommendation)
-    team_rows = await db.execute_fetchall("SELECT * FROM teams ORDER BY name")
+    team_rows = await db.execute_fetchall("SELECT * FROM teams WHERE org_id = ? ORDER BY name", (db.org_id,))
     ctx["existing_teams"] = [dict(r) for r in team_rows]
 
     # External sources (fail gracefully)
@@ -143,11 +143,11 @@ async def gather_initiative_context(db) -> dict:
 
     # RAG: Include relevant document context when in live mode
     try:
-        from rag_engine import build_rag_context, is_live_mode
+        from rag_engine import build_rag_context, context_query, is_live_mode
         if await is_live_mode(db):
             org_id = ctx["organization"].get("id")
-            query = f"{org_name} {industry} digital initiatives strategy transformation capabilities"
-            rag_text = await build_rag_context(db, query, org_id=org_id, top_k=8)
+            query = context_query("initiatives", org_name=org_name, industry=industry)
+            rag_text = await build_rag_context(db, org_id=org_id, **query)
             if rag_text:
                 ctx["rag_context"] = rag_text
     except Exception:
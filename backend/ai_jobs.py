@@ -0,0 +1,70 @@
+"""
+AI Jobs — `?async=1` mode for the /ai-generate endpoints.
+Instead of holding the request open for the LLM round trip, the endpoint queues an
+"ai_generate" job (see job_queue.py) and answers 202 with the job id; the job runs the
+same endpoint function on a worker and stores its response as the job result, readable
+from GET /api/jobs/{job_id}.
+"""
+
+import hashlib
+import importlib
+import json
+import logging
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+
+from job_queue import enqueue
+
+logger = logging.getLogger(__name__)
+
+# Generator name -> "module:function" of the endpoint it runs. Endpoints take `db`, an
+# optional `data` body and the `run_async` flag.
+GENERATORS = {
+    "readiness": "routers.step0_readiness:ai_generate_readiness",
+    "maturity": "routers.step0_readiness:ai_generate_maturity",
+    "journeys": "routers.step2b_journeys:ai_generate_journeys",
+    "regulatory": "routers.step4b_regulatory:ai_generate_regulatory",
+    "change_plans": "routers.step5b_change_mgmt:ai_generate_change_plans",
+    "tom": "routers.step6b_tom:ai_generate_tom",
+    "risks": "routers.v2_features:ai_generate_risks",
+    "pilot_scopes": "routers.v2_features:ai_generate_pilot_scopes",
+    "tech_recommendations": "routers.v2_features:ai_generate_tech",
+    "business_case": "routers.v2_features:ai_generate_business_case",
+    "feasibility": "routers.v2_features:ai_generate_feasibility",
+    "scenarios": "routers.v2_features:ai_generate_scenarios",
+}
+
+# LLM calls fail transiently (rate limits, timeouts); one retry with backoff
+GENERATOR_MAX_ATTEMPTS = 2
+
+
+async def enqueue_generator(db, name: str, data: dict | None = None) -> JSONResponse:
+    """Queue a generator run and return the 202 response for the caller.
+
+    Identical requests while one is still queued or running share the same job.
+    """
+    body = json.dumps(data or {}, sort_keys=True, default=str)
+    dedupe_key = f"ai_generate:{name}:{hashlib.md5(body.encode()).hexdigest()}"
+    job_id = await enqueue(db, "ai_generate", {"generator": name, "data": data}, dedupe_key=dedupe_key,
+                           max_attempts=GENERATOR_MAX_ATTEMPTS)
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={"job_id": job_id, "status": "queued", "generator": name, "status_url": f"/api/jobs/{job_id}"},
+        headers={"Location": f"/api/jobs/{job_id}"},
+    )
+
+
+async def run_generator_job(db, payload: dict):
+    """Job queue handler (kind "ai_generate"): run the endpoint synchronously on this worker."""
+    name = payload.get("generator")
+    target = GENERATORS.get(name)
+    if not target:
+        raise LookupError(f"Unknown generator '{name}'")
+    module_name, func_name = target.split(":")
+    endpoint = getattr(importlib.import_module(module_name), func_name)
+
+    kwargs = {"db": db, "run_async": False}
+    if payload.get("data") is not None:
+        kwargs["data"] = payload["data"]
+    return await endpoint(**kwargs)
@@ -21,22 +21,22 @@ async def gather_full_context(db, business_unit_id: int) -> dict:
     ctx = {}
 
     # Organization info
-    org_rows = await db.execute_fetchall("SELECT * FROM organization LIMIT 1")
+    org_rows = await db.execute_fetchall("SELECT * FROM organization WHERE id = ?", (db.org_id,))
     ctx["organization"] = dict(org_rows[0]) if org_rows else {}
 
     org_name = ctx["organization"].get("name", "")
     industry = ctx["organization"].get("industry", "")
 
     # Financial metrics from ops_efficiency
-    ops_rows = await db.execute_fetchall("SELECT * FROM ops_efficiency ORDER BY period DESC")
+    ops_rows = await db.execute_fetchall("SELECT * FROM ops_efficiency WHERE org_id = ? ORDER BY period DESC", (db.org_id,))
     ctx["financial_metrics"] = [dict(r) for r in ops_rows]
 
     # Revenue trends
-    rev_rows = await db.execute_fetchall("SELECT * FROM revenue_splits ORDER BY period")
+    rev_rows = await db.execute_fetchall("SELECT * FROM revenue_splits WHERE org_id = ? ORDER BY period", (db.org_id,))
     ctx["revenue_trends"] = [dict(r) for r in rev_rows]
 
     # Competitors from DB
-    comp_rows = await db.execute_fetchall("SELECT * FROM competitors ORDER BY name")
+    comp_rows = await db.execute_fetchall("SELECT * FROM competitors WHERE org_id = ? ORDER BY name", (db.org_id,))
     ctx["competitors"] = [dict(r) for r in comp_rows]
 
     # Value stream data with metrics
@@ -44,39 +44,39 @@ async def gather_full_context(db, business_unit_id: int) -> dict:
         "SELECT vs.*, vsm.total_lead_time_hours, vsm.total_process_time_hours, "
         "vsm.total_wait_time_hours, vsm.flow_efficiency, vsm.bottleneck_step, vsm.bottleneck_reason "
         "FROM value_streams vs LEFT JOIN value_stream_metrics vsm ON vs.id = vsm.value_stream_id "
-        "WHERE vs.business_unit_id = ?",
-        (business_unit_id,),
+        "WHERE vs.org_id = ? AND vs.business_unit_id = ?",
+        (db.org_id, business_unit_id),
     )
     ctx["value_streams"] = [dict(r) for r in vs_rows]
 
     # Value stream benchmarks
     for vs in ctx["value_streams"]:
         bench_rows = await db.execute_fetchall(
-            "SELECT * FROM value_stream_benchmarks WHERE value_stream_id = ?", (vs["id"],)
+            "SELECT * FROM value_stream_benchmarks WHERE org_id = ? AND value_stream_id = ?", (db.org_id, vs["id"])
         )
         vs["benchmarks"] = [dict(r) for r in bench_rows]
 
     # Value stream levers
     lever_rows = await db.execute_fetchall(
-        "SELECT * FROM value_stream_levers WHERE impact_estimate = 'high' ORDER BY lever_type"
+        "SELECT * FROM value_stream_levers WHERE org_id = ? AND impact_estimate = 'high' ORDER BY lever_type", (db.org_id,)
     )
     ctx["high_impact_levers"] = [dict(r) for r in lever_rows]
 
     # SWOT entries (for strategy generation)
     swot_rows = await db.execute_fetchall(
-        "SELECT * FROM swot_entries WHERE business_unit_id = ? ORDER BY category",
-        (business_unit_id,),
+        "SELECT * FROM swot_entries WHERE org_id = ? AND business_unit_id = ? ORDER BY category",
+        (db.org_id, business_unit_id),
     )
     ctx["swot_entries"] = [dict(r) for r in swot_rows]
 
     # TOWS actions (for strategy generation)
     tows_rows = await db.execute_fetchall(
-        "SELECT * FROM tows_actions ORDER BY strategy_type, priority DESC"
+        "SELECT * FROM tows_actions WHERE org_id = ? ORDER BY strategy_type, priority DESC", (db.org_id,)
     )
     ctx["tows_actions"] = [dict(r) for r in tows_rows]
 
     # User strategy inputs (full content)
-    input_rows = await db.execute_fetchall("SELECT * FROM strategy_inputs ORDER BY input_type")
+    input_rows = await db.execute_fetchall("SELECT * FROM strategy_inputs WHERE org_id = ? ORDER BY input_type", (db.org_id,))
     inputs_by_type = {}
     for inp in input_rows:
         inp_dict = dict(inp)
@@ -102,7 +102,7 @@ async def gather_full_context(db, business_unit_id: int) -> dict:
         ctx["industry_benchmarks"] = {}
 
     try:
-        ctx["jira_data"] = await gather_jira(segment, industry)
+        ctx["jira_data"] = await gather_jira(segment, industry, db.org_id)
     except Exception:
         ctx["jira_data"] = {}
 
@@ -118,11 +118,11 @@ async def gather_full_context(db, business_unit_id: int) -> dict:
 
     # RAG: Include relevant document context when in live mode
     try:
-        from rag_engine import build_rag_context, is_live_mode
+        from rag_engine import build_rag_context, context_query, is_live_mode
         if await is_live_mode(db):
             org_id = ctx["organization"].get("id")
-            query = f"{org_name} {industry} business performance financial metrics strategy value stream"
-            rag_text = await build_rag_context(db, query, org_id=org_id, top_k=8)
+            query = context_query("full_context", org_name=org_name, industry=industry)
+            rag_text = await build_rag_context(db, org_id=org_id, **query)
             if rag_text:
                 ctx["rag_context"] = rag_text
     except Exception:
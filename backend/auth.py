@@ -29,6 +29,16 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
+def decode_user_id(token: str) -> Optional[int]:
+    """User id from a valid access token, or None if it is missing, expired or tampered."""
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        user_id = payload.get("sub")
+        return int(user_id) if user_id is not None else None
+    except (JWTError, ValueError):
+        return None
+
+
 async def get_current_user(token: str = Depends(oauth2_scheme)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -46,7 +56,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
     from database import get_db_connection
     db = await get_db_connection()
     try:
-        row = await db.execute_fetchone("SELECT id, email, name, is_active FROM users WHERE id = ?", [int(user_id)])
+        row = await db.execute_fetchone("SELECT id, email, name, is_active, org_id FROM users WHERE id = ?", [int(user_id)])
     finally:
         await db.close()
 
@@ -17,12 +17,20 @@ logger = logging.getLogger(__name__)
 # Configuration helpers
 # ──────────────────────────────────────────────
 
+def jira_auth() -> tuple[str, dict] | None:
+    """(base URL, request headers) for Jira Cloud, or None when not configured.
+    JIRA_URL is accepted as an older name for JIRA_BASE_URL."""
+    base_url = (os.getenv("JIRA_BASE_URL") or os.getenv("JIRA_URL") or "").rstrip("/")
+    email = os.getenv("JIRA_EMAIL", "")
+    token = os.getenv("JIRA_API_TOKEN", "")
+    if not base_url or not email or not token:
+        return None
+    cred = base64.b64encode(f"{email}:{token}".encode()).decode()
+    return base_url, {"Authorization": f"Basic {cred}", "Accept": "application/json"}
+
+
 def is_jira_configured() -> bool:
-    return bool(
-        os.getenv("JIRA_BASE_URL")
-        and os.getenv("JIRA_EMAIL")
-        and os.getenv("JIRA_API_TOKEN")
-    )
+    return jira_auth() is not None
 
 
 def is_servicenow_configured() -> bool:
@@ -37,25 +45,22 @@ def is_servicenow_configured() -> bool:
 # Jira Cloud Connector
 # ──────────────────────────────────────────────
 
-async def fetch_jira_workflows(project_key: str | None = None) -> dict:
+async def fetch_jira_workflows(org_id: int, project_key: str | None = None) -> dict:
     """
     Fetch workflow data from Jira Cloud.
-    Extracts process steps from workflow statuses and computes cycle time estimates.
+    Syncs the organization's local issue store (see jira_sync.py), then extracts process
+    steps from workflow statuses, timed by the average hours issues spent in each one.
     Returns {source, steps, project_summary}.
     """
-    base_url = os.getenv("JIRA_BASE_URL", "").rstrip("/")
-    email = os.getenv("JIRA_EMAIL", "")
-    token = os.getenv("JIRA_API_TOKEN", "")
+    import jira_sync
+    from database import get_db_connection
 
-    if not base_url or not email or not token:
+    auth = jira_auth()
+    if auth is None:
         return {"error": "Jira not configured. Set JIRA_BASE_URL, JIRA_EMAIL, JIRA_API_TOKEN."}
+    base_url, headers = auth
 
-    cred = base64.b64encode(f"{email}:{token}".encode()).decode()
-    headers = {
-        "Authorization": f"Basic {cred}",
-        "Accept": "application/json",
-    }
-
+    db = await get_db_connection(org_id)
     try:
         async with httpx.AsyncClient(timeout=30) as client:
             # 1. Get projects
@@ -70,22 +75,7 @@ async def fetch_jira_workflows(project_key: str | None = None) -> dict:
                     return {"error": "No Jira projects found"}
                 project_key = projects[0]["key"]
 
-            # 2. Search recent issues for cycle time data
-            jql = f"project={project_key} ORDER BY created DESC"
-            resp = await client.get(
-                f"{base_url}/rest/api/3/search",
-                params={
-                    "jql": jql,
-                    "maxResults": 50,
-                    "fields": "status,created,resolutiondate,summary,issuetype",
-                },
-                headers=headers,
-            )
-            resp.raise_for_status()
-            search_data = resp.json()
-            issues = search_data.get("issues", [])
-
-            # 3. Get workflow statuses
+            # 2. Get workflow statuses
             resp = await client.get(
                 f"{base_url}/rest/api/3/project/{project_key}/statuses",
                 headers=headers,
@@ -93,80 +83,70 @@ async def fetch_jira_workflows(project_key: str | None = None) -> dict:
             resp.raise_for_status()
             status_data = resp.json()
 
-            # Extract unique statuses from the first issue type's workflow
-            statuses = []
-            seen_names = set()
-            for issue_type_statuses in status_data:
-                for status in issue_type_statuses.get("statuses", []):
-                    name = status.get("name", "")
-                    if name and name not in seen_names:
-                        seen_names.add(name)
-                        statuses.append({
-                            "name": name,
-                            "category": status.get("statusCategory", {}).get("key", ""),
-                            "category_name": status.get("statusCategory", {}).get("name", ""),
-                        })
-
-            # Map statuses to steps
-            CATEGORY_MAP = {
-                "new": "trigger",
-                "undefined": "process",
-                "indeterminate": "process",
-                "done": "delivery",
-            }
-
-            steps = []
-            for i, status in enumerate(statuses, 1):
-                step_type = CATEGORY_MAP.get(status["category"], "process")
-                steps.append({
-                    "step_order": i,
-                    "step_name": status["name"],
-                    "description": f"Jira workflow status ({status['category_name']})",
-                    "step_type": step_type,
-                    "process_time_hours": 0,
-                    "wait_time_hours": 0,
-                    "resources": "",
-                    "is_bottleneck": False,
-                    "notes": f"Jira status category: {status['category_name']}",
-                })
-
-            # Compute average cycle time from resolved issues
-            cycle_times = []
-            for issue in issues:
-                fields = issue.get("fields", {})
-                created = fields.get("created")
-                resolved = fields.get("resolutiondate")
-                if created and resolved:
-                    try:
-                        created_dt = datetime.fromisoformat(created.replace("Z", "+00:00"))
-                        resolved_dt = datetime.fromisoformat(resolved.replace("Z", "+00:00"))
-                        hours = (resolved_dt - created_dt).total_seconds() / 3600
-                        if hours > 0:
-                            cycle_times.append(hours)
-                    except (ValueError, TypeError):
-                        pass
-
-            avg_cycle_hours = sum(cycle_times) / len(cycle_times) if cycle_times else 0
-
-            # Distribute cycle time across process steps
-            process_steps = [s for s in steps if s["step_type"] == "process"]
-            if process_steps and avg_cycle_hours > 0:
-                per_step = avg_cycle_hours / len(process_steps)
-                for step in process_steps:
-                    step["process_time_hours"] = round(per_step * 0.4, 1)
-                    step["wait_time_hours"] = round(per_step * 0.6, 1)
-
-            return {
-                "source": "jira",
-                "steps": steps,
-                "project_summary": {
-                    "project_key": project_key,
-                    "total_issues_sampled": len(issues),
-                    "resolved_issues": len(cycle_times),
-                    "avg_cycle_time_hours": round(avg_cycle_hours, 1),
-                    "workflow_statuses": len(statuses),
-                },
-            }
+        # 3. Pull issues changed since the last sync, then measure the whole store
+        sync = await jira_sync.sync_jira(db, project_key)
+        cycle = await jira_sync.cycle_time_metrics(db, project_key)
+        timings = {t["status"]: t for t in await jira_sync.status_timings(db, project_key)}
+
+        # Extract unique statuses from every issue type's workflow
+        statuses = []
+        seen_names = set()
+        for issue_type_statuses in status_data:
+            for status in issue_type_statuses.get("statuses", []):
+                name = status.get("name", "")
+                if name and name not in seen_names:
+                    seen_names.add(name)
+                    statuses.append({
+                        "name": name,
+                        "category": status.get("statusCategory", {}).get("key", ""),
+                        "category_name": status.get("statusCategory", {}).get("name", ""),
+                    })
+        # Statuses issues passed through that the current workflow no longer lists
+        for name, timing in timings.items():
+            if name not in seen_names:
+                statuses.append({"name": name, "category": timing["category"] or "", "category_name": "Historical"})
+
+        # Map statuses to steps
+        CATEGORY_MAP = {
+            "new": "trigger",
+            "undefined": "process",
+            "indeterminate": "process",
+            "done": "delivery",
+        }
+
+        steps = []
+        for i, status in enumerate(statuses, 1):
+            step_type = CATEGORY_MAP.get(status["category"], "process")
+            hours = round((timings.get(status["name"]) or {}).get("avg_hours") or 0, 1)
+            # Time before work starts is waiting; time in an in-progress status is processing
+            steps.append({
+                "step_order": i,
+                "step_name": status["name"],
+                "description": f"Jira workflow status ({status['category_name']})",
+                "step_type": step_type,
+                "process_time_hours": hours if step_type == "process" else 0,
+                "wait_time_hours": hours if step_type == "trigger" else 0,
+                "resources": "",
+                "is_bottleneck": False,
+                "notes": f"Jira status category: {status['category_name']}",
+            })
+
+        active = [s for s in steps if s["step_type"] != "delivery" and (s["process_time_hours"] or s["wait_time_hours"])]
+        if active:
+            max(active, key=lambda s: s["process_time_hours"] + s["wait_time_hours"])["is_bottleneck"] = True
+
+        return {
+            "source": "jira",
+            "steps": steps,
+            "project_summary": {
+                "project_key": project_key,
+                "issues_stored": cycle["issues"],
+                "issues_synced": sync["issues_synced"],
+                "resolved_issues": cycle["resolved"],
+                "avg_cycle_time_hours": round(cycle["avg_cycle_hours"] or 0, 1),
+                "workflow_statuses": len(statuses),
+            },
+        }
 
     except httpx.HTTPStatusError as e:
         logger.error("Jira API error: %s %s", e.response.status_code, e.response.text[:200])
@@ -174,6 +154,8 @@ async def fetch_jira_workflows(project_key: str | None = None) -> dict:
     except Exception as e:
         logger.error("Jira connector error: %s", e)
         return {"error": f"Jira connector error: {e}"}
+    finally:
+        await db.close()
 
 
 # ──────────────────────────────────────────────
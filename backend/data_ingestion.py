@@ -5,9 +5,12 @@ Fetches company profiles, financials, peers, and key ratios from free APIs.
 
 import logging
 import os
+from datetime import date
 
 import httpx
 
+from web_search import RateLimiter
+
 logger = logging.getLogger("data_ingestion")
 
 FINNHUB_API_KEY = os.getenv("FINNHUB_API_KEY", "")
@@ -16,6 +19,9 @@ ALPHA_VANTAGE_API_KEY = os.getenv("ALPHA_VANTAGE_API_KEY", "")
 FINNHUB_BASE = "https://finnhub.io/api/v1"
 ALPHA_VANTAGE_BASE = "https://www.alphavantage.co/query"
 
+# Finnhub's free plan allows 60 calls/minute
+FINNHUB_LIMITER = RateLimiter(float(os.getenv("FINNHUB_MIN_INTERVAL", "1.0")))
+
 
 async def search_ticker(company_name: str) -> str | None:
     """Search for a stock ticker symbol by company name using Finnhub.
@@ -282,6 +288,24 @@ async def fetch_financials(ticker: str) -> dict | None:
         return None
 
 
+async def fetch_company_news(ticker: str, since: date, until: date, client: httpx.AsyncClient = None) -> list[dict]:
+    """Company news from Finnhub /company-news published between two dates (inclusive).
+
+    Waits its turn on FINNHUB_LIMITER. Unlike the fetchers above it raises on failure, so
+    callers can tell "no news" from "couldn't ask".
+    """
+    params = {"symbol": ticker, "from": since.isoformat(), "to": until.isoformat(), "token": FINNHUB_API_KEY}
+    await FINNHUB_LIMITER.wait()
+    if client is None:
+        async with httpx.AsyncClient(timeout=15) as own_client:
+            resp = await own_client.get(f"{FINNHUB_BASE}/company-news", params=params)
+    else:
+        resp = await client.get(f"{FINNHUB_BASE}/company-news", params=params)
+    resp.raise_for_status()
+    news = resp.json()
+    return news if isinstance(news, list) else []
+
+
 def _parse_float(val) -> float | None:
     """Safely parse a numeric string to float."""
     if val is None or val == "None" or val == "-":
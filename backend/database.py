@@ -1,5 +1,9 @@
 import os
 import re
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+
+from fastapi import Request
 
 DB_PATH = os.path.join(os.path.dirname(__file__), "..", "database", "bmad_transform.db")
 DATABASE_URL = os.getenv("DATABASE_URL")
@@ -7,9 +11,22 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 # Detect mode
 USE_POSTGRES = bool(DATABASE_URL)
 
+# PostgreSQL role that read-only analytical connections switch to (optional)
+READONLY_DB_ROLE = os.getenv("READONLY_DB_ROLE", "")
+
 # Connection pool (initialized at startup for PostgreSQL)
 _pg_pool = None
 
+# Target table of an INSERT / UPDATE / DELETE, for table_versions (see response_cache.py)
+_WRITE_TARGET = re.compile(r"^\s*(?:INSERT\s+(?:OR\s+\w+\s+)?INTO|UPDATE|DELETE\s+FROM)\s+(\w+)", re.IGNORECASE)
+# Bookkeeping tables whose writes never change an API response
+UNVERSIONED_TABLES = {"table_versions", "schema_migrations", "jobs", "web_search_cache", "web_page_cache",
+                      "source_refresh_runs", "competitor_news_sync", "jira_sync_state"}
+_BUMP_VERSION = (
+    "INSERT INTO table_versions (table_name, version) VALUES (?, 1) "
+    "ON CONFLICT (table_name) DO UPDATE SET version = table_versions.version + 1, updated_at = CURRENT_TIMESTAMP"
+)
+
 
 def _sqlite_to_pg_query(query: str, params: list | None = None):
     """Convert SQLite-style ? placeholders to PostgreSQL $1, $2, ... style."""
@@ -71,9 +88,15 @@ class CursorResult:
 class DBConnection:
     """Unified database connection interface for both SQLite and PostgreSQL."""
 
-    def __init__(self, conn, is_postgres=False):
+    def __init__(self, conn, is_postgres=False, org_id=None):
         self._conn = conn
         self._is_postgres = is_postgres
+        # Tenant the connection is serving; every step-table query filters by it
+        self.org_id = org_id
+        # Tables written since the last commit; their versions are bumped on commit
+        self._written = set()
+        # Open SQLite savepoints, for nesting transaction()
+        self._savepoints = 0
 
     async def execute_fetchall(self, query: str, params: list | None = None) -> list:
         if self._is_postgres:
@@ -99,6 +122,9 @@ class DBConnection:
             return SQLiteRow(row, cursor.description)
 
     async def execute(self, query: str, params: list | None = None) -> CursorResult:
+        target = _WRITE_TARGET.match(query)
+        if target and target.group(1).lower() not in UNVERSIONED_TABLES:
+            self._written.add(target.group(1).lower())
         if self._is_postgres:
             q, p = _sqlite_to_pg_query(query, params)
             # For INSERT ... RETURNING id, try to get the id
@@ -125,12 +151,56 @@ class DBConnection:
         else:
             await self._conn.executescript(script)
 
+    async def _bump_table_versions(self):
+        tables, self._written = sorted(self._written), set()
+        for table in tables:
+            try:
+                if self._is_postgres:
+                    await self._conn.execute(_sqlite_to_pg_query(_BUMP_VERSION, [table])[0], table)
+                else:
+                    await self._conn.execute(_BUMP_VERSION, [table])
+            except Exception:
+                pass  # table_versions not created yet (legacy database mid-migration)
+
+    @asynccontextmanager
+    async def transaction(self):
+        """Run a block atomically, rolling back its writes if it raises.
+
+        Opens a transaction, or a savepoint inside an enclosing one. Leaving the outermost
+        block commits on PostgreSQL (where statements otherwise autocommit); SQLite keeps
+        the writes pending until commit(). On PostgreSQL, a failed statement inside the
+        block aborts it, so an INSERT must target a table with an id column (see execute()).
+        """
+        if self._is_postgres:
+            async with self._conn.transaction():
+                yield
+            return
+        if not self._conn.in_transaction:
+            await self._conn.execute("BEGIN")  # so releasing the savepoint doesn't commit
+        self._savepoints += 1
+        name = f"sp_{self._savepoints}"
+        await self._conn.execute(f"SAVEPOINT {name}")
+        try:
+            yield
+        except BaseException:
+            await self._conn.execute(f"ROLLBACK TO {name}")
+            await self._conn.execute(f"RELEASE {name}")
+            raise
+        else:
+            await self._conn.execute(f"RELEASE {name}")
+        finally:
+            self._savepoints -= 1
+
     async def commit(self):
+        if self._written:
+            await self._bump_table_versions()
         if not self._is_postgres:
             await self._conn.commit()
 
     async def close(self):
         if self._is_postgres:
+            if self._written:
+                await self._bump_table_versions()  # the writes themselves were autocommitted
             await _pg_pool.release(self._conn)
         else:
             await self._conn.close()
@@ -156,23 +226,92 @@ async def close_pg_pool():
         _pg_pool = None
 
 
-async def get_db_connection() -> DBConnection:
-    """Get a raw database connection (not a generator). Caller must close."""
+def timestamp_param(offset_seconds: float = 0, at: datetime | None = None):
+    """UTC timestamp query parameter in the form each backend compares correctly.
+
+    Defaults to now; `at` (naive UTC) stores a given moment instead.
+    """
+    value = (at or datetime.utcnow()) + timedelta(seconds=offset_seconds)
+    if USE_POSTGRES:
+        return value
+    return value.strftime("%Y-%m-%d %H:%M:%S")
+
+
+async def get_db_connection(org_id: int | None = None) -> DBConnection:
+    """Get a raw database connection (not a generator). Caller must close.
+
+    Background work outside a request passes the org it runs for.
+    """
     if USE_POSTGRES:
         conn = await _pg_pool.acquire()
-        return DBConnection(conn, is_postgres=True)
+        return DBConnection(conn, is_postgres=True, org_id=org_id)
     else:
         import aiosqlite
         conn = await aiosqlite.connect(DB_PATH)
         conn.row_factory = aiosqlite.Row
         await conn.execute("PRAGMA foreign_keys = ON")
-        return DBConnection(conn, is_postgres=False)
+        return DBConnection(conn, is_postgres=False, org_id=org_id)
+
+
+def _column_authorizer(allowed_columns: dict):
+    """sqlite3 authorizer: reading a table outside `allowed_columns` fails the statement,
+    and an unlisted column of an allowed table reads as NULL."""
+    import sqlite3
+
+    def authorize(action, table, column, _db_name, _trigger):
+        if action != sqlite3.SQLITE_READ:
+            return sqlite3.SQLITE_OK
+        if table not in allowed_columns:
+            return sqlite3.SQLITE_DENY
+        return sqlite3.SQLITE_OK if column in allowed_columns[table] else sqlite3.SQLITE_IGNORE
+    return authorize
+
+
+@asynccontextmanager
+async def get_readonly_connection(timeout_ms: int = 5000, org_id: int | None = None,
+                                  allowed_columns: dict | None = None):
+    """Read-only connection for ad-hoc analytical queries (e.g. NLQ text-to-SQL).
+
+    PostgreSQL: a READ ONLY transaction with a statement timeout, always rolled back. When
+    READONLY_DB_ROLE is set the transaction also switches to that role, which the DBA grants
+    SELECT on the readable tables only.
+    SQLite: the database file opened with mode=ro plus PRAGMA query_only. `allowed_columns`
+    ({table: columns}) installs an authorizer so nothing else can be read.
+    """
+    if USE_POSTGRES:
+        conn = await _pg_pool.acquire()
+        tx = conn.transaction(readonly=True)
+        await tx.start()
+        try:
+            await conn.execute(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+            if READONLY_DB_ROLE:
+                await conn.execute(f'SET LOCAL ROLE "{READONLY_DB_ROLE}"')
+            yield DBConnection(conn, is_postgres=True, org_id=org_id)
+        finally:
+            await tx.rollback()
+            await _pg_pool.release(conn)
+    else:
+        import aiosqlite
+        uri = "file:" + os.path.abspath(DB_PATH) + "?mode=ro"
+        conn = await aiosqlite.connect(uri, uri=True)
+        conn.row_factory = aiosqlite.Row
+        await conn.execute("PRAGMA query_only = ON")
+        if allowed_columns is not None:
+            # aiosqlite has no wrapper for this; run it on the connection's own thread
+            await conn._execute(conn._conn.set_authorizer, _column_authorizer(allowed_columns))
+        try:
+            yield DBConnection(conn, is_postgres=False, org_id=org_id)
+        finally:
+            await conn.close()
+
 
+async def get_db(request: Request):
+    """FastAPI dependency that yields a DBConnection scoped to the request's organization."""
+    from tenancy import resolve_org_id
 
-async def get_db():
-    """FastAPI dependency that yields a DBConnection."""
     db = await get_db_connection()
     try:
+        db.org_id = await resolve_org_id(request, db)
         yield db
     finally:
         await db.close()
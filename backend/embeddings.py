@@ -0,0 +1,265 @@
+"""
+Embeddings — Pluggable embedding providers for the RAG engine.
+EMBEDDING_PROVIDER selects "openai" (text-embedding-3-small over the API), "local"
+(in-process hashed TF-IDF + SVD, fitted per organization) or "auto" (the default: OpenAI
+when OPENAI_API_KEY is set, otherwise local). Every embedded chunk records the provider id
+that produced it, and retrieval only compares vectors from the same provider.
+
+The local model hashes word unigrams and bigrams into HASH_BUCKETS columns, weights them
+with sublinear TF-IDF and projects onto the top singular vectors of the org's chunk
+matrix (randomized SVD). It is refitted when the org's corpus has grown REFIT_GROWTH-fold
+since the last fit; chunks embedded by an older model are then re-embedded in place.
+"""
+
+import asyncio
+import io
+import logging
+import os
+import re
+import time
+import zlib
+
+import numpy as np
+from scipy import sparse
+
+from serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+OPENAI_MODEL = "text-embedding-3-small"
+OPENAI_BATCH_SIZE = 20
+
+HASH_BUCKETS = 2 ** 14
+EMBEDDING_DIM = 256
+MIN_FIT_CHUNKS = 16  # below this an SVD says little; keyword search covers small corpora
+FIT_SAMPLE = 5000  # most recent chunks used for a fit
+REFIT_GROWTH = 2.0
+TRANSFORM_BATCH = 1024
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+# ─── OpenAI ──────────────────────────────────────────────────────────────────
+
+
+async def openai_embeddings(texts: list[str]) -> list[list[float]]:
+    """Embed texts with OpenAI text-embedding-3-small."""
+    if not os.getenv("OPENAI_API_KEY"):
+        raise RuntimeError("OPENAI_API_KEY not set")
+    from openai import AsyncOpenAI
+
+    client = AsyncOpenAI()
+    # Process in batches of 20 to avoid rate limits
+    all_embeddings = []
+    for i in range(0, len(texts), OPENAI_BATCH_SIZE):
+        batch = texts[i : i + OPENAI_BATCH_SIZE]
+        response = await client.embeddings.create(model=OPENAI_MODEL, input=batch)
+        all_embeddings.extend([item.embedding for item in response.data])
+    return all_embeddings
+
+
+class OpenAIEmbeddingProvider:
+    name = "openai"
+    local = False
+    provider_id = f"openai:{OPENAI_MODEL}"
+
+    async def embed_documents(self, db, org_id: int, texts: list[str]) -> tuple[list, str]:
+        return await openai_embeddings(texts), self.provider_id
+
+    async def embed_queries(self, db, org_id: int, texts: list[str]) -> tuple[list, str]:
+        return await openai_embeddings(texts), self.provider_id
+
+
+# ─── Local TF-IDF + SVD ──────────────────────────────────────────────────────
+
+
+def hashed_term_matrix(texts: list[str], buckets: int = HASH_BUCKETS) -> sparse.csr_matrix:
+    """Sublinear term frequencies of hashed unigrams + bigrams, one row per text."""
+    indptr, indices = [0], []
+    for text in texts:
+        words = _TOKEN.findall(text.lower())
+        terms = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        indices.extend(zlib.crc32(t.encode()) & (buckets - 1) for t in terms)
+        indptr.append(len(indices))
+    data = np.ones(len(indices), dtype=np.float32)
+    matrix = sparse.csr_matrix((data, np.asarray(indices, dtype=np.int32), np.asarray(indptr)),
+                               shape=(len(texts), buckets))
+    matrix.sum_duplicates()
+    matrix.data = 1.0 + np.log(matrix.data)
+    return matrix
+
+
+def _normalize_rows(matrix):
+    if sparse.issparse(matrix):
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return sparse.diags(1.0 / norms) @ matrix
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def randomized_svd(matrix, k: int, oversample: int = 10, power_iters: int = 2, seed: int = 0) -> np.ndarray:
+    """Top-k right singular vectors (k x columns) of a sparse matrix (Halko et al. 2011)."""
+    rng = np.random.default_rng(seed)
+    width = min(k + oversample, min(matrix.shape))
+    q, _ = np.linalg.qr(matrix @ rng.standard_normal((matrix.shape[1], width)).astype(np.float32))
+    for _ in range(power_iters):
+        q, _ = np.linalg.qr(matrix.T @ q)
+        q, _ = np.linalg.qr(matrix @ q)
+    _, _, vt = np.linalg.svd(np.asarray((matrix.T @ q).T), full_matrices=False)
+    return vt[:k]
+
+
+class LocalEmbeddingModel:
+    """A fitted projection: IDF weights per hash bucket and the SVD basis."""
+
+    def __init__(self, idf: np.ndarray, components: np.ndarray, model_id: int | None = None):
+        self.idf = idf.astype(np.float32)
+        self.components = components.astype(np.float32)
+        self.model_id = model_id
+
+    @property
+    def provider_id(self) -> str:
+        return f"local:{self.model_id}"
+
+    @classmethod
+    def fit(cls, texts: list[str], dim: int = EMBEDDING_DIM) -> "LocalEmbeddingModel":
+        counts = hashed_term_matrix(texts)
+        df = np.bincount(counts.indices, minlength=counts.shape[1])
+        idf = (np.log((1 + len(texts)) / (1 + df)) + 1.0).astype(np.float32)
+        weighted = _normalize_rows(counts @ sparse.diags(idf))
+        components = randomized_svd(weighted, min(dim, len(texts) - 1))
+        return cls(idf, components)
+
+    def transform(self, texts: list[str]) -> np.ndarray:
+        """Unit-length embeddings, one row per text, computed in batches."""
+        out = np.empty((len(texts), self.components.shape[0]), dtype=np.float32)
+        for i in range(0, len(texts), TRANSFORM_BATCH):
+            counts = hashed_term_matrix(texts[i : i + TRANSFORM_BATCH], self.idf.shape[0])
+            weighted = _normalize_rows(counts @ sparse.diags(self.idf))
+            out[i : i + TRANSFORM_BATCH] = _normalize_rows(np.asarray(weighted @ self.components.T))
+        return out
+
+    def to_bytes(self) -> bytes:
+        buffer = io.BytesIO()
+        np.savez(buffer, idf=self.idf, components=self.components.astype(np.float16))
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data: bytes, model_id: int) -> "LocalEmbeddingModel":
+        arrays = np.load(io.BytesIO(bytes(data)))
+        return cls(arrays["idf"], arrays["components"], model_id)
+
+
+def _as_lists(vectors: np.ndarray) -> list[list[float]]:
+    return np.round(vectors.astype(np.float64), 6).tolist()
+
+
+class LocalEmbeddingProvider:
+    name = "local"
+    local = True  # cheap enough to re-embed a whole org after a refit
+
+    def __init__(self):
+        self._models = {}  # org_id -> LocalEmbeddingModel (latest loaded)
+
+    async def current_model(self, db, org_id: int) -> LocalEmbeddingModel | None:
+        row = await db.execute_fetchone(
+            "SELECT id FROM embedding_models WHERE org_id = ? AND provider = ? ORDER BY id DESC LIMIT 1",
+            [org_id, self.name],
+        )
+        if not row:
+            return None
+        cached = self._models.get(org_id)
+        if cached is not None and cached.model_id == row["id"]:
+            return cached
+        data = await db.execute_fetchone("SELECT model_data FROM embedding_models WHERE id = ?", [row["id"]])
+        model = LocalEmbeddingModel.from_bytes(data["model_data"], row["id"])
+        self._models[org_id] = model
+        return model
+
+    async def _refit_if_grown(self, db, org_id: int, new_texts: list[str]) -> LocalEmbeddingModel | None:
+        model = await self.current_model(db, org_id)
+        row = await db.execute_fetchone("SELECT COUNT(*) AS c FROM document_chunks WHERE org_id = ?", [org_id])
+        total = (row["c"] if row else 0) + len(new_texts)
+        if model is not None:
+            fitted = await db.execute_fetchone("SELECT chunk_count FROM embedding_models WHERE id = ?", [model.model_id])
+            if total < REFIT_GROWTH * fitted["chunk_count"]:
+                return model
+        if total < MIN_FIT_CHUNKS:
+            return model
+
+        rows = await db.execute_fetchall(
+            "SELECT chunk_text FROM document_chunks WHERE org_id = ? ORDER BY id DESC LIMIT ?",
+            [org_id, max(FIT_SAMPLE - len(new_texts), 0)],
+        )
+        corpus = list(new_texts[:FIT_SAMPLE]) + [r["chunk_text"] for r in rows]
+        started = time.perf_counter()
+        fitted_model = await asyncio.to_thread(LocalEmbeddingModel.fit, corpus)
+        cursor = await db.execute(
+            "INSERT INTO embedding_models (org_id, provider, dimensions, chunk_count, model_data) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [org_id, self.name, fitted_model.components.shape[0], total, fitted_model.to_bytes()],
+        )
+        fitted_model.model_id = cursor.lastrowid
+        # Chunks on older models are re-embedded right after (rag_engine.store_document)
+        await db.execute("DELETE FROM embedding_models WHERE org_id = ? AND provider = ? AND id < ?",
+                         [org_id, self.name, fitted_model.model_id])
+        await db.commit()
+        self._models[org_id] = fitted_model
+        logger.info("Fitted local embedding model %s for org %s on %d chunks in %.0f ms",
+                    fitted_model.model_id, org_id, len(corpus), (time.perf_counter() - started) * 1000)
+        return fitted_model
+
+    async def embed_documents(self, db, org_id: int, texts: list[str]) -> tuple[list, str]:
+        model = await self._refit_if_grown(db, org_id, texts)
+        if model is None:
+            raise RuntimeError(f"fewer than {MIN_FIT_CHUNKS} chunks to fit a local embedding model")
+        vectors = await asyncio.to_thread(model.transform, texts)
+        return _as_lists(vectors), model.provider_id
+
+    async def embed_queries(self, db, org_id: int, texts: list[str]) -> tuple[list, str]:
+        model = await self.current_model(db, org_id)
+        if model is None:
+            raise RuntimeError("no local embedding model fitted for this organization yet")
+        return _as_lists(model.transform(texts)), model.provider_id
+
+    async def reembed_stale(self, db, org_id: int) -> int:
+        """Re-embed the org's chunks not produced by the current model (after a refit)."""
+        model = await self.current_model(db, org_id)
+        if model is None:
+            return 0
+        rows = await db.execute_fetchall(
+            "SELECT id, chunk_text FROM document_chunks WHERE org_id = ? "
+            "AND (embedding_provider IS NULL OR embedding_provider != ?)",
+            [org_id, model.provider_id],
+        )
+        if not rows:
+            return 0
+        vectors = _as_lists(await asyncio.to_thread(model.transform, [r["chunk_text"] for r in rows]))
+        for row, vector in zip(rows, vectors):
+            await db.execute(
+                "UPDATE document_chunks SET embedding_json = ?, embedding_provider = ? WHERE id = ?",
+                [dumps(vector), model.provider_id, row["id"]],
+            )
+        await db.commit()
+        logger.info("Re-embedded %d chunks for org %s with %s", len(rows), org_id, model.provider_id)
+        return len(rows)
+
+
+# ─── Selection ───────────────────────────────────────────────────────────────
+
+
+_providers = {}
+
+
+def get_embedding_provider(name: str | None = None):
+    """The configured provider (EMBEDDING_PROVIDER: auto | openai | local)."""
+    name = name or os.getenv("EMBEDDING_PROVIDER", "auto")
+    if name == "auto":
+        name = "openai" if os.getenv("OPENAI_API_KEY") else "local"
+    if name not in ("openai", "local"):
+        raise ValueError(f"Unknown EMBEDDING_PROVIDER: {name}")
+    if name not in _providers:
+        _providers[name] = OpenAIEmbeddingProvider() if name == "openai" else LocalEmbeddingProvider()
+    return _providers[name]
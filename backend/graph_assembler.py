@@ -0,0 +1,98 @@
+"""
+Graph Assembler — Batched child loading and dependency adjacency for nested list responses.
+Nested endpoints (epics-full, initiatives-full, the roadmaps) fetch each child table with
+one query per batch of parent ids and group the rows into dict-of-lists in a single pass,
+instead of one query (or one scan of every edge) per parent row.
+"""
+
+import logging
+from collections import defaultdict
+
+logger = logging.getLogger(__name__)
+
+# Ids per IN (...) list; keeps each statement well under SQLite's and asyncpg's bind limits
+BATCH_SIZE = 500
+
+DEPENDENCY_TABLES = {
+    # kind: (edge table, node table, node column, depends-on column)
+    "epic": ("epic_dependencies", "epics", "epic_id", "depends_on_epic_id"),
+    "feature": ("feature_dependencies", "features", "feature_id", "depends_on_feature_id"),
+}
+
+
+def group_by(rows, key: str) -> dict:
+    """Rows grouped into {rows[key]: [row, ...]} in one pass, keeping row order."""
+    grouped = defaultdict(list)
+    for row in rows:
+        grouped[row[key]].append(row)
+    return grouped
+
+
+def _batches(ids) -> list[list]:
+    ids = list(dict.fromkeys(i for i in ids if i is not None))
+    return [ids[i:i + BATCH_SIZE] for i in range(0, len(ids), BATCH_SIZE)]
+
+
+async def fetch_children(db, table: str, parent_column: str, parent_ids, order_by: str = "id") -> dict:
+    """All rows of `table` belonging to `parent_ids`, as {parent_id: [row, ...]}."""
+    rows = []
+    for batch in _batches(parent_ids):
+        placeholders = ", ".join("?" for _ in batch)
+        rows += await db.execute_fetchall(
+            f"SELECT * FROM {table} WHERE org_id = ? AND {parent_column} IN ({placeholders}) ORDER BY {order_by}",
+            [db.org_id, *batch],
+        )
+    return group_by([dict(r) for r in rows], parent_column)
+
+
+# ─── Dependency Graphs ───────────────────────────────────────────────────────
+
+
+class DependencyGraph:
+    """Dependency rows indexed both ways: depends_on[n] are n's outgoing edges (n waits on
+    them), blocks[n] the edges of items waiting on n."""
+
+    def __init__(self, kind: str, rows: list[dict]):
+        _, _, self.node_column, self.target_column = DEPENDENCY_TABLES[kind]
+        self.rows = rows
+        self.depends_on = defaultdict(list)
+        self.blocks = defaultdict(list)
+        for row in rows:
+            self.depends_on[row[self.node_column]].append(row)
+            self.blocks[row[self.target_column]].append(row)
+
+    def edges(self, blocks_only: bool = False) -> list[tuple]:
+        """(node, depends_on) pairs; blocks_only keeps the edges that gate scheduling."""
+        return [
+            (r[self.node_column], r[self.target_column]) for r in self.rows
+            if not blocks_only or (r.get("dependency_type") or "blocks") == "blocks"
+        ]
+
+
+async def load_dependency_graph(db, kind: str, node_ids=None, with_names: bool = False) -> DependencyGraph:
+    """Dependency graph of the org, or just the edges touching `node_ids` (either end).
+
+    with_names adds `node_name` and `depends_on_name` from the node table.
+    """
+    edge_table, node_table, node_column, target_column = DEPENDENCY_TABLES[kind]
+    select = "d.*"
+    joins = ""
+    if with_names:
+        select += ", n1.name AS node_name, n2.name AS depends_on_name"
+        joins = (f" JOIN {node_table} n1 ON d.{node_column} = n1.id"
+                 f" JOIN {node_table} n2 ON d.{target_column} = n2.id")
+    query = f"SELECT {select} FROM {edge_table} d{joins} WHERE d.org_id = ?"
+
+    if node_ids is None:
+        rows = [dict(r) for r in await db.execute_fetchall(query + " ORDER BY d.id", [db.org_id])]
+    else:
+        seen = {}
+        for batch in _batches(node_ids):
+            placeholders = ", ".join("?" for _ in batch)
+            for r in await db.execute_fetchall(
+                query + f" AND (d.{node_column} IN ({placeholders}) OR d.{target_column} IN ({placeholders}))",
+                [db.org_id, *batch, *batch],
+            ):
+                seen.setdefault(r["id"], dict(r))  # edges between two batches come back twice
+        rows = [seen[k] for k in sorted(seen)]
+    return DependencyGraph(kind, rows)
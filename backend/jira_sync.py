@@ -0,0 +1,266 @@
+"""
+Jira Sync — Incremental local copy of Jira issues and their status history.
+Pages through the search API with bounded concurrency into jira_issues and
+jira_issue_transitions, remembering the newest `updated` seen per scope so the next sync
+only asks for `updated >= last_sync`. Cycle-time and time-in-status figures are SQL
+aggregates over the whole store rather than over one page of live results.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+from connectors import jira_auth
+from database import timestamp_param
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = 100  # Jira Cloud's maximum for /search; it may answer with less
+SYNC_CONCURRENCY = 4
+WRITE_BATCH = 100
+ISSUE_FIELDS = "summary,status,issuetype,project,created,updated,resolutiondate"
+ALL_PROJECTS = "*"
+
+
+# ─── Fetching ────────────────────────────────────────────────────────────────
+
+
+def _parse_time(value: str | None) -> datetime | None:
+    """Jira timestamp ("2024-05-01T10:00:00.000+0100") as naive UTC."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f%z")
+    except ValueError:
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        return parsed
+    return parsed.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _jql(scope: str, last_updated: str | None) -> str:
+    clauses = ["project is not EMPTY" if scope == ALL_PROJECTS else f'project = "{scope}"']
+    if last_updated:
+        # JQL dates are read in the Jira user's time zone, which is the offset Jira reports
+        # timestamps in, so the wall-clock part is used as-is. Minute precision: step back one.
+        since = datetime.strptime(last_updated[:16], "%Y-%m-%dT%H:%M") - timedelta(minutes=1)
+        clauses.append(f'updated >= "{since:%Y-%m-%d %H:%M}"')
+    # Created order is stable while issues change, so concurrent offset pages don't shift
+    return " AND ".join(clauses) + " ORDER BY created ASC"
+
+
+def _normalize(issue: dict) -> dict:
+    fields = issue.get("fields", {})
+    status = fields.get("status") or {}
+    created = _parse_time(fields.get("created"))
+    resolved = _parse_time(fields.get("resolutiondate"))
+
+    changes = []
+    for history in (issue.get("changelog") or {}).get("histories", []):
+        at = _parse_time(history.get("created"))
+        for item in history.get("items", []):
+            if at and item.get("field") == "status":
+                changes.append((at, item.get("fromString"), item.get("toString")))
+    changes.sort(key=lambda c: c[0])
+
+    # Each transition closes the time spent in its from-status
+    transitions, entered = [], created
+    for seq, (at, from_status, to_status) in enumerate(changes, 1):
+        hours = max((at - entered).total_seconds() / 3600, 0) if entered else None
+        transitions.append({"seq": seq, "from_status": from_status, "to_status": to_status, "at": at, "hours": hours})
+        entered = at
+
+    cycle_hours = None
+    if created and resolved and resolved > created:
+        cycle_hours = (resolved - created).total_seconds() / 3600
+    return {
+        "key": issue["key"],
+        "project_key": (fields.get("project") or {}).get("key"),
+        "issue_type": (fields.get("issuetype") or {}).get("name"),
+        "summary": fields.get("summary"),
+        "status": status.get("name"),
+        "status_category": (status.get("statusCategory") or {}).get("key"),
+        "created": created,
+        "updated": fields.get("updated"),
+        "resolved": resolved,
+        "cycle_hours": cycle_hours,
+        "transitions": transitions,
+    }
+
+
+async def _full_changelog(get, key: str) -> list[dict]:
+    histories, start = [], 0
+    while True:
+        page = await get(f"/rest/api/3/issue/{key}/changelog", startAt=start, maxResults=PAGE_SIZE)
+        values = page.get("values", [])
+        histories += values
+        start += len(values)
+        if not values or page.get("isLast") or start >= page.get("total", start):
+            return histories
+
+
+async def fetch_changes(scope: str = ALL_PROJECTS, last_updated: str | None = None) -> dict:
+    """Issues in `scope` (a project key, or ALL_PROJECTS) updated since the Jira timestamp
+    `last_updated`, or all of them, each with its full status history.
+
+    Touches no database; returns {"scope", "issues", "last_updated", "pages"}, where
+    last_updated is the newest `updated` seen. Raises on HTTP errors.
+    """
+    auth = jira_auth()
+    if auth is None:
+        raise RuntimeError("Jira not configured. Set JIRA_BASE_URL, JIRA_EMAIL, JIRA_API_TOKEN.")
+    base_url, headers = auth
+    params = {"jql": _jql(scope, last_updated), "maxResults": PAGE_SIZE, "fields": ISSUE_FIELDS,
+              "expand": "changelog"}
+    semaphore = asyncio.Semaphore(SYNC_CONCURRENCY)
+
+    async with httpx.AsyncClient(timeout=30, headers=headers) as client:
+        async def get(path, **query):
+            async with semaphore:
+                resp = await client.get(f"{base_url}{path}", params=query)
+                resp.raise_for_status()
+                return resp.json()
+
+        first = await get("/rest/api/3/search", **params, startAt=0)
+        step = first.get("maxResults") or PAGE_SIZE
+        rest = await asyncio.gather(*(
+            get("/rest/api/3/search", **params, startAt=start)
+            for start in range(step, first.get("total", 0), step)
+        ))
+        raw = [issue for page in (first, *rest) for issue in page.get("issues", [])]
+
+        # Search embeds at most 100 changelog entries per issue
+        truncated = [
+            issue for issue in raw
+            if (issue.get("changelog") or {}).get("total", 0) > len(issue["changelog"].get("histories", []))
+        ]
+        for issue, histories in zip(truncated, await asyncio.gather(*(_full_changelog(get, i["key"]) for i in truncated))):
+            issue["changelog"]["histories"] = histories
+
+    issues = list({issue["key"]: _normalize(issue) for issue in raw}.values())
+    newest = max((i["updated"] for i in issues if _parse_time(i["updated"])), key=_parse_time, default=None)
+    if newest is None or (last_updated and _parse_time(newest) < _parse_time(last_updated)):
+        newest = last_updated
+    logger.info("Jira %s: %d issues changed (%d pages)", scope, len(issues), 1 + len(rest))
+    return {"scope": scope, "issues": issues, "last_updated": newest, "pages": 1 + len(rest)}
+
+
+# ─── Storing ─────────────────────────────────────────────────────────────────
+
+
+async def sync_state(db, scope: str = ALL_PROJECTS):
+    return await db.execute_fetchone(
+        "SELECT * FROM jira_sync_state WHERE org_id = ? AND scope = ?", (db.org_id, scope)
+    )
+
+
+async def store_changes(db, fetched: dict, commit: bool = True) -> int:
+    """Upsert fetched issues, replace their transitions and advance the scope's sync point."""
+    issues = fetched["issues"]
+    for i in range(0, len(issues), WRITE_BATCH):
+        batch = issues[i : i + WRITE_BATCH]
+        params = []
+        for issue in batch:
+            params += [
+                db.org_id, issue["key"], issue["project_key"], issue["issue_type"], issue["summary"],
+                issue["status"], issue["status_category"],
+                issue["created"] and timestamp_param(at=issue["created"]),
+                _parse_time(issue["updated"]) and timestamp_param(at=_parse_time(issue["updated"])),
+                issue["resolved"] and timestamp_param(at=issue["resolved"]),
+                issue["cycle_hours"],
+            ]
+        await db.execute(
+            "INSERT INTO jira_issues (org_id, issue_key, project_key, issue_type, summary, status, status_category, "
+            "created_at, updated_at, resolved_at, cycle_hours) VALUES "
+            + ", ".join("(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)" for _ in batch)
+            + " ON CONFLICT (org_id, issue_key) DO UPDATE SET project_key = excluded.project_key, "
+            "issue_type = excluded.issue_type, summary = excluded.summary, status = excluded.status, "
+            "status_category = excluded.status_category, created_at = excluded.created_at, "
+            "updated_at = excluded.updated_at, resolved_at = excluded.resolved_at, cycle_hours = excluded.cycle_hours",
+            params,
+        )
+        keys = [issue["key"] for issue in batch]
+        await db.execute(
+            f"DELETE FROM jira_issue_transitions WHERE org_id = ? AND issue_key IN ({', '.join('?' for _ in keys)})",
+            [db.org_id, *keys],
+        )
+
+    transitions = [(issue["key"], t) for issue in issues for t in issue["transitions"]]
+    for i in range(0, len(transitions), WRITE_BATCH):
+        batch = transitions[i : i + WRITE_BATCH]
+        params = []
+        for key, t in batch:
+            params += [db.org_id, key, t["seq"], t["from_status"], t["to_status"],
+                       timestamp_param(at=t["at"]), t["hours"]]
+        await db.execute(
+            "INSERT INTO jira_issue_transitions (org_id, issue_key, seq, from_status, to_status, "
+            "transitioned_at, hours_in_status) VALUES "
+            + ", ".join("(?, ?, ?, ?, ?, ?, ?)" for _ in batch),
+            params,
+        )
+
+    await db.execute(
+        "INSERT INTO jira_sync_state (org_id, scope, last_updated, last_synced_at) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT (org_id, scope) DO UPDATE SET last_updated = excluded.last_updated, "
+        "last_synced_at = excluded.last_synced_at",
+        [db.org_id, fetched["scope"], fetched["last_updated"], timestamp_param()],
+    )
+    if commit:
+        await db.commit()
+    return len(issues)
+
+
+async def sync_jira(db, project_key: str | None = None, full: bool = False) -> dict:
+    """Bring the local store up to date with Jira; `full` re-reads every issue."""
+    scope = project_key or ALL_PROJECTS
+    state = None if full else await sync_state(db, scope)
+    fetched = await fetch_changes(scope, state["last_updated"] if state else None)
+    synced = await store_changes(db, fetched)
+    return {"scope": scope, "issues_synced": synced, "pages": fetched["pages"], "incremental": state is not None}
+
+
+# ─── Metrics ─────────────────────────────────────────────────────────────────
+
+
+async def cycle_time_metrics(db, project_key: str | None = None) -> dict:
+    """Issue counts and created-to-resolved hours over every stored issue."""
+    query = (
+        "SELECT COUNT(*) AS issues, COUNT(resolved_at) AS resolved, AVG(cycle_hours) AS avg_cycle_hours, "
+        "MIN(cycle_hours) AS min_cycle_hours, MAX(cycle_hours) AS max_cycle_hours "
+        "FROM jira_issues WHERE org_id = ?"
+    )
+    params = [db.org_id]
+    if project_key:
+        query += " AND project_key = ?"
+        params.append(project_key)
+    return dict(await db.execute_fetchone(query, params))
+
+
+async def status_timings(db, project_key: str | None = None) -> list[dict]:
+    """Time spent in each status, in the order issues usually pass through them.
+
+    Returns [{"status", "category", "visits", "issues", "avg_hours", "total_hours"}].
+    """
+    project_filter = " AND i.project_key = ?" if project_key else ""
+    params = [db.org_id, *([project_key] if project_key else [])]
+    rows = await db.execute_fetchall(
+        "SELECT t.from_status AS status, COUNT(*) AS visits, COUNT(DISTINCT t.issue_key) AS issues, "
+        "AVG(t.hours_in_status) AS avg_hours, SUM(t.hours_in_status) AS total_hours "
+        "FROM jira_issue_transitions t "
+        "JOIN jira_issues i ON i.org_id = t.org_id AND i.issue_key = t.issue_key "
+        f"WHERE t.org_id = ? AND t.from_status IS NOT NULL{project_filter} "
+        "GROUP BY t.from_status ORDER BY AVG(t.seq), t.from_status",
+        params,
+    )
+    categories = await db.execute_fetchall(
+        "SELECT status, MAX(status_category) AS category FROM jira_issues i "
+        f"WHERE org_id = ?{project_filter} GROUP BY status",
+        params,
+    )
+    category_of = {r["status"]: r["category"] for r in categories}
+    return [{**dict(r), "category": category_of.get(r["status"])} for r in rows]
@@ -0,0 +1,293 @@
+"""
+Job Queue — Durable, database-backed background jobs shared by every API and worker process.
+Jobs are rows in the jobs table. Workers lease them atomically (FOR UPDATE SKIP LOCKED on
+PostgreSQL, a single-statement UPDATE on SQLite), heartbeat while running, and record the
+result. Failed jobs are retried with exponential backoff, jobs whose worker stopped
+heartbeating are re-queued, and cancellation is cooperative via cancel_requested.
+"""
+
+import asyncio
+import importlib
+import json
+import logging
+import os
+import socket
+import uuid
+
+from database import timestamp_param
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_SECONDS = 10
+LEASE_TIMEOUT_SECONDS = 60  # a running job without a heartbeat this long is considered orphaned
+POLL_INTERVAL_SECONDS = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))
+WORKER_CONCURRENCY = int(os.getenv("JOB_WORKER_CONCURRENCY", "2"))
+RETRY_BACKOFF_SECONDS = 30
+RETRY_BACKOFF_MAX_SECONDS = 900
+# Run a worker inside each API process; set to 0 when dedicated `python worker.py` processes run
+EMBEDDED_WORKER = os.getenv("JOB_WORKER_EMBEDDED", "1").lower() in ("1", "true", "yes")
+SHUTDOWN_GRACE_SECONDS = 10
+
+# Job kind -> "module:function" handler, resolved lazily so workers import only what they run.
+# Handlers are `async def handler(db, payload: dict) -> dict | None`; db is scoped to the job's org.
+# The payload also carries "_attempt" and "_max_attempts", so a handler can tell its last try.
+JOB_HANDLERS = {
+    "generate_all": "ai_generate_all:run_generation_job",
+    "ai_generate": "ai_jobs:run_generator_job",
+}
+
+
+# ─── Helpers ─────────────────────────────────────────────────────────────────
+
+
+def retry_delay(attempts: int) -> int:
+    """Exponential backoff before retry number `attempts` (1-based), capped."""
+    return min(RETRY_BACKOFF_SECONDS * 2 ** max(attempts - 1, 0), RETRY_BACKOFF_MAX_SECONDS)
+
+
+def resolve_handler(kind: str):
+    target = JOB_HANDLERS.get(kind)
+    if not target:
+        raise LookupError(f"No handler registered for job kind '{kind}'")
+    module_name, func_name = target.split(":")
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def serialize_job(row) -> dict:
+    """API representation of a jobs row."""
+    job = dict(row)
+    for key in ("payload_json", "result_json"):
+        raw = job.pop(key, None)
+        try:
+            job[key[:-5]] = json.loads(raw) if raw else None
+        except (TypeError, ValueError):
+            job[key[:-5]] = raw
+    job.pop("lease_token", None)
+    job["cancel_requested"] = bool(job.get("cancel_requested"))
+    for key in ("run_after", "heartbeat_at", "created_at", "started_at", "finished_at"):
+        if job.get(key) is not None:
+            job[key] = str(job[key])
+    return job
+
+
+# ─── Producer API ────────────────────────────────────────────────────────────
+
+
+async def enqueue(db, kind: str, payload: dict | None = None, org_id: int | None = None,
+                  dedupe_key: str | None = None, max_attempts: int = 3, delay_seconds: float = 0) -> int:
+    """Queue a job and return its id. With a dedupe_key, an already queued or running job
+    with the same key is returned instead of creating a second one."""
+    if kind not in JOB_HANDLERS:
+        raise LookupError(f"No handler registered for job kind '{kind}'")
+    org_id = org_id if org_id is not None else db.org_id
+    if dedupe_key:
+        existing = await find_active_job(db, dedupe_key, org_id)
+        if existing:
+            return existing["id"]
+    cursor = await db.execute(
+        "INSERT INTO jobs (org_id, kind, payload_json, dedupe_key, status, max_attempts, run_after) "
+        "VALUES (?, ?, ?, ?, 'queued', ?, ?)",
+        [org_id, kind, json.dumps(payload or {}, default=str), dedupe_key, max_attempts,
+         timestamp_param(delay_seconds)],
+    )
+    await db.commit()
+    return cursor.lastrowid
+
+
+async def get_job(db, job_id: int, org_id: int | None = None) -> dict | None:
+    org_id = org_id if org_id is not None else db.org_id
+    row = await db.execute_fetchone("SELECT * FROM jobs WHERE id = ? AND org_id = ?", [job_id, org_id])
+    return dict(row) if row else None
+
+
+async def find_active_job(db, dedupe_key: str, org_id: int | None = None) -> dict | None:
+    """Queued or running job for a dedupe key, if any."""
+    org_id = org_id if org_id is not None else db.org_id
+    row = await db.execute_fetchone(
+        "SELECT * FROM jobs WHERE org_id = ? AND dedupe_key = ? AND status IN ('queued', 'running') "
+        "ORDER BY id DESC LIMIT 1",
+        [org_id, dedupe_key],
+    )
+    return dict(row) if row else None
+
+
+async def cancel_job(db, job_id: int, org_id: int | None = None) -> str | None:
+    """Cancel a job. Queued jobs are cancelled at once; running jobs are flagged and their
+    worker cancels the handler at its next heartbeat. Returns the resulting status."""
+    job = await get_job(db, job_id, org_id)
+    if not job:
+        return None
+    if job["status"] == "queued":
+        await db.execute(
+            "UPDATE jobs SET status = 'cancelled', cancel_requested = 1, finished_at = ? "
+            "WHERE id = ? AND status = 'queued'",
+            [timestamp_param(), job_id],
+        )
+        await db.commit()
+        job = await get_job(db, job_id, org_id)
+        if job["status"] != "running":
+            return job["status"]
+    if job["status"] == "running":
+        await db.execute("UPDATE jobs SET cancel_requested = 1 WHERE id = ?", [job_id])
+        await db.commit()
+    return job["status"]
+
+
+# ─── Worker Side ─────────────────────────────────────────────────────────────
+
+
+async def lease_next(db, worker_name: str) -> dict | None:
+    """Atomically claim the oldest due job, or return None when the queue is empty."""
+    from database import USE_POSTGRES
+
+    token = uuid.uuid4().hex
+    now = timestamp_param()
+    skip_locked = " FOR UPDATE SKIP LOCKED" if USE_POSTGRES else ""
+    await db.execute(
+        "UPDATE jobs SET status = 'running', lease_token = ?, locked_by = ?, heartbeat_at = ?, "
+        "attempts = attempts + 1, started_at = COALESCE(started_at, ?) "
+        "WHERE id = (SELECT id FROM jobs WHERE status = 'queued' AND run_after <= ? "
+        f"ORDER BY run_after, id LIMIT 1{skip_locked}) AND status = 'queued'",
+        [token, worker_name, now, now, now],
+    )
+    await db.commit()
+    row = await db.execute_fetchone("SELECT * FROM jobs WHERE lease_token = ?", [token])
+    return dict(row) if row else None
+
+
+async def heartbeat(db, job: dict) -> bool:
+    """Refresh the lease; returns True when cancellation has been requested."""
+    await db.execute(
+        "UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND lease_token = ?",
+        [timestamp_param(), job["id"], job["lease_token"]],
+    )
+    await db.commit()
+    row = await db.execute_fetchone("SELECT cancel_requested FROM jobs WHERE id = ?", [job["id"]])
+    return bool(row and row["cancel_requested"])
+
+
+async def _finish(db, job: dict, status: str, result=None, error: str | None = None):
+    await db.execute(
+        "UPDATE jobs SET status = ?, result_json = ?, error_message = ?, finished_at = ?, lease_token = NULL "
+        "WHERE id = ? AND lease_token = ?",
+        [status, json.dumps(result, default=str) if result is not None else None, error,
+         timestamp_param(), job["id"], job["lease_token"]],
+    )
+    await db.commit()
+
+
+async def _retry_or_fail(db, job: dict, error: str):
+    if job["attempts"] < job["max_attempts"]:
+        delay = retry_delay(job["attempts"])
+        logger.warning("Job %s (%s) failed attempt %s/%s, retrying in %ss: %s",
+                       job["id"], job["kind"], job["attempts"], job["max_attempts"], delay, error)
+        await db.execute(
+            "UPDATE jobs SET status = 'queued', error_message = ?, run_after = ?, lease_token = NULL, "
+            "locked_by = NULL WHERE id = ? AND lease_token = ?",
+            [error, timestamp_param(delay), job["id"], job["lease_token"]],
+        )
+        await db.commit()
+    else:
+        logger.error("Job %s (%s) failed permanently: %s", job["id"], job["kind"], error)
+        await _finish(db, job, "failed", error=error)
+
+
+async def reap_orphans(db) -> int:
+    """Re-queue (or fail/cancel) running jobs whose worker stopped heartbeating."""
+    stale = timestamp_param(-LEASE_TIMEOUT_SECONDS)
+    rows = await db.execute_fetchall(
+        "SELECT id, kind, attempts, max_attempts, cancel_requested, lease_token FROM jobs "
+        "WHERE status = 'running' AND heartbeat_at < ?",
+        [stale],
+    )
+    for row in rows:
+        job = dict(row)
+        if job["cancel_requested"]:
+            await _finish(db, job, "cancelled", error="Cancelled (worker lost)")
+        else:
+            await _retry_or_fail(db, job, "Worker stopped heartbeating")
+    return len(rows)
+
+
+class JobWorker:
+    """Polls the queue and runs up to `concurrency` jobs at a time in this process."""
+
+    def __init__(self, concurrency: int = WORKER_CONCURRENCY, poll_interval: float = POLL_INTERVAL_SECONDS,
+                 name: str | None = None):
+        self.concurrency = max(concurrency, 1)
+        self.poll_interval = poll_interval
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._active: set[asyncio.Task] = set()
+
+    async def run(self, stop: asyncio.Event):
+        from database import get_db_connection
+
+        logger.info("Job worker %s started (concurrency %s)", self.name, self.concurrency)
+        last_reap = 0.0
+        loop = asyncio.get_running_loop()
+        while not stop.is_set():
+            try:
+                db = await get_db_connection()
+                try:
+                    if loop.time() - last_reap >= LEASE_TIMEOUT_SECONDS / 2:
+                        last_reap = loop.time()
+                        await reap_orphans(db)
+                    while len(self._active) < self.concurrency:
+                        job = await lease_next(db, self.name)
+                        if not job:
+                            break
+                        task = asyncio.create_task(self._execute(job))
+                        self._active.add(task)
+                        task.add_done_callback(self._active.discard)
+                finally:
+                    await db.close()
+            except Exception as e:
+                logger.error("Job worker poll failed: %s", e)
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+        # Let in-flight jobs finish; anything still running at shutdown is reaped elsewhere
+        if self._active:
+            await asyncio.gather(*self._active, return_exceptions=True)
+        logger.info("Job worker %s stopped", self.name)
+
+    async def _execute(self, job: dict):
+        from database import get_db_connection
+
+        meta = await get_db_connection(org_id=job["org_id"])
+        conn = await get_db_connection(org_id=job["org_id"])
+        try:
+            try:
+                handler = resolve_handler(job["kind"])
+                payload = json.loads(job.get("payload_json") or "{}")
+                payload.update(_attempt=job["attempts"], _max_attempts=job["max_attempts"])
+            except Exception as e:
+                await _finish(meta, job, "failed", error=str(e))
+                return
+
+            task = asyncio.create_task(handler(conn, payload))
+            cancelled = False
+            while True:
+                done, _ = await asyncio.wait({task}, timeout=HEARTBEAT_SECONDS)
+                if done:
+                    break
+                try:
+                    if await heartbeat(meta, job) and not cancelled:
+                        cancelled = True
+                        task.cancel()
+                except Exception as e:
+                    logger.warning("Heartbeat for job %s failed: %s", job["id"], e)
+
+            if cancelled or task.cancelled():
+                await _finish(meta, job, "cancelled", error="Cancelled")
+            elif task.exception() is not None:
+                await _retry_or_fail(meta, job, f"{type(task.exception()).__name__}: {task.exception()}")
+            else:
+                await _finish(meta, job, "succeeded", result=task.result())
+        except Exception as e:
+            logger.error("Job %s bookkeeping failed: %s", job["id"], e)
+        finally:
+            await conn.close()
+            await meta.close()
@@ -4,8 +4,13 @@ load_dotenv()
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+import asyncio
 import os
 
+from compression import CompressionMiddleware
+from serialization import FastJSONResponse
+from static_assets import IMMUTABLE, PrecompressedStaticFiles, frontend_directory
+
 from routers import (
     step1_performance,
     step1_ai_dashboard,
@@ -18,6 +23,7 @@ from routers import (
     review_gates,
     auth_router,
     generate_all,
+    jobs,
     documents,
     version_toggle,
     step0_readiness,
@@ -29,7 +35,7 @@ from routers import (
     v2_features,
 )
 
-app = FastAPI(title="Business Transformation Architect", version="1.0.0")
+app = FastAPI(title="Business Transformation Architect", version="1.0.0", default_response_class=FastJSONResponse)
 
 # CORS: configurable origins (default restrictive for production)
 ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "http://localhost:8000").split(",")
@@ -39,6 +45,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# brotli/gzip for JSON and text over COMPRESSION_MIN_BYTES (see compression.py)
+app.add_middleware(CompressionMiddleware)
 
 app.include_router(auth_router.router, prefix="/api/auth", tags=["Auth"])
 app.include_router(step1_performance.router, prefix="/api/step1", tags=["Step 1: Performance"])
@@ -51,6 +59,7 @@ app.include_router(step6_epics_teams.router, prefix="/api/step6", tags=["Step 6:
 app.include_router(step7_features.router, prefix="/api/step7", tags=["Step 7: Features & Roadmap"])
 app.include_router(review_gates.router, prefix="/api/gates", tags=["Review Gates"])
 app.include_router(generate_all.router, prefix="/api/generate-all", tags=["Generate All"])
+app.include_router(jobs.router, prefix="/api/jobs", tags=["Jobs"])
 app.include_router(documents.router, prefix="/api/kb", tags=["Knowledge Base & RAG"])
 # V2.0 Enhancement Routers
 app.include_router(version_toggle.router, prefix="/api/version", tags=["Version Toggle"])
@@ -63,33 +72,58 @@ app.include_router(step6b_tom.router, prefix="/api/step6", tags=["Step 6b: TOM"]
 app.include_router(v2_features.router, prefix="/api/v2", tags=["V2 Features"])
 
 
+# Job worker running inside this API process (see job_queue.EMBEDDED_WORKER)
+_embedded_worker: dict = {}
+
+
 @app.on_event("startup")
 async def startup():
     from database import USE_POSTGRES, init_pg_pool
+    from job_queue import EMBEDDED_WORKER, JobWorker
     await init_pg_pool()
     await run_migrations()
+    if EMBEDDED_WORKER:
+        stop = asyncio.Event()
+        _embedded_worker["stop"] = stop
+        _embedded_worker["task"] = asyncio.create_task(JobWorker().run(stop))
 
 
 @app.on_event("shutdown")
 async def shutdown():
     from database import close_pg_pool
+    from job_queue import SHUTDOWN_GRACE_SECONDS
+    if _embedded_worker:
+        _embedded_worker["stop"].set()
+        try:
+            await asyncio.wait_for(_embedded_worker["task"], timeout=SHUTDOWN_GRACE_SECONDS)
+        except asyncio.TimeoutError:
+            pass  # Unfinished jobs stop heartbeating and are re-queued by the next worker
+        _embedded_worker.clear()
     await close_pg_pool()
 
 
 async def run_migrations():
-    """Initialize database from schema if fresh, apply column migrations for existing DBs."""
-    from database import USE_POSTGRES, get_db_connection
+    """Apply pending versioned migrations (see migrations.py); a no-op once up to date."""
+    from database import get_db_connection
+    from migrations import apply_migrations
 
     db = await get_db_connection()
     try:
-        if USE_POSTGRES:
-            await _migrate_postgres(db)
-        else:
-            await _migrate_sqlite(db)
+        await apply_migrations(db, baseline=_migrate_baseline)
     finally:
         await db.close()
 
 
+async def _migrate_baseline(db):
+    """Create the schema if fresh, or bring a pre-versioning database up to the baseline."""
+    from database import USE_POSTGRES
+
+    if USE_POSTGRES:
+        await _migrate_postgres(db)
+    else:
+        await _migrate_sqlite(db)
+
+
 async def _migrate_postgres(db):
     """Run PostgreSQL schema (all CREATE IF NOT EXISTS) + column migrations."""
     import logging
@@ -192,6 +226,10 @@ async def _migrate_postgres(db):
         "ALTER TABLE product_key_results ADD COLUMN last_updated TEXT",
         "ALTER TABLE delivery_key_results ADD COLUMN actual_value DOUBLE PRECISION",
         "ALTER TABLE delivery_key_results ADD COLUMN last_updated TEXT",
+        # nlq_history: semantic answer cache
+        "ALTER TABLE nlq_history ADD COLUMN question_embedding_json TEXT",
+        "ALTER TABLE nlq_history ADD COLUMN data_version TEXT",
+        "ALTER TABLE nlq_history ADD COLUMN hit_count INTEGER DEFAULT 0",
     ]
     for stmt in alter_statements:
         try:
@@ -199,6 +237,9 @@ async def _migrate_postgres(db):
         except Exception:
             pass  # Column already exists
 
+    await _migrate_tenancy(db)
+    await _migrate_indexes(db)
+
 
 async def _migrate_sqlite(db):
     """Initialize SQLite database from schema.sql if fresh, then apply column migrations."""
@@ -750,6 +791,17 @@ async def _migrate_sqlite(db):
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )""")
 
+            # NLQ semantic answer cache columns
+            for col in [
+                "question_embedding_json TEXT",
+                "data_version TEXT",
+                "hit_count INTEGER DEFAULT 0",
+            ]:
+                try:
+                    await raw_db.execute(f"ALTER TABLE nlq_history ADD COLUMN {col}")
+                except Exception:
+                    pass
+
             for col in [
                 "ai_executive_summary TEXT",
                 "ai_health_score REAL",
@@ -942,16 +994,91 @@ async def _migrate_sqlite(db):
 
         await raw_db.commit()
 
+    await _migrate_tenancy(db)
+    await _migrate_indexes(db)
+
+
+async def _migrate_tenancy(db):
+    """Add org_id to step tables of pre-tenancy databases, assign existing rows to the
+    original (first) organization, and create the (org_id, ...) composite indexes."""
+    from database import USE_POSTGRES
+    from tenancy import TENANT_TABLES, tenant_index_statements
+
+    first_org = await db.execute_fetchone("SELECT MIN(id) AS id FROM organization")
+    first_org_id = first_org["id"] if first_org else None
+
+    for table in ["users"] + list(TENANT_TABLES):
+        column = "org_id INTEGER" if table == "users" else "org_id INTEGER REFERENCES organization(id)"
+        try:
+            await db.execute(f"ALTER TABLE {table} ADD COLUMN {column}")
+        except Exception:
+            continue  # Column already exists
+        # Only backfill right after adding the column; later NULLs must never be adopted
+        if first_org_id is not None:
+            await db.execute(f"UPDATE {table} SET org_id = ? WHERE org_id IS NULL", [first_org_id])
+
+    if USE_POSTGRES:
+        # Names are unique per tenant, not globally (SQLite keeps the legacy constraint
+        # on pre-tenancy databases since it cannot drop table constraints in place)
+        for stmt in [
+            "ALTER TABLE business_units DROP CONSTRAINT IF EXISTS business_units_name_key",
+            "ALTER TABLE teams DROP CONSTRAINT IF EXISTS teams_name_key",
+            "CREATE UNIQUE INDEX IF NOT EXISTS uq_business_units_org_name ON business_units(org_id, name)",
+            "CREATE UNIQUE INDEX IF NOT EXISTS uq_teams_org_name ON teams(org_id, name)",
+        ]:
+            try:
+                await db.execute(stmt)
+            except Exception:
+                pass
+
+    for stmt in tenant_index_statements():
+        try:
+            await db.execute(stmt)
+        except Exception:
+            pass
+    await db.commit()
+
+
+# Foreign-key indexes for hot joins and cascade deletes (mirrors both schema files)
+FOREIGN_KEY_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_epics_initiative ON epics(initiative_id)",
+    "CREATE INDEX IF NOT EXISTS idx_epic_dependencies_pair ON epic_dependencies(epic_id, depends_on_epic_id)",
+    "CREATE INDEX IF NOT EXISTS idx_epic_dependencies_depends_on ON epic_dependencies(depends_on_epic_id)",
+    "CREATE INDEX IF NOT EXISTS idx_feature_dependencies_depends_on ON feature_dependencies(depends_on_feature_id)",
+    "CREATE INDEX IF NOT EXISTS idx_strategic_okrs_strategy ON strategic_okrs(strategy_id)",
+    "CREATE INDEX IF NOT EXISTS idx_strategic_key_results_okr ON strategic_key_results(okr_id)",
+    "CREATE INDEX IF NOT EXISTS idx_product_key_results_okr ON product_key_results(product_okr_id)",
+    "CREATE INDEX IF NOT EXISTS idx_swot_entries_bu ON swot_entries(business_unit_id)",
+    "CREATE INDEX IF NOT EXISTS idx_tows_actions_swot1 ON tows_actions(swot_entry_1_id)",
+    "CREATE INDEX IF NOT EXISTS idx_tows_actions_swot2 ON tows_actions(swot_entry_2_id)",
+    "CREATE INDEX IF NOT EXISTS idx_comments_entity ON comments(entity_type, entity_id)",
+]
+
+
+async def _migrate_indexes(db):
+    """Create foreign-key indexes missing from databases built before they were in the schema."""
+    for stmt in FOREIGN_KEY_INDEXES:
+        try:
+            await db.execute(stmt)
+        except Exception:
+            pass
+    await db.commit()
+
 
-frontend_path = os.path.join(os.path.dirname(__file__), "..", "frontend")
-app.mount("/", StaticFiles(directory=frontend_path, html=True), name="frontend")
+# Built bundle (python static_assets.py): hashed assets are immutable, only the shell revalidates
+frontend_path, frontend_built = frontend_directory()
+if frontend_built:
+    app.mount("/assets", PrecompressedStaticFiles(directory=os.path.join(frontend_path, "assets"),
+                                                  cache_control=IMMUTABLE), name="assets")
+    app.mount("/", PrecompressedStaticFiles(directory=frontend_path, html=True), name="frontend")
+else:
+    app.mount("/", StaticFiles(directory=frontend_path, html=True), name="frontend")
 
 
 @app.middleware("http")
 async def add_no_cache_headers(request, call_next):
     response = await call_next(request)
     if request.url.path == "/" or request.url.path.endswith(".html"):
-        response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
-        response.headers["Pragma"] = "no-cache"
-        response.headers["Expires"] = "0"
+        # Revalidate on every load (a 304 when unchanged) so new asset hashes are picked up
+        response.headers["Cache-Control"] = "no-cache"
     return response
@@ -0,0 +1,180 @@
+"""
+Migrations — Versioned schema migrations applied once per database.
+Applied versions are recorded in schema_migrations, so a boot with nothing pending costs a
+single SELECT. Pending migrations run under a cross-process lock (a PostgreSQL advisory
+lock, or a lock file next to the SQLite database) so several workers can boot concurrently.
+
+Version 1 is the baseline: the schema files plus the legacy in-place migrations in
+main.py, run once for databases created before versioning. Later versions live in
+database/migrations as NNNN_name.sql (both dialects), NNNN_name.sqlite.sql /
+NNNN_name.postgres.sql (one dialect) or NNNN_name.py defining `async def upgrade(db)`.
+Fresh databases are created from the schema files, which already contain every migration,
+so all versions are recorded as applied without running them.
+"""
+
+import importlib.util
+import logging
+import os
+import re
+import time
+from contextlib import asynccontextmanager
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), "..", "database", "migrations")
+BASELINE_VERSION = 1
+ADVISORY_LOCK_KEY = 7_301_2024  # arbitrary, shared by every worker of this app
+
+_FILE_PATTERN = re.compile(r"^(\d{4})_([a-z0-9_]+?)(?:\.(sqlite|postgres))?\.(sql|py)$")
+
+_CREATE_TABLE = """CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)"""
+
+
+# ─── Discovery ───────────────────────────────────────────────────────────────
+
+
+def discover_migrations(is_postgres: bool) -> list[dict]:
+    """Ordered migrations after the baseline, resolved to this dialect's file.
+
+    A version with only the other dialect's file is kept with path None (a no-op here) so
+    version numbers stay contiguous across both backends.
+    """
+    dialect = "postgres" if is_postgres else "sqlite"
+    found = {}
+    if os.path.isdir(MIGRATIONS_DIR):
+        for filename in sorted(os.listdir(MIGRATIONS_DIR)):
+            match = _FILE_PATTERN.match(filename)
+            if not match:
+                continue
+            version, name, file_dialect, kind = int(match.group(1)), match.group(2), match.group(3), match.group(4)
+            if version <= BASELINE_VERSION:
+                raise RuntimeError(f"Migration {filename} must be numbered above the baseline ({BASELINE_VERSION})")
+            entry = found.setdefault(version, {"version": version, "name": name, "path": None, "kind": None})
+            if entry["name"] != name:
+                raise RuntimeError(f"Migration version {version} is used by more than one name")
+            if file_dialect in (None, dialect):
+                if entry["path"] and file_dialect is None:
+                    continue  # the dialect-specific file wins over the shared one
+                entry["path"] = os.path.join(MIGRATIONS_DIR, filename)
+                entry["kind"] = kind
+    return [found[v] for v in sorted(found)]
+
+
+# ─── Locking ─────────────────────────────────────────────────────────────────
+
+
+@asynccontextmanager
+async def _migration_lock(db):
+    """Hold an exclusive cross-process lock while migrations run."""
+    from database import DB_PATH, USE_POSTGRES
+
+    if USE_POSTGRES:
+        await db.execute_fetchone("SELECT pg_advisory_lock(?)", [ADVISORY_LOCK_KEY])
+        try:
+            yield
+        finally:
+            await db.execute_fetchone("SELECT pg_advisory_unlock(?)", [ADVISORY_LOCK_KEY])
+        return
+
+    try:
+        import fcntl
+    except ImportError:  # Windows: single-process dev setups only
+        yield
+        return
+    with open(DB_PATH + ".migrate.lock", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+# ─── Runner ──────────────────────────────────────────────────────────────────
+
+
+async def _applied_versions(db) -> set | None:
+    """Recorded versions, or None when the database predates versioning."""
+    try:
+        rows = await db.execute_fetchall("SELECT version FROM schema_migrations")
+    except Exception:
+        return None
+    return {r["version"] for r in rows}
+
+
+async def _table_exists(db, table: str) -> bool:
+    from database import USE_POSTGRES
+
+    if USE_POSTGRES:
+        row = await db.execute_fetchone(f"SELECT to_regclass('public.{table}') AS t")
+        return bool(row and row["t"])
+    row = await db.execute_fetchone("SELECT name FROM sqlite_master WHERE type = 'table' AND name = ?", [table])
+    return row is not None
+
+
+async def _record(db, version: int, name: str):
+    await db.execute("INSERT INTO schema_migrations (version, name) VALUES (?, ?)", [version, name])
+    await db.commit()
+
+
+async def _apply(db, migration: dict):
+    if migration["path"] is None:
+        return
+    if migration["kind"] == "py":
+        spec = importlib.util.spec_from_file_location(f"migration_{migration['version']:04d}", migration["path"])
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        await module.upgrade(db)
+    else:
+        with open(migration["path"], "r") as f:
+            await db.executescript(f.read())
+    await db.commit()
+
+
+async def apply_migrations(db, baseline) -> list[int]:
+    """Bring the database to the latest version and return the versions applied.
+
+    baseline(db) creates or upgrades a pre-versioning database to version 1.
+    """
+    from database import USE_POSTGRES
+
+    migrations = discover_migrations(USE_POSTGRES)
+    known = {BASELINE_VERSION} | {m["version"] for m in migrations}
+
+    applied = await _applied_versions(db)
+    if applied is not None and known <= applied:
+        return []  # Fast path: nothing pending, no lock taken
+
+    started = time.perf_counter()
+    done = []
+    async with _migration_lock(db):
+        # Another worker may have finished while this one waited for the lock
+        applied = await _applied_versions(db)
+        if applied is None or BASELINE_VERSION not in applied:
+            fresh = not await _table_exists(db, "organization")
+            await baseline(db)
+            await db.executescript(_CREATE_TABLE)
+            await db.commit()
+            await _record(db, BASELINE_VERSION, "baseline")
+            done.append(BASELINE_VERSION)
+            applied = {BASELINE_VERSION}
+            if fresh:
+                # The schema files already include every later migration
+                for migration in migrations:
+                    await _record(db, migration["version"], migration["name"])
+                    applied.add(migration["version"])
+
+        for migration in migrations:
+            if migration["version"] in applied:
+                continue
+            logger.info("Applying migration %04d_%s", migration["version"], migration["name"])
+            await _apply(db, migration)
+            await _record(db, migration["version"], migration["name"])
+            done.append(migration["version"])
+
+    if done:
+        logger.info("Applied migrations %s in %.0f ms", done, (time.perf_counter() - started) * 1000)
+    return done
@@ -0,0 +1,558 @@
+"""
+NLQ Engine — Text-to-SQL answering for natural language questions.
+Turns a question into a parameterized, read-only SELECT against a whitelisted view
+of the 7-step tables, runs it on a read-only connection with a row limit, and sends
+only the result rows to the LLM for narration. Answers are cached semantically in
+nlq_history and reused while the rows they were narrated from are unchanged.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+from collections import OrderedDict
+
+import numpy as np
+
+from ai_research import is_openai_available
+
+logger = logging.getLogger(__name__)
+
+MAX_RESULT_ROWS = 200
+NARRATION_ROWS = 50
+QUERY_TIMEOUT_SECONDS = 5
+
+# Semantic answer cache: minimum cosine similarity between questions to reuse an answer,
+# and how many recent history rows are considered as candidates.
+CACHE_SIMILARITY_THRESHOLD = float(os.getenv("NLQ_CACHE_SIMILARITY", "0.92"))
+CACHE_CANDIDATES = 500
+QUESTION_VECTOR_CACHE = CACHE_CANDIDATES * 8
+
+
+# ─── Whitelisted Schema View ─────────────────────────────────────────────────
+
+# Only these tables/columns are described to the LLM and accepted in generated SQL.
+# Large free-text blobs (AI summaries, embeddings, document bodies) and auth tables are
+# deliberately left out.
+NLQ_SCHEMA = {
+    "organization": ["id", "name", "ticker", "industry", "sub_industry", "market_cap", "country", "currency"],
+    "business_units": ["id", "name", "description"],
+    "revenue_splits": ["id", "business_unit_id", "dimension", "dimension_value", "revenue", "period"],
+    "ops_efficiency": ["id", "business_unit_id", "metric_name", "metric_value", "target_value", "period"],
+    "competitors": [
+        "id", "name", "ticker", "market_share", "revenue", "profit_margin", "operating_margin",
+        "return_on_equity", "return_on_assets", "pe_ratio", "eps", "market_cap_value",
+        "strengths", "weaknesses",
+    ],
+    "value_streams": ["id", "business_unit_id", "name", "description"],
+    "value_stream_steps": [
+        "id", "value_stream_id", "step_order", "step_name", "step_type",
+        "process_time_hours", "wait_time_hours", "lead_time_hours", "is_bottleneck",
+    ],
+    "value_stream_metrics": [
+        "id", "value_stream_id", "total_lead_time_hours", "total_process_time_hours",
+        "total_wait_time_hours", "flow_efficiency", "bottleneck_step",
+    ],
+    "value_stream_benchmarks": [
+        "id", "value_stream_id", "competitor_name", "total_lead_time_hours",
+        "total_process_time_hours", "flow_efficiency", "bottleneck_step",
+    ],
+    "value_stream_levers": ["id", "value_stream_id", "lever_type", "opportunity", "impact_estimate"],
+    "swot_entries": ["id", "business_unit_id", "category", "description", "severity", "confidence"],
+    "tows_actions": [
+        "id", "strategy_type", "swot_entry_1_id", "swot_entry_2_id", "action_description",
+        "priority", "impact_score",
+    ],
+    "strategies": ["id", "layer", "name", "description", "tows_action_id", "approved", "risk_level"],
+    "strategic_okrs": ["id", "strategy_id", "objective", "time_horizon", "status"],
+    "strategic_key_results": [
+        "id", "okr_id", "key_result", "metric", "current_value", "target_value", "actual_value", "unit",
+    ],
+    "digital_products": ["id", "product_group_id", "name", "description"],
+    "initiatives": [
+        "id", "digital_product_id", "strategy_id", "name", "reach", "impact", "confidence", "effort",
+        "rice_score", "rice_override", "status", "roadmap_phase", "estimated_cost_k",
+        "annual_benefit_k", "npv_k", "payback_months", "roi_pct", "completion_pct",
+    ],
+    "teams": ["id", "name", "capacity"],
+    "product_okrs": ["id", "strategic_okr_id", "digital_product_id", "objective", "status"],
+    "epics": [
+        "id", "initiative_id", "team_id", "product_okr_id", "name", "status", "start_date",
+        "target_date", "value_score", "size_score", "effort_score", "priority_score",
+        "risk_level", "roadmap_phase", "estimated_effort_days", "completion_pct",
+    ],
+    "epic_dependencies": ["id", "epic_id", "depends_on_epic_id", "dependency_type"],
+    "features": [
+        "id", "epic_id", "delivery_okr_id", "name", "priority", "status", "estimated_effort",
+        "start_date", "target_date", "value_score", "size_score", "effort_score",
+        "priority_score", "risk_level", "roadmap_phase", "completion_pct",
+    ],
+    "review_gates": ["id", "step_number", "gate_number", "gate_name", "status", "reviewer"],
+    "risk_registry": ["id", "risk_name", "category", "probability", "impact_score", "risk_score", "status"],
+}
+
+# Words that are never part of a read-only SELECT. REPLACE (a string function) and DO (only
+# ever a statement of its own, which the single-SELECT check already rules out) are allowed.
+_FORBIDDEN_KEYWORDS = {
+    "insert", "update", "delete", "drop", "alter", "create", "truncate", "attach",
+    "detach", "pragma", "vacuum", "grant", "revoke", "copy", "reindex", "analyze", "begin",
+    "commit", "rollback", "savepoint", "release", "into", "lock", "call", "execute",
+}
+
+# Catalog/auth objects that must never appear anywhere in a generated query
+_PRIVATE_IDENTIFIERS = {"users", "information_schema", "sqlite_master", "sqlite_schema", "sqlite_temp_master"}
+
+# Schema qualifiers would reach the real tables past the tenant-scoping CTEs
+_SCHEMA_QUALIFIER = re.compile(r"\b(?:main|temp|public)\s*\.", re.IGNORECASE)
+
+
+def _database_tables() -> set:
+    """Every table the schema defines, whitelisted or not."""
+    path = os.path.join(os.path.dirname(__file__), "..", "database", "schema.sql")
+    with open(path) as f:
+        return {
+            name.lower()
+            for name in re.findall(r"CREATE\s+(?:VIRTUAL\s+)?TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)", f.read(), re.I)
+        }
+
+
+_DATABASE_TABLES = _database_tables()
+
+# What the read-only connection's authorizer lets a query see; org_id is read by the
+# tenant-scoping CTEs
+READABLE_COLUMNS = {table: {*cols, "org_id"} for table, cols in NLQ_SCHEMA.items()}
+
+
+def describe_schema() -> str:
+    """Render the whitelisted schema view as compact text for the SQL prompt."""
+    return "\n".join(f"{table}({', '.join(cols)})" for table, cols in NLQ_SCHEMA.items())
+
+
+# ─── SQL Validation ──────────────────────────────────────────────────────────
+
+
+def _referenced_tables(sql: str) -> set:
+    """Extract table names from FROM/JOIN clauses (including comma-separated FROM lists)."""
+    tables = set()
+    for match in re.finditer(r"\bjoin\s+([a-z_][a-z0-9_]*)", sql, re.IGNORECASE):
+        tables.add(match.group(1).lower())
+    table_list = re.compile(
+        r"(.+?)(?=\bwhere\b|\bgroup\b|\border\b|\blimit\b|\bhaving\b|\bunion\b|\bselect\b"
+        r"|\bleft\b|\bright\b|\binner\b|\bouter\b|\bcross\b|\bjoin\b|\(|\)|$)",
+        re.IGNORECASE | re.DOTALL,
+    )
+    # Scan every FROM independently so nested subqueries are not swallowed by an outer match
+    for from_kw in re.finditer(r"\bfrom\s+", sql, re.IGNORECASE):
+        match = table_list.match(sql, from_kw.end())
+        if not match:
+            continue
+        for item in match.group(1).split(","):
+            name = item.strip().split(" ")[0].strip()
+            if re.fullmatch(r"[a-z_][a-z0-9_]*", name, re.IGNORECASE):
+                tables.add(name.lower())
+    return tables
+
+
+def validate_sql(sql: str) -> tuple[str, list]:
+    """Check a generated query is a single read-only SELECT over whitelisted tables.
+
+    Returns (normalized_sql, tables). Raises ValueError describing the rejection.
+    """
+    if not sql or not isinstance(sql, str):
+        raise ValueError("Empty SQL")
+    sql = sql.strip().rstrip(";").strip()
+    if ";" in sql:
+        raise ValueError("Multiple statements are not allowed")
+    if "--" in sql or "/*" in sql:
+        raise ValueError("SQL comments are not allowed")
+
+    lowered = sql.lower()
+    if not (lowered.startswith("select") or lowered.startswith("with")):
+        raise ValueError("Only SELECT queries are allowed")
+
+    # Strip string literals before keyword checks so values like 'Update plan' pass
+    bare = re.sub(r"'(?:[^']|'')*'", "''", lowered)
+    words = set(re.findall(r"[a-z_][a-z0-9_]*", bare))
+    forbidden = words & _FORBIDDEN_KEYWORDS
+    if forbidden:
+        raise ValueError(f"Forbidden keyword(s): {', '.join(sorted(forbidden))}")
+    private = {w for w in words if w in _PRIVATE_IDENTIFIERS or w.startswith("pg_")}
+    if private:
+        raise ValueError(f"Restricted identifier(s): {', '.join(sorted(private))}")
+    if _SCHEMA_QUALIFIER.search(bare):
+        raise ValueError("Schema-qualified table names are not allowed")
+    # Any mention of a real table outside the whitelist, wherever the clause parser stops
+    hidden = (words & _DATABASE_TABLES) - set(NLQ_SCHEMA)
+    if hidden:
+        raise ValueError(f"Table(s) not in NLQ schema: {', '.join(sorted(hidden))}")
+
+    cte_names = {m.lower() for m in re.findall(r"(?:\bwith|,)\s*([a-z_][a-z0-9_]*)\s+as\s*\(", bare)}
+    tables = _referenced_tables(bare) - cte_names
+    if not tables:
+        raise ValueError("Query does not reference any table")
+    unknown = tables - set(NLQ_SCHEMA)
+    if unknown:
+        raise ValueError(f"Table(s) not in NLQ schema: {', '.join(sorted(unknown))}")
+
+    # Whitelisted tables referenced in positions the clause parser skips (e.g. after ON ...,)
+    tables |= words & set(NLQ_SCHEMA)
+    return sql, sorted(tables)
+
+
+# ─── Query Execution ─────────────────────────────────────────────────────────
+
+
+def scope_to_org(sql: str, tables: list, org_id: int | None, is_postgres: bool) -> tuple[str, list]:
+    """Shadow every referenced table with a CTE holding only the organization's rows.
+
+    CTE names take precedence over tables of the same name, so the generated query runs
+    unchanged against tenant-filtered data; the CTE bodies reach the real tables through
+    their schema-qualified names, which validate_sql rejects in generated SQL.
+    """
+    schema = "public" if is_postgres else "main"
+    ctes = []
+    for table in tables:
+        column = "id" if table == "organization" else "org_id"
+        ctes.append(f"{table} AS (SELECT * FROM {schema}.{table} WHERE {column} = ?)")
+    if not ctes:
+        return sql, []
+    return f"WITH {', '.join(ctes)} {sql}", [org_id] * len(ctes)
+
+
+async def run_readonly_query(sql: str, params: list, org_id: int | None = None,
+                             max_rows: int = MAX_RESULT_ROWS) -> list:
+    """Execute a validated SELECT over one organization's rows on a read-only connection
+    with a hard row limit."""
+    from database import USE_POSTGRES, get_readonly_connection
+
+    _, tables = validate_sql(sql)
+    limited_sql, scope_params = scope_to_org(
+        f"SELECT * FROM ({sql}) AS nlq_result LIMIT ?", tables, org_id, USE_POSTGRES
+    )
+    async with get_readonly_connection(timeout_ms=QUERY_TIMEOUT_SECONDS * 1000, org_id=org_id,
+                                       allowed_columns=READABLE_COLUMNS) as ro_db:
+        rows = await asyncio.wait_for(
+            ro_db.execute_fetchall(limited_sql, scope_params + list(params or []) + [max_rows]),
+            timeout=QUERY_TIMEOUT_SECONDS,
+        )
+    return [dict(r) for r in rows]
+
+
+# ─── LLM Steps ───────────────────────────────────────────────────────────────
+
+
+async def generate_sql(question: str) -> dict | None:
+    """Ask the LLM to translate a question into a parameterized SELECT. Returns None on failure."""
+    if not is_openai_available():
+        return None
+
+    try:
+        from openai import AsyncOpenAI
+
+        system_prompt = (
+            "You translate business questions into a single read-only SQL SELECT statement.\n\n"
+            "Schema (table(columns)):\n"
+            f"{describe_schema()}\n\n"
+            "Relationships: revenue_splits/ops_efficiency/value_streams/swot_entries -> business_units; "
+            "value_stream_* -> value_streams; strategic_okrs -> strategies; strategic_key_results.okr_id -> strategic_okrs; "
+            "initiatives -> strategies, digital_products; epics -> initiatives, teams, product_okrs; "
+            "features -> epics; epic_dependencies links epics.\n\n"
+            "Return JSON:\n"
+            "{\n"
+            '  "sql": "SELECT ... WHERE name = ?",\n'
+            '  "params": ["..."],\n'
+            '  "intent": "one sentence describing what the query computes"\n'
+            "}\n\n"
+            "Rules:\n"
+            "- Use ONLY the tables and columns listed above\n"
+            "- Use ? placeholders for every literal value taken from the question and list them in params\n"
+            "- Portable SQL that runs on both SQLite and PostgreSQL (no vendor functions)\n"
+            "- One statement, no semicolons, no comments, no LIMIT larger than 200\n"
+            "- Prefer aggregates (SUM, AVG, COUNT) over returning raw rows when the question asks for totals\n"
+        )
+
+        client = AsyncOpenAI()
+        response = await client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": question},
+            ],
+            response_format={"type": "json_object"},
+            temperature=0,
+            max_tokens=800,
+        )
+
+        result = json.loads(response.choices[0].message.content)
+        if not isinstance(result.get("params"), list):
+            result["params"] = []
+        result.setdefault("intent", "")
+        return result
+
+    except Exception as e:
+        logger.error("NLQ SQL generation failed: %s", e)
+        return None
+
+
+async def narrate_results(question: str, sql: str, tables: list, rows: list) -> dict | None:
+    """Ask the LLM to answer the question from the query result rows only. Returns None on failure."""
+    if not is_openai_available():
+        return None
+
+    try:
+        from openai import AsyncOpenAI
+
+        system_prompt = (
+            "You are a business intelligence assistant. You are given a question, the SQL that was run "
+            "to answer it, and the resulting rows. Answer using ONLY these rows.\n\n"
+            "Return JSON:\n"
+            "{\n"
+            '  "answer": "Direct, concise answer",\n'
+            '  "supporting_data": [{"source": "table name", "data_point": "...", "relevance": "..."}],\n'
+            '  "confidence": "high|medium|low",\n'
+            '  "caveats": ["..."],\n'
+            '  "follow_up_questions": ["..."]\n'
+            "}\n\n"
+            "Rules:\n"
+            "- Quote actual values from the rows\n"
+            "- If the rows are empty or insufficient, say so and lower confidence\n"
+            "- Suggest 2-3 relevant follow-up questions\n"
+        )
+
+        user_prompt = (
+            f"Question: {question}\n\n"
+            f"SQL: {sql}\n"
+            f"Tables: {', '.join(tables)}\n"
+            f"Row count: {len(rows)}\n\n"
+            f"Rows: {json.dumps(rows[:NARRATION_ROWS], default=str)}\n"
+        )
+
+        client = AsyncOpenAI()
+        response = await client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            response_format={"type": "json_object"},
+            temperature=0.3,
+            max_tokens=1500,
+        )
+
+        result = json.loads(response.choices[0].message.content)
+
+        # Validate
+        result.setdefault("answer", "Unable to determine from available data.")
+        if "supporting_data" not in result or not isinstance(result["supporting_data"], list):
+            result["supporting_data"] = []
+        if result.get("confidence") not in ("high", "medium", "low"):
+            result["confidence"] = "medium"
+        if "caveats" not in result or not isinstance(result["caveats"], list):
+            result["caveats"] = []
+        if "follow_up_questions" not in result or not isinstance(result["follow_up_questions"], list):
+            result["follow_up_questions"] = []
+        if len(rows) >= MAX_RESULT_ROWS:
+            result["caveats"].append(f"Result truncated to the first {MAX_RESULT_ROWS} rows.")
+
+        return result
+
+    except Exception as e:
+        logger.error("NLQ narration failed: %s", e)
+        return None
+
+
+# ─── Entry Point ─────────────────────────────────────────────────────────────
+
+
+async def answer_question(question: str, org_id: int | None = None) -> dict | None:
+    """Text-to-SQL pipeline: generate → validate → execute read-only → narrate.
+
+    Returns None when any stage fails so callers can fall back to context-based answering.
+    """
+    plan = await generate_sql(question)
+    if not plan:
+        return None
+
+    try:
+        sql, tables = validate_sql(plan.get("sql", ""))
+    except ValueError as e:
+        logger.warning("NLQ rejected generated SQL: %s", e)
+        return None
+
+    try:
+        rows = await run_readonly_query(sql, plan["params"], org_id)
+    except Exception as e:
+        logger.warning("NLQ query execution failed: %s", e)
+        return None
+
+    result = await narrate_results(question, sql, tables, rows)
+    if not result:
+        return None
+
+    result["data_tables_queried"] = tables
+    result["sql"] = sql
+    result["sql_params"] = plan["params"]
+    result["row_count"] = len(rows)
+    result["data_version"] = compute_data_version(rows)
+    result["engine"] = "text_to_sql"
+    return result
+
+
+# ─── Semantic Answer Cache ───────────────────────────────────────────────────
+
+_cache_stats = {"lookups": 0, "hits": 0, "exact_hits": 0, "semantic_hits": 0, "stale": 0, "misses": 0}
+
+
+def _normalize_question(question: str) -> str:
+    return " ".join(re.findall(r"[a-z0-9]+", question.lower()))
+
+
+def compute_data_version(rows: list) -> str:
+    """Fingerprint of the rows an answer was narrated from."""
+    raw = json.dumps(rows, sort_keys=True, default=str)
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+async def embed_question(question: str) -> list | None:
+    """Embed a question for cache matching. Returns None when embeddings are unavailable."""
+    from rag_engine import generate_embeddings
+    try:
+        return (await generate_embeddings([question]))[0]
+    except Exception as e:
+        logger.debug("NLQ question embedding failed: %s", e)
+        return None
+
+
+async def _is_current(entry: dict, org_id: int | None) -> bool:
+    """An answer is current when re-running its SQL yields the same rows it was narrated from."""
+    answer = entry["answer"]
+    sql, data_version = answer.get("sql"), entry.get("data_version")
+    if not sql or not data_version:
+        return False
+    try:
+        rows = await run_readonly_query(sql, answer.get("sql_params") or [], org_id)
+    except Exception:
+        return False
+    return compute_data_version(rows) == data_version
+
+
+_question_vectors = OrderedDict()  # (org_id, history id) -> unit-normalized float32 embedding
+
+
+async def _candidate_vectors(db, ids: list) -> list:
+    """Unit-normalized question embeddings of history rows `ids`, each parsed from JSON once."""
+    missing = [i for i in ids if (db.org_id, i) not in _question_vectors]
+    if missing:
+        rows = await db.execute_fetchall(
+            f"SELECT id, question_embedding_json FROM nlq_history WHERE org_id = ? "
+            f"AND id IN ({', '.join('?' for _ in missing)})",
+            [db.org_id, *missing],
+        )
+        for row in rows:
+            try:
+                vector = np.asarray(json.loads(row["question_embedding_json"]), dtype=np.float32)
+            except Exception:
+                vector = np.zeros(0, dtype=np.float32)
+            norm = np.linalg.norm(vector)
+            _question_vectors[(db.org_id, row["id"])] = vector / norm if norm else vector
+        while len(_question_vectors) > QUESTION_VECTOR_CACHE:
+            _question_vectors.popitem(last=False)
+    return [_question_vectors.get((db.org_id, i)) for i in ids]
+
+
+async def lookup_cached_answer(db, question: str, embed=embed_question) -> tuple[dict | None, list | None]:
+    """Find a prior answer to the same (or a semantically equivalent) question whose data is unchanged.
+
+    The question is only embedded (with the async `embed`) when no earlier question matches
+    its normalized text, so exact repeats cost no embedding call. Returns (answer or None,
+    the question's embedding or None) so a miss can store the embedding with its answer.
+    """
+    _cache_stats["lookups"] += 1
+    embedding = None
+    try:
+        rows = [dict(r) for r in await db.execute_fetchall(
+            "SELECT id, question, question_embedding_json IS NOT NULL AS has_embedding, data_version "
+            "FROM nlq_history WHERE org_id = ? AND data_version IS NOT NULL ORDER BY id DESC LIMIT ?",
+            [db.org_id, CACHE_CANDIDATES],
+        )]
+    except Exception:
+        rows = []
+
+    normalized = _normalize_question(question)
+    best, best_score, match_type = None, 0.0, None
+    for row in rows:
+        if _normalize_question(row["question"]) == normalized:
+            best, best_score, match_type = row, 1.0, "exact"
+            break
+
+    if best is None and embed is not None:
+        embedding = await embed(question)
+    if best is None and embedding:
+        # All candidates scored with one matrix product, as in the RAG chunk search
+        query = np.asarray(embedding, dtype=np.float32)
+        candidates = [row for row in rows if row["has_embedding"]]
+        try:
+            vectors = await _candidate_vectors(db, [row["id"] for row in candidates])
+        except Exception:
+            vectors = []
+        scored = [(row, v) for row, v in zip(candidates, vectors) if v is not None and v.shape == query.shape]
+        norm = np.linalg.norm(query)
+        if scored and norm:
+            sims = np.stack([v for _, v in scored]) @ (query / norm)
+            j = int(np.argmax(sims))
+            if sims[j] >= CACHE_SIMILARITY_THRESHOLD:
+                best, best_score, match_type = scored[j][0], float(sims[j]), "semantic"
+
+    if best is not None:
+        try:
+            answer_row = await db.execute_fetchone(
+                "SELECT answer_json FROM nlq_history WHERE id = ? AND org_id = ?", [best["id"], db.org_id]
+            )
+        except Exception:
+            answer_row = None
+        best["answer_json"] = answer_row["answer_json"] if answer_row else None
+
+    if not best:
+        _cache_stats["misses"] += 1
+        return None, embedding
+
+    try:
+        best["answer"] = json.loads(best["answer_json"])
+    except Exception:
+        _cache_stats["misses"] += 1
+        return None, embedding
+
+    if not await _is_current(best, db.org_id):
+        _cache_stats["stale"] += 1
+        _cache_stats["misses"] += 1
+        return None, embedding
+
+    _cache_stats["hits"] += 1
+    _cache_stats[f"{match_type}_hits"] += 1
+    try:
+        await db.execute("UPDATE nlq_history SET hit_count = COALESCE(hit_count, 0) + 1 WHERE id = ? AND org_id = ?", [best["id"], db.org_id])
+        await db.commit()
+    except Exception:
+        pass
+
+    return {
+        **best["answer"],
+        "cache_match": {
+            "type": match_type,
+            "similarity": round(best_score, 4),
+            "matched_question": best["question"],
+            "history_id": best["id"],
+        },
+    }, embedding
+
+
+def get_cache_stats() -> dict:
+    """Hit-rate metrics for the semantic answer cache (per process)."""
+    lookups = _cache_stats["lookups"]
+    return {
+        **_cache_stats,
+        "hit_rate": round(_cache_stats["hits"] / lookups, 4) if lookups else 0.0,
+        "similarity_threshold": CACHE_SIMILARITY_THRESHOLD,
+    }
@@ -0,0 +1,176 @@
+"""
+Pagination — Keyset (cursor) pagination and sparse fieldsets for list endpoints.
+List endpoints accept `limit`, `cursor` and `fields`. Without `limit` or `cursor` they keep
+returning a plain list; with either they return {"items": [...], "next_cursor": ...}, where
+the cursor encodes the last row's sort key so the next page starts with an index range
+scan instead of an OFFSET. `fields=a,b` narrows the SELECT list (and skips nested
+lookups) to just those columns, leaving large TEXT columns out of the query.
+"""
+
+import base64
+import json
+
+from fastapi import HTTPException
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# table -> column names, read once per process (the schema only changes at boot)
+_table_columns: dict[str, list[str]] = {}
+
+
+async def table_columns(db, table: str) -> list[str]:
+    """Column names of a table, in schema order."""
+    if table not in _table_columns:
+        if db._is_postgres:
+            rows = await db.execute_fetchall(
+                "SELECT column_name AS name FROM information_schema.columns "
+                "WHERE table_schema = 'public' AND table_name = ? ORDER BY ordinal_position",
+                [table],
+            )
+        else:
+            rows = await db.execute_fetchall(f"PRAGMA table_info({table})")
+        _table_columns[table] = [r["name"] for r in rows]
+    return _table_columns[table]
+
+
+# ─── Cursors ─────────────────────────────────────────────────────────────────
+
+
+def encode_cursor(values: list) -> str:
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: list) -> list:
+    """Sort key values of a cursor, coerced to each key's type."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(sort):
+            raise ValueError("wrong number of sort keys")
+        return [None if v is None else kind(v) for v, (_, _, kind) in zip(values, sort)]
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {e}")
+
+
+def _keyset_condition(sort: list) -> str:
+    """WHERE fragment selecting rows strictly after the cursor in ORDER BY order.
+
+    (a DESC, b ASC) expands to `a < ? OR (a = ? AND b > ?)`; the params are each key's
+    value repeated as in `_keyset_params`.
+    """
+    clauses = []
+    for i, (expr, direction, _) in enumerate(sort):
+        op = "<" if direction == "DESC" else ">"
+        terms = [f"{prev} = ?" for prev, _, _ in sort[:i]] + [f"{expr} {op} ?"]
+        clauses.append("(" + " AND ".join(terms) + ")")
+    return "(" + " OR ".join(clauses) + ")"
+
+
+def _keyset_params(values: list) -> list:
+    params = []
+    for i in range(len(values)):
+        params.extend(values[: i + 1])
+    return params
+
+
+# ─── List Queries ────────────────────────────────────────────────────────────
+
+
+class Page:
+    """One page of rows. Nested fields are filled in by the endpoint before response()."""
+
+    def __init__(self, rows: list[dict], next_cursor: str | None, paginated: bool, nested: set, hidden: set):
+        self.rows = rows
+        self.next_cursor = next_cursor
+        self.paginated = paginated
+        self._nested = nested
+        self._hidden = hidden
+
+    def wants(self, nested_field: str) -> bool:
+        return nested_field in self._nested
+
+    def response(self):
+        for row in self.rows:
+            for column in self._hidden:
+                row.pop(column, None)
+        if not self.paginated:
+            return self.rows
+        return {"items": self.rows, "next_cursor": self.next_cursor}
+
+
+class ListQuery:
+    """A paginated list endpoint's query.
+
+    `computed` maps output names to SQL expressions over the joined tables, `columns`
+    restricts which base-table columns are exposed (default: all of them), `sort` is the
+    ORDER BY as (expression, "ASC"|"DESC", python type) ending in a unique key, and
+    `nested` maps fields the endpoint attaches itself to the base columns they need.
+    """
+
+    def __init__(self, table: str, alias: str, joins: str = "", computed: dict | None = None,
+                 columns: list[str] | None = None, sort: list | None = None, nested: dict | None = None):
+        self.table = table
+        self.alias = alias
+        self.joins = joins
+        self.computed = computed or {}
+        self.columns = columns
+        self.sort = sort or [(f"{alias}.id", "ASC", int)]
+        self.nested = nested or {}
+
+    async def _select_list(self, db, fields: str | None) -> tuple[str, set, set]:
+        """SELECT list, nested fields to attach and helper columns to strip afterwards."""
+        base = self.columns or await table_columns(db, self.table)
+        if fields is None:
+            if self.columns:
+                select = [f"{self.alias}.{c}" for c in self.columns]
+            else:
+                select = [f"{self.alias}.*"]
+            select += [f"{expr} AS {name}" for name, expr in self.computed.items()]
+            return ", ".join(select), set(self.nested), set()
+
+        wanted = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = [f for f in wanted if f not in base and f not in self.computed and f not in self.nested]
+        if unknown:
+            allowed = sorted(set(base) | set(self.computed) | set(self.nested))
+            raise HTTPException(status_code=400,
+                                detail=f"Unknown field(s) {', '.join(unknown)}; choose from {', '.join(allowed)}")
+        nested = {f for f in wanted if f in self.nested}
+        needed = [f for f in wanted if f not in self.nested]
+        hidden = set()
+        for field in nested:
+            for column in ("id", *self.nested[field]):
+                if column not in needed:
+                    needed.append(column)
+                    hidden.add(column)
+        select = [f"{self.computed[f]} AS {f}" if f in self.computed else f"{self.alias}.{f}"
+                  for f in dict.fromkeys(needed)]
+        return ", ".join(select), nested, hidden
+
+    async def fetch(self, db, where: str, params: list, fields: str | None = None,
+                    limit: int | None = None, cursor: str | None = None) -> Page:
+        paginated = limit is not None or cursor is not None
+        if paginated:
+            limit = min(max(limit or DEFAULT_PAGE_SIZE, 1), MAX_PAGE_SIZE)
+
+        select, nested, hidden = await self._select_list(db, fields)
+        select += "".join(f", {expr} AS _sort{i}" for i, (expr, _, _) in enumerate(self.sort))
+        params = list(params)
+        if cursor:
+            where = f"({where}) AND {_keyset_condition(self.sort)}"
+            params += _keyset_params(decode_cursor(cursor, self.sort))
+        order = ", ".join(f"{expr} {direction}" for expr, direction, _ in self.sort)
+        query = f"SELECT {select} FROM {self.table} {self.alias} {self.joins} WHERE {where} ORDER BY {order}"
+        if paginated:
+            query += " LIMIT ?"
+            params.append(limit + 1)  # one extra row tells whether another page exists
+
+        rows = [dict(r) for r in await db.execute_fetchall(query, params)]
+        next_cursor = None
+        if paginated and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor([rows[-1][f"_sort{i}"] for i in range(len(self.sort))])
+        for row in rows:
+            for i in range(len(self.sort)):
+                row.pop(f"_sort{i}", None)
+        return Page(rows, next_cursor, paginated, nested, hidden)
@@ -0,0 +1,289 @@
+"""
+Portfolio Optimizer — Capacity- and budget-constrained scheduling of RICE-ranked initiatives.
+Assigns initiatives to quarters to maximize (time-discounted) portfolio value subject to
+per-quarter effort capacity, per-quarter budget, and initiative precedence derived from
+epic dependencies. Uses an ILP (SciPy/HiGHS) when available and a greedy value-density
+scheduler as fallback; both scale to 1k+ initiatives in well under a second.
+"""
+
+import heapq
+import logging
+import time
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUARTERS = 8
+QUARTER_DISCOUNT = 0.05  # value lost per quarter of delay, rewards doing high-value work first
+ILP_TIME_LIMIT_SECONDS = 0.8
+ILP_MIP_GAP = 0.01  # accept solutions proven within 1% of optimal
+ILP_MAX_VARIABLES = 1000  # beyond this "auto" goes straight to greedy to stay sub-second
+
+
+# ─── Quarter Helpers ─────────────────────────────────────────────────────────
+
+
+def build_quarters(count: int = DEFAULT_QUARTERS, start: datetime | None = None) -> list[dict]:
+    """Quarter buckets starting with the current quarter."""
+    start = start or datetime.now()
+    quarters = []
+    q_month = ((start.month - 1) // 3) * 3 + 1
+    q_year = start.year
+    for _ in range(count):
+        q_num = (q_month - 1) // 3 + 1
+        quarters.append({"label": f"Q{q_num} {q_year}", "year": q_year, "quarter": q_num, "items": []})
+        q_month += 3
+        if q_month > 12:
+            q_month -= 12
+            q_year += 1
+    return quarters
+
+
+# ─── Data Loading ────────────────────────────────────────────────────────────
+
+
+async def load_portfolio(db, statuses: tuple = ("proposed", "approved", "in_progress")) -> dict:
+    """Fetch candidate initiatives, team capacity and initiative-level dependencies."""
+    placeholders = ", ".join("?" for _ in statuses)
+    rows = await db.execute_fetchall(
+        "SELECT id, name, status, effort, rice_score, rice_override, estimated_cost_k, "
+        "annual_benefit_k, npv_k, roadmap_phase FROM initiatives "
+        f"WHERE org_id = ? AND status IN ({placeholders})",
+        [db.org_id, *statuses],
+    )
+    initiatives = [dict(r) for r in rows]
+
+    cap_row = await db.execute_fetchone("SELECT COALESCE(SUM(capacity), 0) AS headcount FROM teams WHERE org_id = ?", (db.org_id,))
+    headcount = float(cap_row["headcount"] or 0) if cap_row else 0.0
+
+    # An initiative depends on another when any of its epics is blocked by one of the other's epics
+    dep_rows = await db.execute_fetchall(
+        "SELECT DISTINCT e1.initiative_id AS initiative_id, e2.initiative_id AS depends_on "
+        "FROM epic_dependencies ed "
+        "JOIN epics e1 ON ed.epic_id = e1.id "
+        "JOIN epics e2 ON ed.depends_on_epic_id = e2.id "
+        "WHERE ed.org_id = ? AND e1.initiative_id != e2.initiative_id "
+        "AND COALESCE(ed.dependency_type, 'blocks') = 'blocks'", (db.org_id,)
+    )
+    dependencies = [(r["initiative_id"], r["depends_on"]) for r in dep_rows]
+
+    return {"initiatives": initiatives, "headcount": headcount, "dependencies": dependencies}
+
+
+def initiative_value(item: dict, objective: str = "rice") -> float:
+    """Objective value of one initiative: RICE (override wins) or NPV in $K."""
+    if objective == "npv":
+        npv = item.get("npv_k")
+        if npv is None:
+            benefit = item.get("annual_benefit_k") or 0
+            cost = item.get("estimated_cost_k") or 0
+            npv = benefit * 3 - cost  # 3-year undiscounted proxy when no business case exists
+        return max(float(npv), 0.0)
+    rice = item.get("rice_override")
+    if rice is None:
+        rice = item.get("rice_score")
+    return max(float(rice or 0), 0.0)
+
+
+# ─── Solvers ─────────────────────────────────────────────────────────────────
+
+
+def _solve_greedy(values, efforts, costs, deps, n_quarters, capacity, budget) -> list:
+    """Value-density list scheduler. Each initiative goes to the earliest quarter after its
+    prerequisites that still has capacity and budget; prerequisites are released in
+    topological order so a dependent is never considered before what blocks it."""
+    n = len(values)
+    cap_left = [capacity] * n_quarters
+    budget_left = [budget] * n_quarters
+    assignment = [None] * n
+
+    def density(i):
+        use = 0.0
+        if capacity:
+            use += efforts[i] / capacity
+        if budget:
+            use += costs[i] / budget
+        return values[i] / max(use, 1e-9)
+
+    preds = [[] for _ in range(n)]
+    succs = [[] for _ in range(n)]
+    for i, j in deps:
+        preds[i].append(j)
+        succs[j].append(i)
+    indegree = [len(p) for p in preds]
+    ready = [(-density(i), i) for i in range(n) if indegree[i] == 0]
+    heapq.heapify(ready)
+
+    while ready:
+        _, i = heapq.heappop(ready)
+        earliest = 0
+        blocked = False
+        for j in preds[i]:
+            if assignment[j] is None:
+                blocked = True
+                break
+            earliest = max(earliest, assignment[j] + 1)
+        if not blocked:
+            for q in range(earliest, n_quarters):
+                if (capacity is None or efforts[i] <= cap_left[q] + 1e-9) and \
+                        (budget is None or costs[i] <= budget_left[q] + 1e-9):
+                    assignment[i] = q
+                    if capacity is not None:
+                        cap_left[q] -= efforts[i]
+                    if budget is not None:
+                        budget_left[q] -= costs[i]
+                    break
+        for k in succs[i]:
+            indegree[k] -= 1
+            if indegree[k] == 0:
+                heapq.heappush(ready, (-density(k), k))
+
+    return assignment
+
+
+def _solve_ilp(values, efforts, costs, deps, n_quarters, capacity, budget, time_limit):
+    """Exact multi-quarter knapsack via scipy.optimize.milp (HiGHS).
+
+    Returns (assignment, optimal) or None when SciPy is unavailable or no solution is found;
+    optimal means proven within ILP_MIP_GAP rather than stopped by the time limit.
+    """
+    try:
+        import numpy as np
+        from scipy.optimize import Bounds, LinearConstraint, milp
+        from scipy.sparse import coo_matrix
+    except ImportError:
+        return None
+
+    n, Q = len(values), n_quarters
+    n_vars = n * Q
+
+    def var(i, q):
+        return i * Q + q
+
+    c = np.empty(n_vars)
+    for i in range(n):
+        for q in range(Q):
+            c[var(i, q)] = -values[i] * (1.0 - QUARTER_DISCOUNT * q)
+
+    rows, cols, data, lower, upper = [], [], [], [], []
+    r = 0
+    # Each initiative scheduled at most once
+    for i in range(n):
+        for q in range(Q):
+            rows.append(r); cols.append(var(i, q)); data.append(1.0)
+        lower.append(0); upper.append(1); r += 1
+    # Per-quarter effort capacity and budget
+    for limit, weights in ((capacity, efforts), (budget, costs)):
+        if limit is None:
+            continue
+        for q in range(Q):
+            for i in range(n):
+                if weights[i]:
+                    rows.append(r); cols.append(var(i, q)); data.append(float(weights[i]))
+            lower.append(-np.inf); upper.append(limit); r += 1
+    # Precedence: i may run in quarter q only if its prerequisite j ran strictly earlier
+    for i, j in deps:
+        for q in range(Q):
+            rows.append(r); cols.append(var(i, q)); data.append(1.0)
+            for qp in range(q):
+                rows.append(r); cols.append(var(j, qp)); data.append(-1.0)
+            lower.append(-np.inf); upper.append(0); r += 1
+
+    A = coo_matrix((data, (rows, cols)), shape=(r, n_vars)).tocsr()
+    res = milp(
+        c,
+        constraints=LinearConstraint(A, lower, upper),
+        integrality=np.ones(n_vars),
+        bounds=Bounds(0, 1),
+        options={"time_limit": time_limit, "mip_rel_gap": ILP_MIP_GAP, "disp": False},
+    )
+    if res.x is None:
+        return None
+
+    x = res.x.reshape(n, Q)
+    assignment = [int(x[i].argmax()) if x[i].max() > 0.5 else None for i in range(n)]
+    return assignment, res.status == 0
+
+
+# ─── Entry Point ─────────────────────────────────────────────────────────────
+
+
+def optimize_portfolio(
+    initiatives: list,
+    dependencies: list,
+    quarters: int = DEFAULT_QUARTERS,
+    capacity_per_quarter: float | None = None,
+    budget_per_quarter_k: float | None = None,
+    objective: str = "rice",
+    solver: str = "auto",
+    time_limit: float = ILP_TIME_LIMIT_SECONDS,
+) -> dict:
+    """Schedule initiatives into quarters. Pure function of its inputs.
+
+    capacity_per_quarter is in initiative effort units (person-months); budget in $K.
+    Either constraint may be None (unconstrained).
+    """
+    started = time.perf_counter()
+    index = {item["id"]: i for i, item in enumerate(initiatives)}
+    values = [initiative_value(item, objective) for item in initiatives]
+    efforts = [float(item.get("effort") or 1) for item in initiatives]
+    costs = [float(item.get("estimated_cost_k") or 0) for item in initiatives]
+    deps = [(index[a], index[b]) for a, b in dependencies if a in index and b in index and a != b]
+
+    def score(plan):
+        return sum(values[i] * (1.0 - QUARTER_DISCOUNT * q) for i, q in enumerate(plan) if q is not None)
+
+    assignment = _solve_greedy(values, efforts, costs, deps, quarters,
+                               capacity_per_quarter, budget_per_quarter_k)
+    used_solver, optimal = "greedy", False
+    use_ilp = solver == "ilp" or (solver == "auto" and len(initiatives) * quarters <= ILP_MAX_VARIABLES)
+    if use_ilp and initiatives:
+        solved = _solve_ilp(values, efforts, costs, deps, quarters, capacity_per_quarter,
+                            budget_per_quarter_k, time_limit)
+        # A time-limited ILP incumbent can trail the greedy plan; keep whichever is better
+        if solved and (solved[1] or score(solved[0]) >= score(assignment)):
+            assignment, optimal = solved
+            used_solver = "ilp"
+
+    buckets = build_quarters(quarters)
+    for bucket in buckets:
+        bucket.update({"effort_used": 0.0, "capacity": capacity_per_quarter,
+                       "budget_used_k": 0.0, "budget_k": budget_per_quarter_k, "value": 0.0})
+    unscheduled = []
+    objective_value = 0.0
+    for i, item in enumerate(initiatives):
+        entry = {**item, "value": round(values[i], 4)}
+        q = assignment[i]
+        if q is None:
+            unscheduled.append(entry)
+            continue
+        bucket = buckets[q]
+        bucket["items"].append(entry)
+        bucket["effort_used"] += efforts[i]
+        bucket["budget_used_k"] += costs[i]
+        bucket["value"] += values[i]
+        objective_value += values[i] * (1.0 - QUARTER_DISCOUNT * q)
+
+    for bucket in buckets:
+        bucket["items"].sort(key=lambda it: it["value"], reverse=True)
+        for key in ("effort_used", "budget_used_k", "value"):
+            bucket[key] = round(bucket[key], 2)
+    unscheduled.sort(key=lambda it: it["value"], reverse=True)
+
+    return {
+        "solver": used_solver,
+        "optimal": optimal,
+        "objective": objective,
+        "objective_value": round(objective_value, 4),
+        "quarters": buckets,
+        "scheduled": len(initiatives) - len(unscheduled),
+        "unscheduled": unscheduled,
+        "total": len(initiatives),
+        "constraints": {
+            "quarters": quarters,
+            "capacity_per_quarter": capacity_per_quarter,
+            "budget_per_quarter_k": budget_per_quarter_k,
+            "dependencies": len(deps),
+        },
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
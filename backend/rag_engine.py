@@ -1,56 +1,189 @@
 """
 RAG Engine — Document persistence, chunking, embedding, and semantic retrieval.
 Stores embeddings as JSON arrays (works on both SQLite and PostgreSQL without extensions).
-Uses OpenAI text-embedding-3-small for embeddings, falls back to keyword search.
+Embeddings come from the configured provider (embeddings.py: OpenAI or a local model), and
+each chunk records which one produced its vector. Keyword search runs on a full-text index
+(SQLite FTS5 with BM25, PostgreSQL tsvector + GIN); by default both rankings are fused
+with reciprocal-rank fusion, and keyword search alone is the fallback when embedding fails.
 """
 
-import json
+import asyncio
+import hashlib
+import itertools
 import logging
 import os
-from typing import List, Optional
+import re
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+import numpy as np
+
+from embeddings import get_embedding_provider, openai_embeddings
+from response_cache import table_versions
+from serialization import dumps, loads
 
 logger = logging.getLogger(__name__)
 
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# "hybrid" fuses vector and keyword rankings; "vector" or "keyword" use one of them
+RETRIEVAL_MODE = os.getenv("RAG_RETRIEVAL_MODE", "hybrid")
+RRF_K = 60  # reciprocal-rank fusion damping constant (Cormack et al.)
+HYBRID_CANDIDATES = 50  # per-ranking depth fed into the fusion
+
 
 # ─── Text Chunking ───────────────────────────────────────────────────────────
 
 
-def chunk_text(text: str, chunk_size: int = 400, overlap: int = 80) -> List[str]:
-    """Split text into overlapping chunks by word count."""
+CHUNK_TOKENS = 400
+CHUNK_OVERLAP_TOKENS = 60
+PAGE_BREAK = "\f"  # text extractors join PDF pages with this so chunks know their page
+
+# A sentence ends at terminal punctuation + whitespace, a blank line, a page break, or a
+# newline before a markdown heading
+_BOUNDARY = re.compile(r"[.!?][\"')\]]*\s+|\n[ \t]*\n\s*|\f\s*|\n(?=#)")
+_HEADING = re.compile(r"#{1,6}\s+(.*)")
+_LINE = re.compile(r"[^\n]+")
+_WORD = re.compile(r"\S+")
+_APPROX_TOKEN = re.compile(r"\w+|[^\w\s]")
+
+_encoding = None
+_encoding_failed = False
+
+
+def _tiktoken_encoding():
+    global _encoding, _encoding_failed
+    if _encoding is None and tiktoken is not None and not _encoding_failed:
+        try:
+            _encoding = tiktoken.get_encoding("cl100k_base")  # the OpenAI embedding models' encoding
+        except Exception as e:  # the BPE file is downloaded on first use, which offline hosts can't do
+            _encoding_failed = True
+            logger.warning("tiktoken encoding unavailable (%s); approximating token counts", e)
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """cl100k_base token count, or a word/punctuation count when tiktoken is unavailable."""
+    encoding = _tiktoken_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return len(_APPROX_TOKEN.findall(text))
+
+
+def _sentences(text: str) -> Iterator[tuple]:
+    """(start, end, page, paragraph_start) of each whitespace-trimmed sentence, in one pass."""
+    page, pos, paragraph_start = 1, 0, True
+    for match in itertools.chain(_BOUNDARY.finditer(text), [None]):
+        end = match.end() if match else len(text)
+        start, stop = pos, end
+        while start < stop and text[start].isspace():
+            start += 1
+        while stop > start and text[stop - 1].isspace():
+            stop -= 1
+        if stop > start:
+            yield start, stop, page, paragraph_start
+            paragraph_start = False
+        if match:
+            separator = match.group()
+            page += separator.count(PAGE_BREAK)
+            paragraph_start = paragraph_start or "\n" in separator or PAGE_BREAK in separator
+        pos = end
+
+
+def _split_long(text: str, start: int, end: int, max_tokens: int) -> Iterator[tuple]:
+    """(start, end, tokens) pieces of an over-long sentence: whole lines where they fit, else words."""
+    def units():
+        for line in _LINE.finditer(text, start, end):
+            tokens = count_tokens(line.group())
+            if tokens <= max_tokens:
+                yield line.start(), line.end(), tokens
+            else:
+                for word in _WORD.finditer(text, line.start(), line.end()):
+                    yield word.start(), word.end(), count_tokens(word.group())
+
+    piece = None
+    for unit_start, unit_end, tokens in units():
+        if piece and piece[2] + tokens > max_tokens:
+            yield piece
+            piece = None
+        piece = (unit_start, unit_end, tokens) if piece is None else (piece[0], unit_end, piece[2] + tokens)
+    if piece:
+        yield piece
+
+
+def iter_chunks(
+    text: str, max_tokens: int = CHUNK_TOKENS, overlap_tokens: int = CHUNK_OVERLAP_TOKENS
+) -> Iterator[dict]:
+    """Lazily pack sentences into chunks of up to max_tokens, walking the text once.
+
+    Chunks end at sentence boundaries (preferring paragraph breaks once half full), start a
+    new chunk at each markdown heading, and repeat up to overlap_tokens of trailing
+    sentences. Each chunk is {"text", "token_count", "char_start", "char_end", "page",
+    "section"}; offsets index into `text`, and page is set when it contains PAGE_BREAKs.
+    """
     if not text or not text.strip():
-        return []
-    words = text.split()
-    if len(words) <= chunk_size:
-        return [text.strip()]
-    chunks = []
-    i = 0
-    while i < len(words):
-        chunk = " ".join(words[i : i + chunk_size])
-        if chunk.strip():
-            chunks.append(chunk.strip())
-        i += chunk_size - overlap
-    return chunks
+        return
+    paged = PAGE_BREAK in text
+    units = deque()  # (start, end, tokens, page) of the chunk being filled
+    size, fresh = 0, False
+    section = chunk_section = None
+
+    def make_chunk():
+        chunk = text[units[0][0]:units[-1][1]]
+        return {
+            "text": chunk,
+            "token_count": count_tokens(chunk),
+            "char_start": units[0][0],
+            "char_end": units[-1][1],
+            "page": units[0][3] if paged else None,
+            "section": chunk_section,
+        }
+
+    for start, end, page, paragraph_start in _sentences(text):
+        heading = _HEADING.match(text, start, end)
+        tokens = count_tokens(text[start:end])
+        pieces = [(start, end, tokens)] if tokens <= max_tokens else _split_long(text, start, end, max_tokens)
+        for piece_start, piece_end, piece_tokens in pieces:
+            full = size + piece_tokens > max_tokens
+            paragraph_end = paragraph_start and size >= max_tokens // 2
+            if fresh and (full or paragraph_end or heading):
+                yield make_chunk()
+                # Overlap: carry trailing sentences into the next chunk, but never across a heading
+                carried, carry = deque(), 0
+                while not heading and units and carry + units[-1][2] <= overlap_tokens:
+                    carried.appendleft(units.pop())
+                    carry += carried[0][2]
+                units, size, fresh = carried, carry, False
+                chunk_section = section
+            while units and size + piece_tokens > max_tokens:
+                size -= units.popleft()[2]
+            if heading:
+                section = chunk_section = heading.group(1).strip()
+            if not units:
+                chunk_section = section
+            units.append((piece_start, piece_end, piece_tokens, page))
+            size += piece_tokens
+            fresh = True
+            heading, paragraph_start = None, False
+    if fresh:
+        yield make_chunk()
+
+
+def chunk_text(text: str, max_tokens: int = CHUNK_TOKENS, overlap_tokens: int = CHUNK_OVERLAP_TOKENS) -> List[str]:
+    """Chunk texts only (see iter_chunks)."""
+    return [c["text"] for c in iter_chunks(text, max_tokens, overlap_tokens)]
 
 
 # ─── Embedding Generation ────────────────────────────────────────────────────
 
 
 async def generate_embeddings(texts: List[str]) -> List[List[float]]:
-    """Generate embeddings using OpenAI text-embedding-3-small."""
-    if not os.getenv("OPENAI_API_KEY"):
-        raise RuntimeError("OPENAI_API_KEY not set")
-    from openai import AsyncOpenAI
-
-    client = AsyncOpenAI()
-    # Process in batches of 20 to avoid rate limits
-    all_embeddings = []
-    for i in range(0, len(texts), 20):
-        batch = texts[i : i + 20]
-        response = await client.embeddings.create(
-            model="text-embedding-3-small", input=batch
-        )
-        all_embeddings.extend([item.embedding for item in response.data])
-    return all_embeddings
+    """Generate embeddings using OpenAI text-embedding-3-small (provider-independent callers, e.g. NLQ)."""
+    return await openai_embeddings(texts)
 
 
 # ─── Cosine Similarity ───────────────────────────────────────────────────────
@@ -69,7 +202,88 @@ def cosine_similarity(a: List[float], b: List[float]) -> float:
 # ─── Document Storage ────────────────────────────────────────────────────────
 
 
-async def store_document(
+EMBED_STREAM_BATCH = 32
+EMBED_CONCURRENCY = 4
+
+
+def _batched(items, size: int) -> Iterator[list]:
+    iterator = iter(items)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+
+def content_hash(data) -> str:
+    """sha256 of an upload's bytes (or of text); identifies re-uploads of the same file."""
+    if isinstance(data, str):
+        data = data.encode()
+    return hashlib.sha256(data).hexdigest()
+
+
+async def find_document(db, org_id: int, digest: str) -> Optional[dict]:
+    """The org's already-indexed document with this content hash, if any."""
+    return await db.execute_fetchone(
+        "SELECT id, filename, doc_category FROM org_documents WHERE org_id = ? AND content_hash = ? "
+        "ORDER BY id DESC LIMIT 1",
+        [org_id, digest],
+    )
+
+
+async def _embed_and_insert(db, org_id: int, doc_id: int, provider, chunks, filename: str) -> tuple[int, int]:
+    """Insert (chunk_index, chunk) pairs with embeddings; returns (inserted, embedded).
+
+    Chunks are embedded in batches as they arrive, so embedding calls overlap with chunking
+    the rest of the document.
+    """
+    if provider.local:
+        # The local model may refit on this document's chunks, so it embeds them in one call
+        batches = [list(chunks)]
+    else:
+        batches = _batched(chunks, EMBED_STREAM_BATCH)
+
+    semaphore = asyncio.Semaphore(EMBED_CONCURRENCY)
+    failed = []
+
+    async def embed(batch):
+        if failed:
+            return None, None
+        async with semaphore:
+            try:
+                return await provider.embed_documents(db, org_id, [c["text"] for _, c in batch])
+            except Exception as e:
+                if not failed:
+                    logger.warning("Embedding generation failed for %s: %s (storing without embeddings)",
+                                   filename, e)
+                failed.append(e)
+                return None, None
+
+    pending = []
+    for batch in batches:
+        if batch:
+            pending.append((batch, asyncio.create_task(embed(batch))))
+            await asyncio.sleep(0)
+
+    inserted, embedded, used_provider = 0, 0, None
+    for batch, task in pending:
+        embeddings, provider_id = await task
+        used_provider = provider_id or used_provider
+        for i, (idx, chunk) in enumerate(batch):
+            has_embedding = embeddings is not None and i < len(embeddings)
+            await db.execute(
+                "INSERT INTO document_chunks (org_id, document_id, chunk_index, chunk_text, embedding_json, "
+                "embedding_provider, token_count, char_start, char_end, page_number, section) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [org_id, doc_id, idx, chunk["text"], dumps(embeddings[i]) if has_embedding else None,
+                 provider_id if has_embedding else None, chunk["token_count"], chunk["char_start"],
+                 chunk["char_end"], chunk["page"], chunk["section"]],
+            )
+            inserted += 1
+            embedded += has_embedding
+    if embedded:
+        logger.info("Generated %d/%d %s embeddings for %s", embedded, inserted, used_provider, filename)
+    return inserted, embedded
+
+
+async def index_document(
     db,
     org_id: int,
     filename: str,
@@ -78,118 +292,381 @@ async def store_document(
     doc_category: str = "general",
     upload_source: str = "manual",
     step_number: int = None,
-) -> int:
-    """Store a document with its text, chunk it, and generate embeddings."""
+    digest: str = None,
+) -> dict:
+    """Store a document, or re-index an earlier upload of it, and embed its chunks.
+
+    `digest` is the content_hash() of the uploaded bytes (defaults to the hash of the text).
+    Returns {"document_id", "status", "chunks", "embedded", "reused", "removed"}, where status is
+    - "unchanged": the org already has a fully embedded document with this hash; nothing
+      is written.
+    - "updated": a document with the same filename and category exists. Chunks whose text
+      it already holds keep their embeddings, only new or changed chunks are embedded, and
+      chunks that no longer occur are removed.
+    - "created": a new document.
+    """
+    result = {"document_id": 0, "status": "empty", "chunks": 0, "embedded": 0, "reused": 0, "removed": 0}
     if not content_text or not content_text.strip():
-        return 0
+        return result
+    digest = digest or content_hash(content_text)
 
-    # Truncate very large documents to 50K chars for storage
-    stored_text = content_text[:50000]
+    existing = await find_document(db, org_id, digest)
+    if existing:
+        count = await db.execute_fetchone(
+            "SELECT COUNT(*) AS c FROM document_chunks WHERE document_id = ? AND org_id = ?", [existing["id"], org_id]
+        )
+        return {**result, "document_id": existing["id"], "status": "unchanged", "chunks": count["c"]}
 
-    # Insert document record
-    cursor = await db.execute(
-        "INSERT INTO org_documents (org_id, filename, file_type, content_text, "
-        "doc_category, upload_source, step_number) VALUES (?, ?, ?, ?, ?, ?, ?)",
-        [org_id, filename, file_type, stored_text, doc_category, upload_source, step_number],
+    provider = get_embedding_provider()
+    previous = await db.execute_fetchone(
+        "SELECT id FROM org_documents WHERE org_id = ? AND filename = ? AND doc_category = ? ORDER BY id DESC LIMIT 1",
+        [org_id, filename, doc_category],
     )
-    doc_id = cursor.lastrowid
+    reusable = {}  # chunk hash -> ids of the previous version's chunks embedded by this provider
+    stale_ids = []
+    if previous:
+        doc_id = previous["id"]
+        await db.execute(
+            "UPDATE org_documents SET file_type = ?, content_text = ?, content_hash = NULL WHERE id = ? AND org_id = ?",
+            [file_type, content_text, doc_id, org_id],
+        )
+        for row in await db.execute_fetchall(
+            "SELECT id, chunk_text, embedding_provider FROM document_chunks "
+            "WHERE document_id = ? AND org_id = ? ORDER BY chunk_index",
+            [doc_id, org_id],
+        ):
+            if (row["embedding_provider"] or "").startswith(provider.name + ":"):
+                reusable.setdefault(content_hash(row["chunk_text"]), []).append(row["id"])
+            else:
+                stale_ids.append(row["id"])  # unembedded or another provider's; re-inserted if still present
+        result["status"] = "updated"
+    else:
+        cursor = await db.execute(
+            "INSERT INTO org_documents (org_id, filename, file_type, content_text, "
+            "doc_category, upload_source, step_number) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [org_id, filename, file_type, content_text, doc_category, upload_source, step_number],
+        )
+        doc_id = cursor.lastrowid
+        result["status"] = "created"
     await db.commit()
+    result["document_id"] = doc_id
 
-    # Chunk text
-    chunks = chunk_text(content_text)
-    if not chunks:
-        return doc_id
+    kept = []  # (chunk id, chunk_index, chunk) of unchanged chunks
 
-    # Try to generate embeddings
-    embeddings = None
-    try:
-        embeddings = await generate_embeddings(chunks)
-        logger.info("Generated %d embeddings for %s", len(embeddings), filename)
-    except Exception as e:
-        logger.warning("Embedding generation failed for %s: %s (storing without embeddings)", filename, e)
+    def changed_chunks():
+        for idx, chunk in enumerate(iter_chunks(content_text)):
+            ids = reusable.get(content_hash(chunk["text"]))
+            if ids:
+                kept.append((ids.pop(0), idx, chunk))
+            else:
+                yield idx, chunk
 
-    # Store chunks
-    for idx, chunk in enumerate(chunks):
-        embedding_json = json.dumps(embeddings[idx]) if embeddings and idx < len(embeddings) else None
+    inserted, result["embedded"] = await _embed_and_insert(db, org_id, doc_id, provider, changed_chunks(), filename)
+    for chunk_id, idx, chunk in kept:
         await db.execute(
-            "INSERT INTO document_chunks (document_id, chunk_index, chunk_text, "
-            "embedding_json, token_count) VALUES (?, ?, ?, ?, ?)",
-            [doc_id, idx, chunk, embedding_json, len(chunk.split())],
+            "UPDATE document_chunks SET chunk_index = ?, token_count = ?, char_start = ?, char_end = ?, "
+            "page_number = ?, section = ? WHERE id = ?",
+            [idx, chunk["token_count"], chunk["char_start"], chunk["char_end"], chunk["page"], chunk["section"],
+             chunk_id],
         )
+    stale_ids += [chunk_id for ids in reusable.values() for chunk_id in ids]
+    for chunk_id in stale_ids:
+        await db.execute("DELETE FROM document_chunks WHERE id = ?", [chunk_id])
+    if result["embedded"] == inserted:
+        # Only a fully embedded document may answer later uploads as "unchanged"; until then
+        # re-uploading it retries the chunks that failed
+        await db.execute("UPDATE org_documents SET content_hash = ? WHERE id = ? AND org_id = ?", [digest, doc_id, org_id])
     await db.commit()
-    return doc_id
+    result.update(chunks=inserted + len(kept), reused=len(kept), removed=len(stale_ids))
+
+    if provider.local:
+        # A refit leaves earlier chunks on the previous model; bring them onto the new one
+        try:
+            await provider.reembed_stale(db, org_id)
+        except Exception as e:
+            logger.warning("Re-embedding after refit failed for org %s: %s", org_id, e)
+    return result
+
+
+async def store_document(
+    db,
+    org_id: int,
+    filename: str,
+    file_type: str,
+    content_text: str,
+    doc_category: str = "general",
+    upload_source: str = "manual",
+    step_number: int = None,
+    digest: str = None,
+) -> int:
+    """Store a document with its text, chunk it, and generate embeddings (see index_document)."""
+    result = await index_document(db, org_id, filename, file_type, content_text, doc_category,
+                                  upload_source, step_number, digest)
+    return result["document_id"]
 
 
 # ─── Semantic Retrieval ──────────────────────────────────────────────────────
 
 
+def _scope(org_id: int, doc_category: str) -> tuple[list, list]:
+    where_parts, params = [], []
+    if org_id:
+        where_parts.append("od.org_id = ?")
+        params.append(org_id)
+    if doc_category:
+        where_parts.append("od.doc_category = ?")
+        params.append(doc_category)
+    return where_parts, params
+
+
 async def retrieve_relevant_chunks(
     db,
     query: str,
     org_id: int = None,
     top_k: int = 10,
     doc_category: str = None,
+    mode: str = None,
 ) -> List[dict]:
-    """Retrieve most relevant document chunks for a query using cosine similarity."""
-    # Try semantic search first
-    try:
-        query_embedding = (await generate_embeddings([query]))[0]
-    except Exception as e:
-        logger.warning("Query embedding failed: %s — falling back to keyword search", e)
-        return await _keyword_search(db, query, org_id, top_k, doc_category)
+    """Retrieve most relevant document chunks for a query.
+    Scoped to the connection's organization unless org_id is given. `mode` overrides
+    RAG_RETRIEVAL_MODE: "vector" ranks by cosine similarity, "keyword" by the full-text
+    index, "hybrid" fuses both rankings (reciprocal-rank fusion)."""
+    spec = {"query": query, "top_k": top_k, "doc_category": doc_category}
+    return (await retrieve_many(db, [spec], org_id=org_id, mode=mode))[0]
+
+
+def _as_spec(query, top_k: int, doc_category: str) -> dict:
+    if isinstance(query, str):
+        return {"query": query, "top_k": top_k, "doc_category": doc_category}
+    return {"top_k": top_k, "doc_category": doc_category, **query}
 
-    # Get all chunks with embeddings for this org
-    where_parts = ["dc.embedding_json IS NOT NULL"]
-    params = []
-    if org_id:
-        where_parts.append("od.org_id = ?")
-        params.append(org_id)
-    if doc_category:
-        where_parts.append("od.doc_category = ?")
-        params.append(doc_category)
 
-    where = " AND ".join(where_parts)
+async def retrieve_many(
+    db,
+    queries: list,
+    org_id: int = None,
+    top_k: int = 10,
+    doc_category: str = None,
+    mode: str = None,
+    dedupe: bool = False,
+) -> List[List[dict]]:
+    """Retrieve chunks for several queries at once; returns one ranked list per query.
+
+    Each query is a string or a {"query", "top_k", "doc_category"} dict (missing keys take
+    the defaults given here). All queries are embedded in one provider call and scored in
+    one matrix product against the org's chunk matrix. With dedupe, a chunk returned for
+    an earlier query is left out of later ones.
+    """
+    org_id = org_id or getattr(db, "org_id", None)
+    mode = mode or RETRIEVAL_MODE
+    specs = [_as_spec(q, top_k, doc_category) for q in queries]
+    if not specs:
+        return []
+
+    chunks = None
+    if mode != "keyword":
+        try:
+            vectors, provider_id = await get_embedding_provider().embed_queries(
+                db, org_id, [s["query"] for s in specs]
+            )
+            chunks = await _chunk_matrix(db, org_id, provider_id, len(vectors[0]))
+        except Exception as e:
+            logger.warning("Query embedding failed: %s — falling back to keyword search", e)
+
+    sims = None
+    if chunks is not None and chunks.rows:
+        sims = np.asarray(vectors, dtype=np.float32) @ chunks.matrix.T
+        norms = np.linalg.norm(np.asarray(vectors, dtype=np.float32), axis=1)
+        sims /= np.where(norms == 0, 1.0, norms)[:, None]
+
+    used = set()
+    results = []
+    for i, spec in enumerate(specs):
+        k = spec["top_k"]
+        if chunks is None:
+            hits = await keyword_search(db, spec["query"], org_id, k + len(used), spec["doc_category"])
+            hits = [h for h in hits if h["id"] not in used][:k]
+        else:
+            depth = max(HYBRID_CANDIDATES, k) if mode == "hybrid" else k
+            hits = chunks.top(sims[i] if sims is not None else None, depth, spec["doc_category"], used)
+            if mode == "hybrid":
+                keyword_hits = await keyword_search(db, spec["query"], org_id, depth + len(used), spec["doc_category"])
+                keyword_hits = [chunks.with_similarity(h, sims[i] if sims is not None else None)
+                                for h in keyword_hits if h["id"] not in used]
+                hits = reciprocal_rank_fusion([hits, keyword_hits], k)
+            else:
+                hits = hits[:k]
+        if dedupe:
+            used.update(h["id"] for h in hits)
+        results.append(hits)
+    return results
+
+
+def reciprocal_rank_fusion(rankings: List[List[dict]], top_k: int) -> List[dict]:
+    """Fuse ranked chunk lists by sum of 1 / (RRF_K + rank), keyed on chunk id.
+    Each fused row merges the fields every ranking had for it (similarity, keyword_score)."""
+    fused = {}
+    for ranking in rankings:
+        for rank, row in enumerate(ranking, start=1):
+            entry = fused.setdefault(row["id"], {"rrf_score": 0.0})
+            entry.update(row)
+            entry["rrf_score"] += 1.0 / (RRF_K + rank)
+    merged = sorted(fused.values(), key=lambda r: r["rrf_score"], reverse=True)
+    return merged[:top_k]
+
+
+# ─── Chunk Matrix ────────────────────────────────────────────────────────────
+
+
+class ChunkMatrix:
+    """An org's embedded chunks as one unit-normalized float32 matrix plus row metadata."""
+
+    def __init__(self, rows: List[dict], matrix, categories):
+        self.rows = rows
+        self.matrix = matrix
+        self.categories = categories
+        self.index = {r["id"]: j for j, r in enumerate(rows)}
+
+    def top(self, sims, depth: int, doc_category: str = None, exclude=()) -> List[dict]:
+        """Best `depth` rows by similarity, optionally within a category, skipping `exclude` ids."""
+        if sims is None:
+            return []
+        scores = sims.copy()
+        if doc_category:
+            scores[self.categories != doc_category] = -np.inf
+        for chunk_id in exclude:
+            j = self.index.get(chunk_id)
+            if j is not None:
+                scores[j] = -np.inf
+        depth = min(depth, len(scores))
+        best = np.argpartition(-scores, depth - 1)[:depth] if depth else []
+        best = sorted(best, key=lambda j: -scores[j])
+        return [{**self.rows[j], "similarity": float(scores[j])} for j in best if scores[j] != -np.inf]
+
+    def with_similarity(self, row: dict, sims) -> dict:
+        j = self.index.get(row["id"])
+        return {**row, "similarity": float(sims[j])} if sims is not None and j is not None else row
+
+
+_chunk_matrices = OrderedDict()  # (org_id, provider_id) -> (corpus version, ChunkMatrix)
+CHUNK_MATRIX_CACHE = 16
+
+
+async def _corpus_version(db):
+    """Write counters of the document tables (see response_cache), or None if unavailable."""
+    try:
+        versions = await table_versions(db, ("document_chunks", "org_documents"))
+    except Exception:
+        return None
+    return (versions["document_chunks"], versions["org_documents"])
+
+
+async def _chunk_matrix(db, org_id: int, provider_id: str, dim: int) -> ChunkMatrix:
+    """The org's chunks embedded by `provider_id`, parsed once per corpus version."""
+    key = (org_id, provider_id)
+    version = await _corpus_version(db)
+    cached = _chunk_matrices.get(key)
+    if cached is not None and version is not None and cached[0] == version:
+        _chunk_matrices.move_to_end(key)
+        return cached[1]
+
+    where_parts, params = _scope(org_id, None)
+    where = " AND ".join(["dc.embedding_json IS NOT NULL", "dc.embedding_provider = ?", *where_parts])
     rows = await db.execute_fetchall(
         f"SELECT dc.id, dc.chunk_text, dc.embedding_json, od.filename, od.doc_category "
         f"FROM document_chunks dc "
         f"JOIN org_documents od ON dc.document_id = od.id "
-        f"WHERE {where}",
-        params,
+        f"WHERE {where} ORDER BY dc.id",
+        [provider_id, *params],
     )
-
-    # Compute similarities
-    results = []
+    meta, vectors = [], []
     for row in rows:
         row_dict = dict(row)
         try:
-            embedding = json.loads(row_dict.get("embedding_json", "[]"))
-            if embedding:
-                sim = cosine_similarity(query_embedding, embedding)
-                row_dict["similarity"] = sim
-                results.append(row_dict)
+            embedding = loads(row_dict.pop("embedding_json") or "[]")
         except Exception:
             continue
+        if len(embedding) == dim:
+            meta.append(row_dict)
+            vectors.append(embedding)
+
+    matrix = np.asarray(vectors, dtype=np.float32).reshape(len(vectors), dim)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix /= np.where(norms == 0, 1.0, norms)
+    chunks = ChunkMatrix(meta, matrix, np.asarray([m.get("doc_category") for m in meta], dtype=object))
+    if version is not None:
+        _chunk_matrices[key] = (version, chunks)
+        while len(_chunk_matrices) > CHUNK_MATRIX_CACHE:
+            _chunk_matrices.popitem(last=False)
+    return chunks
+
+
+# ─── Keyword Retrieval ───────────────────────────────────────────────────────
+
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+_STOPWORDS = frozenset(
+    "the and for with that this from what which are was were has have how our their about into "
+    "over than then them they its not but all any can will would should".split()
+)
+MAX_QUERY_TERMS = 16
 
-    # Sort by similarity descending, return top_k
-    results.sort(key=lambda x: x.get("similarity", 0), reverse=True)
-    return results[:top_k]
 
+def _query_terms(query: str) -> List[str]:
+    """Distinct content words of a query, in order; word characters only, so safe to quote."""
+    terms = [t for t in _TOKEN.findall(query.lower()) if len(t) > 2 and t not in _STOPWORDS]
+    return list(dict.fromkeys(terms))[:MAX_QUERY_TERMS]
 
-async def _keyword_search(
-    db, query: str, org_id: int, top_k: int, doc_category: str
+
+async def keyword_search(
+    db, query: str, org_id: int, top_k: int, doc_category: str = None
 ) -> List[dict]:
-    """Fallback keyword search when embeddings are unavailable."""
-    where_parts = []
-    params = []
-    if org_id:
-        where_parts.append("od.org_id = ?")
-        params.append(org_id)
-    if doc_category:
-        where_parts.append("od.doc_category = ?")
-        params.append(doc_category)
+    """Chunks matching any query term, best first, with `keyword_score` (higher is better).
 
-    # Extract keywords from query
-    keywords = [w for w in query.lower().split() if len(w) > 3][:5]
+    SQLite ranks with FTS5's BM25; PostgreSQL with ts_rank_cd over the GIN-indexed tsvector.
+    Databases without the index fall back to an unranked LIKE scan.
+    """
+    terms = _query_terms(query)
+    if not terms:
+        return []
+    where_parts, params = _scope(org_id, doc_category)
+    scope = "".join(f" AND {w}" for w in where_parts)
+    try:
+        if getattr(db, "_is_postgres", False):
+            rows = await db.execute_fetchall(
+                f"SELECT dc.id, dc.chunk_text, od.filename, od.doc_category, "
+                f"ts_rank_cd(dc.search_vector, q) AS keyword_score "
+                f"FROM document_chunks dc "
+                f"JOIN org_documents od ON dc.document_id = od.id, "
+                f"to_tsquery('english', ?) q "
+                f"WHERE dc.search_vector @@ q{scope} "
+                f"ORDER BY keyword_score DESC, dc.id LIMIT ?",
+                [" | ".join(terms), *params, top_k],
+            )
+        else:
+            # bm25() is lower-is-better; negate it so both dialects sort descending
+            rows = await db.execute_fetchall(
+                f"SELECT dc.id, dc.chunk_text, od.filename, od.doc_category, "
+                f"-bm25(document_chunks_fts) AS keyword_score "
+                f"FROM document_chunks_fts "
+                f"JOIN document_chunks dc ON dc.id = document_chunks_fts.rowid "
+                f"JOIN org_documents od ON dc.document_id = od.id "
+                f"WHERE document_chunks_fts MATCH ?{scope} "
+                f"ORDER BY bm25(document_chunks_fts), dc.id LIMIT ?",
+                [" OR ".join(f'"{t}"' for t in terms), *params, top_k],
+            )
+    except Exception as e:
+        logger.warning("Full-text search unavailable: %s — using LIKE scan", e)
+        return await _like_search(db, terms, org_id, top_k, doc_category)
+    return [dict(r) for r in rows]
+
+
+async def _like_search(
+    db, keywords: List[str], org_id: int, top_k: int, doc_category: str
+) -> List[dict]:
+    """Unranked substring match, for databases created before the full-text index."""
+    where_parts, params = _scope(org_id, doc_category)
+    keywords = keywords[:5]
     if keywords:
         kw_clauses = ["LOWER(dc.chunk_text) LIKE ?" for _ in keywords]
         where_parts.append("(" + " OR ".join(kw_clauses) + ")")
@@ -209,18 +686,64 @@ async def _keyword_search(
 # ─── RAG Context Builder ─────────────────────────────────────────────────────
 
 
-async def build_rag_context(
-    db,
-    query: str,
-    org_id: int = None,
-    top_k: int = 8,
-    doc_category: str = None,
-) -> str:
-    """Build a context string from retrieved chunks for inclusion in AI prompts."""
-    chunks = await retrieve_relevant_chunks(db, query, org_id, top_k, doc_category)
-    if not chunks:
-        return ""
+# Retrieval queries of the context gatherers: name -> (query template, top_k, doc_category)
+CONTEXT_QUERIES = {
+    "dashboard": ("{org_name} {industry} business performance financial analysis transformation", 6, None),
+    "full_context": ("{org_name} {industry} business performance financial metrics strategy value stream", 8, None),
+    "initiatives": ("{org_name} {industry} digital initiatives strategy transformation capabilities", 8, None),
+    "value_stream": ("{segment} value stream {industry} {org_name} operations process", 8, None),
+    "competitor_operations": ("{segment} competitor operations benchmarks {industry}", 5, "competitor"),
+}
+
+# Results of prefetch_contexts() for the current task: {"version", "org_id", "results": {key: chunks}}
+_prefetched: ContextVar[dict | None] = ContextVar("rag_prefetched", default=None)
+
+
+def context_query(name: str, **fields) -> dict:
+    """A gatherer's named query as {"query", "top_k", "doc_category"} (build_rag_context kwargs)."""
+    template, top_k, doc_category = CONTEXT_QUERIES[name]
+    return {"query": template.format(**fields), "top_k": top_k, "doc_category": doc_category}
+
+
+def _spec_key(spec: dict) -> tuple:
+    return (spec["query"], spec["top_k"], spec["doc_category"])
+
+
+async def prefetch_contexts(db, specs: List[dict], org_id: int = None):
+    """Retrieve several gatherers' queries in one retrieve_many() call up front.
+
+    For the rest of the current task (e.g. one job), build_rag_context() answers those
+    exact queries from the batch while the document tables are unchanged, instead of
+    embedding and scanning again.
+    """
+    org_id = org_id or getattr(db, "org_id", None)
+    version = await _corpus_version(db)
+    if version is None:
+        return
+    current = _prefetched.get()
+    keep = current and current["org_id"] == org_id and current["version"] == version
+    store = dict(current["results"]) if keep else {}
+    specs = [s for s in specs if _spec_key(s) not in store]
+    try:
+        for spec, chunks in zip(specs, await retrieve_many(db, specs, org_id=org_id)):
+            store[_spec_key(spec)] = chunks
+    except Exception as e:
+        logger.warning("Batched RAG retrieval failed: %s — gatherers will retrieve individually", e)
+        return
+    _prefetched.set({"version": version, "org_id": org_id, "results": store})
+
+
+async def _prefetched_chunks(db, spec: dict, org_id: int) -> List[dict] | None:
+    batch = _prefetched.get()
+    if not batch or batch["org_id"] != org_id or _spec_key(spec) not in batch["results"]:
+        return None
+    if batch["version"] != await _corpus_version(db):
+        return None
+    return batch["results"][_spec_key(spec)]
 
+
+def format_rag_context(chunks: List[dict]) -> str:
+    """Render retrieved chunks as a prompt context block."""
     parts = []
     for chunk in chunks:
         source = chunk.get("filename", "Unknown")
@@ -236,12 +759,28 @@ async def build_rag_context(
     return "\n\n---\n\n".join(parts)
 
 
+async def build_rag_context(
+    db,
+    query: str,
+    org_id: int = None,
+    top_k: int = 8,
+    doc_category: str = None,
+) -> str:
+    """Build a context string from retrieved chunks for inclusion in AI prompts."""
+    org_id = org_id or getattr(db, "org_id", None)
+    spec = {"query": query, "top_k": top_k, "doc_category": doc_category}
+    chunks = await _prefetched_chunks(db, spec, org_id)
+    if chunks is None:
+        chunks = await retrieve_relevant_chunks(db, query, org_id, top_k, doc_category)
+    return format_rag_context(chunks) if chunks else ""
+
+
 # ─── Data Mode Helpers ───────────────────────────────────────────────────────
 
 
 async def get_org_data_mode(db) -> str:
     """Get the current organization's data_mode ('demo' or 'live')."""
-    row = await db.execute_fetchone("SELECT data_mode FROM organization LIMIT 1")
+    row = await db.execute_fetchone("SELECT data_mode FROM organization WHERE id = ?", (db.org_id,))
     if row:
         return row.get("data_mode", "demo") or "demo"
     return "demo"
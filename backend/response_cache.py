@@ -0,0 +1,148 @@
+"""
+Response Cache — ETag caching for read-heavy GET endpoints, driven by table versions.
+Every committed write bumps its table's counter in table_versions (see DBConnection.commit).
+A cached endpoint declares the tables it reads; its weak ETag hashes the request, the
+organization and those tables' versions, so If-None-Match is answered with 304 after one
+small SELECT and unchanged bodies are served from a bounded in-process LRU. A write to any
+listed table, from any process, changes the ETag, so nothing is invalidated by hand.
+"""
+
+import functools
+import hashlib
+import inspect
+import logging
+import os
+from collections import OrderedDict
+from datetime import date
+
+from fastapi import Request, Response
+
+from serialization import dumps_bytes
+
+logger = logging.getLogger(__name__)
+
+MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_ENTRIES", "256"))
+MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_MB", "64")) * 1024 * 1024
+
+_BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _build_id() -> str:
+    """Identifies the deployed backend code, so a deploy changes every ETag.
+
+    Same in every worker and across restarts of one build, so 304s survive both.
+    BUILD_ID (e.g. the release's git SHA) overrides hashing the sources.
+    """
+    if os.getenv("BUILD_ID"):
+        return os.environ["BUILD_ID"]
+    digest = hashlib.sha1()
+    for root, dirs, files in os.walk(_BACKEND_DIR):
+        dirs[:] = sorted(d for d in dirs if not d.startswith((".", "__")))
+        for name in sorted(f for f in files if f.endswith(".py")):
+            with open(os.path.join(root, name), "rb") as f:
+                digest.update(name.encode() + b"\0" + f.read())
+    return digest.hexdigest()[:16]
+
+
+BUILD_ID = _build_id()
+
+_bodies: OrderedDict = OrderedDict()  # etag -> serialized body
+_size = 0
+
+
+# ─── Versions & ETags ────────────────────────────────────────────────────────
+
+
+async def table_versions(db, tables) -> dict:
+    """Current version of each table (0 if it has never been written)."""
+    placeholders = ", ".join("?" for _ in tables)
+    rows = await db.execute_fetchall(
+        f"SELECT table_name, version FROM table_versions WHERE table_name IN ({placeholders})", list(tables)
+    )
+    versions = {t: 0 for t in tables}
+    versions.update({r["table_name"]: r["version"] for r in rows})
+    return versions
+
+
+def compute_etag(request: Request, org_id, versions: dict) -> str:
+    # Date is included because roadmap schedules are laid out from today
+    parts = [BUILD_ID, request.url.path, str(request.url.query), str(org_id), date.today().isoformat()]
+    parts += [f"{t}={versions[t]}" for t in sorted(versions)]
+    return 'W/"' + hashlib.sha1("|".join(parts).encode()).hexdigest()[:24] + '"'
+
+
+def _matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or etag.removeprefix("W/") in (t.removeprefix("W/") for t in tags)
+
+
+# ─── LRU ─────────────────────────────────────────────────────────────────────
+
+
+def _get(etag: str) -> bytes | None:
+    body = _bodies.get(etag)
+    if body is not None:
+        _bodies.move_to_end(etag)
+    return body
+
+
+def _put(etag: str, body: bytes):
+    global _size
+    if len(body) > MAX_BYTES // 4:
+        return  # one huge payload shouldn't flush everything else
+    if etag in _bodies:
+        return
+    _bodies[etag] = body
+    _size += len(body)
+    while _bodies and (len(_bodies) > MAX_ENTRIES or _size > MAX_BYTES):
+        _, evicted = _bodies.popitem(last=False)
+        _size -= len(evicted)
+
+
+def clear():
+    global _size
+    _bodies.clear()
+    _size = 0
+
+
+# ─── Decorator ───────────────────────────────────────────────────────────────
+
+
+def cached_response(*tables: str):
+    """Serve an endpoint through the ETag cache. `tables` must list every table it reads.
+
+    The endpoint must take `db=Depends(get_db)`; the request is injected for the headers.
+    """
+    def decorate(endpoint):
+        signature = inspect.signature(endpoint)
+
+        @functools.wraps(endpoint)
+        async def wrapper(*args, _cache_request: Request, **kwargs):
+            db = kwargs["db"]
+            try:
+                versions = await table_versions(db, tables)
+            except Exception as e:  # table_versions missing: serve uncached
+                logger.warning("Response cache disabled for %s: %s", _cache_request.url.path, e)
+                return await endpoint(*args, **kwargs)
+
+            etag = compute_etag(_cache_request, db.org_id, versions)
+            headers = {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Authorization"}
+            if _matches(_cache_request.headers.get("if-none-match"), etag):
+                return Response(status_code=304, headers=headers)
+
+            body = _get(etag)
+            if body is None:
+                result = await endpoint(*args, **kwargs)
+                if isinstance(result, Response):
+                    return result
+                body = dumps_bytes(result)
+                _put(etag, body)
+            return Response(content=body, media_type="application/json", headers=headers)
+
+        request_param = inspect.Parameter("_cache_request", inspect.Parameter.KEYWORD_ONLY, annotation=Request)
+        wrapper.__signature__ = signature.replace(parameters=[*signature.parameters.values(), request_param])
+        return wrapper
+
+    return decorate
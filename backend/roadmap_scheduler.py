@@ -0,0 +1,327 @@
+"""
+Roadmap Scheduler — Dependency-aware critical-path scheduling for epics and features.
+Topologically orders the epic_dependencies / feature_dependencies graph, detects cycles,
+computes earliest/latest start and slack (CPM), then levels the plan against per-team
+headcount so no team is over-allocated in any week. Results are memoized on a fingerprint
+of the scheduling inputs, so repeated roadmap views are free until an epic, feature,
+team or dependency actually changes.
+"""
+
+import hashlib
+import heapq
+import logging
+import math
+from collections import OrderedDict
+from datetime import date, timedelta
+
+from graph_assembler import DependencyGraph, load_dependency_graph
+
+logger = logging.getLogger(__name__)
+
+WORKING_DAYS_PER_WEEK = 5
+
+# Default effort conversion when explicit estimates are missing
+EPIC_DAYS_PER_EFFORT_POINT = 10  # effort_score 1-5 -> 10-50 person-days
+FEATURE_DAYS_PER_STORY_POINT = 1  # estimated_effort is in story points (1-40)
+FEATURE_DAYS_PER_EFFORT_POINT = 3
+
+# People working one item in parallel (capped by the team's capacity)
+EPIC_STAFF = 4
+FEATURE_STAFF = 2
+
+_CACHE_SIZE = 16
+_schedule_cache: OrderedDict = OrderedDict()
+
+
+# ─── Graph Analysis ──────────────────────────────────────────────────────────
+
+
+def find_cycles(node_ids: list, preds: dict) -> list[list]:
+    """Strongly connected components with more than one node (or a self-loop).
+
+    Iterative Tarjan so 5k-node graphs don't hit the recursion limit.
+    """
+    index_of, low, on_stack, stack = {}, {}, set(), []
+    cycles = []
+    counter = 0
+    for root in node_ids:
+        if root in index_of:
+            continue
+        work = [(root, iter(preds.get(root, ())))]
+        index_of[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, children = work[-1]
+            advanced = False
+            for child in children:
+                if child not in index_of:
+                    index_of[child] = low[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(preds.get(child, ()))))
+                    advanced = True
+                    break
+                if child in on_stack:
+                    low[node] = min(low[node], index_of[child])
+            if advanced:
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index_of[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                if len(component) > 1 or node in preds.get(node, ()):
+                    cycles.append(sorted(component))
+    return cycles
+
+
+def topological_order(node_ids: list, preds: dict, succs: dict) -> tuple[list, set]:
+    """Kahn's algorithm. Returns (order, unresolved) where unresolved holds every node
+    in a cycle or downstream of one."""
+    indegree = {n: len(preds.get(n, ())) for n in node_ids}
+    queue = [n for n in node_ids if indegree[n] == 0]
+    order = []
+    while queue:
+        node = queue.pop()
+        order.append(node)
+        for nxt in succs.get(node, ()):
+            indegree[nxt] -= 1
+            if indegree[nxt] == 0:
+                queue.append(nxt)
+    return order, set(node_ids) - set(order)
+
+
+# ─── Scheduling ──────────────────────────────────────────────────────────────
+
+
+def _critical_path(order: list, preds: dict, duration: dict, es: dict, ef: dict, slack: dict) -> list:
+    """Trace one zero-slack chain back from the latest-finishing node."""
+    if not order:
+        return []
+    node = max(order, key=lambda n: (ef[n], -slack[n]))
+    path = [node]
+    while True:
+        prev = [p for p in preds.get(node, ()) if ef[p] == es[node] and slack[p] == 0]
+        if not prev:
+            break
+        node = prev[0]
+        path.append(node)
+    return list(reversed(path))
+
+
+def schedule(nodes: list, edges: list, team_capacity: dict, start: date | None = None) -> dict:
+    """Compute CPM timings and a capacity-levelled plan.
+
+    nodes: dicts with id, team_id, work_days, staff, priority.
+    edges: (node_id, depends_on_id) pairs — node cannot start before depends_on finishes.
+    team_capacity: team_id -> headcount. Items without a team (or with an unknown team)
+    are scheduled on dependencies alone.
+    """
+    start = start or date.today()
+    by_id = {n["id"]: n for n in nodes}
+    node_ids = list(by_id)
+    preds: dict = {n: [] for n in node_ids}
+    succs: dict = {n: [] for n in node_ids}
+    for node, dep in edges:
+        if node in by_id and dep in by_id and dep not in preds[node]:
+            preds[node].append(dep)
+            succs[dep].append(node)
+
+    order, unresolved = topological_order(node_ids, preds, succs)
+    cycles = find_cycles(sorted(unresolved), preds) if unresolved else []
+    in_cycle = {n for c in cycles for n in c}
+
+    # Durations in weeks given the item's staffing
+    duration, staff = {}, {}
+    for n in node_ids:
+        item = by_id[n]
+        cap = team_capacity.get(item.get("team_id"))
+        people = max(1, min(item.get("staff") or 1, cap or item.get("staff") or 1))
+        staff[n] = people
+        duration[n] = max(1, math.ceil(float(item.get("work_days") or 1) / (WORKING_DAYS_PER_WEEK * people)))
+
+    # Forward / backward pass (unconstrained CPM)
+    es, ef = {}, {}
+    for n in order:
+        es[n] = max((ef[p] for p in preds[n]), default=0)
+        ef[n] = es[n] + duration[n]
+    horizon = max(ef.values(), default=0)
+    lf, ls = {}, {}
+    for n in reversed(order):
+        lf[n] = min((ls[s] for s in succs[n] if s in ls), default=horizon)
+        ls[n] = lf[n] - duration[n]
+    slack = {n: ls[n] - es[n] for n in order}
+
+    # Resource levelling: serial schedule generation, least-slack first
+    usage: dict = {}
+    level_start, level_finish = {}, {}
+    remaining = {n: len(preds[n]) for n in order}
+    ready = [(ls[n], -(by_id[n].get("priority") or 0), n) for n in order if remaining[n] == 0]
+    heapq.heapify(ready)
+    while ready:
+        _, _, n = heapq.heappop(ready)
+        t = max((level_finish[p] for p in preds[n]), default=0)
+        team = by_id[n].get("team_id")
+        cap = team_capacity.get(team)
+        if cap:
+            profile = usage.setdefault(team, [])
+            while True:
+                end = t + duration[n]
+                if len(profile) < end:
+                    profile.extend([0] * (end - len(profile)))
+                clash = next((w for w in range(t, end) if profile[w] + staff[n] > cap), None)
+                if clash is None:
+                    break
+                t = clash + 1
+            for w in range(t, t + duration[n]):
+                profile[w] += staff[n]
+        level_start[n] = t
+        level_finish[n] = t + duration[n]
+        for s in succs[n]:
+            if s not in remaining:
+                continue  # downstream of a cycle
+            remaining[s] -= 1
+            if remaining[s] == 0:
+                heapq.heappush(ready, (ls[s], -(by_id[s].get("priority") or 0), s))
+
+    results = {}
+    for n in node_ids:
+        if n in unresolved:
+            results[n] = {
+                "id": n, "scheduled": False,
+                "reason": "cycle" if n in in_cycle else "blocked_by_cycle",
+                "duration_weeks": duration[n],
+            }
+            continue
+        results[n] = {
+            "id": n,
+            "scheduled": True,
+            "duration_weeks": duration[n],
+            "staff": staff[n],
+            "earliest_start_week": es[n],
+            "earliest_finish_week": ef[n],
+            "latest_start_week": ls[n],
+            "latest_finish_week": lf[n],
+            "slack_weeks": slack[n],
+            "critical": slack[n] == 0,
+            "start_week": level_start[n],
+            "finish_week": level_finish[n],
+            "delay_weeks": level_start[n] - es[n],
+            "start_date": (start + timedelta(weeks=level_start[n])).isoformat(),
+            "finish_date": (start + timedelta(weeks=level_finish[n])).isoformat(),
+        }
+
+    utilization = {}
+    for team, profile in usage.items():
+        cap = team_capacity.get(team) or 1
+        busy = [u for u in profile if u]
+        utilization[team] = {
+            "capacity": cap,
+            "peak": max(profile, default=0),
+            "avg_utilization_pct": round(100 * sum(busy) / (cap * len(profile)), 1) if profile else 0,
+            "weeks_loaded": len(busy),
+        }
+
+    return {
+        "nodes": results,
+        "critical_path": _critical_path(order, preds, duration, es, ef, slack),
+        "cycles": cycles,
+        "unscheduled": sorted(unresolved),
+        "project_weeks": horizon,
+        "levelled_weeks": max(level_finish.values(), default=0),
+        "team_utilization": utilization,
+        "start_date": start.isoformat(),
+        "node_count": len(node_ids),
+        "edge_count": sum(len(p) for p in preds.values()),
+    }
+
+
+def schedule_cached(nodes: list, edges: list, team_capacity: dict, start: date | None = None) -> dict:
+    """schedule() memoized on a fingerprint of its inputs (bounded LRU)."""
+    start = start or date.today()
+    digest = hashlib.sha1(repr((
+        sorted((n["id"], n.get("team_id"), n.get("work_days"), n.get("staff"), n.get("priority"))
+               for n in nodes),
+        sorted(edges),
+        sorted(team_capacity.items(), key=lambda kv: str(kv[0])),
+        start.isoformat(),
+    )).encode()).hexdigest()
+    cached = _schedule_cache.get(digest)
+    if cached is not None:
+        _schedule_cache.move_to_end(digest)
+        return cached
+    result = schedule(nodes, edges, team_capacity, start)
+    _schedule_cache[digest] = result
+    while len(_schedule_cache) > _CACHE_SIZE:
+        _schedule_cache.popitem(last=False)
+    return result
+
+
+# ─── Data Loading ────────────────────────────────────────────────────────────
+
+
+async def _team_capacity(db) -> dict:
+    rows = await db.execute_fetchall("SELECT id, capacity FROM teams WHERE org_id = ?", (db.org_id,))
+    return {r["id"]: r["capacity"] for r in rows if r["capacity"]}
+
+
+async def schedule_epics(db, epics: list | None = None, graph: DependencyGraph | None = None) -> dict:
+    """Schedule epics over epic_dependencies ('blocks' edges only).
+    Pass an already loaded `graph` to avoid reading the dependencies twice."""
+    if epics is None:
+        epics = [dict(r) for r in await db.execute_fetchall(
+            "SELECT id, team_id, effort_score, estimated_effort_days, priority_score FROM epics WHERE org_id = ?", (db.org_id,)
+        )]
+    nodes = [{
+        "id": e["id"],
+        "team_id": e.get("team_id"),
+        "work_days": e.get("estimated_effort_days") or (e.get("effort_score") or 3) * EPIC_DAYS_PER_EFFORT_POINT,
+        "staff": EPIC_STAFF,
+        "priority": e.get("priority_score") or 0,
+    } for e in epics]
+    graph = graph or await load_dependency_graph(db, "epic")
+    return schedule_cached(nodes, graph.edges(blocks_only=True), await _team_capacity(db))
+
+
+async def schedule_features(db, features: list | None = None, graph: DependencyGraph | None = None) -> dict:
+    """Schedule features over feature_dependencies; features inherit their epic's team."""
+    if features is None:
+        features = [dict(r) for r in await db.execute_fetchall(
+            "SELECT f.id, f.effort_score, f.estimated_effort, f.priority_score, e.team_id "
+            "FROM features f JOIN epics e ON f.epic_id = e.id WHERE f.org_id = ?", (db.org_id,)
+        )]
+    nodes = []
+    for f in features:
+        if f.get("estimated_effort"):
+            work = f["estimated_effort"] * FEATURE_DAYS_PER_STORY_POINT
+        else:
+            work = (f.get("effort_score") or 3) * FEATURE_DAYS_PER_EFFORT_POINT
+        nodes.append({
+            "id": f["id"],
+            "team_id": f.get("team_id"),
+            "work_days": work,
+            "staff": FEATURE_STAFF,
+            "priority": f.get("priority_score") or 0,
+        })
+    graph = graph or await load_dependency_graph(db, "feature")
+    return schedule_cached(nodes, graph.edges(blocks_only=True), await _team_capacity(db))
+
+
+def quarter_index(start_date: str, quarters: list) -> int:
+    """Index of the quarter bucket containing an ISO date (clamped to the last bucket)."""
+    d = date.fromisoformat(start_date)
+    q = (d.month - 1) // 3 + 1
+    for idx, bucket in enumerate(quarters):
+        if bucket["year"] == d.year and bucket["quarter"] == q:
+            return idx
+    return 0 if (d.year, q) < (quarters[0]["year"], quarters[0]["quarter"]) else len(quarters) - 1
@@ -5,8 +5,9 @@ from pydantic import BaseModel, EmailStr
 
 from auth import create_access_token, get_current_user, hash_password, verify_password
 from database import get_db
+from serialization import FastJSONRoute
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 
 class RegisterRequest(BaseModel):
@@ -7,10 +7,13 @@ import logging
 
 from fastapi import APIRouter, Depends, UploadFile, File, Form
 from database import get_db
-from rag_engine import store_document, retrieve_relevant_chunks, build_rag_context, is_live_mode
+from serialization import FastJSONRoute
+from pagination import ListQuery
+from rag_engine import PAGE_BREAK, content_hash, find_document, index_document, retrieve_relevant_chunks, build_rag_context, is_live_mode
+from embeddings import get_embedding_provider
 from ai_research import is_openai_available
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 logger = logging.getLogger(__name__)
 
 
@@ -20,7 +23,7 @@ logger = logging.getLogger(__name__)
 @router.get("/data-mode")
 async def get_data_mode(db=Depends(get_db)):
     """Get the current organization data mode (demo or live)."""
-    row = await db.execute_fetchone("SELECT data_mode FROM organization LIMIT 1")
+    row = await db.execute_fetchone("SELECT data_mode FROM organization WHERE id = ?", (db.org_id,))
     mode = (row.get("data_mode") if row else "demo") or "demo"
     return {"data_mode": mode}
 
@@ -32,7 +35,7 @@ async def set_data_mode(data: dict, db=Depends(get_db)):
     if mode not in ("demo", "live"):
         return {"error": "data_mode must be 'demo' or 'live'"}
 
-    await db.execute("UPDATE organization SET data_mode = ?", [mode])
+    await db.execute("UPDATE organization SET data_mode = ? WHERE id = ?", [mode, db.org_id])
     await db.commit()
     return {"data_mode": mode, "message": f"Switched to {mode} mode"}
 
@@ -51,7 +54,7 @@ async def upload_document(
         return {"error": "No file provided"}
 
     # Get org
-    org = await db.execute_fetchone("SELECT id FROM organization LIMIT 1")
+    org = await db.execute_fetchone("SELECT id FROM organization WHERE id = ?", (db.org_id,))
     if not org:
         return {"error": "No organization set up. Complete Org Setup first."}
     org_id = org["id"]
@@ -59,6 +62,23 @@ async def upload_document(
     ext = file.filename.rsplit(".", 1)[-1].lower() if "." in file.filename else ""
     content = await file.read()
 
+    # Re-uploading a file the knowledge base already holds is a no-op, whatever category was
+    # asked for; the response reports the category it is actually filed under
+    digest = content_hash(content)
+    existing = await find_document(db, org_id, digest)
+    if existing:
+        row = await db.execute_fetchone(
+            "SELECT COUNT(*) as c FROM document_chunks WHERE org_id = ? AND document_id = ?", [org_id, existing["id"]]
+        )
+        return {
+            "success": True,
+            "document_id": existing["id"],
+            "filename": existing["filename"],
+            "status": "unchanged",
+            "chunks": row["c"] if row else 0,
+            "doc_category": existing["doc_category"],
+        }
+
     # Extract text based on file type
     text = ""
     try:
@@ -68,7 +88,7 @@ async def upload_document(
             try:
                 import fitz
                 doc = fitz.open(stream=content, filetype="pdf")
-                text = "\n".join(page.get_text() for page in doc).strip()
+                text = PAGE_BREAK.join(page.get_text() for page in doc).strip()
             except ImportError:
                 return {"error": "PyMuPDF not installed for PDF parsing"}
         elif ext == "docx":
@@ -110,25 +130,24 @@ async def upload_document(
     if not text.strip():
         return {"error": "No text content found in the document"}
 
-    # Store document with embeddings
+    # Store document with embeddings; a changed re-upload only embeds its new chunks
     try:
-        doc_id = await store_document(
+        result = await index_document(
             db, org_id, file.filename, ext, text,
             doc_category=doc_category,
             upload_source="manual",
+            digest=digest,
         )
-        # Count chunks
-        row = await db.execute_fetchone(
-            "SELECT COUNT(*) as c FROM document_chunks WHERE document_id = ?", [doc_id]
-        )
-        chunk_count = row["c"] if row else 0
-
         return {
             "success": True,
-            "document_id": doc_id,
+            "document_id": result["document_id"],
             "filename": file.filename,
+            "status": result["status"],
             "text_length": len(text),
-            "chunks": chunk_count,
+            "chunks": result["chunks"],
+            "embedded_chunks": result["embedded"],
+            "reused_chunks": result["reused"],
+            "removed_chunks": result["removed"],
             "doc_category": doc_category,
         }
     except Exception as e:
@@ -139,24 +158,32 @@ async def upload_document(
 # ─── Document List / Delete ──────────────────────────────────────────────────
 
 
+DOCUMENTS_LIST = ListQuery(
+    "org_documents", "d",
+    columns=["id", "filename", "file_type", "doc_category", "upload_source", "step_number", "created_at"],
+    computed={
+        "text_length": "LENGTH(d.content_text)",
+        "chunks": "(SELECT COUNT(*) FROM document_chunks WHERE document_id = d.id)",
+        "embedded_chunks": "(SELECT COUNT(*) FROM document_chunks WHERE document_id = d.id AND embedding_json IS NOT NULL)",
+    },
+    # Newest first; ids are assigned in upload order, so they stand in for created_at
+    sort=[("d.id", "DESC", int)],
+)
+
+
 @router.get("/list")
-async def list_documents(db=Depends(get_db)):
-    """List all documents in the knowledge base."""
-    rows = await db.execute_fetchall(
-        "SELECT d.id, d.filename, d.file_type, d.doc_category, d.upload_source, "
-        "d.step_number, d.created_at, LENGTH(d.content_text) as text_length, "
-        "(SELECT COUNT(*) FROM document_chunks WHERE document_id = d.id) as chunks, "
-        "(SELECT COUNT(*) FROM document_chunks WHERE document_id = d.id AND embedding_json IS NOT NULL) as embedded_chunks "
-        "FROM org_documents d ORDER BY d.created_at DESC"
-    )
-    return [dict(r) for r in rows]
+async def list_documents(limit: int | None = None, cursor: str | None = None, fields: str | None = None,
+                         db=Depends(get_db)):
+    """List all documents in the knowledge base, newest first."""
+    page = await DOCUMENTS_LIST.fetch(db, "d.org_id = ?", [db.org_id], fields, limit, cursor)
+    return page.response()
 
 
 @router.delete("/{doc_id}")
 async def delete_document(doc_id: int, db=Depends(get_db)):
     """Delete a document and its chunks from the knowledge base."""
-    await db.execute("DELETE FROM document_chunks WHERE document_id = ?", [doc_id])
-    await db.execute("DELETE FROM org_documents WHERE id = ?", [doc_id])
+    await db.execute("DELETE FROM document_chunks WHERE document_id = ? AND org_id = ?", [doc_id, db.org_id])
+    await db.execute("DELETE FROM org_documents WHERE id = ? AND org_id = ?", [doc_id, db.org_id])
     await db.commit()
     return {"deleted": True}
 
@@ -171,7 +198,7 @@ async def search_documents(data: dict, db=Depends(get_db)):
     if not query:
         return {"error": "Please provide a search query"}
 
-    org = await db.execute_fetchone("SELECT id FROM organization LIMIT 1")
+    org = await db.execute_fetchone("SELECT id FROM organization WHERE id = ?", (db.org_id,))
     org_id = org["id"] if org else None
 
     chunks = await retrieve_relevant_chunks(
@@ -197,12 +224,12 @@ async def search_documents(data: dict, db=Depends(get_db)):
 @router.get("/stats")
 async def rag_stats(db=Depends(get_db)):
     """Get RAG knowledge base statistics."""
-    docs = await db.execute_fetchone("SELECT COUNT(*) as c FROM org_documents")
-    chunks = await db.execute_fetchone("SELECT COUNT(*) as c FROM document_chunks")
+    docs = await db.execute_fetchone("SELECT COUNT(*) as c FROM org_documents WHERE org_id = ?", (db.org_id,))
+    chunks = await db.execute_fetchone("SELECT COUNT(*) as c FROM document_chunks WHERE org_id = ?", (db.org_id,))
     embedded = await db.execute_fetchone(
-        "SELECT COUNT(*) as c FROM document_chunks WHERE embedding_json IS NOT NULL"
+        "SELECT COUNT(*) as c FROM document_chunks WHERE org_id = ? AND embedding_json IS NOT NULL", (db.org_id,)
     )
-    mode = await db.execute_fetchone("SELECT data_mode FROM organization LIMIT 1")
+    mode = await db.execute_fetchone("SELECT data_mode FROM organization WHERE id = ?", (db.org_id,))
 
     return {
         "documents": docs["c"] if docs else 0,
@@ -210,4 +237,5 @@ async def rag_stats(db=Depends(get_db)):
         "embedded_chunks": embedded["c"] if embedded else 0,
         "data_mode": (mode.get("data_mode") if mode else "demo") or "demo",
         "openai_available": is_openai_available(),
+        "embedding_provider": get_embedding_provider().name,
     }
@@ -1,98 +1,92 @@
 """
 Generate All — API router for end-to-end 7-step generation.
-Provides start, status polling, and retry endpoints.
+Provides start, status polling, retry and cancel endpoints. Runs execute as durable
+"generate_all" jobs (see job_queue.py), so any API worker can report on or cancel them.
 """
 
-import asyncio
 import json
 
 from fastapi import APIRouter, Depends
-from database import get_db, get_db_connection
+from database import get_db
+from serialization import FastJSONRoute
+from job_queue import cancel_job, enqueue, find_active_job
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
-# In-memory tracking of running tasks (by run_id)
-_running_tasks: dict[int, asyncio.Task] = {}
+# A crashed orchestrator is retried once; step failures are already reported per step
+GENERATION_MAX_ATTEMPTS = 2
+
+
+def _job_key(run_id: int) -> str:
+    return f"generate_all:{run_id}"
+
+
+async def _latest_job(db, run_id: int) -> dict | None:
+    row = await db.execute_fetchone(
+        "SELECT id, status, attempts, max_attempts, error_message FROM jobs "
+        "WHERE org_id = ? AND dedupe_key = ? ORDER BY id DESC LIMIT 1",
+        [db.org_id, _job_key(run_id)],
+    )
+    return dict(row) if row else None
+
+
+def _run_response(row: dict, job: dict | None) -> dict:
+    # Parse JSON arrays
+    steps_completed = json.loads(row.get("steps_completed") or "[]")
+    steps_failed = json.loads(row.get("steps_failed") or "[]")
+
+    return {
+        "run_id": row["id"],
+        "org_id": row["org_id"],
+        "status": row["status"],
+        "current_step": row["current_step"],
+        "steps_completed": steps_completed,
+        "steps_failed": steps_failed,
+        "message": row.get("message"),
+        "error_message": row.get("error_message"),
+        "started_at": str(row.get("started_at") or ""),
+        "completed_at": str(row.get("completed_at") or ""),
+        "job": job,
+    }
 
 
 @router.post("/start")
 async def start_generation(data: dict, db=Depends(get_db)):
     """Kick off end-to-end generation for an organization.
-    Body: {"org_id": 1}
-    Returns: {"run_id": 1, "status": "running"}
+    Runs against the caller's organization; a body org_id for another tenant is ignored.
+    Returns: {"run_id": 1, "job_id": 1, "status": "running"}
     """
-    org_id = data.get("org_id")
-    if not org_id:
-        # Default: use the latest org
-        org_row = await db.execute_fetchone("SELECT id FROM organization ORDER BY id DESC LIMIT 1")
-        if not org_row:
-            return {"error": "No organization found. Create one first."}
-        org_id = org_row["id"]
+    org_row = await db.execute_fetchone("SELECT id FROM organization WHERE id = ?", (db.org_id,))
+    if not org_row:
+        return {"error": "No organization found. Create one first."}
+    org_id = org_row["id"]
 
     # Create generation_runs record
     cursor = await db.execute(
-        "INSERT INTO generation_runs (org_id, status, current_step, message) VALUES (?, 'running', 0, 'Starting...')",
+        "INSERT INTO generation_runs (org_id, status, current_step, message) VALUES (?, 'running', 0, 'Queued...')",
         [org_id],
     )
     await db.commit()
     run_id = cursor.lastrowid
 
-    # Launch background task
-    async def _run_orchestrator():
-        conn = await get_db_connection()
-        try:
-            from ai_generate_all import generate_all_steps
-            await generate_all_steps(run_id, org_id, conn)
-        except Exception as e:
-            import logging
-            logging.getLogger(__name__).error("Orchestrator crashed: %s", e)
-            try:
-                await conn.execute(
-                    "UPDATE generation_runs SET status='failed', message=?, error_message=? WHERE id=?",
-                    [f"Crashed: {e}", str(e), run_id],
-                )
-                await conn.commit()
-            except Exception:
-                pass
-        finally:
-            await conn.close()
-            _running_tasks.pop(run_id, None)
-
-    task = asyncio.create_task(_run_orchestrator())
-    _running_tasks[run_id] = task
-
-    return {"run_id": run_id, "status": "running"}
+    job_id = await enqueue(db, "generate_all", {"run_id": run_id}, org_id=org_id,
+                           dedupe_key=_job_key(run_id), max_attempts=GENERATION_MAX_ATTEMPTS)
+
+    return {"run_id": run_id, "job_id": job_id, "status": "running"}
 
 
 @router.get("/status/{run_id}")
 async def get_status(run_id: int, db=Depends(get_db)):
     """Poll for generation progress.
-    Returns current step, completed/failed steps, and message.
+    Returns current step, completed/failed steps, message and the backing job.
     """
     row = await db.execute_fetchone(
-        "SELECT * FROM generation_runs WHERE id = ?", [run_id]
+        "SELECT * FROM generation_runs WHERE id = ? AND org_id = ?", [run_id, db.org_id]
     )
     if not row:
         return {"error": "Run not found"}
 
-    row = dict(row)
-
-    # Parse JSON arrays
-    steps_completed = json.loads(row.get("steps_completed") or "[]")
-    steps_failed = json.loads(row.get("steps_failed") or "[]")
-
-    return {
-        "run_id": row["id"],
-        "org_id": row["org_id"],
-        "status": row["status"],
-        "current_step": row["current_step"],
-        "steps_completed": steps_completed,
-        "steps_failed": steps_failed,
-        "message": row.get("message"),
-        "error_message": row.get("error_message"),
-        "started_at": str(row.get("started_at") or ""),
-        "completed_at": str(row.get("completed_at") or ""),
-    }
+    return _run_response(dict(row), await _latest_job(db, run_id))
 
 
 @router.post("/retry/{run_id}")
@@ -101,66 +95,56 @@ async def retry_generation(run_id: int, db=Depends(get_db)):
     Re-runs the full pipeline (completed steps are idempotent and will be skipped).
     """
     row = await db.execute_fetchone(
-        "SELECT * FROM generation_runs WHERE id = ?", [run_id]
+        "SELECT * FROM generation_runs WHERE id = ? AND org_id = ?", [run_id, db.org_id]
     )
     if not row:
         return {"error": "Run not found"}
 
-    row = dict(row)
-    org_id = row["org_id"]
-
-    # Check if already running
-    if run_id in _running_tasks and not _running_tasks[run_id].done():
-        return {"error": "Generation is already running", "run_id": run_id}
+    # Check if already queued or running on any worker
+    active = await find_active_job(db, _job_key(run_id))
+    if active:
+        return {"error": "Generation is already running", "run_id": run_id, "job_id": active["id"]}
 
     # Reset status
     await db.execute(
-        "UPDATE generation_runs SET status='running', message='Retrying...', error_message=NULL, completed_at=NULL WHERE id=?",
-        [run_id],
+        "UPDATE generation_runs SET status='running', message='Retrying...', error_message=NULL, completed_at=NULL WHERE id=? AND org_id = ?",
+        [run_id, db.org_id],
     )
     await db.commit()
 
-    # Re-launch
-    async def _run_orchestrator():
-        conn = await get_db_connection()
-        try:
-            from ai_generate_all import generate_all_steps
-            await generate_all_steps(run_id, org_id, conn)
-        except Exception as e:
-            import logging
-            logging.getLogger(__name__).error("Retry orchestrator crashed: %s", e)
-        finally:
-            await conn.close()
-            _running_tasks.pop(run_id, None)
+    job_id = await enqueue(db, "generate_all", {"run_id": run_id}, dedupe_key=_job_key(run_id),
+                           max_attempts=GENERATION_MAX_ATTEMPTS)
+
+    return {"run_id": run_id, "job_id": job_id, "status": "running", "message": "Retrying generation..."}
+
 
-    task = asyncio.create_task(_run_orchestrator())
-    _running_tasks[run_id] = task
+@router.post("/cancel/{run_id}")
+async def cancel_generation(run_id: int, db=Depends(get_db)):
+    """Cancel a queued or running generation. Running jobs stop at the worker's next heartbeat."""
+    active = await find_active_job(db, _job_key(run_id))
+    if not active:
+        return {"error": "Generation is not running", "run_id": run_id}
 
-    return {"run_id": run_id, "status": "running", "message": "Retrying generation..."}
+    job_status = await cancel_job(db, active["id"])
+    if job_status == "cancelled":
+        # Never started, so the handler won't record it
+        await db.execute(
+            "UPDATE generation_runs SET status='failed', message='Cancelled', completed_at=CURRENT_TIMESTAMP "
+            "WHERE id=? AND org_id = ?",
+            [run_id, db.org_id],
+        )
+        await db.commit()
+    return {"run_id": run_id, "job_id": active["id"], "job_status": job_status, "cancel_requested": True}
 
 
 @router.get("/latest")
 async def get_latest_run(db=Depends(get_db)):
     """Get the most recent generation run."""
     row = await db.execute_fetchone(
-        "SELECT * FROM generation_runs ORDER BY id DESC LIMIT 1"
+        "SELECT * FROM generation_runs WHERE org_id = ? ORDER BY id DESC LIMIT 1", (db.org_id,)
     )
     if not row:
         return None
 
     row = dict(row)
-    steps_completed = json.loads(row.get("steps_completed") or "[]")
-    steps_failed = json.loads(row.get("steps_failed") or "[]")
-
-    return {
-        "run_id": row["id"],
-        "org_id": row["org_id"],
-        "status": row["status"],
-        "current_step": row["current_step"],
-        "steps_completed": steps_completed,
-        "steps_failed": steps_failed,
-        "message": row.get("message"),
-        "error_message": row.get("error_message"),
-        "started_at": str(row.get("started_at") or ""),
-        "completed_at": str(row.get("completed_at") or ""),
-    }
+    return _run_response(row, await _latest_job(db, row["id"]))
@@ -0,0 +1,47 @@
+"""
+Jobs — API router for background job status, results and cancellation.
+Backs the `?async=1` mode of the AI generate endpoints (see ai_jobs.py).
+"""
+
+from fastapi import APIRouter, Depends
+from database import get_db
+from serialization import FastJSONRoute
+from job_queue import cancel_job, get_job, serialize_job
+
+router = APIRouter(route_class=FastJSONRoute)
+
+JOB_LIST_LIMIT = 50
+
+
+@router.get("")
+async def list_jobs(kind: str | None = None, status: str | None = None, db=Depends(get_db)):
+    """Recent jobs for the caller's organization, newest first."""
+    query = "SELECT * FROM jobs WHERE org_id = ?"
+    params = [db.org_id]
+    if kind:
+        query += " AND kind = ?"
+        params.append(kind)
+    if status:
+        query += " AND status = ?"
+        params.append(status)
+    query += f" ORDER BY id DESC LIMIT {JOB_LIST_LIMIT}"
+    rows = await db.execute_fetchall(query, params)
+    return [serialize_job(r) for r in rows]
+
+
+@router.get("/{job_id}")
+async def get_job_status(job_id: int, db=Depends(get_db)):
+    """Poll a job. `result` holds the endpoint's response once status is "succeeded"."""
+    job = await get_job(db, job_id)
+    if not job:
+        return {"error": "Job not found"}
+    return serialize_job(job)
+
+
+@router.post("/{job_id}/cancel")
+async def cancel(job_id: int, db=Depends(get_db)):
+    """Cancel a queued or running job. Running jobs stop at the worker's next heartbeat."""
+    status = await cancel_job(db, job_id)
+    if status is None:
+        return {"error": "Job not found"}
+    return {"job_id": job_id, "status": status, "cancel_requested": status in ("queued", "running", "cancelled")}
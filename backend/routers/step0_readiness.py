@@ -4,12 +4,15 @@ Step 0: Organizational Readiness Assessment & Digital Maturity Model (Enhancemen
 
 import json
 import logging
+from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from database import get_db
+from serialization import FastJSONRoute
+from ai_jobs import enqueue_generator
 from ai_research import is_openai_available, extract_list, ensure_str
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 logger = logging.getLogger(__name__)
 
 READINESS_DIMENSIONS = [
@@ -29,7 +32,7 @@ MATURITY_DIMENSIONS = [
 
 @router.get("/readiness")
 async def get_readiness(db=Depends(get_db)):
-    org = await db.execute_fetchone("SELECT id FROM organization LIMIT 1")
+    org = await db.execute_fetchone("SELECT id FROM organization WHERE id = ?", (db.org_id,))
     if not org:
         return []
     rows = await db.execute_fetchall(
@@ -40,7 +43,7 @@ async def get_readiness(db=Depends(get_db)):
 
 @router.post("/readiness")
 async def upsert_readiness(data: dict, db=Depends(get_db)):
-    org = await db.execute_fetchone("SELECT id FROM organization LIMIT 1")
+    org = await db.execute_fetchone("SELECT id FROM organization WHERE id = ?", (db.org_id,))
     if not org:
         return {"error": "No organization found"}
     org_id = org["id"]
@@ -67,9 +70,11 @@ async def upsert_readiness(data: dict, db=Depends(get_db)):
 
 
 @router.post("/readiness/ai-generate")
-async def ai_generate_readiness(db=Depends(get_db)):
+async def ai_generate_readiness(db=Depends(get_db), run_async: Annotated[bool, Query(alias="async")] = False):
     """AI-generate readiness assessment for all 8 dimensions."""
-    org = await db.execute_fetchone("SELECT * FROM organization LIMIT 1")
+    if run_async:
+        return await enqueue_generator(db, "readiness")
+    org = await db.execute_fetchone("SELECT * FROM organization WHERE id = ?", (db.org_id,))
     if not org:
         return {"error": "No organization found"}
     org_id = org["id"]
@@ -135,7 +140,7 @@ Return JSON array: [{{"dimension": "...", "score": N, "evidence": "...", "confid
 
 @router.get("/maturity")
 async def get_maturity(db=Depends(get_db)):
-    org = await db.execute_fetchone("SELECT id FROM organization LIMIT 1")
+    org = await db.execute_fetchone("SELECT id FROM organization WHERE id = ?", (db.org_id,))
     if not org:
         return []
     rows = await db.execute_fetchall(
@@ -146,7 +151,7 @@ async def get_maturity(db=Depends(get_db)):
 
 @router.post("/maturity")
 async def upsert_maturity(data: dict, db=Depends(get_db)):
-    org = await db.execute_fetchone("SELECT id FROM organization LIMIT 1")
+    org = await db.execute_fetchone("SELECT id FROM organization WHERE id = ?", (db.org_id,))
     if not org:
         return {"error": "No organization found"}
     org_id = org["id"]
@@ -175,9 +180,11 @@ async def upsert_maturity(data: dict, db=Depends(get_db)):
 
 
 @router.post("/maturity/ai-generate")
-async def ai_generate_maturity(db=Depends(get_db)):
+async def ai_generate_maturity(db=Depends(get_db), run_async: Annotated[bool, Query(alias="async")] = False):
     """AI-generate digital maturity assessment."""
-    org = await db.execute_fetchone("SELECT * FROM organization LIMIT 1")
+    if run_async:
+        return await enqueue_generator(db, "maturity")
+    org = await db.execute_fetchone("SELECT * FROM organization WHERE id = ?", (db.org_id,))
     if not org:
         return {"error": "No organization found"}
     org_id = org["id"]
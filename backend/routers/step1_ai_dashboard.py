@@ -1,11 +1,12 @@
 """
-Step 1 AI Dashboard Router — 13 endpoints for AI-powered dashboard capabilities.
+Step 1 AI Dashboard Router — 14 endpoints for AI-powered dashboard capabilities.
 """
 
 import json
 
 from fastapi import APIRouter, Depends
 from database import get_db
+from serialization import FastJSONRoute
 from ai_research import is_openai_available
 from ai_dashboard import (
     gather_dashboard_context,
@@ -23,8 +24,10 @@ from ai_dashboard import (
     ai_whatif_scenario,
     ai_generate_report,
 )
+from scenario_engine import SUPPORTED_SCENARIOS, load_baseline, simulate, to_impact_analysis
+from nlq_engine import answer_question, embed_question, lookup_cached_answer, get_cache_stats
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 
 # ─── 1. AI Financial Analysis ────────────────────────────────────────────────
@@ -94,12 +97,13 @@ async def save_discovered_competitors(data: dict, db=Depends(get_db)):
             continue
         # Check if already exists
         existing = await db.execute_fetchall(
-            "SELECT id FROM competitors WHERE name = ?", (name,)
+            "SELECT id FROM competitors WHERE org_id = ? AND name = ?", (db.org_id, name)
         )
         if not existing:
             await db.execute(
-                "INSERT INTO competitors (name, ticker, strengths, data_source) VALUES (?, ?, ?, ?)",
+                "INSERT INTO competitors (org_id, name, ticker, strengths, data_source) VALUES (?, ?, ?, ?, ?)",
                 (
+                    db.org_id,
                     name,
                     comp.get("ticker", ""),
                     comp.get("rationale", ""),
@@ -308,21 +312,42 @@ async def natural_language_query(data: dict, db=Depends(get_db)):
     if not question:
         return {"error": "Please provide a question."}
 
-    ctx = await gather_dashboard_context(db)
-    if not ctx["organization"]:
+    org = await db.execute_fetchone("SELECT id FROM organization WHERE id = ?", (db.org_id,))
+    if not org:
         return {"error": "No organization set up. Complete Org Setup first."}
 
     if not is_openai_available():
         return {"ai_powered": False, "message": "OpenAI not configured. Set OPENAI_API_KEY environment variable."}
 
-    result = await ai_natural_language_query(question, ctx)
+    cached, embedding = await lookup_cached_answer(db, question)
+    if cached:
+        return {**cached, "ai_powered": True, "cached": True}
+
+    # Text-to-SQL first; only fall back to the full-context prompt if it can't answer
+    result = await answer_question(question, db.org_id)
+    if not result:
+        ctx = await gather_dashboard_context(db)
+        result = await ai_natural_language_query(question, ctx)
+        if result:
+            result["engine"] = "full_context"
     if result:
+        if embedding is None:
+            # The lookup skipped embedding on a (stale) exact match; store one for later semantic hits
+            embedding = await embed_question(question)
         # Save to history
         try:
             tables_queried = ",".join(result.get("data_tables_queried", []))
             await db.execute(
-                "INSERT INTO nlq_history (question, answer_json, data_tables_queried) VALUES (?, ?, ?)",
-                (question, json.dumps(result, default=str), tables_queried),
+                "INSERT INTO nlq_history (org_id, question, answer_json, data_tables_queried, "
+                "question_embedding_json, data_version) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    db.org_id,
+                    question,
+                    json.dumps(result, default=str),
+                    tables_queried,
+                    json.dumps(embedding) if embedding else None,
+                    result.get("data_version"),
+                ),
             )
             await db.commit()
         except Exception:
@@ -344,6 +369,35 @@ async def run_whatif_scenario(data: dict, db=Depends(get_db)):
     if not parameters:
         return {"error": "Please provide scenario parameters."}
 
+    # Quantitative scenarios are simulated locally; the LLM (optional) only narrates
+    simulation = None
+    if scenario_type in SUPPORTED_SCENARIOS:
+        org = await db.execute_fetchone("SELECT id FROM organization WHERE id = ?", (db.org_id,))
+        if not org:
+            return {"error": "No organization set up. Complete Org Setup first."}
+        baseline = await load_baseline(db)
+        try:
+            simulation = simulate(scenario_type, parameters, baseline, draws=data.get("draws", 20000))
+        except ValueError as e:
+            return {"error": str(e)}
+        if not data.get("narrate", True) or not is_openai_available():
+            result = {
+                "scenario_summary": f"{scenario_name}: {simulation['draws']:,}-draw Monte Carlo simulation",
+                "impact_analysis": to_impact_analysis(simulation),
+                "simulation": simulation,
+                "risks": [],
+                "opportunities": [],
+            }
+            try:
+                await db.execute(
+                    "INSERT INTO ai_scenarios (org_id, scenario_name, scenario_type, parameters_json, result_json) VALUES (?, ?, ?, ?, ?)",
+                    (db.org_id, scenario_name, scenario_type, json.dumps(parameters, default=str), json.dumps(result, default=str)),
+                )
+                await db.commit()
+            except Exception:
+                pass
+            return {**result, "ai_powered": False, "quantitative": True}
+
     ctx = await gather_dashboard_context(db)
     if not ctx["organization"]:
         return {"error": "No organization set up. Complete Org Setup first."}
@@ -358,14 +412,27 @@ async def run_whatif_scenario(data: dict, db=Depends(get_db)):
     }
 
     result = await ai_whatif_scenario(
-        scenario_params, ctx["organization"], ctx["competitors"], ctx["revenue_trends"]
+        scenario_params, ctx["organization"], ctx["competitors"], ctx["revenue_trends"],
+        simulation=simulation,
     )
+    if result and simulation:
+        result["simulation"] = simulation
+        result["quantitative"] = True
+    elif simulation:
+        # Narration failed — the computed numbers still stand on their own
+        return {
+            "scenario_summary": f"{scenario_name}: {simulation['draws']:,}-draw Monte Carlo simulation",
+            "impact_analysis": to_impact_analysis(simulation),
+            "simulation": simulation,
+            "ai_powered": False,
+            "quantitative": True,
+        }
     if result:
         # Save scenario
         try:
             await db.execute(
-                "INSERT INTO ai_scenarios (scenario_name, scenario_type, parameters_json, result_json) VALUES (?, ?, ?, ?)",
-                (scenario_name, scenario_type, json.dumps(parameters, default=str), json.dumps(result, default=str)),
+                "INSERT INTO ai_scenarios (org_id, scenario_name, scenario_type, parameters_json, result_json) VALUES (?, ?, ?, ?, ?)",
+                (db.org_id, scenario_name, scenario_type, json.dumps(parameters, default=str), json.dumps(result, default=str)),
             )
             await db.commit()
         except Exception:
@@ -381,7 +448,7 @@ async def run_whatif_scenario(data: dict, db=Depends(get_db)):
 @router.get("/ai/scenarios")
 async def list_scenarios(db=Depends(get_db)):
     rows = await db.execute_fetchall(
-        "SELECT * FROM ai_scenarios ORDER BY created_at DESC LIMIT 50"
+        "SELECT * FROM ai_scenarios WHERE org_id = ? ORDER BY created_at DESC LIMIT 50", (db.org_id,)
     )
     results = []
     for r in rows:
@@ -430,14 +497,30 @@ async def generate_report(data: dict, db=Depends(get_db)):
 @router.get("/ai/query-history")
 async def get_query_history(db=Depends(get_db)):
     rows = await db.execute_fetchall(
-        "SELECT * FROM nlq_history ORDER BY created_at DESC LIMIT 50"
+        "SELECT * FROM nlq_history WHERE org_id = ? ORDER BY created_at DESC LIMIT 50", (db.org_id,)
     )
     results = []
     for r in rows:
         row_dict = dict(r)
+        row_dict.pop("question_embedding_json", None)
         try:
             row_dict["answer"] = json.loads(row_dict.get("answer_json", "{}"))
         except Exception:
             row_dict["answer"] = {}
         results.append(row_dict)
     return results
+
+
+# ─── 14. NLQ Answer Cache Metrics ────────────────────────────────────────────
+
+
+@router.get("/ai/query-cache/stats")
+async def get_query_cache_stats(db=Depends(get_db)):
+    stats = get_cache_stats()
+    row = await db.execute_fetchone(
+        "SELECT COUNT(*) AS cached_answers, COALESCE(SUM(hit_count), 0) AS total_hits "
+        "FROM nlq_history WHERE org_id = ? AND data_version IS NOT NULL", (db.org_id,)
+    )
+    stats["cached_answers"] = row["cached_answers"] if row else 0
+    stats["total_hits_all_time"] = row["total_hits"] if row else 0
+    return stats
@@ -1,15 +1,22 @@
+import asyncio
 import csv
+import hashlib
 import io
 import json
 import logging
 import os
+import time
 from datetime import datetime
 
 import httpx
 from bs4 import BeautifulSoup
-from fastapi import APIRouter, Depends, UploadFile, File
+from fastapi import APIRouter, Depends, Request, UploadFile, File
 
-from database import get_db
+from database import get_db, timestamp_param
+from serialization import FastJSONRoute
+from response_cache import cached_response
+from pagination import ListQuery
+from tenancy import attach_user_to_org
 from data_ingestion import (
     search_ticker,
     fetch_company_profile,
@@ -19,15 +26,11 @@ from data_ingestion import (
     fetch_finnhub_metrics,
 )
 from ai_research import is_openai_available
+from web_search import USER_AGENT, fetch_page
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 logger = logging.getLogger(__name__)
 
-USER_AGENT = (
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-)
-
 FINANCIAL_EXTRACTION_PROMPT = """Extract financial and business data from this content.
 Return ONLY valid JSON with this structure:
 {
@@ -110,18 +113,18 @@ def _detect_table_type(columns: list[str]) -> tuple[str | None, dict]:
 async def _get_or_create_bu(db, bu_name: str) -> int:
     """Get or create a business unit by name, return its ID."""
     existing = await db.execute_fetchall(
-        "SELECT id FROM business_units WHERE name = ?", (bu_name,)
+        "SELECT id FROM business_units WHERE org_id = ? AND name = ?", (db.org_id, bu_name)
     )
     if existing:
         return existing[0]["id"]
     cursor = await db.execute(
-        "INSERT INTO business_units (name, description) VALUES (?, ?)",
-        (bu_name, f"Imported: {bu_name}"),
+        "INSERT INTO business_units (org_id, name, description) VALUES (?, ?, ?)",
+        (db.org_id, bu_name, f"Imported: {bu_name}"),
     )
     return cursor.lastrowid
 
 
-async def _insert_extracted_data(data: dict, db, data_source: str = "upload") -> dict:
+async def _insert_extracted_data(data: dict, db, data_source: str = "upload", commit: bool = True) -> dict:
     """Insert extracted financial data into the 4 Step 1 tables.
     Checks for duplicates before inserting. Returns summary counts."""
     summary = {"business_units": 0, "revenue_splits": 0, "ops_efficiency": 0, "competitors": 0}
@@ -133,14 +136,14 @@ async def _insert_extracted_data(data: dict, db, data_source: str = "upload") ->
         if not name:
             continue
         existing = await db.execute_fetchall(
-            "SELECT id FROM business_units WHERE name = ?", (name,)
+            "SELECT id FROM business_units WHERE org_id = ? AND name = ?", (db.org_id, name)
         )
         if existing:
             bu_name_to_id[name] = existing[0]["id"]
         else:
             cursor = await db.execute(
-                "INSERT INTO business_units (name, description) VALUES (?, ?)",
-                (name, bu.get("description", "")),
+                "INSERT INTO business_units (org_id, name, description) VALUES (?, ?, ?)",
+                (db.org_id, name, bu.get("description", "")),
             )
             bu_name_to_id[name] = cursor.lastrowid
             summary["business_units"] += 1
@@ -149,12 +152,12 @@ async def _insert_extracted_data(data: dict, db, data_source: str = "upload") ->
     async def resolve_bu(bu_name):
         if not bu_name:
             # Use first existing BU or create a default
-            rows = await db.execute_fetchall("SELECT id FROM business_units LIMIT 1")
+            rows = await db.execute_fetchall("SELECT id FROM business_units WHERE org_id = ? LIMIT 1", (db.org_id,))
             if rows:
                 return rows[0]["id"]
             cursor = await db.execute(
-                "INSERT INTO business_units (name, description) VALUES (?, ?)",
-                ("Default", "Auto-created for data import"),
+                "INSERT INTO business_units (org_id, name, description) VALUES (?, ?, ?)",
+                (db.org_id, "Default", "Auto-created for data import"),
             )
             return cursor.lastrowid
         if bu_name in bu_name_to_id:
@@ -175,13 +178,13 @@ async def _insert_extracted_data(data: dict, db, data_source: str = "upload") ->
         except (ValueError, TypeError):
             continue
         existing = await db.execute_fetchall(
-            "SELECT id FROM revenue_splits WHERE business_unit_id=? AND period=? AND dimension=? AND dimension_value=?",
-            (bu_id, period, dimension, dim_value),
+            "SELECT id FROM revenue_splits WHERE org_id = ? AND business_unit_id=? AND period=? AND dimension=? AND dimension_value=?",
+            (db.org_id, bu_id, period, dimension, dim_value),
         )
         if not existing:
             await db.execute(
-                "INSERT INTO revenue_splits (business_unit_id, dimension, dimension_value, revenue, period) VALUES (?, ?, ?, ?, ?)",
-                (bu_id, dimension, dim_value, revenue, period),
+                "INSERT INTO revenue_splits (org_id, business_unit_id, dimension, dimension_value, revenue, period) VALUES (?, ?, ?, ?, ?, ?)",
+                (db.org_id, bu_id, dimension, dim_value, revenue, period),
             )
             summary["revenue_splits"] += 1
 
@@ -204,13 +207,13 @@ async def _insert_extracted_data(data: dict, db, data_source: str = "upload") ->
             except (ValueError, TypeError):
                 target_value = None
         existing = await db.execute_fetchall(
-            "SELECT id FROM ops_efficiency WHERE business_unit_id=? AND metric_name=? AND period=?",
-            (bu_id, metric_name, period),
+            "SELECT id FROM ops_efficiency WHERE org_id = ? AND business_unit_id=? AND metric_name=? AND period=?",
+            (db.org_id, bu_id, metric_name, period),
         )
         if not existing:
             await db.execute(
-                "INSERT INTO ops_efficiency (business_unit_id, metric_name, metric_value, target_value, period) VALUES (?, ?, ?, ?, ?)",
-                (bu_id, metric_name, metric_value, target_value, period),
+                "INSERT INTO ops_efficiency (org_id, business_unit_id, metric_name, metric_value, target_value, period) VALUES (?, ?, ?, ?, ?, ?)",
+                (db.org_id, bu_id, metric_name, metric_value, target_value, period),
             )
             summary["ops_efficiency"] += 1
 
@@ -220,7 +223,7 @@ async def _insert_extracted_data(data: dict, db, data_source: str = "upload") ->
         if not name:
             continue
         existing = await db.execute_fetchall(
-            "SELECT id FROM competitors WHERE name = ?", (name,)
+            "SELECT id FROM competitors WHERE org_id = ? AND name = ?", (db.org_id, name)
         )
         if not existing:
             market_share = comp.get("market_share")
@@ -230,29 +233,18 @@ async def _insert_extracted_data(data: dict, db, data_source: str = "upload") ->
                 except (ValueError, TypeError):
                     market_share = None
             await db.execute(
-                "INSERT INTO competitors (name, market_share, strengths, weaknesses, data_source) VALUES (?, ?, ?, ?, ?)",
-                (name, market_share, comp.get("strengths"), comp.get("weaknesses"), data_source),
+                "INSERT INTO competitors (org_id, name, market_share, strengths, weaknesses, data_source) VALUES (?, ?, ?, ?, ?, ?)",
+                (db.org_id, name, market_share, comp.get("strengths"), comp.get("weaknesses"), data_source),
             )
             summary["competitors"] += 1
 
-    await db.commit()
+    if commit:
+        await db.commit()
     return summary
 
 
-async def _extract_financial_from_url(url: str) -> dict:
-    """Fetch a URL and use AI to extract financial data."""
-    try:
-        async with httpx.AsyncClient(
-            timeout=30, follow_redirects=True, verify=True
-        ) as client:
-            resp = await client.get(url, headers={"User-Agent": USER_AGENT})
-            resp.raise_for_status()
-            html = resp.text
-    except httpx.HTTPStatusError as e:
-        return {"error": f"HTTP {e.response.status_code} fetching URL: {url}"}
-    except Exception as e:
-        return {"error": f"Failed to fetch URL: {e}"}
-
+def _page_text(html: str) -> str:
+    """Readable text of a page as sent to the extraction model (first 8,000 chars)."""
     soup = BeautifulSoup(html, "html.parser")
     for tag in soup(["script", "style", "nav", "footer", "header"]):
         tag.decompose()
@@ -266,11 +258,14 @@ async def _extract_financial_from_url(url: str) -> dict:
     extracted_text = "\n".join(text_parts)
     if not extracted_text.strip():
         extracted_text = soup.get_text(separator="\n", strip=True)
+    return extracted_text[:8000]
+
+
+async def _extract_financial_from_text(extracted_text: str) -> dict:
+    """Use AI to extract financial data from page text."""
     if not extracted_text.strip():
         return {"error": "No text content found at URL"}
 
-    extracted_text = extracted_text[:8000]
-
     if not is_openai_available():
         return {
             "error": "OpenAI API key not configured. Cannot extract financial data from URLs.",
@@ -301,30 +296,201 @@ async def _extract_financial_from_url(url: str) -> dict:
         return {"error": f"AI extraction error: {e}"}
 
 
+async def _extract_financial_from_url(url: str) -> dict:
+    """Fetch a URL (revalidating any cached copy) and use AI to extract financial data."""
+    try:
+        html = (await fetch_page(url))["text"]
+    except httpx.HTTPStatusError as e:
+        return {"error": f"HTTP {e.response.status_code} fetching URL: {url}"}
+    except Exception as e:
+        return {"error": f"Failed to fetch URL: {e}"}
+    return await _extract_financial_from_text(_page_text(html))
+
+
+# --- Saved URL refresh ---
+
+URL_FETCH_CONCURRENCY = 4
+
+
+def _ms(started: float) -> int:
+    return round((time.perf_counter() - started) * 1000)
+
+
+async def _fetch_saved_url(client: httpx.AsyncClient, url_row: dict) -> dict:
+    """Fetch one step1_data_urls row and extract its data unless the page is unchanged.
+
+    Sends the stored ETag / Last-Modified when the last fetch succeeded; a 304, or page text
+    hashing to the stored content_hash, skips the LLM extraction. Touches no database, so
+    rows can be fetched concurrently. Returns {"status": "extracted" | "unchanged" | "error",
+    "result", "etag", "last_modified", "content_hash", "fetch_ms", "extract_ms"}.
+    """
+    outcome = {"status": "error", "result": None, "etag": url_row.get("etag"),
+               "last_modified": url_row.get("last_modified"), "content_hash": url_row.get("content_hash"),
+               "fetch_ms": None, "extract_ms": None}
+    revalidate = url_row.get("status") == "success" and url_row.get("content_hash")
+    headers = {"User-Agent": USER_AGENT}
+    if revalidate and url_row.get("etag"):
+        headers["If-None-Match"] = url_row["etag"]
+    if revalidate and url_row.get("last_modified"):
+        headers["If-Modified-Since"] = url_row["last_modified"]
+
+    started = time.perf_counter()
+    try:
+        resp = await client.get(url_row["url"], headers=headers)
+        if resp.status_code == 304 and revalidate:
+            outcome.update(status="unchanged", fetch_ms=_ms(started))
+            return outcome
+        resp.raise_for_status()
+        html = resp.text
+    except httpx.HTTPStatusError as e:
+        outcome.update(result={"error": f"HTTP {e.response.status_code} fetching URL: {url_row['url']}"},
+                       fetch_ms=_ms(started))
+        return outcome
+    except Exception as e:
+        outcome.update(result={"error": f"Failed to fetch URL: {e}"}, fetch_ms=_ms(started))
+        return outcome
+    outcome["fetch_ms"] = _ms(started)
+    outcome["etag"], outcome["last_modified"] = resp.headers.get("etag"), resp.headers.get("last-modified")
+
+    text = _page_text(html)
+    digest = hashlib.sha256(text.encode()).hexdigest()
+    if revalidate and digest == url_row["content_hash"]:
+        outcome["status"] = "unchanged"
+        return outcome
+
+    started = time.perf_counter()
+    result = await _extract_financial_from_text(text)
+    outcome["extract_ms"] = _ms(started)
+    if "error" in result and "business_units" not in result:
+        outcome["result"] = result
+        return outcome
+    outcome.update(status="extracted", result=result, content_hash=digest)
+    return outcome
+
+
+async def _fetch_saved_urls(url_rows: list[dict]) -> list[dict]:
+    """_fetch_saved_url for each row, URL_FETCH_CONCURRENCY at a time."""
+    semaphore = asyncio.Semaphore(URL_FETCH_CONCURRENCY)
+    async with httpx.AsyncClient(timeout=30, follow_redirects=True) as client:
+        async def fetch(url_row):
+            async with semaphore:
+                return await _fetch_saved_url(client, url_row)
+
+        return await asyncio.gather(*(fetch(row) for row in url_rows))
+
+
+async def _refresh_saved_urls(db, url_rows: list[dict]) -> list[dict]:
+    """Fetch saved URLs concurrently, then record each outcome in order.
+
+    Returns one {"url_id", "url", "status", "unchanged", "summary" | "error", "timings"} per
+    row; status is "success" or "error".
+    """
+    return await _write_saved_urls(db, url_rows, await _fetch_saved_urls(url_rows))
+
+
+async def _write_saved_urls(db, url_rows: list[dict], outcomes: list[dict], commit: bool = True) -> list[dict]:
+    results = []
+    for url_row, outcome in zip(url_rows, outcomes):
+        url_id, url = url_row["id"], url_row["url"]
+        now = datetime.utcnow().isoformat()
+        timings = {"fetch_ms": outcome["fetch_ms"], "extract_ms": outcome["extract_ms"]}
+        entry = {"url_id": url_id, "url": url, "unchanged": outcome["status"] == "unchanged", "timings": timings}
+        if outcome["status"] == "error":
+            error = outcome["result"]["error"]
+            await db.execute(
+                "UPDATE step1_data_urls SET status='error', error_message=?, last_fetched_at=?, fetch_ms=?, "
+                "extract_ms=? WHERE id=? AND org_id = ?",
+                (error, now, outcome["fetch_ms"], outcome["extract_ms"], url_id, db.org_id),
+            )
+            results.append({**entry, "status": "error", "error": error})
+            continue
+
+        if outcome["status"] == "unchanged":
+            summary = json.loads(url_row["last_result_json"]) if url_row.get("last_result_json") else None
+        else:
+            summary = await _insert_extracted_data(outcome["result"], db, f"url:{url}", commit=False)
+        await db.execute(
+            "UPDATE step1_data_urls SET status='success', error_message=NULL, last_fetched_at=?, last_result_json=?, "
+            "etag=?, last_modified=?, content_hash=?, fetch_ms=?, extract_ms=? WHERE id=? AND org_id = ?",
+            (now, json.dumps(summary), outcome["etag"], outcome["last_modified"], outcome["content_hash"],
+             outcome["fetch_ms"], outcome["extract_ms"], url_id, db.org_id),
+        )
+        results.append({**entry, "status": "success", "summary": summary})
+    if commit:
+        await db.commit()
+    return results
+
+
 async def _run_api_ingestion(org: dict, db) -> dict:
     """Core API ingestion logic (Finnhub primary + Alpha Vantage supplement).
     Uses Finnhub /stock/metric as the primary data source (60 calls/min)
     and Alpha Vantage INCOME_STATEMENT + OVERVIEW as supplements (25 calls/day)."""
+    return await _write_api_data(org, await _fetch_api_data(org), db)
+
+
+async def _fetch_api_data(org: dict) -> dict:
+    """Every Finnhub / Alpha Vantage call for the org, its named competitors and its peers.
+    Touches no database; returns {"skipped": True, "message": ...} when there is nothing to fetch."""
     from data_ingestion import FINNHUB_API_KEY, ALPHA_VANTAGE_API_KEY
 
     org_name = org["name"]
-    summary = {"ticker": None, "profile": False, "financials": 0, "ops_metrics": 0, "competitors": 0}
 
     # Check if API keys are configured
     if not FINNHUB_API_KEY and not ALPHA_VANTAGE_API_KEY:
-        return {"skipped": True, "message": "Finnhub/Alpha Vantage API keys not configured. You can still add data manually, via file upload, or URL extraction.", "summary": summary}
+        return {"skipped": True, "message": "Finnhub/Alpha Vantage API keys not configured. You can still add data manually, via file upload, or URL extraction."}
 
-    # 1. Search for ticker
+    # Search for ticker
     logger.info("Searching ticker for '%s'", org_name)
     ticker = await search_ticker(org_name)
     if not ticker:
         logger.warning("No ticker found for '%s'", org_name)
-        return {"skipped": True, "message": f"Could not find stock ticker for '{org_name}'. You can still add data manually, via file upload, or URL extraction.", "summary": summary}
-    summary["ticker"] = ticker
+        return {"skipped": True, "message": f"Could not find stock ticker for '{org_name}'. You can still add data manually, via file upload, or URL extraction."}
     logger.info("Found ticker %s for '%s'", ticker, org_name)
 
-    # 2. Fetch company profile and update organization
-    profile = await fetch_company_profile(ticker)
+    data = {"ticker": ticker, "profile": await fetch_company_profile(ticker)}
+    logger.info("Fetching Finnhub metrics for %s", ticker)
+    data["fh_metrics"] = await fetch_finnhub_metrics(ticker)
+    logger.info("Fetching Alpha Vantage financials for %s", ticker)
+    data["financials"] = await fetch_financials(ticker)
+    logger.info("Fetching Alpha Vantage overview for %s", ticker)
+    data["overview"] = await fetch_company_overview(ticker)
+
+    # Named competitors with full financial data
+    data["competitors"] = []
+    for comp_name in (org.get("competitor_1_name"), org.get("competitor_2_name")):
+        if not comp_name:
+            continue
+        comp_ticker = await search_ticker(comp_name)
+        if not comp_ticker:
+            logger.warning("No ticker found for competitor '%s'", comp_name)
+            continue
+        data["competitors"].append({
+            "name": comp_name,
+            "ticker": comp_ticker,
+            "profile": await fetch_company_profile(comp_ticker),
+            "fh_metrics": await fetch_finnhub_metrics(comp_ticker),
+            "overview": await fetch_company_overview(comp_ticker),
+            "financials": await fetch_financials(comp_ticker),
+        })
+
+    # Peers for additional context
+    data["peers"] = []
+    for peer_ticker in (await fetch_peers(ticker))[:4]:
+        data["peers"].append((peer_ticker, await fetch_company_profile(peer_ticker)))
+    return data
+
+
+async def _write_api_data(org: dict, data: dict, db, commit: bool = True) -> dict:
+    """Insert data returned by _fetch_api_data into the Step 1 tables."""
+    org_name = org["name"]
+    summary = {"ticker": None, "profile": False, "financials": 0, "ops_metrics": 0, "competitors": 0}
+    if data.get("skipped"):
+        return {**data, "summary": summary}
+    ticker = data["ticker"]
+    summary["ticker"] = ticker
+
+    # 1. Update organization from the company profile
+    profile = data["profile"]
     if profile:
         await db.execute(
             "UPDATE organization SET ticker=?, sub_industry=?, market_cap=?, country=?, currency=? WHERE id=?",
@@ -336,30 +502,28 @@ async def _run_api_ingestion(org: dict, db) -> dict:
     else:
         logger.warning("No profile returned for %s", ticker)
 
-    # 3. Ensure a business unit exists for this company
+    # 2. Ensure a business unit exists for this company
     existing_bu = await db.execute_fetchall(
-        "SELECT id FROM business_units WHERE name = ?", (org_name,)
+        "SELECT id FROM business_units WHERE org_id = ? AND name = ?", (db.org_id, org_name)
     )
     if existing_bu:
         bu_id = existing_bu[0]["id"]
     else:
         cursor = await db.execute(
-            "INSERT INTO business_units (name, description) VALUES (?, ?)",
-            (org_name, f"Primary business unit for {org_name}"),
+            "INSERT INTO business_units (org_id, name, description) VALUES (?, ?, ?)",
+            (db.org_id, org_name, f"Primary business unit for {org_name}"),
         )
         bu_id = cursor.lastrowid
 
-    # 4. Fetch Finnhub metrics (PRIMARY source — 60 calls/min, always available)
-    logger.info("Fetching Finnhub metrics for %s", ticker)
-    fh_metrics = await fetch_finnhub_metrics(ticker)
+    # 3. Finnhub metrics (PRIMARY source — 60 calls/min, always available)
+    fh_metrics = data["fh_metrics"]
     if fh_metrics:
         logger.info("Finnhub metrics available for %s", ticker)
     else:
         logger.warning("Finnhub metrics unavailable for %s", ticker)
 
-    # 5. Fetch Alpha Vantage financials (income statement) -> revenue_splits
-    logger.info("Fetching Alpha Vantage financials for %s", ticker)
-    financials = await fetch_financials(ticker)
+    # 4. Alpha Vantage financials (income statement) -> revenue_splits
+    financials = data["financials"]
     if financials and financials.get("annual_reports"):
         logger.info("Alpha Vantage INCOME_STATEMENT returned %d annual reports for %s",
                      len(financials["annual_reports"]), ticker)
@@ -368,70 +532,69 @@ async def _run_api_ingestion(org: dict, db) -> dict:
             revenue = report.get("total_revenue")
             if revenue:
                 existing = await db.execute_fetchall(
-                    "SELECT id FROM revenue_splits WHERE business_unit_id=? AND period=? AND dimension='product' AND dimension_value='Total Revenue'",
-                    (bu_id, period),
+                    "SELECT id FROM revenue_splits WHERE org_id = ? AND business_unit_id=? AND period=? AND dimension='product' AND dimension_value='Total Revenue'",
+                    (db.org_id, bu_id, period),
                 )
                 if not existing:
                     await db.execute(
-                        "INSERT INTO revenue_splits (business_unit_id, dimension, dimension_value, revenue, period) VALUES (?, ?, ?, ?, ?)",
-                        (bu_id, "product", "Total Revenue", revenue, period),
+                        "INSERT INTO revenue_splits (org_id, business_unit_id, dimension, dimension_value, revenue, period) VALUES (?, ?, ?, ?, ?, ?)",
+                        (db.org_id, bu_id, "product", "Total Revenue", revenue, period),
                     )
                     summary["financials"] += 1
     else:
         logger.warning("Alpha Vantage INCOME_STATEMENT returned no data for %s (likely rate limited)", ticker)
 
-    # 6. Fetch Alpha Vantage company overview (supplementary)
-    logger.info("Fetching Alpha Vantage overview for %s", ticker)
-    overview = await fetch_company_overview(ticker)
+    # 5. Alpha Vantage company overview (supplementary)
+    overview = data["overview"]
     if overview:
         logger.info("Alpha Vantage OVERVIEW available for %s", ticker)
     else:
         logger.warning("Alpha Vantage OVERVIEW unavailable for %s (likely rate limited)", ticker)
 
-    # 6a. Revenue fallback: if no revenue from INCOME_STATEMENT, try OVERVIEW TTM
+    # 5a. Revenue fallback: if no revenue from INCOME_STATEMENT, try OVERVIEW TTM
     if summary["financials"] == 0 and overview:
         revenue_ttm = overview.get("revenue_ttm")
         if revenue_ttm:
             existing = await db.execute_fetchall(
-                "SELECT id FROM revenue_splits WHERE business_unit_id=? AND period='TTM' AND dimension='product' AND dimension_value='Total Revenue'",
-                (bu_id,),
+                "SELECT id FROM revenue_splits WHERE org_id = ? AND business_unit_id=? AND period='TTM' AND dimension='product' AND dimension_value='Total Revenue'",
+                (db.org_id, bu_id),
             )
             if not existing:
                 await db.execute(
-                    "INSERT INTO revenue_splits (business_unit_id, dimension, dimension_value, revenue, period) VALUES (?, ?, ?, ?, ?)",
-                    (bu_id, "product", "Total Revenue", revenue_ttm, "TTM"),
+                    "INSERT INTO revenue_splits (org_id, business_unit_id, dimension, dimension_value, revenue, period) VALUES (?, ?, ?, ?, ?, ?)",
+                    (db.org_id, bu_id, "product", "Total Revenue", revenue_ttm, "TTM"),
                 )
                 summary["financials"] += 1
                 logger.info("Inserted TTM revenue from OVERVIEW fallback for %s: %.0f", ticker, revenue_ttm)
         gross_profit_ttm = overview.get("gross_profit_ttm")
         if gross_profit_ttm:
             existing = await db.execute_fetchall(
-                "SELECT id FROM revenue_splits WHERE business_unit_id=? AND period='TTM' AND dimension='product' AND dimension_value='Gross Profit'",
-                (bu_id,),
+                "SELECT id FROM revenue_splits WHERE org_id = ? AND business_unit_id=? AND period='TTM' AND dimension='product' AND dimension_value='Gross Profit'",
+                (db.org_id, bu_id),
             )
             if not existing:
                 await db.execute(
-                    "INSERT INTO revenue_splits (business_unit_id, dimension, dimension_value, revenue, period) VALUES (?, ?, ?, ?, ?)",
-                    (bu_id, "product", "Gross Profit", gross_profit_ttm, "TTM"),
+                    "INSERT INTO revenue_splits (org_id, business_unit_id, dimension, dimension_value, revenue, period) VALUES (?, ?, ?, ?, ?, ?)",
+                    (db.org_id, bu_id, "product", "Gross Profit", gross_profit_ttm, "TTM"),
                 )
                 summary["financials"] += 1
 
-    # 6b. Revenue last resort: if still 0, use Finnhub enterprise value as proxy
+    # 5b. Revenue last resort: if still 0, use Finnhub enterprise value as proxy
     if summary["financials"] == 0 and fh_metrics and fh_metrics.get("enterpriseValue"):
         ev = fh_metrics["enterpriseValue"]
         existing = await db.execute_fetchall(
-            "SELECT id FROM revenue_splits WHERE business_unit_id=? AND period='TTM' AND dimension='segment' AND dimension_value='Enterprise Value (estimated)'",
-            (bu_id,),
+            "SELECT id FROM revenue_splits WHERE org_id = ? AND business_unit_id=? AND period='TTM' AND dimension='segment' AND dimension_value='Enterprise Value (estimated)'",
+            (db.org_id, bu_id),
         )
         if not existing:
             await db.execute(
-                "INSERT INTO revenue_splits (business_unit_id, dimension, dimension_value, revenue, period) VALUES (?, ?, ?, ?, ?)",
-                (bu_id, "segment", "Enterprise Value (estimated)", ev, "TTM"),
+                "INSERT INTO revenue_splits (org_id, business_unit_id, dimension, dimension_value, revenue, period) VALUES (?, ?, ?, ?, ?, ?)",
+                (db.org_id, bu_id, "segment", "Enterprise Value (estimated)", ev, "TTM"),
             )
             summary["financials"] += 1
             logger.info("Inserted enterprise value as revenue proxy for %s: %.0f", ticker, ev)
 
-    # 7. Build merged ops metrics: Finnhub primary, Alpha Vantage supplement
+    # 6. Build merged ops metrics: Finnhub primary, Alpha Vantage supplement
     # Define metric mappings: (display_name, finnhub_key, av_key, period, finnhub_is_pct)
     ops_metric_defs = [
         ("Net Profit Margin", "netProfitMarginTTM", "profit_margin", "TTM", True),
@@ -463,36 +626,26 @@ async def _run_api_ingestion(org: dict, db) -> dict:
 
         if value is not None:
             existing = await db.execute_fetchall(
-                "SELECT id FROM ops_efficiency WHERE business_unit_id=? AND metric_name=? AND period=?",
-                (bu_id, metric_name, period),
+                "SELECT id FROM ops_efficiency WHERE org_id = ? AND business_unit_id=? AND metric_name=? AND period=?",
+                (db.org_id, bu_id, metric_name, period),
             )
             if not existing:
                 await db.execute(
-                    "INSERT INTO ops_efficiency (business_unit_id, metric_name, metric_value, period) VALUES (?, ?, ?, ?)",
-                    (bu_id, metric_name, value, period),
+                    "INSERT INTO ops_efficiency (org_id, business_unit_id, metric_name, metric_value, period) VALUES (?, ?, ?, ?, ?)",
+                    (db.org_id, bu_id, metric_name, value, period),
                 )
                 summary["ops_metrics"] += 1
 
     logger.info("Inserted %d revenue splits, %d ops metrics for %s",
                 summary["financials"], summary["ops_metrics"], ticker)
 
-    # 8. Fetch named competitors with full financial data
-    competitor_names = []
-    if org.get("competitor_1_name"):
-        competitor_names.append(org["competitor_1_name"])
-    if org.get("competitor_2_name"):
-        competitor_names.append(org["competitor_2_name"])
-
-    for comp_name in competitor_names:
-        comp_ticker = await search_ticker(comp_name)
-        if not comp_ticker:
-            logger.warning("No ticker found for competitor '%s'", comp_name)
-            continue
-
-        comp_profile = await fetch_company_profile(comp_ticker)
-        comp_fh_metrics = await fetch_finnhub_metrics(comp_ticker)
-        comp_overview = await fetch_company_overview(comp_ticker)
-        comp_financials = await fetch_financials(comp_ticker)
+    # 7. Named competitors with full financial data
+    for comp in data["competitors"]:
+        comp_name, comp_ticker = comp["name"], comp["ticker"]
+        comp_profile = comp["profile"]
+        comp_fh_metrics = comp["fh_metrics"]
+        comp_overview = comp["overview"]
+        comp_financials = comp["financials"]
 
         display_name = comp_profile.get("name", comp_name) if comp_profile else comp_name
 
@@ -540,16 +693,17 @@ async def _run_api_ingestion(org: dict, db) -> dict:
                 comp_eps = comp_overview.get("eps")
 
         existing = await db.execute_fetchall(
-            "SELECT id FROM competitors WHERE name = ?", (display_name,)
+            "SELECT id FROM competitors WHERE org_id = ? AND name = ?", (db.org_id, display_name)
         )
         if not existing:
             await db.execute(
                 """INSERT INTO competitors
-                   (name, ticker, revenue, profit_margin, operating_margin,
+                   (org_id, name, ticker, revenue, profit_margin, operating_margin,
                     return_on_equity, return_on_assets, pe_ratio, eps,
                     market_cap_value, strengths, data_source)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
                 (
+                    db.org_id,
                     display_name,
                     comp_ticker,
                     comp_revenue,
@@ -568,14 +722,14 @@ async def _run_api_ingestion(org: dict, db) -> dict:
 
         # Create business unit for competitor
         existing_bu = await db.execute_fetchall(
-            "SELECT id FROM business_units WHERE name = ?", (display_name,)
+            "SELECT id FROM business_units WHERE org_id = ? AND name = ?", (db.org_id, display_name)
         )
         if existing_bu:
             comp_bu_id = existing_bu[0]["id"]
         else:
             cursor = await db.execute(
-                "INSERT INTO business_units (name, description) VALUES (?, ?)",
-                (display_name, f"Competitor: {display_name}"),
+                "INSERT INTO business_units (org_id, name, description) VALUES (?, ?, ?)",
+                (db.org_id, display_name, f"Competitor: {display_name}"),
             )
             comp_bu_id = cursor.lastrowid
 
@@ -586,13 +740,13 @@ async def _run_api_ingestion(org: dict, db) -> dict:
                 revenue = report.get("total_revenue")
                 if revenue:
                     existing = await db.execute_fetchall(
-                        "SELECT id FROM revenue_splits WHERE business_unit_id=? AND period=? AND dimension='product' AND dimension_value='Total Revenue'",
-                        (comp_bu_id, period),
+                        "SELECT id FROM revenue_splits WHERE org_id = ? AND business_unit_id=? AND period=? AND dimension='product' AND dimension_value='Total Revenue'",
+                        (db.org_id, comp_bu_id, period),
                     )
                     if not existing:
                         await db.execute(
-                            "INSERT INTO revenue_splits (business_unit_id, dimension, dimension_value, revenue, period) VALUES (?, ?, ?, ?, ?)",
-                            (comp_bu_id, "product", "Total Revenue", revenue, period),
+                            "INSERT INTO revenue_splits (org_id, business_unit_id, dimension, dimension_value, revenue, period) VALUES (?, ?, ?, ?, ?, ?)",
+                            (db.org_id, comp_bu_id, "product", "Total Revenue", revenue, period),
                         )
 
         # Insert competitor ops metrics from merged sources
@@ -615,29 +769,28 @@ async def _run_api_ingestion(org: dict, db) -> dict:
         for metric_name, metric_value in comp_merged_metrics.items():
             if metric_value is not None:
                 existing = await db.execute_fetchall(
-                    "SELECT id FROM ops_efficiency WHERE business_unit_id=? AND metric_name=? AND period='TTM'",
-                    (comp_bu_id, metric_name),
+                    "SELECT id FROM ops_efficiency WHERE org_id = ? AND business_unit_id=? AND metric_name=? AND period='TTM'",
+                    (db.org_id, comp_bu_id, metric_name),
                 )
                 if not existing:
                     await db.execute(
-                        "INSERT INTO ops_efficiency (business_unit_id, metric_name, metric_value, period) VALUES (?, ?, ?, ?)",
-                        (comp_bu_id, metric_name, metric_value, "TTM"),
+                        "INSERT INTO ops_efficiency (org_id, business_unit_id, metric_name, metric_value, period) VALUES (?, ?, ?, ?, ?)",
+                        (db.org_id, comp_bu_id, metric_name, metric_value, "TTM"),
                     )
 
-    # 9. Also fetch peers for additional context
-    peers = await fetch_peers(ticker)
-    for peer_ticker in peers[:4]:
-        peer_profile = await fetch_company_profile(peer_ticker)
+    # 8. Peers for additional context
+    for peer_ticker, peer_profile in data["peers"]:
         if peer_profile and peer_profile.get("name"):
             existing = await db.execute_fetchall(
-                "SELECT id FROM competitors WHERE name = ?", (peer_profile["name"],)
+                "SELECT id FROM competitors WHERE org_id = ? AND name = ?", (db.org_id, peer_profile["name"])
             )
             if not existing:
                 market_cap = peer_profile.get("market_cap")
                 await db.execute(
-                    """INSERT INTO competitors (name, ticker, market_cap_value, strengths, data_source)
-                       VALUES (?, ?, ?, ?, ?)""",
+                    """INSERT INTO competitors (org_id, name, ticker, market_cap_value, strengths, data_source)
+                       VALUES (?, ?, ?, ?, ?, ?)""",
                     (
+                        db.org_id,
                         peer_profile["name"],
                         peer_ticker,
                         market_cap,
@@ -647,7 +800,8 @@ async def _run_api_ingestion(org: dict, db) -> dict:
                 )
                 summary["competitors"] += 1
 
-    await db.commit()
+    if commit:
+        await db.commit()
     logger.info("Ingestion complete for %s: %s", ticker, summary)
     return {"success": True, "summary": summary}
 
@@ -656,61 +810,72 @@ async def _run_api_ingestion(org: dict, db) -> dict:
 
 @router.get("/organization")
 async def get_organization(db=Depends(get_db)):
-    row = await db.execute_fetchall("SELECT * FROM organization ORDER BY id DESC LIMIT 1")
+    row = await db.execute_fetchall("SELECT * FROM organization WHERE id = ?", (db.org_id,))
     return dict(row[0]) if row else None
 
 
 @router.post("/organization")
-async def create_organization(data: dict, db=Depends(get_db)):
-    # Upsert: delete existing, insert new
+async def create_organization(data: dict, request: Request, db=Depends(get_db)):
+    # Upsert: reset this tenant's data, then replace its organization profile in place
     # Full data reset across all steps to prevent stale cross-session data
     # Step 7
-    await db.execute("DELETE FROM feature_dependencies")
-    await db.execute("DELETE FROM features")
-    await db.execute("DELETE FROM delivery_key_results")
-    await db.execute("DELETE FROM delivery_okrs")
+    await db.execute("DELETE FROM feature_dependencies WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM features WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM delivery_key_results WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM delivery_okrs WHERE org_id = ?", (db.org_id,))
     # Step 6
-    await db.execute("DELETE FROM epic_dependencies")
-    await db.execute("DELETE FROM epics")
-    await db.execute("DELETE FROM product_key_results")
-    await db.execute("DELETE FROM product_okrs")
-    await db.execute("DELETE FROM teams")
+    await db.execute("DELETE FROM epic_dependencies WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM epics WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM product_key_results WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM product_okrs WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM teams WHERE org_id = ?", (db.org_id,))
     # Step 5
-    await db.execute("DELETE FROM initiatives")
-    await db.execute("DELETE FROM digital_products")
-    await db.execute("DELETE FROM product_groups")
+    await db.execute("DELETE FROM initiatives WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM digital_products WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM product_groups WHERE org_id = ?", (db.org_id,))
     # Step 4
-    await db.execute("DELETE FROM strategic_key_results")
-    await db.execute("DELETE FROM strategic_okrs")
-    await db.execute("DELETE FROM strategies")
-    await db.execute("DELETE FROM strategy_inputs")
+    await db.execute("DELETE FROM strategic_key_results WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM strategic_okrs WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM strategies WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM strategy_inputs WHERE org_id = ?", (db.org_id,))
     # Step 3
-    await db.execute("DELETE FROM tows_actions")
-    await db.execute("DELETE FROM swot_entries")
+    await db.execute("DELETE FROM tows_actions WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM swot_entries WHERE org_id = ?", (db.org_id,))
     # Step 2
-    await db.execute("DELETE FROM value_stream_benchmarks")
-    await db.execute("DELETE FROM value_stream_metrics")
-    await db.execute("DELETE FROM value_stream_levers")
-    await db.execute("DELETE FROM value_stream_steps")
-    await db.execute("DELETE FROM value_streams")
+    await db.execute("DELETE FROM value_stream_benchmarks WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM value_stream_metrics WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM value_stream_levers WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM value_stream_steps WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM value_streams WHERE org_id = ?", (db.org_id,))
     # Step 1
-    await db.execute("DELETE FROM revenue_splits")
-    await db.execute("DELETE FROM ops_efficiency")
-    await db.execute("DELETE FROM competitors")
-    await db.execute("DELETE FROM business_units")
+    await db.execute("DELETE FROM revenue_splits WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM ops_efficiency WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM competitors WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM business_units WHERE org_id = ?", (db.org_id,))
     # Other
-    await db.execute("DELETE FROM step1_data_urls")
-    await db.execute("DELETE FROM review_gates")
-    await db.execute("DELETE FROM document_chunks WHERE document_id IN (SELECT id FROM org_documents)")
-    await db.execute("DELETE FROM org_documents")
-    await db.execute("DELETE FROM generation_runs")
-    await db.execute("DELETE FROM organization")
-    cursor = await db.execute(
-        "INSERT INTO organization (name, industry, competitor_1_name, competitor_2_name) VALUES (?, ?, ?, ?)",
-        (data["name"], data["industry"], data.get("competitor_1_name"), data.get("competitor_2_name")),
-    )
+    await db.execute("DELETE FROM step1_data_urls WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM review_gates WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM document_chunks WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM org_documents WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM generation_runs WHERE org_id = ?", (db.org_id,))
+    if db.org_id is not None:
+        await db.execute(
+            "UPDATE organization SET name = ?, industry = ?, competitor_1_name = ?, competitor_2_name = ?, "
+            "ticker = NULL, sub_industry = NULL, market_cap = NULL, country = NULL, currency = NULL, "
+            "data_mode = 'demo', platform_version = '1.0', ai_executive_summary = NULL, "
+            "ai_health_score = NULL, ai_summary_updated_at = NULL WHERE id = ?",
+            (data["name"], data["industry"], data.get("competitor_1_name"), data.get("competitor_2_name"), db.org_id),
+        )
+        org_id = db.org_id
+    else:
+        cursor = await db.execute(
+            "INSERT INTO organization (name, industry, competitor_1_name, competitor_2_name) VALUES (?, ?, ?, ?)",
+            (data["name"], data["industry"], data.get("competitor_1_name"), data.get("competitor_2_name")),
+        )
+        org_id = cursor.lastrowid
+        await attach_user_to_org(db, request, org_id)
     await db.commit()
-    return {"id": cursor.lastrowid}
+    return {"id": org_id}
 
 
 # --- Company Search (Autocomplete) ---
@@ -778,42 +943,47 @@ async def reset_all_data(db=Depends(get_db)):
     """Delete ALL application data across all steps for a clean slate.
     Deletes in reverse FK dependency order."""
     # Step 7
-    await db.execute("DELETE FROM feature_dependencies")
-    await db.execute("DELETE FROM features")
-    await db.execute("DELETE FROM delivery_key_results")
-    await db.execute("DELETE FROM delivery_okrs")
+    await db.execute("DELETE FROM feature_dependencies WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM features WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM delivery_key_results WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM delivery_okrs WHERE org_id = ?", (db.org_id,))
     # Step 6
-    await db.execute("DELETE FROM epic_dependencies")
-    await db.execute("DELETE FROM epics")
-    await db.execute("DELETE FROM product_key_results")
-    await db.execute("DELETE FROM product_okrs")
-    await db.execute("DELETE FROM teams")
+    await db.execute("DELETE FROM epic_dependencies WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM epics WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM product_key_results WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM product_okrs WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM teams WHERE org_id = ?", (db.org_id,))
     # Step 5
-    await db.execute("DELETE FROM initiatives")
-    await db.execute("DELETE FROM digital_products")
-    await db.execute("DELETE FROM product_groups")
+    await db.execute("DELETE FROM initiatives WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM digital_products WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM product_groups WHERE org_id = ?", (db.org_id,))
     # Step 4
-    await db.execute("DELETE FROM strategic_key_results")
-    await db.execute("DELETE FROM strategic_okrs")
-    await db.execute("DELETE FROM strategies")
-    await db.execute("DELETE FROM strategy_inputs")
+    await db.execute("DELETE FROM strategic_key_results WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM strategic_okrs WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM strategies WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM strategy_inputs WHERE org_id = ?", (db.org_id,))
     # Step 3
-    await db.execute("DELETE FROM tows_actions")
-    await db.execute("DELETE FROM swot_entries")
+    await db.execute("DELETE FROM tows_actions WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM swot_entries WHERE org_id = ?", (db.org_id,))
     # Step 2
-    await db.execute("DELETE FROM value_stream_benchmarks")
-    await db.execute("DELETE FROM value_stream_metrics")
-    await db.execute("DELETE FROM value_stream_levers")
-    await db.execute("DELETE FROM value_stream_steps")
-    await db.execute("DELETE FROM value_streams")
+    await db.execute("DELETE FROM value_stream_benchmarks WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM value_stream_metrics WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM value_stream_levers WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM value_stream_steps WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM value_streams WHERE org_id = ?", (db.org_id,))
     # Step 1
-    await db.execute("DELETE FROM revenue_splits")
-    await db.execute("DELETE FROM ops_efficiency")
-    await db.execute("DELETE FROM competitors")
-    await db.execute("DELETE FROM business_units")
+    await db.execute("DELETE FROM revenue_splits WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM ops_efficiency WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM competitors WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM business_units WHERE org_id = ?", (db.org_id,))
     # Other
-    await db.execute("DELETE FROM step1_data_urls")
-    await db.execute("DELETE FROM review_gates")
+    await db.execute("DELETE FROM step1_data_urls WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM review_gates WHERE org_id = ?", (db.org_id,))
+    # Synced copies and their sync points, so the next sync starts over
+    await db.execute("DELETE FROM jira_issue_transitions WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM jira_issues WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM jira_sync_state WHERE org_id = ?", (db.org_id,))
+    await db.execute("DELETE FROM competitor_news_sync WHERE org_id = ?", (db.org_id,))
     await db.commit()
     return {"reset": True, "message": "All data deleted across steps 1-7"}
 
@@ -823,7 +993,7 @@ async def reset_all_data(db=Depends(get_db)):
 @router.post("/ingest")
 async def ingest_data(db=Depends(get_db)):
     """Auto-fetch company data from Finnhub & Alpha Vantage APIs."""
-    org_rows = await db.execute_fetchall("SELECT * FROM organization ORDER BY id DESC LIMIT 1")
+    org_rows = await db.execute_fetchall("SELECT * FROM organization WHERE id = ?", (db.org_id,))
     if not org_rows:
         return {"error": "No organization set. Create one first."}
     org = dict(org_rows[0])
@@ -866,18 +1036,25 @@ async def upload_file(file: UploadFile = File(...), db=Depends(get_db)):
 
         # In live mode, also persist raw text to RAG knowledge base
         try:
-            from rag_engine import store_document, is_live_mode
-            if await is_live_mode(db):
-                raw_text = _extract_raw_text(content, ext)
-                if raw_text and len(raw_text.strip()) > 50:
-                    org = await db.execute_fetchone("SELECT id FROM organization LIMIT 1")
-                    if org:
-                        doc_id = await store_document(
+            from rag_engine import content_hash, find_document, index_document, is_live_mode
+            org = await db.execute_fetchone("SELECT id FROM organization WHERE id = ?", (db.org_id,))
+            if org and await is_live_mode(db):
+                digest = content_hash(content)
+                existing = await find_document(db, org["id"], digest)
+                if existing:
+                    result["rag_document_id"] = existing["id"]
+                    result["rag_indexed"] = True
+                    result["rag_status"] = "unchanged"
+                else:
+                    raw_text = _extract_raw_text(content, ext)
+                    if raw_text and len(raw_text.strip()) > 50:
+                        indexed = await index_document(
                             db, org["id"], file.filename, ext, raw_text,
-                            doc_category="financial", upload_source="step1_upload", step_number=1,
+                            doc_category="financial", upload_source="step1_upload", step_number=1, digest=digest,
                         )
-                        result["rag_document_id"] = doc_id
+                        result["rag_document_id"] = indexed["document_id"]
                         result["rag_indexed"] = True
+                        result["rag_status"] = indexed["status"]
         except Exception as e:
             logger.warning("RAG indexing failed (non-fatal): %s", e)
 
@@ -894,8 +1071,9 @@ def _extract_raw_text(content: bytes, ext: str) -> str:
             return content.decode("utf-8-sig", errors="replace")
         elif ext == "pdf":
             import fitz
+            from rag_engine import PAGE_BREAK
             doc = fitz.open(stream=content, filetype="pdf")
-            return "\n".join(page.get_text() for page in doc).strip()
+            return PAGE_BREAK.join(page.get_text() for page in doc).strip()
         elif ext == "docx":
             import docx as docx_mod
             doc = docx_mod.Document(io.BytesIO(content))
@@ -1199,7 +1377,7 @@ def _map_rows_to_data(rows: list, table_type: str, mapping: dict) -> dict:
 @router.get("/urls")
 async def list_urls(db=Depends(get_db)):
     """List all saved data ingestion URLs."""
-    rows = await db.execute_fetchall("SELECT * FROM step1_data_urls ORDER BY created_at DESC")
+    rows = await db.execute_fetchall("SELECT * FROM step1_data_urls WHERE org_id = ? ORDER BY created_at DESC", (db.org_id,))
     return [dict(r) for r in rows]
 
 
@@ -1212,8 +1390,8 @@ async def add_url(data: dict, db=Depends(get_db)):
     label = data.get("label", "").strip() or None
     url_type = data.get("url_type", "external")
     cursor = await db.execute(
-        "INSERT INTO step1_data_urls (url, label, url_type) VALUES (?, ?, ?)",
-        (url, label, url_type),
+        "INSERT INTO step1_data_urls (org_id, url, label, url_type) VALUES (?, ?, ?, ?)",
+        (db.org_id, url, label, url_type),
     )
     await db.commit()
     return {"id": cursor.lastrowid, "success": True}
@@ -1222,7 +1400,7 @@ async def add_url(data: dict, db=Depends(get_db)):
 @router.delete("/urls/{url_id}")
 async def delete_url(url_id: int, db=Depends(get_db)):
     """Delete a saved URL."""
-    await db.execute("DELETE FROM step1_data_urls WHERE id = ?", (url_id,))
+    await db.execute("DELETE FROM step1_data_urls WHERE id = ? AND org_id = ?", (url_id, db.org_id))
     await db.commit()
     return {"deleted": True}
 
@@ -1230,252 +1408,277 @@ async def delete_url(url_id: int, db=Depends(get_db)):
 @router.post("/urls/{url_id}/fetch")
 async def fetch_single_url(url_id: int, db=Depends(get_db)):
     """Fetch a single saved URL and extract financial data."""
-    rows = await db.execute_fetchall("SELECT * FROM step1_data_urls WHERE id = ?", (url_id,))
+    rows = await db.execute_fetchall("SELECT * FROM step1_data_urls WHERE org_id = ? AND id = ?", (db.org_id, url_id))
     if not rows:
         return {"error": "URL not found"}
-    url_row = dict(rows[0])
-
-    result = await _extract_financial_from_url(url_row["url"])
-    now = datetime.utcnow().isoformat()
 
-    if "error" in result and "business_units" not in result:
-        await db.execute(
-            "UPDATE step1_data_urls SET status='error', error_message=?, last_fetched_at=? WHERE id=?",
-            (result["error"], now, url_id),
-        )
-        await db.commit()
-        return {"error": result["error"], "url_id": url_id}
-
-    summary = await _insert_extracted_data(result, db, f"url:{url_row['url']}")
-    await db.execute(
-        "UPDATE step1_data_urls SET status='success', error_message=NULL, last_fetched_at=?, last_result_json=? WHERE id=?",
-        (now, json.dumps(summary), url_id),
-    )
-    await db.commit()
-    return {"success": True, "url_id": url_id, "summary": summary}
+    result = (await _refresh_saved_urls(db, [dict(rows[0])]))[0]
+    if result["status"] == "error":
+        return {"error": result["error"], "url_id": url_id, "timings": result["timings"]}
+    return {"success": True, "url_id": url_id, "summary": result["summary"], "unchanged": result["unchanged"],
+            "timings": result["timings"]}
 
 
 @router.post("/urls/fetch-all")
 async def fetch_all_urls(db=Depends(get_db)):
-    """Re-fetch all saved URLs and extract data."""
-    rows = await db.execute_fetchall("SELECT * FROM step1_data_urls ORDER BY id")
+    """Re-fetch all saved URLs and extract data. Unchanged pages are not re-extracted."""
+    rows = await db.execute_fetchall("SELECT * FROM step1_data_urls WHERE org_id = ? ORDER BY id", (db.org_id,))
     if not rows:
         return {"message": "No URLs configured", "results": []}
 
-    results = []
-    for row in rows:
-        url_row = dict(row)
-        url_id = url_row["id"]
-        result = await _extract_financial_from_url(url_row["url"])
-        now = datetime.utcnow().isoformat()
-
-        if "error" in result and "business_units" not in result:
-            await db.execute(
-                "UPDATE step1_data_urls SET status='error', error_message=?, last_fetched_at=? WHERE id=?",
-                (result["error"], now, url_id),
-            )
-            results.append({"url_id": url_id, "url": url_row["url"], "status": "error", "error": result["error"]})
-        else:
-            summary = await _insert_extracted_data(result, db, f"url:{url_row['url']}")
-            await db.execute(
-                "UPDATE step1_data_urls SET status='success', error_message=NULL, last_fetched_at=?, last_result_json=? WHERE id=?",
-                (now, json.dumps(summary), url_id),
-            )
-            results.append({"url_id": url_id, "url": url_row["url"], "status": "success", "summary": summary})
-
-    await db.commit()
+    results = await _refresh_saved_urls(db, [dict(r) for r in rows])
     return {"success": True, "results": results}
 
 
 # --- Refresh All Sources ---
 
-@router.post("/refresh-all")
-async def refresh_all_sources(db=Depends(get_db)):
-    """Pull from ALL configured sources: APIs, saved URLs, web search, integrations."""
-    org_rows = await db.execute_fetchall("SELECT * FROM organization ORDER BY id DESC LIMIT 1")
-    if not org_rows:
-        return {"error": "No organization set. Create one first."}
-    org = dict(org_rows[0])
+# Seconds a source may run before it is cancelled and reported as timed out
+REFRESH_SOURCE_DEADLINES = {"api": 120, "urls": 120, "web_search": 90, "jira": 120, "servicenow": 45}
 
-    results = {}
+# Each source collector does its network work without touching the database and returns
+# (result, write): `write(db)` applies its data later, or is None when there is nothing to store.
 
-    # 1. Finnhub + Alpha Vantage APIs
-    try:
-        api_result = await _run_api_ingestion(org, db)
-        if "error" in api_result:
-            results["api"] = {"status": "error", "error": api_result["error"]}
-        else:
-            results["api"] = {"status": "ok", "summary": api_result.get("summary")}
-    except Exception as e:
-        results["api"] = {"status": "error", "error": str(e)}
-
-    # 2. Saved URLs
-    url_rows = await db.execute_fetchall("SELECT * FROM step1_data_urls ORDER BY id")
-    if url_rows:
-        url_results = []
-        for row in url_rows:
-            url_row = dict(row)
-            url_id = url_row["id"]
-            try:
-                result = await _extract_financial_from_url(url_row["url"])
-                now = datetime.utcnow().isoformat()
-                if "error" in result and "business_units" not in result:
-                    await db.execute(
-                        "UPDATE step1_data_urls SET status='error', error_message=?, last_fetched_at=? WHERE id=?",
-                        (result["error"], now, url_id),
-                    )
-                    url_results.append({"url": url_row["url"], "status": "error"})
-                else:
-                    summary = await _insert_extracted_data(result, db, f"url:{url_row['url']}")
-                    await db.execute(
-                        "UPDATE step1_data_urls SET status='success', error_message=NULL, last_fetched_at=?, last_result_json=? WHERE id=?",
-                        (now, json.dumps(summary), url_id),
-                    )
-                    url_results.append({"url": url_row["url"], "status": "ok", "summary": summary})
-            except Exception as e:
-                url_results.append({"url": url_row["url"], "status": "error", "error": str(e)})
-        results["urls"] = {"status": "ok", "fetched": len(url_results), "details": url_results}
-    else:
-        results["urls"] = {"status": "skipped", "reason": "No URLs configured"}
 
-    # 3. Web Search (if available)
-    try:
-        from ai_research import web_search_available
-        if web_search_available():
-            # Search for financial data about the org
-            search_query = f"{org['name']} financial data revenue"
-            from ai_research import search_web
-            search_results = await search_web(search_query)
-            if search_results:
-                search_extracted = 0
-                for sr in search_results[:3]:
-                    url = sr.get("url") or sr.get("link")
-                    if url:
-                        try:
-                            result = await _extract_financial_from_url(url)
-                            if "error" not in result or "business_units" in result:
-                                await _insert_extracted_data(result, db, f"web_search:{url}")
-                                search_extracted += 1
-                        except Exception:
-                            pass
-                results["web_search"] = {"status": "ok", "urls_extracted": search_extracted}
+async def _collect_api(org: dict):
+    data = await _fetch_api_data(org)
+    result = {"status": "ok"}
+
+    async def write(db):
+        result["summary"] = (await _write_api_data(org, data, db, commit=False)).get("summary")
+    return result, write
+
+
+async def _collect_urls(url_rows: list[dict]):
+    if not url_rows:
+        return {"status": "skipped", "reason": "No URLs configured"}, None
+    outcomes = await _fetch_saved_urls(url_rows)
+    result = {"status": "ok", "fetched": len(url_rows)}
+
+    async def write(db):
+        details = []
+        for r in await _write_saved_urls(db, url_rows, outcomes, commit=False):
+            detail = {"url": r["url"], "status": "ok" if r["status"] == "success" else "error",
+                      "unchanged": r["unchanged"], "timings": r["timings"]}
+            if r["status"] == "success":
+                detail["summary"] = r["summary"]
             else:
-                results["web_search"] = {"status": "skipped", "reason": "No search results"}
-        else:
-            results["web_search"] = {"status": "skipped", "reason": "Web search not available"}
-    except (ImportError, AttributeError):
-        results["web_search"] = {"status": "skipped", "reason": "Web search not configured"}
-
-    # 4. Jira integration (if configured)
-    jira_url = os.getenv("JIRA_URL")
-    jira_token = os.getenv("JIRA_API_TOKEN")
-    if jira_url and jira_token:
-        try:
-            async with httpx.AsyncClient(timeout=30) as client:
-                jira_email = os.getenv("JIRA_EMAIL", "")
-                import base64
-                auth = base64.b64encode(f"{jira_email}:{jira_token}".encode()).decode()
-                resp = await client.get(
-                    f"{jira_url}/rest/api/3/search?jql=project%20is%20not%20EMPTY&maxResults=50",
-                    headers={"Authorization": f"Basic {auth}", "Accept": "application/json"},
-                )
-                if resp.status_code == 200:
-                    jira_data = resp.json()
-                    issues = jira_data.get("issues", [])
-                    if issues:
-                        # Calculate avg cycle time from resolved issues
-                        cycle_times = []
-                        for issue in issues:
-                            fields = issue.get("fields", {})
-                            created = fields.get("created")
-                            resolved = fields.get("resolutiondate")
-                            if created and resolved:
-                                from datetime import datetime as dt
-                                try:
-                                    c = dt.fromisoformat(created.replace("Z", "+00:00"))
-                                    r = dt.fromisoformat(resolved.replace("Z", "+00:00"))
-                                    cycle_times.append((r - c).total_seconds() / 86400)
-                                except Exception:
-                                    pass
-                        if cycle_times:
-                            avg_cycle = sum(cycle_times) / len(cycle_times)
-                            bu_rows = await db.execute_fetchall("SELECT id FROM business_units LIMIT 1")
-                            if bu_rows:
-                                await _insert_extracted_data({
-                                    "ops_efficiency": [{
-                                        "business_unit": None,
-                                        "metric_name": "Avg Jira Cycle Time (days)",
-                                        "metric_value": round(avg_cycle, 1),
-                                        "period": "TTM",
-                                    }]
-                                }, db, "jira")
-                            results["jira"] = {"status": "ok", "avg_cycle_time_days": round(avg_cycle, 1)}
-                        else:
-                            results["jira"] = {"status": "ok", "message": "No resolved issues found"}
-                else:
-                    results["jira"] = {"status": "error", "error": f"HTTP {resp.status_code}"}
-        except Exception as e:
-            results["jira"] = {"status": "error", "error": str(e)}
-    else:
-        results["jira"] = {"status": "skipped", "reason": "Jira not configured"}
+                detail["error"] = r["error"]
+            details.append(detail)
+        result["details"] = details
+    return result, write
+
+
+async def _collect_web_search(org: dict):
+    from web_search import web_search_available, search_web
+    if not web_search_available():
+        return {"status": "skipped", "reason": "Web search not available"}, None
+    # Search for financial data about the org
+    search_results = await search_web(f"{org['name']} financial data revenue")
+    if not search_results:
+        return {"status": "skipped", "reason": "No search results"}, None
+
+    urls = [u for u in (sr.get("url") or sr.get("link") for sr in search_results[:3]) if u]
+    extracted = await asyncio.gather(*(_extract_financial_from_url(url) for url in urls), return_exceptions=True)
+    usable = [
+        (url, data) for url, data in zip(urls, extracted)
+        if not isinstance(data, Exception) and ("error" not in data or "business_units" in data)
+    ]
+    result = {"status": "ok", "urls_extracted": 0}
 
-    # 5. ServiceNow integration (if configured)
+    async def write(db):
+        for url, data in usable:
+            try:
+                await _insert_extracted_data(data, db, f"web_search:{url}", commit=False)
+                result["urls_extracted"] += 1
+            except Exception:
+                pass
+    return result, write
+
+
+async def _collect_jira(last_updated: str | None):
+    import jira_sync
+    from connectors import is_jira_configured
+    if not is_jira_configured():
+        return {"status": "skipped", "reason": "Jira not configured"}, None
+    fetched = await jira_sync.fetch_changes(jira_sync.ALL_PROJECTS, last_updated)
+    result = {"status": "ok", "issues_synced": len(fetched["issues"])}
+
+    async def write(db):
+        await jira_sync.store_changes(db, fetched, commit=False)
+        # Cycle time over every synced issue, not just the ones that changed
+        metrics = await jira_sync.cycle_time_metrics(db)
+        if not metrics["avg_cycle_hours"]:
+            result["message"] = "No resolved issues found"
+            return
+        avg_cycle = round(metrics["avg_cycle_hours"] / 24, 1)
+        result.update(avg_cycle_time_days=avg_cycle, resolved_issues=metrics["resolved"])
+        bu_rows = await db.execute_fetchall("SELECT id FROM business_units WHERE org_id = ? LIMIT 1", (db.org_id,))
+        if bu_rows:
+            await _insert_extracted_data({
+                "ops_efficiency": [{
+                    "business_unit": None,
+                    "metric_name": "Avg Jira Cycle Time (days)",
+                    "metric_value": avg_cycle,
+                    "period": "TTM",
+                }]
+            }, db, "jira", commit=False)
+    return result, write
+
+
+async def _collect_servicenow():
     snow_url = os.getenv("SERVICENOW_URL")
     snow_user = os.getenv("SERVICENOW_USER")
     snow_pass = os.getenv("SERVICENOW_PASSWORD")
-    if snow_url and snow_user and snow_pass:
-        try:
-            async with httpx.AsyncClient(timeout=30) as client:
-                resp = await client.get(
-                    f"{snow_url}/api/now/table/incident?sysparm_limit=50&sysparm_fields=sys_created_on,resolved_at",
-                    auth=(snow_user, snow_pass),
-                    headers={"Accept": "application/json"},
-                )
-                if resp.status_code == 200:
-                    snow_data = resp.json()
-                    records = snow_data.get("result", [])
-                    resolution_times = []
-                    for rec in records:
-                        created = rec.get("sys_created_on")
-                        resolved = rec.get("resolved_at")
-                        if created and resolved:
-                            from datetime import datetime as dt
-                            try:
-                                c = dt.strptime(created, "%Y-%m-%d %H:%M:%S")
-                                r = dt.strptime(resolved, "%Y-%m-%d %H:%M:%S")
-                                resolution_times.append((r - c).total_seconds() / 3600)
-                            except Exception:
-                                pass
-                    if resolution_times:
-                        avg_res = sum(resolution_times) / len(resolution_times)
-                        await _insert_extracted_data({
-                            "ops_efficiency": [{
-                                "business_unit": None,
-                                "metric_name": "Avg Incident Resolution (hours)",
-                                "metric_value": round(avg_res, 1),
-                                "period": "TTM",
-                            }]
-                        }, db, "servicenow")
-                        results["servicenow"] = {"status": "ok", "avg_resolution_hours": round(avg_res, 1)}
-                    else:
-                        results["servicenow"] = {"status": "ok", "message": "No resolved incidents found"}
-                else:
-                    results["servicenow"] = {"status": "error", "error": f"HTTP {resp.status_code}"}
-        except Exception as e:
-            results["servicenow"] = {"status": "error", "error": str(e)}
-    else:
-        results["servicenow"] = {"status": "skipped", "reason": "ServiceNow not configured"}
+    if not (snow_url and snow_user and snow_pass):
+        return {"status": "skipped", "reason": "ServiceNow not configured"}, None
+    async with httpx.AsyncClient(timeout=30) as client:
+        resp = await client.get(
+            f"{snow_url}/api/now/table/incident?sysparm_limit=50&sysparm_fields=sys_created_on,resolved_at",
+            auth=(snow_user, snow_pass),
+            headers={"Accept": "application/json"},
+        )
+    if resp.status_code != 200:
+        return {"status": "error", "error": f"HTTP {resp.status_code}"}, None
+    records = resp.json().get("result", [])
+
+    resolution_times = []
+    for rec in records:
+        created = rec.get("sys_created_on")
+        resolved = rec.get("resolved_at")
+        if created and resolved:
+            try:
+                c = datetime.strptime(created, "%Y-%m-%d %H:%M:%S")
+                r = datetime.strptime(resolved, "%Y-%m-%d %H:%M:%S")
+                resolution_times.append((r - c).total_seconds() / 3600)
+            except Exception:
+                pass
+    if not resolution_times:
+        return {"status": "ok", "message": "No resolved incidents found"}, None
+    avg_res = round(sum(resolution_times) / len(resolution_times), 1)
+
+    async def write(db):
+        await _insert_extracted_data({
+            "ops_efficiency": [{
+                "business_unit": None,
+                "metric_name": "Avg Incident Resolution (hours)",
+                "metric_value": avg_res,
+                "period": "TTM",
+            }]
+        }, db, "servicenow", commit=False)
+    return {"status": "ok", "avg_resolution_hours": avg_res}, write
+
+
+async def _run_source(name: str, collect):
+    """Run one collector under its deadline; failures and timeouts become its result."""
+    started = time.perf_counter()
+    try:
+        result, write = await asyncio.wait_for(collect, REFRESH_SOURCE_DEADLINES[name])
+    except asyncio.TimeoutError:
+        result, write = {"status": "timeout", "error": f"No response within {REFRESH_SOURCE_DEADLINES[name]}s"}, None
+    except Exception as e:
+        logger.warning("Refresh source %s failed: %s", name, e)
+        result, write = {"status": "error", "error": str(e)}, None
+    result["elapsed_ms"] = _ms(started)
+    return result, write
+
 
+async def _save_refresh_progress(db, run_id: int, progress: dict, status: str = "running"):
+    await db.execute(
+        "UPDATE source_refresh_runs SET status = ?, sources_json = ?, completed_at = ? WHERE id = ? AND org_id = ?",
+        (status, json.dumps(progress), None if status == "running" else timestamp_param(), run_id, db.org_id),
+    )
     await db.commit()
-    return {"success": True, "sources": results}
+
+
+@router.post("/refresh-all")
+async def refresh_all_sources(db=Depends(get_db)):
+    """Pull from ALL configured sources: APIs, saved URLs, web search, integrations.
+
+    Sources run concurrently, each under its own deadline, so a slow provider only costs
+    its own result. Their data is written afterwards in one batch. Per-source progress of
+    the latest run is readable from GET /refresh-all/status while it runs.
+    """
+    org_rows = await db.execute_fetchall("SELECT * FROM organization WHERE id = ?", (db.org_id,))
+    if not org_rows:
+        return {"error": "No organization set. Create one first."}
+    org = dict(org_rows[0])
+    url_rows = await db.execute_fetchall("SELECT * FROM step1_data_urls WHERE org_id = ? ORDER BY id", (db.org_id,))
+    import jira_sync
+    jira_state = await jira_sync.sync_state(db)
+
+    collectors = {
+        "api": _collect_api(org),
+        "urls": _collect_urls([dict(r) for r in url_rows]),
+        "web_search": _collect_web_search(org),
+        "jira": _collect_jira(jira_state["last_updated"] if jira_state else None),
+        "servicenow": _collect_servicenow(),
+    }
+    progress = {name: {"state": "running"} for name in collectors}
+    cursor = await db.execute(
+        "INSERT INTO source_refresh_runs (org_id, status, sources_json) VALUES (?, 'running', ?)",
+        (db.org_id, json.dumps(progress)),
+    )
+    run_id = cursor.lastrowid
+    await db.commit()
+
+    tasks = {asyncio.create_task(_run_source(name, collect)): name for name, collect in collectors.items()}
+    outcomes = {}
+    try:
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name = tasks[task]
+                outcomes[name] = task.result()
+                progress[name] = {"state": outcomes[name][0]["status"], "elapsed_ms": outcomes[name][0]["elapsed_ms"]}
+            await _save_refresh_progress(db, run_id, progress)
+    finally:
+        for task in tasks:
+            task.cancel()  # the client went away: stop whatever is still fetching
+
+    # One writer applies every source's data, in a fixed order, in a single transaction; a
+    # source whose write fails is rolled back to its savepoint without losing the others
+    results = {}
+    async with db.transaction():
+        for name in collectors:
+            result, write = outcomes[name]
+            if write is not None:
+                try:
+                    async with db.transaction():
+                        await write(db)
+                except Exception as e:
+                    logger.error("Writing %s refresh data failed: %s", name, e)
+                    result = {"status": "error", "error": str(e), "elapsed_ms": result["elapsed_ms"]}
+                    progress[name]["state"] = "error"
+            results[name] = result
+    await _save_refresh_progress(db, run_id, progress, status="completed")
+    return {"success": True, "run_id": run_id, "sources": results}
+
+
+@router.get("/refresh-all/status")
+async def refresh_all_status(db=Depends(get_db)):
+    """Per-source progress of the organization's latest refresh-all run."""
+    row = await db.execute_fetchone(
+        "SELECT * FROM source_refresh_runs WHERE org_id = ? ORDER BY id DESC LIMIT 1", (db.org_id,)
+    )
+    if not row:
+        return {"status": "never_run", "sources": {}}
+    return {
+        "run_id": row["id"],
+        "status": row["status"],
+        "sources": json.loads(row["sources_json"] or "{}"),
+        "started_at": str(row["started_at"]),
+        "completed_at": str(row["completed_at"]) if row["completed_at"] else None,
+    }
 
 
 # --- Analysis ---
 
 @router.get("/analysis")
+@cached_response("organization", "revenue_splits", "business_units", "ops_efficiency", "competitors")
 async def get_analysis(db=Depends(get_db)):
     """Return aggregated analysis data including revenue trends, ops benchmarks, competitor comparison, and auto-SWOT."""
-    org_rows = await db.execute_fetchall("SELECT * FROM organization ORDER BY id DESC LIMIT 1")
+    org_rows = await db.execute_fetchall("SELECT * FROM organization WHERE id = ?", (db.org_id,))
     org = dict(org_rows[0]) if org_rows else None
 
     org_name = org["name"] if org else None
@@ -1483,21 +1686,21 @@ async def get_analysis(db=Depends(get_db)):
     # Revenue trends
     revenue_rows = await db.execute_fetchall(
         "SELECT rs.period, rs.dimension_value, rs.revenue, bu.name as business_unit_name "
-        "FROM revenue_splits rs JOIN business_units bu ON rs.business_unit_id = bu.id "
-        "ORDER BY rs.period ASC"
+        "FROM revenue_splits rs JOIN business_units bu ON rs.business_unit_id = bu.id WHERE rs.org_id = ? "
+        "ORDER BY rs.period ASC", (db.org_id,)
     )
     revenue_trends = [dict(r) for r in revenue_rows]
 
     # Ops efficiency
     ops_rows = await db.execute_fetchall(
         "SELECT oe.metric_name, oe.metric_value, oe.target_value, oe.period, bu.name as business_unit_name "
-        "FROM ops_efficiency oe JOIN business_units bu ON oe.business_unit_id = bu.id "
-        "ORDER BY oe.metric_name"
+        "FROM ops_efficiency oe JOIN business_units bu ON oe.business_unit_id = bu.id WHERE oe.org_id = ? "
+        "ORDER BY oe.metric_name", (db.org_id,)
     )
     ops_metrics = [dict(r) for r in ops_rows]
 
     # Competitors
-    comp_rows = await db.execute_fetchall("SELECT * FROM competitors ORDER BY name")
+    comp_rows = await db.execute_fetchall("SELECT * FROM competitors WHERE org_id = ? ORDER BY name", (db.org_id,))
     competitors = [dict(r) for r in comp_rows]
 
     # Build org metrics dict
@@ -1565,7 +1768,7 @@ async def get_analysis(db=Depends(get_db)):
 async def save_analysis_swot(data: dict, db=Depends(get_db)):
     """Save auto-generated SWOT entries to the swot_entries table for Step 3."""
     entries = data.get("entries", [])
-    bu_rows = await db.execute_fetchall("SELECT id FROM business_units LIMIT 1")
+    bu_rows = await db.execute_fetchall("SELECT id FROM business_units WHERE org_id = ? LIMIT 1", (db.org_id,))
     if not bu_rows:
         return {"error": "No business unit exists"}
     bu_id = bu_rows[0]["id"]
@@ -1576,8 +1779,8 @@ async def save_analysis_swot(data: dict, db=Depends(get_db)):
         description = entry.get("description")
         if category and description:
             await db.execute(
-                "INSERT INTO swot_entries (business_unit_id, category, description, data_source, severity, confidence) VALUES (?, ?, ?, ?, ?, ?)",
-                (bu_id, category, description, "Auto-generated from Step 1 Analysis",
+                "INSERT INTO swot_entries (org_id, business_unit_id, category, description, data_source, severity, confidence) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (db.org_id, bu_id, category, description, "Auto-generated from Step 1 Analysis",
                  entry.get("severity", "medium"), entry.get("confidence", "medium")),
             )
             saved += 1
@@ -1761,15 +1964,15 @@ def _generate_auto_swot(org, revenue_trends, ops_metrics, competitors, competito
 
 @router.get("/business-units")
 async def list_business_units(db=Depends(get_db)):
-    rows = await db.execute_fetchall("SELECT * FROM business_units ORDER BY name")
+    rows = await db.execute_fetchall("SELECT * FROM business_units WHERE org_id = ? ORDER BY name", (db.org_id,))
     return [dict(r) for r in rows]
 
 
 @router.post("/business-units")
 async def create_business_unit(data: dict, db=Depends(get_db)):
     cursor = await db.execute(
-        "INSERT INTO business_units (name, description) VALUES (?, ?)",
-        (data["name"], data.get("description")),
+        "INSERT INTO business_units (org_id, name, description) VALUES (?, ?, ?)",
+        (db.org_id, data["name"], data.get("description")),
     )
     await db.commit()
     return {"id": cursor.lastrowid}
@@ -1777,7 +1980,7 @@ async def create_business_unit(data: dict, db=Depends(get_db)):
 
 @router.delete("/business-units/{unit_id}")
 async def delete_business_unit(unit_id: int, db=Depends(get_db)):
-    await db.execute("DELETE FROM business_units WHERE id = ?", (unit_id,))
+    await db.execute("DELETE FROM business_units WHERE id = ? AND org_id = ?", (unit_id, db.org_id))
     await db.commit()
     return {"deleted": True}
 
@@ -1788,7 +1991,7 @@ async def delete_business_unit(unit_id: int, db=Depends(get_db)):
 async def list_revenue_splits(db=Depends(get_db)):
     rows = await db.execute_fetchall(
         "SELECT rs.*, bu.name as business_unit_name FROM revenue_splits rs "
-        "JOIN business_units bu ON rs.business_unit_id = bu.id ORDER BY rs.period DESC"
+        "JOIN business_units bu ON rs.business_unit_id = bu.id WHERE rs.org_id = ? ORDER BY rs.period DESC", (db.org_id,)
     )
     return [dict(r) for r in rows]
 
@@ -1796,9 +1999,9 @@ async def list_revenue_splits(db=Depends(get_db)):
 @router.post("/revenue-splits")
 async def create_revenue_split(data: dict, db=Depends(get_db)):
     cursor = await db.execute(
-        "INSERT INTO revenue_splits (business_unit_id, dimension, dimension_value, revenue, period) "
-        "VALUES (?, ?, ?, ?, ?)",
-        (data["business_unit_id"], data["dimension"], data["dimension_value"], data["revenue"], data["period"]),
+        "INSERT INTO revenue_splits (org_id, business_unit_id, dimension, dimension_value, revenue, period) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        (db.org_id, data["business_unit_id"], data["dimension"], data["dimension_value"], data["revenue"], data["period"]),
     )
     await db.commit()
     return {"id": cursor.lastrowid}
@@ -1810,7 +2013,7 @@ async def create_revenue_split(data: dict, db=Depends(get_db)):
 async def list_ops_efficiency(db=Depends(get_db)):
     rows = await db.execute_fetchall(
         "SELECT oe.*, bu.name as business_unit_name FROM ops_efficiency oe "
-        "JOIN business_units bu ON oe.business_unit_id = bu.id ORDER BY oe.period DESC"
+        "JOIN business_units bu ON oe.business_unit_id = bu.id WHERE oe.org_id = ? ORDER BY oe.period DESC", (db.org_id,)
     )
     return [dict(r) for r in rows]
 
@@ -1818,9 +2021,9 @@ async def list_ops_efficiency(db=Depends(get_db)):
 @router.post("/ops-efficiency")
 async def create_ops_metric(data: dict, db=Depends(get_db)):
     cursor = await db.execute(
-        "INSERT INTO ops_efficiency (business_unit_id, metric_name, metric_value, target_value, period) "
-        "VALUES (?, ?, ?, ?, ?)",
-        (data["business_unit_id"], data["metric_name"], data["metric_value"], data.get("target_value"), data["period"]),
+        "INSERT INTO ops_efficiency (org_id, business_unit_id, metric_name, metric_value, target_value, period) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        (db.org_id, data["business_unit_id"], data["metric_name"], data["metric_value"], data.get("target_value"), data["period"]),
     )
     await db.commit()
     return {"id": cursor.lastrowid}
@@ -1828,19 +2031,23 @@ async def create_ops_metric(data: dict, db=Depends(get_db)):
 
 # --- Competitors ---
 
+COMPETITORS_LIST = ListQuery("competitors", "c", sort=[("c.name", "ASC", str), ("c.id", "ASC", int)])
+
+
 @router.get("/competitors")
-async def list_competitors(db=Depends(get_db)):
-    rows = await db.execute_fetchall("SELECT * FROM competitors ORDER BY name")
-    return [dict(r) for r in rows]
+async def list_competitors(limit: int | None = None, cursor: str | None = None, fields: str | None = None,
+                           db=Depends(get_db)):
+    page = await COMPETITORS_LIST.fetch(db, "c.org_id = ?", [db.org_id], fields, limit, cursor)
+    return page.response()
 
 
 @router.post("/competitors")
 async def create_competitor(data: dict, db=Depends(get_db)):
     cursor = await db.execute(
-        "INSERT INTO competitors (name, ticker, market_share, revenue, profit_margin, operating_margin, "
+        "INSERT INTO competitors (org_id, name, ticker, market_share, revenue, profit_margin, operating_margin, "
         "return_on_equity, return_on_assets, pe_ratio, eps, market_cap_value, strengths, weaknesses, data_source) "
-        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-        (data["name"], data.get("ticker"), data.get("market_share"), data.get("revenue"),
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (db.org_id, data["name"], data.get("ticker"), data.get("market_share"), data.get("revenue"),
          data.get("profit_margin"), data.get("operating_margin"),
          data.get("return_on_equity"), data.get("return_on_assets"),
          data.get("pe_ratio"), data.get("eps"), data.get("market_cap_value"),
@@ -5,6 +5,7 @@ import json
 
 from fastapi import APIRouter, Depends, UploadFile, File
 from database import get_db
+from serialization import FastJSONRoute
 from openai_client import generate_value_stream
 from source_gatherers import (
     gather_app_data,
@@ -20,7 +21,7 @@ from ai_research import is_openai_available, research_value_stream
 from process_parser import parse_process_image, parse_bpmn, is_vision_available
 from url_extractor import extract_from_url
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 
 # ──────────────────────────────────────────────
@@ -31,7 +32,7 @@ router = APIRouter()
 async def list_value_streams(db=Depends(get_db)):
     rows = await db.execute_fetchall(
         "SELECT vs.*, bu.name as business_unit_name FROM value_streams vs "
-        "JOIN business_units bu ON vs.business_unit_id = bu.id"
+        "JOIN business_units bu ON vs.business_unit_id = bu.id WHERE vs.org_id = ?", (db.org_id,)
     )
     return [dict(r) for r in rows]
 
@@ -39,8 +40,8 @@ async def list_value_streams(db=Depends(get_db)):
 @router.post("/value-streams")
 async def create_value_stream(data: dict, db=Depends(get_db)):
     cursor = await db.execute(
-        "INSERT INTO value_streams (business_unit_id, name, description) VALUES (?, ?, ?)",
-        (data["business_unit_id"], data["name"], data.get("description")),
+        "INSERT INTO value_streams (org_id, business_unit_id, name, description) VALUES (?, ?, ?, ?)",
+        (db.org_id, data["business_unit_id"], data["name"], data.get("description")),
     )
     await db.commit()
     return {"id": cursor.lastrowid}
@@ -49,11 +50,11 @@ async def create_value_stream(data: dict, db=Depends(get_db)):
 @router.delete("/value-streams/{vs_id}")
 async def delete_value_stream(vs_id: int, db=Depends(get_db)):
     # Cascade delete child data
-    await db.execute("DELETE FROM value_stream_benchmarks WHERE value_stream_id = ?", (vs_id,))
-    await db.execute("DELETE FROM value_stream_metrics WHERE value_stream_id = ?", (vs_id,))
-    await db.execute("DELETE FROM value_stream_steps WHERE value_stream_id = ?", (vs_id,))
-    await db.execute("DELETE FROM value_stream_levers WHERE value_stream_id = ?", (vs_id,))
-    await db.execute("DELETE FROM value_streams WHERE id = ?", (vs_id,))
+    await db.execute("DELETE FROM value_stream_benchmarks WHERE value_stream_id = ? AND org_id = ?", (vs_id, db.org_id))
+    await db.execute("DELETE FROM value_stream_metrics WHERE value_stream_id = ? AND org_id = ?", (vs_id, db.org_id))
+    await db.execute("DELETE FROM value_stream_steps WHERE value_stream_id = ? AND org_id = ?", (vs_id, db.org_id))
+    await db.execute("DELETE FROM value_stream_levers WHERE value_stream_id = ? AND org_id = ?", (vs_id, db.org_id))
+    await db.execute("DELETE FROM value_streams WHERE id = ? AND org_id = ?", (vs_id, db.org_id))
     await db.commit()
     return {"deleted": True}
 
@@ -65,13 +66,13 @@ async def list_levers(value_stream_id: int = None, db=Depends(get_db)):
     if value_stream_id:
         rows = await db.execute_fetchall(
             "SELECT vl.*, vs.name as value_stream_name FROM value_stream_levers vl "
-            "JOIN value_streams vs ON vl.value_stream_id = vs.id WHERE vl.value_stream_id = ?",
-            (value_stream_id,),
+            "JOIN value_streams vs ON vl.value_stream_id = vs.id WHERE vl.org_id = ? AND vl.value_stream_id = ?",
+            (db.org_id, value_stream_id),
         )
     else:
         rows = await db.execute_fetchall(
             "SELECT vl.*, vs.name as value_stream_name FROM value_stream_levers vl "
-            "JOIN value_streams vs ON vl.value_stream_id = vs.id"
+            "JOIN value_streams vs ON vl.value_stream_id = vs.id WHERE vl.org_id = ?", (db.org_id,)
         )
     return [dict(r) for r in rows]
 
@@ -79,9 +80,9 @@ async def list_levers(value_stream_id: int = None, db=Depends(get_db)):
 @router.post("/levers")
 async def create_lever(data: dict, db=Depends(get_db)):
     cursor = await db.execute(
-        "INSERT INTO value_stream_levers (value_stream_id, lever_type, opportunity, current_state, target_state, impact_estimate) "
-        "VALUES (?, ?, ?, ?, ?, ?)",
-        (data["value_stream_id"], data["lever_type"], data["opportunity"],
+        "INSERT INTO value_stream_levers (org_id, value_stream_id, lever_type, opportunity, current_state, target_state, impact_estimate) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (db.org_id, data["value_stream_id"], data["lever_type"], data["opportunity"],
          data.get("current_state"), data.get("target_state"), data.get("impact_estimate")),
     )
     await db.commit()
@@ -99,7 +100,7 @@ async def generate_vs(data: dict, db=Depends(get_db)):
     business_unit_id = data["business_unit_id"]
 
     # Fetch org info for context
-    org_row = await db.execute_fetchall("SELECT * FROM organization LIMIT 1")
+    org_row = await db.execute_fetchall("SELECT * FROM organization WHERE id = ?", (db.org_id,))
     org = dict(org_row[0]) if org_row else {}
     org_name = org.get("name", "the organization")
     industry = org.get("industry", "general")
@@ -107,8 +108,8 @@ async def generate_vs(data: dict, db=Depends(get_db)):
 
     # Create the value stream record
     cursor = await db.execute(
-        "INSERT INTO value_streams (business_unit_id, name, description) VALUES (?, ?, ?)",
-        (business_unit_id, segment_name, f"Template-generated value stream for {segment_name}"),
+        "INSERT INTO value_streams (org_id, business_unit_id, name, description) VALUES (?, ?, ?, ?)",
+        (db.org_id, business_unit_id, segment_name, f"Template-generated value stream for {segment_name}"),
     )
     vs_id = cursor.lastrowid
 
@@ -121,10 +122,11 @@ async def generate_vs(data: dict, db=Depends(get_db)):
         wt = step.get("wait_time_hours", 0) or 0
         await db.execute(
             "INSERT INTO value_stream_steps "
-            "(value_stream_id, step_order, step_name, description, step_type, "
+            "(org_id, value_stream_id, step_order, step_name, description, step_type, "
             "process_time_hours, wait_time_hours, lead_time_hours, resources, is_bottleneck, notes) "
-            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
             (
+                db.org_id,
                 vs_id,
                 step.get("step_order", 0),
                 step.get("step_name", "Step"),
@@ -143,10 +145,11 @@ async def generate_vs(data: dict, db=Depends(get_db)):
     metrics = result.get("overall_metrics", {})
     await db.execute(
         "INSERT INTO value_stream_metrics "
-        "(value_stream_id, total_lead_time_hours, total_process_time_hours, total_wait_time_hours, "
+        "(org_id, value_stream_id, total_lead_time_hours, total_process_time_hours, total_wait_time_hours, "
         "flow_efficiency, bottleneck_step, bottleneck_reason, data_source) "
-        "VALUES (?, ?, ?, ?, ?, ?, ?, 'template')",
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'template')",
         (
+            db.org_id,
             vs_id,
             metrics.get("total_lead_time_hours", 0),
             metrics.get("total_process_time_hours", 0),
@@ -161,9 +164,10 @@ async def generate_vs(data: dict, db=Depends(get_db)):
     for bm in result.get("competitor_benchmarks", []):
         await db.execute(
             "INSERT INTO value_stream_benchmarks "
-            "(value_stream_id, competitor_name, total_lead_time_hours, total_process_time_hours, "
-            "flow_efficiency, bottleneck_step, notes) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            "(org_id, value_stream_id, competitor_name, total_lead_time_hours, total_process_time_hours, "
+            "flow_efficiency, bottleneck_step, notes) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
             (
+                db.org_id,
                 vs_id,
                 bm.get("competitor_name", "Competitor"),
                 bm.get("total_lead_time_hours"),
@@ -216,8 +220,8 @@ async def upload_vs(business_unit_id: int, file: UploadFile = File(...), db=Depe
     vs_name = file.filename.rsplit(".", 1)[0].replace("_", " ").replace("-", " ").title()
 
     cursor = await db.execute(
-        "INSERT INTO value_streams (business_unit_id, name, description) VALUES (?, ?, ?)",
-        (business_unit_id, vs_name, "Uploaded from file"),
+        "INSERT INTO value_streams (org_id, business_unit_id, name, description) VALUES (?, ?, ?, ?)",
+        (db.org_id, business_unit_id, vs_name, "Uploaded from file"),
     )
     vs_id = cursor.lastrowid
 
@@ -226,10 +230,11 @@ async def upload_vs(business_unit_id: int, file: UploadFile = File(...), db=Depe
         wt = float(step.get("wait_time_hours", 0) or 0)
         await db.execute(
             "INSERT INTO value_stream_steps "
-            "(value_stream_id, step_order, step_name, description, step_type, "
+            "(org_id, value_stream_id, step_order, step_name, description, step_type, "
             "process_time_hours, wait_time_hours, lead_time_hours, resources, is_bottleneck, notes) "
-            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
             (
+                db.org_id,
                 vs_id,
                 step.get("step_order", 0),
                 step.get("step_name", "Step"),
@@ -285,8 +290,8 @@ async def upload_visual(business_unit_id: int, file: UploadFile = File(...), db=
     vs_name = file.filename.rsplit(".", 1)[0].replace("_", " ").replace("-", " ").title()
 
     cursor = await db.execute(
-        "INSERT INTO value_streams (business_unit_id, name, description) VALUES (?, ?, ?)",
-        (business_unit_id, vs_name, f"Extracted from visual upload ({ext})"),
+        "INSERT INTO value_streams (org_id, business_unit_id, name, description) VALUES (?, ?, ?, ?)",
+        (db.org_id, business_unit_id, vs_name, f"Extracted from visual upload ({ext})"),
     )
     vs_id = cursor.lastrowid
 
@@ -295,10 +300,11 @@ async def upload_visual(business_unit_id: int, file: UploadFile = File(...), db=
         wt = float(step.get("wait_time_hours", 0) or 0)
         await db.execute(
             "INSERT INTO value_stream_steps "
-            "(value_stream_id, step_order, step_name, description, step_type, "
+            "(org_id, value_stream_id, step_order, step_name, description, step_type, "
             "process_time_hours, wait_time_hours, lead_time_hours, resources, is_bottleneck, notes) "
-            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
             (
+                db.org_id,
                 vs_id,
                 step.get("step_order", 0),
                 step.get("step_name", "Step"),
@@ -318,7 +324,7 @@ async def upload_visual(business_unit_id: int, file: UploadFile = File(...), db=
 
     # In live mode, persist to RAG knowledge base
     try:
-        from rag_engine import store_document, is_live_mode
+        from rag_engine import PAGE_BREAK, content_hash, store_document, is_live_mode
         if await is_live_mode(db):
             raw_text = ""
             if ext in (".bpmn", ".xml"):
@@ -326,13 +332,14 @@ async def upload_visual(business_unit_id: int, file: UploadFile = File(...), db=
             elif ext == ".pdf":
                 import fitz
                 doc_pdf = fitz.open(stream=content, filetype="pdf")
-                raw_text = "\n".join(page.get_text() for page in doc_pdf).strip()
+                raw_text = PAGE_BREAK.join(page.get_text() for page in doc_pdf).strip()
             if raw_text and len(raw_text.strip()) > 50:
-                org = await db.execute_fetchone("SELECT id FROM organization LIMIT 1")
+                org = await db.execute_fetchone("SELECT id FROM organization WHERE id = ?", (db.org_id,))
                 if org:
                     await store_document(
                         db, org["id"], file.filename, ext.lstrip("."), raw_text,
                         doc_category="value_stream", upload_source="step2_upload", step_number=2,
+                        digest=content_hash(content),
                     )
     except Exception as e:
         import logging
@@ -377,8 +384,8 @@ async def pull_from_url(data: dict, db=Depends(get_db)):
     vs_name = segment_name or url.split("//")[-1].split("/")[0].replace("www.", "").title()
 
     cursor = await db.execute(
-        "INSERT INTO value_streams (business_unit_id, name, description) VALUES (?, ?, ?)",
-        (business_unit_id, vs_name, f"Extracted from URL: {url}"),
+        "INSERT INTO value_streams (org_id, business_unit_id, name, description) VALUES (?, ?, ?, ?)",
+        (db.org_id, business_unit_id, vs_name, f"Extracted from URL: {url}"),
     )
     vs_id = cursor.lastrowid
 
@@ -387,10 +394,11 @@ async def pull_from_url(data: dict, db=Depends(get_db)):
         wt = float(step.get("wait_time_hours", 0) or 0)
         await db.execute(
             "INSERT INTO value_stream_steps "
-            "(value_stream_id, step_order, step_name, description, step_type, "
+            "(org_id, value_stream_id, step_order, step_name, description, step_type, "
             "process_time_hours, wait_time_hours, lead_time_hours, resources, is_bottleneck, notes) "
-            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
             (
+                db.org_id,
                 vs_id,
                 step.get("step_order", 0),
                 step.get("step_name", "Step"),
@@ -428,7 +436,7 @@ GATHERER_MAP = {
     "finnhub": lambda db, segment, industry, org_name, competitors: gather_finnhub_data(org_name, industry, competitors),
     "web_search": lambda db, segment, industry, org_name, competitors: gather_web_search(segment, industry),
     "competitor_operations": lambda db, segment, industry, org_name, competitors: gather_competitor_operations(db, segment, industry, org_name, competitors),
-    "jira": lambda db, segment, industry, org_name, competitors: gather_jira(segment, industry),
+    "jira": lambda db, segment, industry, org_name, competitors: gather_jira(segment, industry, db.org_id),
     "servicenow": lambda db, segment, industry, org_name, competitors: gather_servicenow(segment, industry),
 }
 
@@ -453,7 +461,7 @@ async def pull_from_sources(data: dict, db=Depends(get_db)):
         return {"error": "At least one source is required"}
 
     # Fetch org info
-    org_row = await db.execute_fetchall("SELECT * FROM organization LIMIT 1")
+    org_row = await db.execute_fetchall("SELECT * FROM organization WHERE id = ?", (db.org_id,))
     org = dict(org_row[0]) if org_row else {}
     org_name = org.get("name", "the organization")
     industry = org.get("industry", "general")
@@ -491,15 +499,14 @@ async def pull_from_sources(data: dict, db=Depends(get_db)):
         # Get RAG context in live mode
         rag_context = ""
         try:
-            from rag_engine import build_rag_context, is_live_mode
+            from rag_engine import build_rag_context, context_query, is_live_mode
             if await is_live_mode(db):
-                org_row_rag = await db.execute_fetchone("SELECT id FROM organization LIMIT 1")
+                org_row_rag = await db.execute_fetchone("SELECT id FROM organization WHERE id = ?", (db.org_id,))
                 if org_row_rag:
                     rag_context = await build_rag_context(
                         db,
-                        f"{segment_name} value stream {industry} {org_name} operations process",
                         org_id=org_row_rag["id"],
-                        top_k=8,
+                        **context_query("value_stream", segment=segment_name, industry=industry, org_name=org_name),
                     )
         except Exception:
             pass
@@ -528,8 +535,8 @@ async def pull_from_sources(data: dict, db=Depends(get_db)):
 
     # Create the value stream record
     cursor = await db.execute(
-        "INSERT INTO value_streams (business_unit_id, name, description) VALUES (?, ?, ?)",
-        (business_unit_id, segment_name, f"Generated via pull-sources ({synthesis_method})"),
+        "INSERT INTO value_streams (org_id, business_unit_id, name, description) VALUES (?, ?, ?, ?)",
+        (db.org_id, business_unit_id, segment_name, f"Generated via pull-sources ({synthesis_method})"),
     )
     vs_id = cursor.lastrowid
 
@@ -541,10 +548,11 @@ async def pull_from_sources(data: dict, db=Depends(get_db)):
         wt = step.get("wait_time_hours", 0) or 0
         await db.execute(
             "INSERT INTO value_stream_steps "
-            "(value_stream_id, step_order, step_name, description, step_type, "
+            "(org_id, value_stream_id, step_order, step_name, description, step_type, "
             "process_time_hours, wait_time_hours, lead_time_hours, resources, is_bottleneck, notes) "
-            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
             (
+                db.org_id,
                 vs_id,
                 step.get("step_order", 0),
                 step.get("step_name", "Step"),
@@ -563,10 +571,11 @@ async def pull_from_sources(data: dict, db=Depends(get_db)):
     metrics = result.get("overall_metrics", {})
     await db.execute(
         "INSERT INTO value_stream_metrics "
-        "(value_stream_id, total_lead_time_hours, total_process_time_hours, total_wait_time_hours, "
+        "(org_id, value_stream_id, total_lead_time_hours, total_process_time_hours, total_wait_time_hours, "
         "flow_efficiency, bottleneck_step, bottleneck_reason, data_source) "
-        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
         (
+            db.org_id,
             vs_id,
             metrics.get("total_lead_time_hours", 0),
             metrics.get("total_process_time_hours", 0),
@@ -583,9 +592,10 @@ async def pull_from_sources(data: dict, db=Depends(get_db)):
     for bm in benchmarks:
         await db.execute(
             "INSERT INTO value_stream_benchmarks "
-            "(value_stream_id, competitor_name, total_lead_time_hours, total_process_time_hours, "
-            "flow_efficiency, bottleneck_step, notes) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            "(org_id, value_stream_id, competitor_name, total_lead_time_hours, total_process_time_hours, "
+            "flow_efficiency, bottleneck_step, notes) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
             (
+                db.org_id,
                 vs_id,
                 bm.get("competitor_name", "Competitor"),
                 bm.get("total_lead_time_hours"),
@@ -663,25 +673,25 @@ async def value_stream_detail(vs_id: int, db=Depends(get_db)):
     """Full detail: value stream + steps + metrics + benchmarks."""
     vs_rows = await db.execute_fetchall(
         "SELECT vs.*, bu.name as business_unit_name FROM value_streams vs "
-        "JOIN business_units bu ON vs.business_unit_id = bu.id WHERE vs.id = ?",
-        (vs_id,),
+        "JOIN business_units bu ON vs.business_unit_id = bu.id WHERE vs.org_id = ? AND vs.id = ?",
+        (db.org_id, vs_id),
     )
     if not vs_rows:
         return {"error": "Value stream not found"}
     vs = dict(vs_rows[0])
 
     steps = [dict(r) for r in await db.execute_fetchall(
-        "SELECT * FROM value_stream_steps WHERE value_stream_id = ? ORDER BY step_order",
-        (vs_id,),
+        "SELECT * FROM value_stream_steps WHERE org_id = ? AND value_stream_id = ? ORDER BY step_order",
+        (db.org_id, vs_id),
     )]
 
     metrics_rows = await db.execute_fetchall(
-        "SELECT * FROM value_stream_metrics WHERE value_stream_id = ?", (vs_id,),
+        "SELECT * FROM value_stream_metrics WHERE org_id = ? AND value_stream_id = ?", (db.org_id, vs_id),
     )
     metrics = dict(metrics_rows[0]) if metrics_rows else None
 
     benchmarks = [dict(r) for r in await db.execute_fetchall(
-        "SELECT * FROM value_stream_benchmarks WHERE value_stream_id = ?", (vs_id,),
+        "SELECT * FROM value_stream_benchmarks WHERE org_id = ? AND value_stream_id = ?", (db.org_id, vs_id),
     )]
 
     return {"value_stream": vs, "steps": steps, "metrics": metrics, "benchmarks": benchmarks}
@@ -697,10 +707,11 @@ async def add_step(vs_id: int, data: dict, db=Depends(get_db)):
     wt = float(data.get("wait_time_hours", 0) or 0)
     cursor = await db.execute(
         "INSERT INTO value_stream_steps "
-        "(value_stream_id, step_order, step_name, description, step_type, "
+        "(org_id, value_stream_id, step_order, step_name, description, step_type, "
         "process_time_hours, wait_time_hours, lead_time_hours, resources, is_bottleneck, notes) "
-        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
         (
+            db.org_id,
             vs_id,
             data.get("step_order", 99),
             data.get("step_name", "New Step"),
@@ -739,7 +750,7 @@ async def update_step(vs_id: int, step_id: int, data: dict, db=Depends(get_db)):
     # Recalculate lead_time if time fields changed
     if "process_time_hours" in data or "wait_time_hours" in data:
         # Fetch current values for any missing field
-        row = await db.execute_fetchall("SELECT process_time_hours, wait_time_hours FROM value_stream_steps WHERE id = ?", (step_id,))
+        row = await db.execute_fetchall("SELECT process_time_hours, wait_time_hours FROM value_stream_steps WHERE org_id = ? AND id = ?", (db.org_id, step_id))
         if row:
             cur = dict(row[0])
             pt = float(data.get("process_time_hours", cur["process_time_hours"]) or 0)
@@ -747,15 +758,15 @@ async def update_step(vs_id: int, step_id: int, data: dict, db=Depends(get_db)):
             fields.append("lead_time_hours = ?")
             values.append(pt + wt)
 
-    values.append(step_id)
-    await db.execute(f"UPDATE value_stream_steps SET {', '.join(fields)} WHERE id = ?", values)
+    values.extend([step_id, db.org_id])
+    await db.execute(f"UPDATE value_stream_steps SET {', '.join(fields)} WHERE id = ? AND org_id = ?", values)
     await db.commit()
     return {"updated": True}
 
 
 @router.delete("/value-streams/{vs_id}/steps/{step_id}")
 async def delete_step(vs_id: int, step_id: int, db=Depends(get_db)):
-    await db.execute("DELETE FROM value_stream_steps WHERE id = ? AND value_stream_id = ?", (step_id, vs_id))
+    await db.execute("DELETE FROM value_stream_steps WHERE id = ? AND value_stream_id = ? AND org_id = ?", (step_id, vs_id, db.org_id))
     await db.commit()
     return {"deleted": True}
 
@@ -779,15 +790,15 @@ async def fetch_competitor_benchmarks(vs_id: int, db=Depends(get_db)):
     # Get value stream details
     vs_rows = await db.execute_fetchall(
         "SELECT vs.*, bu.name as business_unit_name FROM value_streams vs "
-        "JOIN business_units bu ON vs.business_unit_id = bu.id WHERE vs.id = ?",
-        (vs_id,),
+        "JOIN business_units bu ON vs.business_unit_id = bu.id WHERE vs.org_id = ? AND vs.id = ?",
+        (db.org_id, vs_id),
     )
     if not vs_rows:
         return {"error": "Value stream not found"}
     vs = dict(vs_rows[0])
 
     # Get org info
-    org_row = await db.execute_fetchall("SELECT * FROM organization LIMIT 1")
+    org_row = await db.execute_fetchall("SELECT * FROM organization WHERE id = ?", (db.org_id,))
     org = dict(org_row[0]) if org_row else {}
     org_name = org.get("name", "the organization")
     industry = org.get("industry", "general")
@@ -795,10 +806,10 @@ async def fetch_competitor_benchmarks(vs_id: int, db=Depends(get_db)):
 
     # Get current steps & metrics
     steps = [dict(r) for r in await db.execute_fetchall(
-        "SELECT * FROM value_stream_steps WHERE value_stream_id = ? ORDER BY step_order", (vs_id,),
+        "SELECT * FROM value_stream_steps WHERE org_id = ? AND value_stream_id = ? ORDER BY step_order", (db.org_id, vs_id),
     )]
     metrics_rows = await db.execute_fetchall(
-        "SELECT * FROM value_stream_metrics WHERE value_stream_id = ?", (vs_id,),
+        "SELECT * FROM value_stream_metrics WHERE org_id = ? AND value_stream_id = ?", (db.org_id, vs_id),
     )
     metrics = dict(metrics_rows[0]) if metrics_rows else {}
 
@@ -807,14 +818,12 @@ async def fetch_competitor_benchmarks(vs_id: int, db=Depends(get_db)):
     # Get RAG context in live mode
     rag_context = ""
     try:
-        from rag_engine import build_rag_context, is_live_mode
+        from rag_engine import build_rag_context, context_query, is_live_mode
         if await is_live_mode(db):
             rag_context = await build_rag_context(
                 db,
-                f"{vs['name']} competitor operations benchmarks {industry}",
                 org_id=org.get("id"),
-                top_k=5,
-                doc_category="competitor",
+                **context_query("competitor_operations", segment=vs["name"], industry=industry),
             )
     except Exception:
         pass
@@ -832,15 +841,16 @@ async def fetch_competitor_benchmarks(vs_id: int, db=Depends(get_db)):
         return {"error": "Failed to generate competitor benchmarks"}
 
     # Clear existing benchmarks and store new ones
-    await db.execute("DELETE FROM value_stream_benchmarks WHERE value_stream_id = ?", (vs_id,))
+    await db.execute("DELETE FROM value_stream_benchmarks WHERE value_stream_id = ? AND org_id = ?", (vs_id, db.org_id))
 
     benchmarks = result.get("benchmarks", [])
     for bm in benchmarks:
         await db.execute(
             "INSERT INTO value_stream_benchmarks "
-            "(value_stream_id, competitor_name, total_lead_time_hours, total_process_time_hours, "
-            "flow_efficiency, bottleneck_step, notes) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            "(org_id, value_stream_id, competitor_name, total_lead_time_hours, total_process_time_hours, "
+            "flow_efficiency, bottleneck_step, notes) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
             (
+                db.org_id,
                 vs_id,
                 bm.get("competitor_name", "Competitor"),
                 bm.get("total_lead_time_hours"),
@@ -884,7 +894,7 @@ async def recalculate(vs_id: int, db=Depends(get_db)):
 async def _recalculate_metrics(vs_id: int, db, data_source: str = "manual") -> dict:
     """Recompute summary metrics from steps."""
     steps = [dict(r) for r in await db.execute_fetchall(
-        "SELECT * FROM value_stream_steps WHERE value_stream_id = ? ORDER BY step_order", (vs_id,),
+        "SELECT * FROM value_stream_steps WHERE org_id = ? AND value_stream_id = ? ORDER BY step_order", (db.org_id, vs_id),
     )]
 
     total_pt = sum(s.get("process_time_hours", 0) or 0 for s in steps)
@@ -905,22 +915,22 @@ async def _recalculate_metrics(vs_id: int, db, data_source: str = "manual") -> d
 
     # Upsert metrics
     existing = await db.execute_fetchall(
-        "SELECT id FROM value_stream_metrics WHERE value_stream_id = ?", (vs_id,),
+        "SELECT id FROM value_stream_metrics WHERE org_id = ? AND value_stream_id = ?", (db.org_id, vs_id),
     )
     if existing:
         await db.execute(
             "UPDATE value_stream_metrics SET total_lead_time_hours=?, total_process_time_hours=?, "
             "total_wait_time_hours=?, flow_efficiency=?, bottleneck_step=?, bottleneck_reason=?, data_source=? "
-            "WHERE value_stream_id = ?",
-            (total_lt, total_pt, total_wt, round(flow_eff, 1), bn_name, bn_reason, data_source, vs_id),
+            "WHERE value_stream_id = ? AND org_id = ?",
+            (total_lt, total_pt, total_wt, round(flow_eff, 1), bn_name, bn_reason, data_source, vs_id, db.org_id),
         )
     else:
         await db.execute(
             "INSERT INTO value_stream_metrics "
-            "(value_stream_id, total_lead_time_hours, total_process_time_hours, total_wait_time_hours, "
+            "(org_id, value_stream_id, total_lead_time_hours, total_process_time_hours, total_wait_time_hours, "
             "flow_efficiency, bottleneck_step, bottleneck_reason, data_source) "
-            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-            (vs_id, total_lt, total_pt, total_wt, round(flow_eff, 1), bn_name, bn_reason, data_source),
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (db.org_id, vs_id, total_lt, total_pt, total_wt, round(flow_eff, 1), bn_name, bn_reason, data_source),
         )
 
     return {
@@ -4,12 +4,15 @@ Step 2b: Customer Personas & Journeys (Enhancement #8).
 
 import json
 import logging
+from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from database import get_db
+from serialization import FastJSONRoute
+from ai_jobs import enqueue_generator
 from ai_research import is_openai_available, extract_list, ensure_str
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 logger = logging.getLogger(__name__)
 
 JOURNEY_STAGES = ["awareness", "consideration", "acquisition", "onboarding", "usage", "retention", "advocacy"]
@@ -17,7 +20,7 @@ JOURNEY_STAGES = ["awareness", "consideration", "acquisition", "onboarding", "us
 
 @router.get("/personas")
 async def get_personas(db=Depends(get_db)):
-    org = await db.execute_fetchone("SELECT id FROM organization LIMIT 1")
+    org = await db.execute_fetchone("SELECT id FROM organization WHERE id = ?", (db.org_id,))
     if not org:
         return []
     rows = await db.execute_fetchall(
@@ -28,7 +31,7 @@ async def get_personas(db=Depends(get_db)):
 
 @router.post("/personas")
 async def create_persona(data: dict, db=Depends(get_db)):
-    org = await db.execute_fetchone("SELECT id FROM organization LIMIT 1")
+    org = await db.execute_fetchone("SELECT id FROM organization WHERE id = ?", (db.org_id,))
     if not org:
         return {"error": "No organization found"}
     await db.execute(
@@ -41,8 +44,8 @@ async def create_persona(data: dict, db=Depends(get_db)):
 
 @router.delete("/personas/{item_id}")
 async def delete_persona(item_id: int, db=Depends(get_db)):
-    await db.execute("DELETE FROM customer_journeys WHERE persona_id = ?", [item_id])
-    await db.execute("DELETE FROM customer_personas WHERE id = ?", [item_id])
+    await db.execute("DELETE FROM customer_journeys WHERE persona_id = ? AND org_id = ?", [item_id, db.org_id])
+    await db.execute("DELETE FROM customer_personas WHERE id = ? AND org_id = ?", [item_id, db.org_id])
     await db.commit()
     return {"deleted": True}
 
@@ -51,19 +54,19 @@ async def delete_persona(item_id: int, db=Depends(get_db)):
 async def get_journeys(persona_id: int = None, db=Depends(get_db)):
     if persona_id:
         rows = await db.execute_fetchall(
-            "SELECT * FROM customer_journeys WHERE persona_id = ? ORDER BY stage", [persona_id]
+            "SELECT * FROM customer_journeys WHERE org_id = ? AND persona_id = ? ORDER BY stage", [db.org_id, persona_id]
         )
     else:
-        rows = await db.execute_fetchall("SELECT * FROM customer_journeys ORDER BY persona_id, stage")
+        rows = await db.execute_fetchall("SELECT * FROM customer_journeys WHERE org_id = ? ORDER BY persona_id, stage", (db.org_id,))
     return [dict(r) for r in rows]
 
 
 @router.post("/journeys")
 async def create_journey(data: dict, db=Depends(get_db)):
     await db.execute(
-        "INSERT INTO customer_journeys (persona_id, stage, touchpoint, channel, emotion_score, pain_point, opportunity) "
-        "VALUES (?, ?, ?, ?, ?, ?, ?)",
-        [data.get("persona_id"), data.get("stage"), data.get("touchpoint", ""),
+        "INSERT INTO customer_journeys (org_id, persona_id, stage, touchpoint, channel, emotion_score, pain_point, opportunity) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        [db.org_id, data.get("persona_id"), data.get("stage"), data.get("touchpoint", ""),
          data.get("channel", ""), data.get("emotion_score", 0),
          data.get("pain_point", ""), data.get("opportunity", "")],
     )
@@ -73,14 +76,16 @@ async def create_journey(data: dict, db=Depends(get_db)):
 
 @router.delete("/journeys/{item_id}")
 async def delete_journey(item_id: int, db=Depends(get_db)):
-    await db.execute("DELETE FROM customer_journeys WHERE id = ?", [item_id])
+    await db.execute("DELETE FROM customer_journeys WHERE id = ? AND org_id = ?", [item_id, db.org_id])
     await db.commit()
     return {"deleted": True}
 
 
 @router.post("/journeys/ai-generate")
-async def ai_generate_journeys(db=Depends(get_db)):
+async def ai_generate_journeys(db=Depends(get_db), run_async: Annotated[bool, Query(alias="async")] = False):
     """AI-generate customer personas and journey maps."""
+    if run_async:
+        return await enqueue_generator(db, "journeys")
     import traceback
     try:
         return await _ai_generate_journeys_impl(db)
@@ -90,7 +95,7 @@ async def ai_generate_journeys(db=Depends(get_db)):
 
 
 async def _ai_generate_journeys_impl(db):
-    org = await db.execute_fetchone("SELECT * FROM organization LIMIT 1")
+    org = await db.execute_fetchone("SELECT * FROM organization WHERE id = ?", (db.org_id,))
     if not org:
         return {"error": "No organization found"}
     org_id = org["id"]
@@ -113,9 +118,9 @@ async def _ai_generate_journeys_impl(db):
             pid = cursor.lastrowid
             for stage in JOURNEY_STAGES:
                 await db.execute(
-                    "INSERT INTO customer_journeys (persona_id, stage, touchpoint, channel, emotion_score, pain_point, opportunity, ai_generated, ai_confidence) "
-                    "VALUES (?, ?, 'TBD', 'digital', 0, 'Assessment pending', 'Analysis pending', 1, 50)",
-                    [pid, stage],
+                    "INSERT INTO customer_journeys (org_id, persona_id, stage, touchpoint, channel, emotion_score, pain_point, opportunity, ai_generated, ai_confidence) "
+                    "VALUES (?, ?, ?, 'TBD', 'digital', 0, 'Assessment pending', 'Analysis pending', 1, 50)",
+                    [db.org_id, pid, stage],
                 )
                 count += 1
         await db.commit()
@@ -152,9 +157,9 @@ Return JSON: {{
         personas_count += 1
         for j in p.get("journey", []):
             await db.execute(
-                "INSERT INTO customer_journeys (persona_id, stage, touchpoint, channel, emotion_score, pain_point, opportunity, ai_generated, ai_confidence) "
-                "VALUES (?, ?, ?, ?, ?, ?, ?, 1, ?)",
-                [pid, ensure_str(j.get("stage", "")), ensure_str(j.get("touchpoint", "")), ensure_str(j.get("channel", "")),
+                "INSERT INTO customer_journeys (org_id, persona_id, stage, touchpoint, channel, emotion_score, pain_point, opportunity, ai_generated, ai_confidence) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1, ?)",
+                [db.org_id, pid, ensure_str(j.get("stage", "")), ensure_str(j.get("touchpoint", "")), ensure_str(j.get("channel", "")),
                  j.get("emotion_score", 0), ensure_str(j.get("pain_point", "")), ensure_str(j.get("opportunity", "")),
                  j.get("confidence", 70)],
             )
@@ -1,34 +1,39 @@
 from fastapi import APIRouter, Depends
 from database import get_db
+from serialization import FastJSONRoute
+from pagination import ListQuery
 from routers.step1_performance import _generate_auto_swot
 from ai_research import is_openai_available
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 
 # --- SWOT ---
 
+SWOT_LIST = ListQuery(
+    "swot_entries", "s",
+    joins="JOIN business_units bu ON s.business_unit_id = bu.id",
+    computed={"business_unit_name": "bu.name"},
+    sort=[("s.category", "ASC", str), ("s.id", "ASC", int)],
+)
+
+
 @router.get("/swot")
-async def list_swot(business_unit_id: int = None, db=Depends(get_db)):
+async def list_swot(business_unit_id: int = None, limit: int | None = None, cursor: str | None = None,
+                    fields: str | None = None, db=Depends(get_db)):
+    where, params = "s.org_id = ?", [db.org_id]
     if business_unit_id:
-        rows = await db.execute_fetchall(
-            "SELECT s.*, bu.name as business_unit_name FROM swot_entries s "
-            "JOIN business_units bu ON s.business_unit_id = bu.id WHERE s.business_unit_id = ?",
-            (business_unit_id,),
-        )
-    else:
-        rows = await db.execute_fetchall(
-            "SELECT s.*, bu.name as business_unit_name FROM swot_entries s "
-            "JOIN business_units bu ON s.business_unit_id = bu.id ORDER BY s.category"
-        )
-    return [dict(r) for r in rows]
+        where += " AND s.business_unit_id = ?"
+        params.append(business_unit_id)
+    page = await SWOT_LIST.fetch(db, where, params, fields, limit, cursor)
+    return page.response()
 
 
 @router.post("/swot")
 async def create_swot_entry(data: dict, db=Depends(get_db)):
     cursor = await db.execute(
-        "INSERT INTO swot_entries (business_unit_id, category, description, data_source, severity, confidence) VALUES (?, ?, ?, ?, ?, ?)",
-        (data["business_unit_id"], data["category"], data["description"],
+        "INSERT INTO swot_entries (org_id, business_unit_id, category, description, data_source, severity, confidence) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (db.org_id, data["business_unit_id"], data["category"], data["description"],
          data.get("data_source"), data.get("severity", "medium"), data.get("confidence", "medium")),
     )
     await db.commit()
@@ -39,10 +44,10 @@ async def create_swot_entry(data: dict, db=Depends(get_db)):
 async def delete_swot_entry(entry_id: int, db=Depends(get_db)):
     # Delete any TOWS actions that reference this SWOT entry first (FK constraint)
     await db.execute(
-        "DELETE FROM tows_actions WHERE swot_entry_1_id = ? OR swot_entry_2_id = ?",
-        (entry_id, entry_id),
+        "DELETE FROM tows_actions WHERE org_id = ? AND (swot_entry_1_id = ? OR swot_entry_2_id = ?)",
+        (db.org_id, entry_id, entry_id),
     )
-    await db.execute("DELETE FROM swot_entries WHERE id = ?", (entry_id,))
+    await db.execute("DELETE FROM swot_entries WHERE id = ? AND org_id = ?", (entry_id, db.org_id))
     await db.commit()
     return {"deleted": True}
 
@@ -56,8 +61,8 @@ async def list_tows(db=Depends(get_db)):
         "s2.description as swot_2, s2.category as swot_2_cat "
         "FROM tows_actions t "
         "JOIN swot_entries s1 ON t.swot_entry_1_id = s1.id "
-        "JOIN swot_entries s2 ON t.swot_entry_2_id = s2.id "
-        "ORDER BY t.impact_score DESC, t.priority DESC"
+        "JOIN swot_entries s2 ON t.swot_entry_2_id = s2.id WHERE t.org_id = ? "
+        "ORDER BY t.impact_score DESC, t.priority DESC", (db.org_id,)
     )
     return [dict(r) for r in rows]
 
@@ -65,9 +70,9 @@ async def list_tows(db=Depends(get_db)):
 @router.post("/tows")
 async def create_tows_action(data: dict, db=Depends(get_db)):
     cursor = await db.execute(
-        "INSERT INTO tows_actions (strategy_type, swot_entry_1_id, swot_entry_2_id, action_description, priority, impact_score, rationale) "
-        "VALUES (?, ?, ?, ?, ?, ?, ?)",
-        (data["strategy_type"], data["swot_entry_1_id"], data["swot_entry_2_id"],
+        "INSERT INTO tows_actions (org_id, strategy_type, swot_entry_1_id, swot_entry_2_id, action_description, priority, impact_score, rationale) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (db.org_id, data["strategy_type"], data["swot_entry_1_id"], data["swot_entry_2_id"],
          data["action_description"], data.get("priority"),
          data.get("impact_score", 5), data.get("rationale")),
     )
@@ -86,19 +91,20 @@ async def auto_generate(data: dict, db=Depends(get_db)):
 
     # 1. Cleanup: delete TOWS referencing auto-generated SWOT, then delete those SWOT entries
     auto_ids = await db.execute_fetchall(
-        "SELECT id FROM swot_entries WHERE data_source LIKE 'Auto-generated%' AND business_unit_id = ?",
-        (business_unit_id,),
+        "SELECT id FROM swot_entries WHERE org_id = ? AND data_source LIKE 'Auto-generated%' AND business_unit_id = ?",
+        (db.org_id, business_unit_id),
     )
     auto_id_list = [r["id"] for r in auto_ids]
     if auto_id_list:
         placeholders = ",".join("?" * len(auto_id_list))
         await db.execute(
-            f"DELETE FROM tows_actions WHERE swot_entry_1_id IN ({placeholders}) OR swot_entry_2_id IN ({placeholders})",
-            auto_id_list + auto_id_list,
+            f"DELETE FROM tows_actions WHERE org_id = ? AND "
+            f"(swot_entry_1_id IN ({placeholders}) OR swot_entry_2_id IN ({placeholders}))",
+            [db.org_id] + auto_id_list + auto_id_list,
         )
         await db.execute(
-            f"DELETE FROM swot_entries WHERE id IN ({placeholders})",
-            auto_id_list,
+            f"DELETE FROM swot_entries WHERE org_id = ? AND id IN ({placeholders})",
+            [db.org_id] + auto_id_list,
         )
 
     # 2. Try AI-powered generation first
@@ -125,9 +131,9 @@ async def auto_generate(data: dict, db=Depends(get_db)):
                         data_source_label = entry.get("data_source", "AI-generated") if isinstance(entry, dict) else "AI-generated"
 
                         cursor = await db.execute(
-                            "INSERT INTO swot_entries (business_unit_id, category, description, data_source, severity, confidence) "
-                            "VALUES (?, ?, ?, ?, ?, ?)",
-                            (business_unit_id, db_cat, desc,
+                            "INSERT INTO swot_entries (org_id, business_unit_id, category, description, data_source, severity, confidence) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            (db.org_id, business_unit_id, db_cat, desc,
                              f"Auto-generated (AI) — {data_source_label}",
                              severity, confidence),
                         )
@@ -163,23 +169,23 @@ async def auto_generate(data: dict, db=Depends(get_db)):
             pass  # Fall through to rule-based
 
     # 3. Rule-based fallback: Step 1 Financial SWOT
-    org_rows = await db.execute_fetchall("SELECT * FROM organization ORDER BY id DESC LIMIT 1")
+    org_rows = await db.execute_fetchall("SELECT * FROM organization WHERE id = ?", (db.org_id,))
     org = dict(org_rows[0]) if org_rows else None
     org_name = org["name"] if org else None
 
     revenue_rows = await db.execute_fetchall(
         "SELECT rs.period, rs.dimension_value, rs.revenue, bu.name as business_unit_name "
-        "FROM revenue_splits rs JOIN business_units bu ON rs.business_unit_id = bu.id ORDER BY rs.period ASC"
+        "FROM revenue_splits rs JOIN business_units bu ON rs.business_unit_id = bu.id WHERE rs.org_id = ? ORDER BY rs.period ASC", (db.org_id,)
     )
     revenue_trends = [dict(r) for r in revenue_rows]
 
     ops_rows = await db.execute_fetchall(
         "SELECT oe.metric_name, oe.metric_value, oe.target_value, oe.period, bu.name as business_unit_name "
-        "FROM ops_efficiency oe JOIN business_units bu ON oe.business_unit_id = bu.id ORDER BY oe.metric_name"
+        "FROM ops_efficiency oe JOIN business_units bu ON oe.business_unit_id = bu.id WHERE oe.org_id = ? ORDER BY oe.metric_name", (db.org_id,)
     )
     ops_metrics = [dict(r) for r in ops_rows]
 
-    comp_rows = await db.execute_fetchall("SELECT * FROM competitors ORDER BY name")
+    comp_rows = await db.execute_fetchall("SELECT * FROM competitors WHERE org_id = ? ORDER BY name", (db.org_id,))
     competitors = [dict(r) for r in comp_rows]
 
     org_metrics = {}
@@ -205,8 +211,8 @@ async def auto_generate(data: dict, db=Depends(get_db)):
     try:
         from source_gatherers import gather_industry_benchmarks
         vs_rows = await db.execute_fetchall(
-            "SELECT name FROM value_streams WHERE business_unit_id = ? LIMIT 1",
-            (business_unit_id,),
+            "SELECT name FROM value_streams WHERE org_id = ? AND business_unit_id = ? LIMIT 1",
+            (db.org_id, business_unit_id),
         )
         segment = dict(vs_rows[0])["name"] if vs_rows else "general"
         industry = org.get("industry", "") if org else ""
@@ -237,9 +243,9 @@ async def auto_generate(data: dict, db=Depends(get_db)):
             confidence = entry.get("confidence", "medium") if isinstance(entry, dict) else "medium"
 
             cursor = await db.execute(
-                "INSERT INTO swot_entries (business_unit_id, category, description, data_source, severity, confidence) "
-                "VALUES (?, ?, ?, ?, ?, ?)",
-                (business_unit_id, category, desc, "Auto-generated from Step 1", severity, confidence),
+                "INSERT INTO swot_entries (org_id, business_unit_id, category, description, data_source, severity, confidence) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (db.org_id, business_unit_id, category, desc, "Auto-generated from Step 1", severity, confidence),
             )
             all_inserted[category].append({"id": cursor.lastrowid, "description": desc})
             step1_count += 1
@@ -256,9 +262,9 @@ async def auto_generate(data: dict, db=Depends(get_db)):
             confidence = entry.get("confidence", "medium") if isinstance(entry, dict) else "medium"
 
             cursor = await db.execute(
-                "INSERT INTO swot_entries (business_unit_id, category, description, data_source, severity, confidence) "
-                "VALUES (?, ?, ?, ?, ?, ?)",
-                (business_unit_id, category, desc, "Auto-generated from Step 2", severity, confidence),
+                "INSERT INTO swot_entries (org_id, business_unit_id, category, description, data_source, severity, confidence) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (db.org_id, business_unit_id, category, desc, "Auto-generated from Step 2", severity, confidence),
             )
             all_inserted[category].append({"id": cursor.lastrowid, "description": desc})
             step2_count += 1
@@ -331,9 +337,9 @@ async def _store_ai_tows(db, ai_tows: list[dict], swot_inserted: dict) -> int:
             continue  # Can't store without valid SWOT entry IDs
 
         await db.execute(
-            "INSERT INTO tows_actions (strategy_type, swot_entry_1_id, swot_entry_2_id, "
-            "action_description, priority, impact_score, rationale) VALUES (?, ?, ?, ?, ?, ?, ?)",
-            (stype, swot_1_id, swot_2_id,
+            "INSERT INTO tows_actions (org_id, strategy_type, swot_entry_1_id, swot_entry_2_id, "
+            "action_description, priority, impact_score, rationale) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (db.org_id, stype, swot_1_id, swot_2_id,
              action.get("action_description", "Strategic action"),
              action.get("priority", "medium"),
              action.get("impact_score", 5),
@@ -360,8 +366,8 @@ async def _generate_vsm_swot(db, business_unit_id: int, benchmarks=None) -> dict
 
     # Get all value streams for this business unit
     vs_rows = await db.execute_fetchall(
-        "SELECT vs.id, vs.name FROM value_streams vs WHERE vs.business_unit_id = ?",
-        (business_unit_id,),
+        "SELECT vs.id, vs.name FROM value_streams vs WHERE vs.org_id = ? AND vs.business_unit_id = ?",
+        (db.org_id, business_unit_id),
     )
 
     for vs in vs_rows:
@@ -370,7 +376,7 @@ async def _generate_vsm_swot(db, business_unit_id: int, benchmarks=None) -> dict
 
         # Fetch metrics
         metrics_rows = await db.execute_fetchall(
-            "SELECT * FROM value_stream_metrics WHERE value_stream_id = ?", (vs_id,),
+            "SELECT * FROM value_stream_metrics WHERE org_id = ? AND value_stream_id = ?", (db.org_id, vs_id),
         )
         if not metrics_rows:
             continue
@@ -408,7 +414,7 @@ async def _generate_vsm_swot(db, business_unit_id: int, benchmarks=None) -> dict
 
         # Fetch benchmarks for competitor comparison
         vs_benchmarks = [dict(r) for r in await db.execute_fetchall(
-            "SELECT * FROM value_stream_benchmarks WHERE value_stream_id = ?", (vs_id,),
+            "SELECT * FROM value_stream_benchmarks WHERE org_id = ? AND value_stream_id = ?", (db.org_id, vs_id),
         )]
 
         if vs_benchmarks:
@@ -437,8 +443,8 @@ async def _generate_vsm_swot(db, business_unit_id: int, benchmarks=None) -> dict
 
         # Fetch levers as opportunities
         levers = [dict(r) for r in await db.execute_fetchall(
-            "SELECT * FROM value_stream_levers WHERE value_stream_id = ? AND impact_estimate = 'high'",
-            (vs_id,),
+            "SELECT * FROM value_stream_levers WHERE org_id = ? AND value_stream_id = ? AND impact_estimate = 'high'",
+            (db.org_id, vs_id),
         )]
         for lever in levers:
             opportunities.append({"description": f"{vs_name}: {lever['opportunity']}",
@@ -506,9 +512,9 @@ async def _generate_tows_actions(db, swot_entries: dict) -> int:
             o_area = _extract_key_area(o["description"])
             action = f"Leverage {s_area} to capitalize on {o_area}"
             await db.execute(
-                "INSERT INTO tows_actions (strategy_type, swot_entry_1_id, swot_entry_2_id, action_description, priority, impact_score, rationale) "
-                "VALUES (?, ?, ?, ?, ?, ?, ?)",
-                ("SO", s["id"], o["id"], action, "high", 7, f"Pairing strength ({s_area}) with opportunity ({o_area})"),
+                "INSERT INTO tows_actions (org_id, strategy_type, swot_entry_1_id, swot_entry_2_id, action_description, priority, impact_score, rationale) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (db.org_id, "SO", s["id"], o["id"], action, "high", 7, f"Pairing strength ({s_area}) with opportunity ({o_area})"),
             )
             count += 1
 
@@ -522,9 +528,9 @@ async def _generate_tows_actions(db, swot_entries: dict) -> int:
             impact = 8 if is_bottleneck else 5
             action = f"Address {w_area} by leveraging {o_area}"
             await db.execute(
-                "INSERT INTO tows_actions (strategy_type, swot_entry_1_id, swot_entry_2_id, action_description, priority, impact_score, rationale) "
-                "VALUES (?, ?, ?, ?, ?, ?, ?)",
-                ("WO", w["id"], o["id"], action, priority, impact, f"Addressing weakness ({w_area}) through opportunity ({o_area})"),
+                "INSERT INTO tows_actions (org_id, strategy_type, swot_entry_1_id, swot_entry_2_id, action_description, priority, impact_score, rationale) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (db.org_id, "WO", w["id"], o["id"], action, priority, impact, f"Addressing weakness ({w_area}) through opportunity ({o_area})"),
             )
             count += 1
 
@@ -535,9 +541,9 @@ async def _generate_tows_actions(db, swot_entries: dict) -> int:
             t_area = _extract_key_area(t["description"])
             action = f"Deploy {s_area} to counter {t_area}"
             await db.execute(
-                "INSERT INTO tows_actions (strategy_type, swot_entry_1_id, swot_entry_2_id, action_description, priority, impact_score, rationale) "
-                "VALUES (?, ?, ?, ?, ?, ?, ?)",
-                ("ST", s["id"], t["id"], action, "high", 6, f"Using strength ({s_area}) to mitigate threat ({t_area})"),
+                "INSERT INTO tows_actions (org_id, strategy_type, swot_entry_1_id, swot_entry_2_id, action_description, priority, impact_score, rationale) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (db.org_id, "ST", s["id"], t["id"], action, "high", 6, f"Using strength ({s_area}) to mitigate threat ({t_area})"),
             )
             count += 1
 
@@ -548,9 +554,9 @@ async def _generate_tows_actions(db, swot_entries: dict) -> int:
             t_area = _extract_key_area(t["description"])
             action = f"Minimize {t_area} exposure while addressing {w_area}"
             await db.execute(
-                "INSERT INTO tows_actions (strategy_type, swot_entry_1_id, swot_entry_2_id, action_description, priority, impact_score, rationale) "
-                "VALUES (?, ?, ?, ?, ?, ?, ?)",
-                ("WT", w["id"], t["id"], action, "medium", 4, f"Risk mitigation: addressing {w_area} while defending against {t_area}"),
+                "INSERT INTO tows_actions (org_id, strategy_type, swot_entry_1_id, swot_entry_2_id, action_description, priority, impact_score, rationale) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (db.org_id, "WT", w["id"], t["id"], action, "medium", 4, f"Risk mitigation: addressing {w_area} while defending against {t_area}"),
             )
             count += 1
 
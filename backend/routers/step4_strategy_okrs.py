@@ -1,12 +1,13 @@
 from fastapi import APIRouter, Depends
 from database import get_db
+from serialization import FastJSONRoute
 from datetime import datetime
 from ai_research import is_openai_available, ensure_str
 import logging, traceback
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 
 def _safe_float(val, default=None):
@@ -23,7 +24,7 @@ def _safe_float(val, default=None):
 
 @router.get("/inputs")
 async def list_inputs(db=Depends(get_db)):
-    rows = await db.execute_fetchall("SELECT * FROM strategy_inputs ORDER BY input_type, created_at")
+    rows = await db.execute_fetchall("SELECT * FROM strategy_inputs WHERE org_id = ? ORDER BY input_type, created_at", (db.org_id,))
     return [dict(r) for r in rows]
 
 
@@ -39,19 +40,19 @@ async def create_or_upsert_input(data: dict, db=Depends(get_db)):
                        'gen_ai_strategy', 'ongoing_initiatives']
     if input_type in singleton_types:
         existing = await db.execute_fetchall(
-            "SELECT id FROM strategy_inputs WHERE input_type = ?", (input_type,)
+            "SELECT id FROM strategy_inputs WHERE org_id = ? AND input_type = ?", (db.org_id, input_type)
         )
         if existing:
             await db.execute(
-                "UPDATE strategy_inputs SET content = ?, title = ?, file_name = ? WHERE input_type = ?",
-                (content, title, file_name, input_type),
+                "UPDATE strategy_inputs SET content = ?, title = ?, file_name = ? WHERE input_type = ? AND org_id = ?",
+                (content, title, file_name, input_type, db.org_id),
             )
             await db.commit()
             return {"id": dict(existing[0])["id"], "updated": True}
 
     cursor = await db.execute(
-        "INSERT INTO strategy_inputs (input_type, title, content, file_name) VALUES (?, ?, ?, ?)",
-        (input_type, title, content, file_name),
+        "INSERT INTO strategy_inputs (org_id, input_type, title, content, file_name) VALUES (?, ?, ?, ?, ?)",
+        (db.org_id, input_type, title, content, file_name),
     )
     await db.commit()
     return {"id": cursor.lastrowid}
@@ -59,7 +60,7 @@ async def create_or_upsert_input(data: dict, db=Depends(get_db)):
 
 @router.delete("/inputs/{input_id}")
 async def delete_input(input_id: int, db=Depends(get_db)):
-    await db.execute("DELETE FROM strategy_inputs WHERE id = ?", (input_id,))
+    await db.execute("DELETE FROM strategy_inputs WHERE id = ? AND org_id = ?", (input_id, db.org_id))
     await db.commit()
     return {"deleted": True}
 
@@ -68,23 +69,23 @@ async def delete_input(input_id: int, db=Depends(get_db)):
 
 @router.get("/data-sources")
 async def check_data_sources(db=Depends(get_db)):
-    org = await db.execute_fetchall("SELECT COUNT(*) as c FROM organization")
+    org = await db.execute_fetchall("SELECT COUNT(*) as c FROM organization WHERE id = ?", (db.org_id,))
     org_count = dict(org[0])["c"]
 
-    streams = await db.execute_fetchall("SELECT COUNT(*) as c FROM value_streams")
+    streams = await db.execute_fetchall("SELECT COUNT(*) as c FROM value_streams WHERE org_id = ?", (db.org_id,))
     stream_count = dict(streams[0])["c"]
 
-    swot = await db.execute_fetchall("SELECT COUNT(*) as c FROM swot_entries")
+    swot = await db.execute_fetchall("SELECT COUNT(*) as c FROM swot_entries WHERE org_id = ?", (db.org_id,))
     swot_count = dict(swot[0])["c"]
 
-    tows = await db.execute_fetchall("SELECT COUNT(*) as c FROM tows_actions")
+    tows = await db.execute_fetchall("SELECT COUNT(*) as c FROM tows_actions WHERE org_id = ?", (db.org_id,))
     tows_count = dict(tows[0])["c"]
 
-    inputs = await db.execute_fetchall("SELECT COUNT(*) as c FROM strategy_inputs")
+    inputs = await db.execute_fetchall("SELECT COUNT(*) as c FROM strategy_inputs WHERE org_id = ?", (db.org_id,))
     input_count = dict(inputs[0])["c"]
 
     input_types = await db.execute_fetchall(
-        "SELECT DISTINCT input_type FROM strategy_inputs"
+        "SELECT DISTINCT input_type FROM strategy_inputs WHERE org_id = ?", (db.org_id,)
     )
     input_type_list = [dict(r)["input_type"] for r in input_types]
 
@@ -109,15 +110,15 @@ async def check_data_sources(db=Depends(get_db)):
 
 @router.get("/strategies")
 async def list_strategies(db=Depends(get_db)):
-    rows = await db.execute_fetchall("SELECT * FROM strategies ORDER BY layer")
+    rows = await db.execute_fetchall("SELECT * FROM strategies WHERE org_id = ? ORDER BY layer", (db.org_id,))
     return [dict(r) for r in rows]
 
 
 @router.post("/strategies")
 async def create_strategy(data: dict, db=Depends(get_db)):
     cursor = await db.execute(
-        "INSERT INTO strategies (layer, name, description, tows_action_id, risk_level, risks) VALUES (?, ?, ?, ?, ?, ?)",
-        (data["layer"], data["name"], data.get("description"), data.get("tows_action_id"),
+        "INSERT INTO strategies (org_id, layer, name, description, tows_action_id, risk_level, risks) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (db.org_id, data["layer"], data["name"], data.get("description"), data.get("tows_action_id"),
          data.get("risk_level", "medium"), data.get("risks")),
     )
     await db.commit()
@@ -133,8 +134,8 @@ async def update_strategy(strategy_id: int, data: dict, db=Depends(get_db)):
             fields.append(f"{key} = ?")
             values.append(data[key])
     if fields:
-        values.append(strategy_id)
-        await db.execute(f"UPDATE strategies SET {', '.join(fields)} WHERE id = ?", values)
+        values.extend([strategy_id, db.org_id])
+        await db.execute(f"UPDATE strategies SET {', '.join(fields)} WHERE id = ? AND org_id = ?", values)
         await db.commit()
     return {"updated": True}
 
@@ -142,15 +143,15 @@ async def update_strategy(strategy_id: int, data: dict, db=Depends(get_db)):
 @router.delete("/strategies/{strategy_id}")
 async def delete_strategy(strategy_id: int, db=Depends(get_db)):
     # Cascade: nullify initiative refs -> delete key results -> OKRs -> strategy
-    await db.execute("UPDATE initiatives SET strategy_id = NULL WHERE strategy_id = ?", (strategy_id,))
+    await db.execute("UPDATE initiatives SET strategy_id = NULL WHERE strategy_id = ? AND org_id = ?", (strategy_id, db.org_id))
     okrs = await db.execute_fetchall(
-        "SELECT id FROM strategic_okrs WHERE strategy_id = ?", (strategy_id,)
+        "SELECT id FROM strategic_okrs WHERE org_id = ? AND strategy_id = ?", (db.org_id, strategy_id)
     )
     for okr in okrs:
         okr_id = dict(okr)["id"]
-        await db.execute("DELETE FROM strategic_key_results WHERE okr_id = ?", (okr_id,))
-    await db.execute("DELETE FROM strategic_okrs WHERE strategy_id = ?", (strategy_id,))
-    await db.execute("DELETE FROM strategies WHERE id = ?", (strategy_id,))
+        await db.execute("DELETE FROM strategic_key_results WHERE okr_id = ? AND org_id = ?", (okr_id, db.org_id))
+    await db.execute("DELETE FROM strategic_okrs WHERE strategy_id = ? AND org_id = ?", (strategy_id, db.org_id))
+    await db.execute("DELETE FROM strategies WHERE id = ? AND org_id = ?", (strategy_id, db.org_id))
     await db.commit()
     return {"deleted": True}
 
@@ -161,7 +162,7 @@ async def delete_strategy(strategy_id: int, db=Depends(get_db)):
 async def list_strategic_okrs(db=Depends(get_db)):
     rows = await db.execute_fetchall(
         "SELECT o.*, s.name as strategy_name, s.layer as strategy_layer "
-        "FROM strategic_okrs o JOIN strategies s ON o.strategy_id = s.id"
+        "FROM strategic_okrs o JOIN strategies s ON o.strategy_id = s.id WHERE o.org_id = ?", (db.org_id,)
     )
     return [dict(r) for r in rows]
 
@@ -169,8 +170,8 @@ async def list_strategic_okrs(db=Depends(get_db)):
 @router.post("/okrs")
 async def create_strategic_okr(data: dict, db=Depends(get_db)):
     cursor = await db.execute(
-        "INSERT INTO strategic_okrs (strategy_id, objective, time_horizon, status) VALUES (?, ?, ?, ?)",
-        (data["strategy_id"], data["objective"], data.get("time_horizon"), data.get("status", "draft")),
+        "INSERT INTO strategic_okrs (org_id, strategy_id, objective, time_horizon, status) VALUES (?, ?, ?, ?, ?)",
+        (db.org_id, data["strategy_id"], data["objective"], data.get("time_horizon"), data.get("status", "draft")),
     )
     await db.commit()
     return {"id": cursor.lastrowid}
@@ -185,16 +186,16 @@ async def update_strategic_okr(okr_id: int, data: dict, db=Depends(get_db)):
             fields.append(f"{key} = ?")
             values.append(data[key])
     if fields:
-        values.append(okr_id)
-        await db.execute(f"UPDATE strategic_okrs SET {', '.join(fields)} WHERE id = ?", values)
+        values.extend([okr_id, db.org_id])
+        await db.execute(f"UPDATE strategic_okrs SET {', '.join(fields)} WHERE id = ? AND org_id = ?", values)
         await db.commit()
     return {"updated": True}
 
 
 @router.delete("/okrs/{okr_id}")
 async def delete_okr(okr_id: int, db=Depends(get_db)):
-    await db.execute("DELETE FROM strategic_key_results WHERE okr_id = ?", (okr_id,))
-    await db.execute("DELETE FROM strategic_okrs WHERE id = ?", (okr_id,))
+    await db.execute("DELETE FROM strategic_key_results WHERE okr_id = ? AND org_id = ?", (okr_id, db.org_id))
+    await db.execute("DELETE FROM strategic_okrs WHERE id = ? AND org_id = ?", (okr_id, db.org_id))
     await db.commit()
     return {"deleted": True}
 
@@ -204,7 +205,7 @@ async def delete_okr(okr_id: int, db=Depends(get_db)):
 @router.get("/okrs/{okr_id}/key-results")
 async def list_key_results(okr_id: int, db=Depends(get_db)):
     rows = await db.execute_fetchall(
-        "SELECT * FROM strategic_key_results WHERE okr_id = ?", (okr_id,)
+        "SELECT * FROM strategic_key_results WHERE org_id = ? AND okr_id = ?", (db.org_id, okr_id)
     )
     return [dict(r) for r in rows]
 
@@ -212,10 +213,10 @@ async def list_key_results(okr_id: int, db=Depends(get_db)):
 @router.post("/okrs/{okr_id}/key-results")
 async def create_key_result(okr_id: int, data: dict, db=Depends(get_db)):
     cursor = await db.execute(
-        "INSERT INTO strategic_key_results (okr_id, key_result, metric, current_value, target_value, unit, "
+        "INSERT INTO strategic_key_results (org_id, okr_id, key_result, metric, current_value, target_value, unit, "
         "target_optimistic, target_pessimistic, rationale) "
-        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
-        (okr_id, data["key_result"], data.get("metric"), data.get("current_value", 0),
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (db.org_id, okr_id, data["key_result"], data.get("metric"), data.get("current_value", 0),
          data["target_value"], data.get("unit"),
          data.get("target_optimistic"), data.get("target_pessimistic"), data.get("rationale")),
     )
@@ -225,7 +226,7 @@ async def create_key_result(okr_id: int, data: dict, db=Depends(get_db)):
 
 @router.delete("/okrs/{okr_id}/key-results/{kr_id}")
 async def delete_key_result(okr_id: int, kr_id: int, db=Depends(get_db)):
-    await db.execute("DELETE FROM strategic_key_results WHERE id = ? AND okr_id = ?", (kr_id, okr_id))
+    await db.execute("DELETE FROM strategic_key_results WHERE id = ? AND okr_id = ? AND org_id = ?", (kr_id, okr_id, db.org_id))
     await db.commit()
     return {"deleted": True}
 
@@ -234,18 +235,18 @@ async def delete_key_result(okr_id: int, kr_id: int, db=Depends(get_db)):
 
 @router.get("/strategies-full")
 async def list_strategies_full(db=Depends(get_db)):
-    strategies = await db.execute_fetchall("SELECT * FROM strategies ORDER BY layer, id")
+    strategies = await db.execute_fetchall("SELECT * FROM strategies WHERE org_id = ? ORDER BY layer, id", (db.org_id,))
     result = []
     for s in strategies:
         s_dict = dict(s)
         okrs = await db.execute_fetchall(
-            "SELECT * FROM strategic_okrs WHERE strategy_id = ? ORDER BY id", (s_dict["id"],)
+            "SELECT * FROM strategic_okrs WHERE org_id = ? AND strategy_id = ? ORDER BY id", (db.org_id, s_dict["id"])
         )
         okr_list = []
         for o in okrs:
             o_dict = dict(o)
             krs = await db.execute_fetchall(
-                "SELECT * FROM strategic_key_results WHERE okr_id = ? ORDER BY id", (o_dict["id"],)
+                "SELECT * FROM strategic_key_results WHERE org_id = ? AND okr_id = ? ORDER BY id", (db.org_id, o_dict["id"])
             )
             o_dict["key_results"] = [dict(kr) for kr in krs]
             okr_list.append(o_dict)
@@ -261,24 +262,24 @@ async def approve_all_strategies(db=Depends(get_db)):
     import logging
     logger = logging.getLogger(__name__)
     try:
-        await db.execute("UPDATE strategies SET approved = 1")
+        await db.execute("UPDATE strategies SET approved = 1 WHERE org_id = ?", (db.org_id,))
         # Update review gate for step 4
         existing = await db.execute_fetchall(
-            "SELECT id FROM review_gates WHERE step_number = 4 AND gate_number = 1"
+            "SELECT id FROM review_gates WHERE org_id = ? AND step_number = 4 AND gate_number = 1", (db.org_id,)
         )
         now = datetime.now()
         if existing:
             await db.execute(
-                "UPDATE review_gates SET status = 'approved', reviewed_at = ? WHERE step_number = 4 AND gate_number = 1",
-                [now],
+                "UPDATE review_gates SET status = 'approved', reviewed_at = ? WHERE step_number = 4 AND gate_number = 1 AND org_id = ?",
+                [now, db.org_id],
             )
         else:
             await db.execute(
-                "INSERT INTO review_gates (step_number, gate_number, gate_name, status, reviewed_at) VALUES (4, 1, 'Strategy Approval', 'approved', ?)",
-                [now],
+                "INSERT INTO review_gates (org_id, step_number, gate_number, gate_name, status, reviewed_at) VALUES (?, 4, 1, 'Strategy Approval', 'approved', ?)",
+                [db.org_id, now],
             )
         await db.commit()
-        row = await db.execute_fetchone("SELECT COUNT(*) as c FROM strategies")
+        row = await db.execute_fetchone("SELECT COUNT(*) as c FROM strategies WHERE org_id = ?", (db.org_id,))
         return {"approved": row["c"] if row else 0}
     except Exception as e:
         logger.error("approve-all failed: %s", e, exc_info=True)
@@ -292,18 +293,18 @@ async def _gather_strategy_context(db):
     ctx = {}
 
     # Organization info
-    org_rows = await db.execute_fetchall("SELECT * FROM organization LIMIT 1")
+    org_rows = await db.execute_fetchall("SELECT * FROM organization WHERE id = ?", (db.org_id,))
     ctx["organization"] = dict(org_rows[0]) if org_rows else None
 
     # Financial metrics from ops_efficiency
     ops_rows = await db.execute_fetchall(
-        "SELECT * FROM ops_efficiency ORDER BY period DESC"
+        "SELECT * FROM ops_efficiency WHERE org_id = ? ORDER BY period DESC", (db.org_id,)
     )
     ctx["financial_metrics"] = [dict(r) for r in ops_rows]
 
     # Revenue trends
     rev_rows = await db.execute_fetchall(
-        "SELECT * FROM revenue_splits ORDER BY period"
+        "SELECT * FROM revenue_splits WHERE org_id = ? ORDER BY period", (db.org_id,)
     )
     ctx["revenue_trends"] = [dict(r) for r in rev_rows]
 
@@ -311,19 +312,19 @@ async def _gather_strategy_context(db):
     vs_rows = await db.execute_fetchall(
         "SELECT vs.*, vsm.total_lead_time_hours, vsm.total_process_time_hours, "
         "vsm.total_wait_time_hours, vsm.flow_efficiency, vsm.bottleneck_step "
-        "FROM value_streams vs LEFT JOIN value_stream_metrics vsm ON vs.id = vsm.value_stream_id"
+        "FROM value_streams vs LEFT JOIN value_stream_metrics vsm ON vs.id = vsm.value_stream_id WHERE vs.org_id = ?", (db.org_id,)
     )
     ctx["value_streams"] = [dict(r) for r in vs_rows]
 
     # Value stream levers
     lever_rows = await db.execute_fetchall(
-        "SELECT * FROM value_stream_levers WHERE impact_estimate = 'high' ORDER BY lever_type"
+        "SELECT * FROM value_stream_levers WHERE org_id = ? AND impact_estimate = 'high' ORDER BY lever_type", (db.org_id,)
     )
     ctx["high_impact_levers"] = [dict(r) for r in lever_rows]
 
     # TOWS actions grouped by type
     tows_rows = await db.execute_fetchall(
-        "SELECT * FROM tows_actions ORDER BY strategy_type, priority DESC"
+        "SELECT * FROM tows_actions WHERE org_id = ? ORDER BY strategy_type, priority DESC", (db.org_id,)
     )
     tows_grouped = {"SO": [], "WO": [], "ST": [], "WT": []}
     for t in tows_rows:
@@ -334,7 +335,7 @@ async def _gather_strategy_context(db):
     ctx["tows"] = tows_grouped
 
     # User strategy inputs by type (full content, not truncated)
-    input_rows = await db.execute_fetchall("SELECT * FROM strategy_inputs ORDER BY input_type")
+    input_rows = await db.execute_fetchall("SELECT * FROM strategy_inputs WHERE org_id = ? ORDER BY input_type", (db.org_id,))
     inputs_by_type = {}
     for inp in input_rows:
         inp_dict = dict(inp)
@@ -345,7 +346,7 @@ async def _gather_strategy_context(db):
     ctx["user_inputs"] = inputs_by_type
 
     # SWOT entries for AI context
-    swot_rows = await db.execute_fetchall("SELECT * FROM swot_entries ORDER BY category")
+    swot_rows = await db.execute_fetchall("SELECT * FROM swot_entries WHERE org_id = ? ORDER BY category", (db.org_id,))
     ctx["swot_entries"] = [dict(r) for r in swot_rows]
 
     # Industry benchmarks (best-effort)
@@ -710,19 +711,19 @@ async def auto_generate_strategies(db=Depends(get_db)):
 async def _do_auto_generate(db):
     # Step 1: Cleanup auto-generated strategies (cascade delete)
     auto_strategies = await db.execute_fetchall(
-        "SELECT id FROM strategies WHERE description LIKE 'Auto-generated%'"
+        "SELECT id FROM strategies WHERE org_id = ? AND description LIKE 'Auto-generated%'", (db.org_id,)
     )
     for s in auto_strategies:
         sid = dict(s)["id"]
         # Nullify initiative references to this strategy
-        await db.execute("UPDATE initiatives SET strategy_id = NULL WHERE strategy_id = ?", (sid,))
+        await db.execute("UPDATE initiatives SET strategy_id = NULL WHERE strategy_id = ? AND org_id = ?", (sid, db.org_id))
         # Nullify regulatory impact references to this strategy
-        await db.execute("UPDATE regulatory_impacts SET strategy_id = NULL WHERE strategy_id = ?", (sid,))
-        okrs = await db.execute_fetchall("SELECT id FROM strategic_okrs WHERE strategy_id = ?", (sid,))
+        await db.execute("UPDATE regulatory_impacts SET strategy_id = NULL WHERE strategy_id = ? AND org_id = ?", (sid, db.org_id))
+        okrs = await db.execute_fetchall("SELECT id FROM strategic_okrs WHERE org_id = ? AND strategy_id = ?", (db.org_id, sid))
         for okr in okrs:
-            await db.execute("DELETE FROM strategic_key_results WHERE okr_id = ?", (dict(okr)["id"],))
-        await db.execute("DELETE FROM strategic_okrs WHERE strategy_id = ?", (sid,))
-        await db.execute("DELETE FROM strategies WHERE id = ?", (sid,))
+            await db.execute("DELETE FROM strategic_key_results WHERE okr_id = ? AND org_id = ?", (dict(okr)["id"], db.org_id))
+        await db.execute("DELETE FROM strategic_okrs WHERE strategy_id = ? AND org_id = ?", (sid, db.org_id))
+        await db.execute("DELETE FROM strategies WHERE id = ? AND org_id = ?", (sid, db.org_id))
 
     # Step 2: Gather context
     ctx = await _gather_strategy_context(db)
@@ -756,9 +757,9 @@ async def _do_auto_generate(db):
                     layer_data = ai_result["layers"].get(layer_name, {})
                     for strat in layer_data.get("strategies", []):
                         cursor = await db.execute(
-                            "INSERT INTO strategies (layer, name, description, tows_action_id, risk_level, risks) "
-                            "VALUES (?, ?, ?, ?, ?, ?)",
-                            (layer_name,
+                            "INSERT INTO strategies (org_id, layer, name, description, tows_action_id, risk_level, risks) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            (db.org_id, layer_name,
                              ensure_str(strat.get("name", f"{layer_name.title()} Strategy")),
                              ensure_str(f"Auto-generated (AI): {strat.get('description', '')}"),
                              None,  # AI doesn't map to specific TOWS action IDs
@@ -770,18 +771,18 @@ async def _do_auto_generate(db):
 
                         for okr in strat.get("okrs", []):
                             okr_cursor = await db.execute(
-                                "INSERT INTO strategic_okrs (strategy_id, objective, time_horizon, status) VALUES (?, ?, ?, 'draft')",
-                                (strategy_id, ensure_str(okr.get("objective", "Strategic objective")), ensure_str(okr.get("time_horizon", "12 months"))),
+                                "INSERT INTO strategic_okrs (org_id, strategy_id, objective, time_horizon, status) VALUES (?, ?, ?, ?, 'draft')",
+                                (db.org_id, strategy_id, ensure_str(okr.get("objective", "Strategic objective")), ensure_str(okr.get("time_horizon", "12 months"))),
                             )
                             okr_id = okr_cursor.lastrowid
                             okr_count += 1
 
                             for kr in okr.get("key_results", []):
                                 await db.execute(
-                                    "INSERT INTO strategic_key_results (okr_id, key_result, metric, current_value, target_value, unit, "
+                                    "INSERT INTO strategic_key_results (org_id, okr_id, key_result, metric, current_value, target_value, unit, "
                                     "target_optimistic, target_pessimistic, rationale) "
-                                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                                    (okr_id, ensure_str(kr.get("key_result", "Key result")),
+                                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                    (db.org_id, okr_id, ensure_str(kr.get("key_result", "Key result")),
                                      ensure_str(kr.get("metric", "")), _safe_float(kr.get("current_value"), 0),
                                      _safe_float(kr.get("target_value"), 0), ensure_str(kr.get("unit", "")),
                                      _safe_float(kr.get("target_optimistic")), _safe_float(kr.get("target_pessimistic")),
@@ -815,8 +816,8 @@ async def _do_auto_generate(db):
     for layer, layer_strategies in all_layers:
         for strat in layer_strategies:
             cursor = await db.execute(
-                "INSERT INTO strategies (layer, name, description, tows_action_id, risk_level, risks) VALUES (?, ?, ?, ?, ?, ?)",
-                (layer, ensure_str(strat.get("name", "")), ensure_str(strat.get("description", "")), strat.get("tows_action_id"),
+                "INSERT INTO strategies (org_id, layer, name, description, tows_action_id, risk_level, risks) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (db.org_id, layer, ensure_str(strat.get("name", "")), ensure_str(strat.get("description", "")), strat.get("tows_action_id"),
                  ensure_str(strat.get("risk_level", "medium")), ensure_str(strat.get("risks", ""))),
             )
             strategy_id = cursor.lastrowid
@@ -824,18 +825,18 @@ async def _do_auto_generate(db):
 
             for okr in strat.get("okrs", []):
                 okr_cursor = await db.execute(
-                    "INSERT INTO strategic_okrs (strategy_id, objective, time_horizon, status) VALUES (?, ?, ?, 'draft')",
-                    (strategy_id, ensure_str(okr.get("objective", "Strategic objective")), ensure_str(okr.get("time_horizon", "12 months"))),
+                    "INSERT INTO strategic_okrs (org_id, strategy_id, objective, time_horizon, status) VALUES (?, ?, ?, ?, 'draft')",
+                    (db.org_id, strategy_id, ensure_str(okr.get("objective", "Strategic objective")), ensure_str(okr.get("time_horizon", "12 months"))),
                 )
                 okr_id = okr_cursor.lastrowid
                 okr_count += 1
 
                 for kr in okr.get("key_results", []):
                     await db.execute(
-                        "INSERT INTO strategic_key_results (okr_id, key_result, metric, current_value, target_value, unit, "
+                        "INSERT INTO strategic_key_results (org_id, okr_id, key_result, metric, current_value, target_value, unit, "
                         "target_optimistic, target_pessimistic, rationale) "
-                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                        (okr_id, ensure_str(kr.get("key_result", "Key result")), ensure_str(kr.get("metric", "")), _safe_float(kr.get("current_value"), 0),
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (db.org_id, okr_id, ensure_str(kr.get("key_result", "Key result")), ensure_str(kr.get("metric", "")), _safe_float(kr.get("current_value"), 0),
                          _safe_float(kr.get("target_value"), 0), ensure_str(kr.get("unit", "")),
                          _safe_float(kr.get("target_optimistic")), _safe_float(kr.get("target_pessimistic")),
                          ensure_str(kr.get("rationale", ""))),
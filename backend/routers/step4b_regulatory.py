@@ -4,12 +4,15 @@ Step 4b: Regulatory Impact Assessment (Enhancement #4).
 
 import json
 import logging
+from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from database import get_db
+from serialization import FastJSONRoute
+from ai_jobs import enqueue_generator
 from ai_research import is_openai_available, extract_list, ensure_str
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 logger = logging.getLogger(__name__)
 
 REGULATIONS = [
@@ -22,19 +25,19 @@ REGULATIONS = [
 async def get_regulatory(strategy_id: int = None, db=Depends(get_db)):
     if strategy_id:
         rows = await db.execute_fetchall(
-            "SELECT * FROM regulatory_impacts WHERE strategy_id = ? ORDER BY regulation", [strategy_id]
+            "SELECT * FROM regulatory_impacts WHERE org_id = ? AND strategy_id = ? ORDER BY regulation", [db.org_id, strategy_id]
         )
     else:
-        rows = await db.execute_fetchall("SELECT * FROM regulatory_impacts ORDER BY regulation")
+        rows = await db.execute_fetchall("SELECT * FROM regulatory_impacts WHERE org_id = ? ORDER BY regulation", (db.org_id,))
     return [dict(r) for r in rows]
 
 
 @router.post("/regulatory")
 async def create_regulatory(data: dict, db=Depends(get_db)):
     await db.execute(
-        "INSERT INTO regulatory_impacts (strategy_id, regulation, impact_level, requirement, mitigation) "
-        "VALUES (?, ?, ?, ?, ?)",
-        [data.get("strategy_id"), data.get("regulation"), data.get("impact_level", "medium"),
+        "INSERT INTO regulatory_impacts (org_id, strategy_id, regulation, impact_level, requirement, mitigation) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        [db.org_id, data.get("strategy_id"), data.get("regulation"), data.get("impact_level", "medium"),
          data.get("requirement", ""), data.get("mitigation", "")],
     )
     await db.commit()
@@ -44,8 +47,8 @@ async def create_regulatory(data: dict, db=Depends(get_db)):
 @router.put("/regulatory/{item_id}")
 async def update_regulatory(item_id: int, data: dict, db=Depends(get_db)):
     await db.execute(
-        "UPDATE regulatory_impacts SET impact_level=?, requirement=?, mitigation=? WHERE id=?",
-        [data.get("impact_level", "medium"), data.get("requirement", ""), data.get("mitigation", ""), item_id],
+        "UPDATE regulatory_impacts SET impact_level=?, requirement=?, mitigation=? WHERE id=? AND org_id = ?",
+        [data.get("impact_level", "medium"), data.get("requirement", ""), data.get("mitigation", ""), item_id, db.org_id],
     )
     await db.commit()
     return {"success": True}
@@ -53,15 +56,17 @@ async def update_regulatory(item_id: int, data: dict, db=Depends(get_db)):
 
 @router.delete("/regulatory/{item_id}")
 async def delete_regulatory(item_id: int, db=Depends(get_db)):
-    await db.execute("DELETE FROM regulatory_impacts WHERE id = ?", [item_id])
+    await db.execute("DELETE FROM regulatory_impacts WHERE id = ? AND org_id = ?", [item_id, db.org_id])
     await db.commit()
     return {"deleted": True}
 
 
 @router.post("/regulatory/ai-generate")
-async def ai_generate_regulatory(db=Depends(get_db)):
+async def ai_generate_regulatory(db=Depends(get_db), run_async: Annotated[bool, Query(alias="async")] = False):
     """AI-generate regulatory impact assessment for strategies."""
-    strategies = await db.execute_fetchall("SELECT * FROM strategies ORDER BY layer")
+    if run_async:
+        return await enqueue_generator(db, "regulatory")
+    strategies = await db.execute_fetchall("SELECT * FROM strategies WHERE org_id = ? ORDER BY layer", (db.org_id,))
     if not strategies:
         return {"error": "No strategies found. Generate strategies first."}
 
@@ -72,14 +77,14 @@ async def ai_generate_regulatory(db=Depends(get_db)):
         for s in strategy_list:
             for reg in REGULATIONS:
                 existing = await db.execute_fetchone(
-                    "SELECT id FROM regulatory_impacts WHERE strategy_id = ? AND regulation = ?",
-                    [s["id"], reg],
+                    "SELECT id FROM regulatory_impacts WHERE org_id = ? AND strategy_id = ? AND regulation = ?",
+                    [db.org_id, s["id"], reg],
                 )
                 if not existing:
                     await db.execute(
-                        "INSERT INTO regulatory_impacts (strategy_id, regulation, impact_level, requirement, mitigation, ai_generated, ai_confidence) "
-                        "VALUES (?, ?, 'medium', 'Assessment pending', 'Review required', 1, 50)",
-                        [s["id"], reg],
+                        "INSERT INTO regulatory_impacts (org_id, strategy_id, regulation, impact_level, requirement, mitigation, ai_generated, ai_confidence) "
+                        "VALUES (?, ?, ?, 'medium', 'Assessment pending', 'Review required', 1, 50)",
+                        [db.org_id, s["id"], reg],
                     )
                     count += 1
         await db.commit()
@@ -112,20 +117,20 @@ Strategy IDs: {json.dumps({s['name']: s['id'] for s in strategy_list})}"""
         if not sid or reg not in REGULATIONS:
             continue
         existing = await db.execute_fetchone(
-            "SELECT id FROM regulatory_impacts WHERE strategy_id = ? AND regulation = ?",
-            [sid, reg],
+            "SELECT id FROM regulatory_impacts WHERE org_id = ? AND strategy_id = ? AND regulation = ?",
+            [db.org_id, sid, reg],
         )
         if existing:
             await db.execute(
-                "UPDATE regulatory_impacts SET impact_level=?, requirement=?, mitigation=?, ai_generated=1, ai_confidence=? WHERE id=?",
+                "UPDATE regulatory_impacts SET impact_level=?, requirement=?, mitigation=?, ai_generated=1, ai_confidence=? WHERE id=? AND org_id = ?",
                 [ensure_str(item.get("impact_level", "medium")), ensure_str(item.get("requirement", "")),
-                 ensure_str(item.get("mitigation", "")), item.get("confidence", 70), existing["id"]],
+                 ensure_str(item.get("mitigation", "")), item.get("confidence", 70), existing["id"], db.org_id],
             )
         else:
             await db.execute(
-                "INSERT INTO regulatory_impacts (strategy_id, regulation, impact_level, requirement, mitigation, ai_generated, ai_confidence) "
-                "VALUES (?, ?, ?, ?, ?, 1, ?)",
-                [sid, reg, ensure_str(item.get("impact_level", "medium")), ensure_str(item.get("requirement", "")),
+                "INSERT INTO regulatory_impacts (org_id, strategy_id, regulation, impact_level, requirement, mitigation, ai_generated, ai_confidence) "
+                "VALUES (?, ?, ?, ?, ?, ?, 1, ?)",
+                [db.org_id, sid, reg, ensure_str(item.get("impact_level", "medium")), ensure_str(item.get("requirement", "")),
                  ensure_str(item.get("mitigation", "")), item.get("confidence", 70)],
             )
         count += 1
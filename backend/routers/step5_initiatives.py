@@ -1,24 +1,30 @@
+import math
+
 from fastapi import APIRouter, Depends
 from database import get_db
+from serialization import FastJSONRoute
+from graph_assembler import fetch_children
+from pagination import ListQuery
 from ai_initiatives import gather_initiative_context, generate_ai_initiatives
 from ai_research import is_openai_available
+from portfolio_optimizer import DEFAULT_QUARTERS, build_quarters, load_portfolio, optimize_portfolio
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 
 # --- Product Groups ---
 
 @router.get("/product-groups")
 async def list_product_groups(db=Depends(get_db)):
-    rows = await db.execute_fetchall("SELECT * FROM product_groups ORDER BY name")
+    rows = await db.execute_fetchall("SELECT * FROM product_groups WHERE org_id = ? ORDER BY name", (db.org_id,))
     return [dict(r) for r in rows]
 
 
 @router.post("/product-groups")
 async def create_product_group(data: dict, db=Depends(get_db)):
     cursor = await db.execute(
-        "INSERT INTO product_groups (name, description) VALUES (?, ?)",
-        (data["name"], data.get("description")),
+        "INSERT INTO product_groups (org_id, name, description) VALUES (?, ?, ?)",
+        (db.org_id, data["name"], data.get("description")),
     )
     await db.commit()
     return {"id": cursor.lastrowid}
@@ -30,7 +36,7 @@ async def create_product_group(data: dict, db=Depends(get_db)):
 async def list_digital_products(db=Depends(get_db)):
     rows = await db.execute_fetchall(
         "SELECT dp.*, pg.name as product_group_name FROM digital_products dp "
-        "JOIN product_groups pg ON dp.product_group_id = pg.id"
+        "JOIN product_groups pg ON dp.product_group_id = pg.id WHERE dp.org_id = ?", (db.org_id,)
     )
     return [dict(r) for r in rows]
 
@@ -38,8 +44,8 @@ async def list_digital_products(db=Depends(get_db)):
 @router.post("/digital-products")
 async def create_digital_product(data: dict, db=Depends(get_db)):
     cursor = await db.execute(
-        "INSERT INTO digital_products (product_group_id, name, description) VALUES (?, ?, ?)",
-        (data["product_group_id"], data["name"], data.get("description")),
+        "INSERT INTO digital_products (org_id, product_group_id, name, description) VALUES (?, ?, ?, ?)",
+        (db.org_id, data["product_group_id"], data["name"], data.get("description")),
     )
     await db.commit()
     return {"id": cursor.lastrowid}
@@ -53,54 +59,49 @@ async def list_initiatives(db=Depends(get_db)):
         "SELECT i.*, dp.name as product_name, s.name as strategy_name, s.layer as strategy_layer "
         "FROM initiatives i "
         "JOIN digital_products dp ON i.digital_product_id = dp.id "
-        "LEFT JOIN strategies s ON i.strategy_id = s.id "
-        "ORDER BY COALESCE(i.rice_override, i.rice_score) DESC"
+        "LEFT JOIN strategies s ON i.strategy_id = s.id WHERE i.org_id = ? "
+        "ORDER BY COALESCE(i.rice_override, i.rice_score) DESC", (db.org_id,)
     )
     return [dict(r) for r in rows]
 
 
+INITIATIVES_FULL = ListQuery(
+    "initiatives", "i",
+    joins="JOIN digital_products dp ON i.digital_product_id = dp.id "
+          "LEFT JOIN strategies s ON i.strategy_id = s.id",
+    computed={"product_name": "dp.name", "strategy_name": "s.name", "strategy_layer": "s.layer"},
+    sort=[("COALESCE(i.rice_override, i.rice_score, 0)", "DESC", float), ("i.id", "ASC", int)],
+    nested={"strategic_okrs": ("strategy_id",)},
+)
+
+
 @router.get("/initiatives-full")
-async def list_initiatives_full(db=Depends(get_db)):
+async def list_initiatives_full(limit: int | None = None, cursor: str | None = None, fields: str | None = None,
+                                db=Depends(get_db)):
     """Return initiatives with nested strategic OKRs and key results."""
-    rows = await db.execute_fetchall(
-        "SELECT i.*, dp.name as product_name, s.name as strategy_name, s.layer as strategy_layer "
-        "FROM initiatives i "
-        "JOIN digital_products dp ON i.digital_product_id = dp.id "
-        "LEFT JOIN strategies s ON i.strategy_id = s.id "
-        "ORDER BY COALESCE(i.rice_override, i.rice_score) DESC"
-    )
-    initiatives = [dict(r) for r in rows]
+    page = await INITIATIVES_FULL.fetch(db, "i.org_id = ?", [db.org_id], fields, limit, cursor)
+    if page.wants("strategic_okrs"):
+        okrs = await fetch_children(db, "strategic_okrs", "strategy_id", [i.get("strategy_id") for i in page.rows])
+        key_results = await fetch_children(
+            db, "strategic_key_results", "okr_id", [o["id"] for group in okrs.values() for o in group]
+        )
+        for group in okrs.values():
+            for okr in group:
+                okr["key_results"] = key_results.get(okr["id"], [])
+        for init in page.rows:
+            init["strategic_okrs"] = okrs.get(init.get("strategy_id"), [])
 
-    for init in initiatives:
-        if init.get("strategy_id"):
-            okrs = await db.execute_fetchall(
-                "SELECT * FROM strategic_okrs WHERE strategy_id = ? ORDER BY id",
-                (init["strategy_id"],),
-            )
-            okr_list = []
-            for o in okrs:
-                o_dict = dict(o)
-                krs = await db.execute_fetchall(
-                    "SELECT * FROM strategic_key_results WHERE okr_id = ? ORDER BY id",
-                    (o_dict["id"],),
-                )
-                o_dict["key_results"] = [dict(kr) for kr in krs]
-                okr_list.append(o_dict)
-            init["strategic_okrs"] = okr_list
-        else:
-            init["strategic_okrs"] = []
-
-    return initiatives
+    return page.response()
 
 
 @router.post("/initiatives")
 async def create_initiative(data: dict, db=Depends(get_db)):
     cursor = await db.execute(
-        "INSERT INTO initiatives (digital_product_id, strategy_id, name, description, "
+        "INSERT INTO initiatives (org_id, digital_product_id, strategy_id, name, description, "
         "reach, impact, confidence, effort, value_score, size_score, "
         "impacted_segments, dependencies, risks, roadmap_phase, status) "
-        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-        (data["digital_product_id"], data.get("strategy_id"), data["name"], data.get("description"),
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (db.org_id, data["digital_product_id"], data.get("strategy_id"), data["name"], data.get("description"),
          data.get("reach", 1), data.get("impact", 1), data.get("confidence", 1.0),
          data.get("effort", 1), data.get("value_score", 3), data.get("size_score", 3),
          data.get("impacted_segments"), data.get("dependencies"), data.get("risks"),
@@ -122,8 +123,8 @@ async def update_initiative(init_id: int, data: dict, db=Depends(get_db)):
             fields.append(f"{key} = ?")
             values.append(data[key])
     if fields:
-        values.append(init_id)
-        await db.execute(f"UPDATE initiatives SET {', '.join(fields)} WHERE id = ?", values)
+        values.extend([init_id, db.org_id])
+        await db.execute(f"UPDATE initiatives SET {', '.join(fields)} WHERE id = ? AND org_id = ?", values)
         await db.commit()
     return {"updated": True}
 
@@ -149,13 +150,13 @@ async def _ensure_product_group(db, layer):
     """Ensure product group exists for a strategy layer, return group_id."""
     group_name = LAYER_LABELS.get(layer, layer.title())
     existing_group = await db.execute_fetchall(
-        "SELECT id FROM product_groups WHERE name = ?", (group_name,)
+        "SELECT id FROM product_groups WHERE org_id = ? AND name = ?", (db.org_id, group_name)
     )
     if existing_group:
         return dict(existing_group[0])["id"], False
     cursor = await db.execute(
-        "INSERT INTO product_groups (name, description) VALUES (?, ?)",
-        (group_name, f"Product group for {layer} layer strategies"),
+        "INSERT INTO product_groups (org_id, name, description) VALUES (?, ?, ?)",
+        (db.org_id, group_name, f"Product group for {layer} layer strategies"),
     )
     return cursor.lastrowid, True
 
@@ -163,14 +164,14 @@ async def _ensure_product_group(db, layer):
 async def _ensure_digital_product(db, group_id, name, description=""):
     """Ensure digital product exists, return product_id."""
     existing = await db.execute_fetchall(
-        "SELECT id FROM digital_products WHERE product_group_id = ? AND name = ?",
-        (group_id, name),
+        "SELECT id FROM digital_products WHERE org_id = ? AND product_group_id = ? AND name = ?",
+        (db.org_id, group_id, name),
     )
     if existing:
         return dict(existing[0])["id"], False
     cursor = await db.execute(
-        "INSERT INTO digital_products (product_group_id, name, description) VALUES (?, ?, ?)",
-        (group_id, name, description),
+        "INSERT INTO digital_products (org_id, product_group_id, name, description) VALUES (?, ?, ?, ?)",
+        (db.org_id, group_id, name, description),
     )
     return cursor.lastrowid, True
 
@@ -180,7 +181,7 @@ async def auto_generate_initiatives(db=Depends(get_db)):
     """Generate initiatives from approved strategies and their OKRs."""
     # Fetch approved strategies with OKRs
     strategies = await db.execute_fetchall(
-        "SELECT * FROM strategies WHERE approved = 1 ORDER BY layer, id"
+        "SELECT * FROM strategies WHERE org_id = ? AND approved = 1 ORDER BY layer, id", (db.org_id,)
     )
     if not strategies:
         return {"error": "No approved strategies found. Approve strategies in Step 4 first."}
@@ -237,19 +238,19 @@ async def auto_generate_initiatives(db=Depends(get_db)):
 
                 # Skip if already exists
                 existing_init = await db.execute_fetchall(
-                    "SELECT id FROM initiatives WHERE name = ? AND strategy_id = ?",
-                    (init_name, strategy_id),
+                    "SELECT id FROM initiatives WHERE org_id = ? AND name = ? AND strategy_id = ?",
+                    (db.org_id, init_name, strategy_id),
                 )
                 if existing_init:
                     continue
 
                 await db.execute(
-                    "INSERT INTO initiatives (digital_product_id, strategy_id, name, description, "
+                    "INSERT INTO initiatives (org_id, digital_product_id, strategy_id, name, description, "
                     "reach, impact, confidence, effort, value_score, size_score, "
                     "impacted_segments, dependencies, risks, roadmap_phase, "
                     "ai_generated, ai_rationale, status) "
-                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1, ?, 'proposed')",
-                    (product_id, strategy_id, init_name, ai_init.get("description", ""),
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1, ?, 'proposed')",
+                    (db.org_id, product_id, strategy_id, init_name, ai_init.get("description", ""),
                      ai_init["reach"], ai_init["impact"], ai_init["confidence"], ai_init["effort"],
                      ai_init.get("value_score", 3), ai_init.get("size_score", 3),
                      ai_init.get("impacted_segments"), ai_init.get("dependencies"),
@@ -275,7 +276,7 @@ async def auto_generate_initiatives(db=Depends(get_db)):
                 created_products += 1
 
             okrs = await db.execute_fetchall(
-                "SELECT * FROM strategic_okrs WHERE strategy_id = ?", (strategy_id,)
+                "SELECT * FROM strategic_okrs WHERE org_id = ? AND strategy_id = ?", (db.org_id, strategy_id)
             )
 
             rice = LAYER_RICE_DEFAULTS.get(layer, {"reach": 3, "impact": 1, "confidence": 0.8, "effort": 3})
@@ -283,7 +284,7 @@ async def auto_generate_initiatives(db=Depends(get_db)):
             for okr in okrs:
                 okr_dict = dict(okr)
                 krs = await db.execute_fetchall(
-                    "SELECT key_result FROM strategic_key_results WHERE okr_id = ?", (okr_dict["id"],)
+                    "SELECT key_result FROM strategic_key_results WHERE org_id = ? AND okr_id = ?", (db.org_id, okr_dict["id"])
                 )
                 kr_text = "; ".join(dict(kr)["key_result"] for kr in krs) if krs else ""
 
@@ -291,18 +292,18 @@ async def auto_generate_initiatives(db=Depends(get_db)):
                 init_desc = f"Initiative from {layer} strategy '{s['name']}'. Key results: {kr_text}" if kr_text else f"Initiative from {layer} strategy '{s['name']}'"
 
                 existing_init = await db.execute_fetchall(
-                    "SELECT id FROM initiatives WHERE name = ? AND strategy_id = ?",
-                    (init_name, strategy_id),
+                    "SELECT id FROM initiatives WHERE org_id = ? AND name = ? AND strategy_id = ?",
+                    (db.org_id, init_name, strategy_id),
                 )
                 if existing_init:
                     continue
 
                 await db.execute(
-                    "INSERT INTO initiatives (digital_product_id, strategy_id, name, description, "
+                    "INSERT INTO initiatives (org_id, digital_product_id, strategy_id, name, description, "
                     "reach, impact, confidence, effort, value_score, size_score, "
                     "ai_generated, status) "
-                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0, 'proposed')",
-                    (product_id, strategy_id, init_name, init_desc,
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0, 'proposed')",
+                    (db.org_id, product_id, strategy_id, init_name, init_desc,
                      rice["reach"], rice["impact"], rice["confidence"], rice["effort"],
                      3, 3),
                 )
@@ -322,28 +323,17 @@ async def auto_generate_initiatives(db=Depends(get_db)):
 @router.get("/roadmap")
 async def get_roadmap(db=Depends(get_db)):
     """Return initiatives grouped by quarterly timeline for next 2 years (8 quarters)."""
-    from datetime import datetime, timedelta
 
     rows = await db.execute_fetchall(
         "SELECT i.*, dp.name as product_name, s.name as strategy_name, s.layer as strategy_layer "
         "FROM initiatives i "
         "JOIN digital_products dp ON i.digital_product_id = dp.id "
-        "LEFT JOIN strategies s ON i.strategy_id = s.id "
-        "ORDER BY COALESCE(i.rice_override, i.rice_score) DESC"
+        "LEFT JOIN strategies s ON i.strategy_id = s.id WHERE i.org_id = ? "
+        "ORDER BY COALESCE(i.rice_override, i.rice_score) DESC", (db.org_id,)
     )
 
-    now = datetime.now()
     # Build 8 quarter labels starting from current quarter
-    quarters = []
-    q_month = ((now.month - 1) // 3) * 3 + 1  # first month of current quarter
-    q_year = now.year
-    for _ in range(8):
-        q_num = (q_month - 1) // 3 + 1
-        quarters.append({"label": f"Q{q_num} {q_year}", "year": q_year, "quarter": q_num, "items": []})
-        q_month += 3
-        if q_month > 12:
-            q_month -= 12
-            q_year += 1
+    quarters = build_quarters(8)
 
     # Categorise initiatives by phase, then distribute across quarters
     quick_wins = []
@@ -386,3 +376,60 @@ async def get_roadmap(db=Depends(get_db)):
             "long_term": len(long_term),
         },
     }
+
+
+# ===================== Portfolio Optimization (Capacity-Constrained) =====================
+
+@router.post("/portfolio/optimize")
+async def optimize_initiative_portfolio(data: dict | None = None, db=Depends(get_db)):
+    """Assign initiatives to quarters maximizing RICE (or NPV) under capacity and budget.
+
+    Body (all optional): quarters, capacity_per_quarter (person-months; defaults to
+    team headcount x 3), budget_per_quarter_k, objective ("rice" | "npv"),
+    solver ("auto" | "ilp" | "greedy"), time_limit_s, statuses.
+    """
+    data = data or {}
+    try:
+        quarters = max(1, min(int(data.get("quarters", DEFAULT_QUARTERS)), 16))
+        capacity = data.get("capacity_per_quarter")
+        capacity = float(capacity) if capacity is not None else None
+        budget = data.get("budget_per_quarter_k")
+        budget = float(budget) if budget is not None else None
+        time_limit = min(float(data.get("time_limit_s", 0.8)), 10.0)
+    except (TypeError, ValueError):
+        return {"error": "quarters must be an integer; capacity_per_quarter, budget_per_quarter_k "
+                         "and time_limit_s must be numbers"}
+    if any(v is not None and not (math.isfinite(v) and v >= 0) for v in (capacity, budget, time_limit)):
+        return {"error": "capacity_per_quarter, budget_per_quarter_k and time_limit_s must be non-negative numbers"}
+    objective = data.get("objective", "rice")
+    if objective not in ("rice", "npv"):
+        return {"error": "objective must be 'rice' or 'npv'"}
+    solver = data.get("solver", "auto")
+    if solver not in ("auto", "ilp", "greedy"):
+        return {"error": "solver must be 'auto', 'ilp' or 'greedy'"}
+    statuses = data.get("statuses") or ("proposed", "approved", "in_progress")
+    if not isinstance(statuses, (list, tuple)) or not all(isinstance(status, str) for status in statuses):
+        return {"error": "statuses must be a list of status names"}
+
+    portfolio = await load_portfolio(db, tuple(statuses))
+    initiatives = portfolio["initiatives"]
+
+    if capacity is None:
+        if portfolio["headcount"]:
+            capacity = portfolio["headcount"] * 3.0  # person-months per quarter
+        elif initiatives:
+            # No teams defined: spread total effort evenly across the horizon
+            capacity = sum(float(i.get("effort") or 1) for i in initiatives) / quarters
+
+    result = optimize_portfolio(
+        initiatives,
+        portfolio["dependencies"],
+        quarters=quarters,
+        capacity_per_quarter=capacity,
+        budget_per_quarter_k=budget,
+        objective=objective,
+        solver=solver,
+        time_limit=time_limit,
+    )
+    result["team_headcount"] = portfolio["headcount"]
+    return result
@@ -4,12 +4,15 @@ Step 5b: Change Management Plans (Enhancement #10).
 
 import json
 import logging
+from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from database import get_db
+from serialization import FastJSONRoute
+from ai_jobs import enqueue_generator
 from ai_research import is_openai_available, extract_list, ensure_str
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 logger = logging.getLogger(__name__)
 
 
@@ -17,19 +20,19 @@ logger = logging.getLogger(__name__)
 async def get_change_plans(initiative_id: int = None, db=Depends(get_db)):
     if initiative_id:
         rows = await db.execute_fetchall(
-            "SELECT * FROM change_plans WHERE initiative_id = ? ORDER BY stakeholder_group", [initiative_id]
+            "SELECT * FROM change_plans WHERE org_id = ? AND initiative_id = ? ORDER BY stakeholder_group", [db.org_id, initiative_id]
         )
     else:
-        rows = await db.execute_fetchall("SELECT * FROM change_plans ORDER BY initiative_id, stakeholder_group")
+        rows = await db.execute_fetchall("SELECT * FROM change_plans WHERE org_id = ? ORDER BY initiative_id, stakeholder_group", (db.org_id,))
     return [dict(r) for r in rows]
 
 
 @router.post("/change-plans")
 async def create_change_plan(data: dict, db=Depends(get_db)):
     await db.execute(
-        "INSERT INTO change_plans (initiative_id, stakeholder_group, impact_level, communication_plan, "
-        "training_needs, resistance_risks, adoption_metrics, wiifm) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-        [data.get("initiative_id"), data.get("stakeholder_group"), data.get("impact_level", "medium"),
+        "INSERT INTO change_plans (org_id, initiative_id, stakeholder_group, impact_level, communication_plan, "
+        "training_needs, resistance_risks, adoption_metrics, wiifm) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [db.org_id, data.get("initiative_id"), data.get("stakeholder_group"), data.get("impact_level", "medium"),
          data.get("communication_plan", ""), data.get("training_needs", ""),
          data.get("resistance_risks", ""), data.get("adoption_metrics", ""), data.get("wiifm", "")],
     )
@@ -41,10 +44,10 @@ async def create_change_plan(data: dict, db=Depends(get_db)):
 async def update_change_plan(item_id: int, data: dict, db=Depends(get_db)):
     await db.execute(
         "UPDATE change_plans SET impact_level=?, communication_plan=?, training_needs=?, "
-        "resistance_risks=?, adoption_metrics=?, wiifm=? WHERE id=?",
+        "resistance_risks=?, adoption_metrics=?, wiifm=? WHERE id=? AND org_id = ?",
         [data.get("impact_level", "medium"), data.get("communication_plan", ""),
          data.get("training_needs", ""), data.get("resistance_risks", ""),
-         data.get("adoption_metrics", ""), data.get("wiifm", ""), item_id],
+         data.get("adoption_metrics", ""), data.get("wiifm", ""), item_id, db.org_id],
     )
     await db.commit()
     return {"success": True}
@@ -52,21 +55,23 @@ async def update_change_plan(item_id: int, data: dict, db=Depends(get_db)):
 
 @router.delete("/change-plans/{item_id}")
 async def delete_change_plan(item_id: int, db=Depends(get_db)):
-    await db.execute("DELETE FROM change_plans WHERE id = ?", [item_id])
+    await db.execute("DELETE FROM change_plans WHERE id = ? AND org_id = ?", [item_id, db.org_id])
     await db.commit()
     return {"deleted": True}
 
 
 @router.post("/change-plans/ai-generate")
-async def ai_generate_change_plans(data: dict, db=Depends(get_db)):
+async def ai_generate_change_plans(data: dict, db=Depends(get_db), run_async: Annotated[bool, Query(alias="async")] = False):
     """AI-generate change management plans for an initiative."""
+    if run_async:
+        return await enqueue_generator(db, "change_plans", data)
     initiative_id = data.get("initiative_id")
     if not initiative_id:
-        initiatives = await db.execute_fetchall("SELECT id, name FROM initiatives LIMIT 10")
+        initiatives = await db.execute_fetchall("SELECT id, name FROM initiatives WHERE org_id = ? LIMIT 10", (db.org_id,))
         if not initiatives:
             return {"error": "No initiatives found"}
     else:
-        initiatives = await db.execute_fetchall("SELECT id, name, description FROM initiatives WHERE id = ?", [initiative_id])
+        initiatives = await db.execute_fetchall("SELECT id, name, description FROM initiatives WHERE org_id = ? AND id = ?", [db.org_id, initiative_id])
 
     init_list = [dict(i) for i in initiatives]
     stakeholder_groups = ["executive_leadership", "middle_management", "frontline_staff", "it_teams", "customers", "regulators"]
@@ -76,15 +81,15 @@ async def ai_generate_change_plans(data: dict, db=Depends(get_db)):
         for init in init_list:
             for sg in stakeholder_groups:
                 existing = await db.execute_fetchone(
-                    "SELECT id FROM change_plans WHERE initiative_id = ? AND stakeholder_group = ?",
-                    [init["id"], sg],
+                    "SELECT id FROM change_plans WHERE org_id = ? AND initiative_id = ? AND stakeholder_group = ?",
+                    [db.org_id, init["id"], sg],
                 )
                 if not existing:
                     await db.execute(
-                        "INSERT INTO change_plans (initiative_id, stakeholder_group, impact_level, communication_plan, "
+                        "INSERT INTO change_plans (org_id, initiative_id, stakeholder_group, impact_level, communication_plan, "
                         "training_needs, resistance_risks, adoption_metrics, wiifm, ai_generated, ai_confidence) "
-                        "VALUES (?, ?, 'medium', 'Plan pending', 'Training TBD', 'Risks TBD', 'Metrics TBD', 'Benefits TBD', 1, 50)",
-                        [init["id"], sg],
+                        "VALUES (?, ?, ?, 'medium', 'Plan pending', 'Training TBD', 'Risks TBD', 'Metrics TBD', 'Benefits TBD', 1, 50)",
+                        [db.org_id, init["id"], sg],
                     )
                     count += 1
         await db.commit()
@@ -115,24 +120,24 @@ Return JSON array."""
                 if sg not in stakeholder_groups:
                     continue
                 existing = await db.execute_fetchone(
-                    "SELECT id FROM change_plans WHERE initiative_id = ? AND stakeholder_group = ?",
-                    [init["id"], sg],
+                    "SELECT id FROM change_plans WHERE org_id = ? AND initiative_id = ? AND stakeholder_group = ?",
+                    [db.org_id, init["id"], sg],
                 )
                 if existing:
                     await db.execute(
                         "UPDATE change_plans SET impact_level=?, communication_plan=?, training_needs=?, "
-                        "resistance_risks=?, adoption_metrics=?, wiifm=?, ai_generated=1, ai_confidence=? WHERE id=?",
+                        "resistance_risks=?, adoption_metrics=?, wiifm=?, ai_generated=1, ai_confidence=? WHERE id=? AND org_id = ?",
                         [ensure_str(item.get("impact_level", "medium")), ensure_str(item.get("communication_plan", "")),
                          ensure_str(item.get("training_needs", "")), ensure_str(item.get("resistance_risks", "")),
                          ensure_str(item.get("adoption_metrics", "")), ensure_str(item.get("wiifm", "")),
-                         item.get("confidence", 70), existing["id"]],
+                         item.get("confidence", 70), existing["id"], db.org_id],
                     )
                 else:
                     await db.execute(
-                        "INSERT INTO change_plans (initiative_id, stakeholder_group, impact_level, communication_plan, "
+                        "INSERT INTO change_plans (org_id, initiative_id, stakeholder_group, impact_level, communication_plan, "
                         "training_needs, resistance_risks, adoption_metrics, wiifm, ai_generated, ai_confidence) "
-                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1, ?)",
-                        [init["id"], sg, ensure_str(item.get("impact_level", "medium")), ensure_str(item.get("communication_plan", "")),
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 1, ?)",
+                        [db.org_id, init["id"], sg, ensure_str(item.get("impact_level", "medium")), ensure_str(item.get("communication_plan", "")),
                          ensure_str(item.get("training_needs", "")), ensure_str(item.get("resistance_risks", "")),
                          ensure_str(item.get("adoption_metrics", "")), ensure_str(item.get("wiifm", "")), item.get("confidence", 70)],
                     )
@@ -1,9 +1,15 @@
 from fastapi import APIRouter, Depends
 from database import get_db
+from serialization import FastJSONRoute
+from response_cache import cached_response
+from graph_assembler import fetch_children, load_dependency_graph
+from pagination import ListQuery
 from ai_initiatives import gather_initiative_context, generate_ai_epics, recommend_team_assignments
 from ai_research import is_openai_available
+from portfolio_optimizer import build_quarters
+from roadmap_scheduler import quarter_index, schedule_epics
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 # --- Layer-specific epic templates (3 epics per initiative) ---
 EPIC_TEMPLATES = {
@@ -41,15 +47,15 @@ CROSS_LAYER_DEPS = [
 
 @router.get("/teams")
 async def list_teams(db=Depends(get_db)):
-    rows = await db.execute_fetchall("SELECT * FROM teams ORDER BY name")
+    rows = await db.execute_fetchall("SELECT * FROM teams WHERE org_id = ? ORDER BY name", (db.org_id,))
     return [dict(r) for r in rows]
 
 
 @router.post("/teams")
 async def create_team(data: dict, db=Depends(get_db)):
     cursor = await db.execute(
-        "INSERT INTO teams (name, capacity) VALUES (?, ?)",
-        (data["name"], data.get("capacity")),
+        "INSERT INTO teams (org_id, name, capacity) VALUES (?, ?, ?)",
+        (db.org_id, data["name"], data.get("capacity")),
     )
     await db.commit()
     return {"id": cursor.lastrowid}
@@ -63,7 +69,7 @@ async def list_product_okrs(db=Depends(get_db)):
         "SELECT po.*, so.objective as strategic_objective, dp.name as product_name "
         "FROM product_okrs po "
         "JOIN strategic_okrs so ON po.strategic_okr_id = so.id "
-        "JOIN digital_products dp ON po.digital_product_id = dp.id"
+        "JOIN digital_products dp ON po.digital_product_id = dp.id WHERE po.org_id = ?", (db.org_id,)
     )
     return [dict(r) for r in rows]
 
@@ -71,8 +77,8 @@ async def list_product_okrs(db=Depends(get_db)):
 @router.post("/product-okrs")
 async def create_product_okr(data: dict, db=Depends(get_db)):
     cursor = await db.execute(
-        "INSERT INTO product_okrs (strategic_okr_id, digital_product_id, objective, status) VALUES (?, ?, ?, ?)",
-        (data["strategic_okr_id"], data["digital_product_id"], data["objective"], data.get("status", "draft")),
+        "INSERT INTO product_okrs (org_id, strategic_okr_id, digital_product_id, objective, status) VALUES (?, ?, ?, ?, ?)",
+        (db.org_id, data["strategic_okr_id"], data["digital_product_id"], data["objective"], data.get("status", "draft")),
     )
     await db.commit()
     return {"id": cursor.lastrowid}
@@ -86,8 +92,8 @@ async def list_epics(db=Depends(get_db)):
         "SELECT e.*, i.name as initiative_name, t.name as team_name "
         "FROM epics e "
         "JOIN initiatives i ON e.initiative_id = i.id "
-        "LEFT JOIN teams t ON e.team_id = t.id "
-        "ORDER BY e.priority_score DESC, e.status, e.target_date"
+        "LEFT JOIN teams t ON e.team_id = t.id WHERE e.org_id = ? "
+        "ORDER BY e.priority_score DESC, e.status, e.target_date", (db.org_id,)
     )
     return [dict(r) for r in rows]
 
@@ -99,11 +105,11 @@ async def create_epic(data: dict, db=Depends(get_db)):
     effort = data.get("effort_score", 3)
     priority = (value * size) / effort if effort else 0
     cursor = await db.execute(
-        "INSERT INTO epics (initiative_id, team_id, product_okr_id, name, description, status, "
+        "INSERT INTO epics (org_id, initiative_id, team_id, product_okr_id, name, description, status, "
         "start_date, target_date, value_score, size_score, effort_score, priority_score, "
         "risk_level, risks, dependencies_text, roadmap_phase) "
-        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-        (data["initiative_id"], data.get("team_id"), data.get("product_okr_id"),
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (db.org_id, data["initiative_id"], data.get("team_id"), data.get("product_okr_id"),
          data["name"], data.get("description"), data.get("status", "backlog"),
          data.get("start_date"), data.get("target_date"),
          value, size, effort, priority,
@@ -132,7 +138,7 @@ async def update_epic(epic_id: int, data: dict, db=Depends(get_db)):
     scoring_fields = {"value_score", "size_score", "effort_score"}
     if scoring_fields & set(data.keys()):
         # Fetch current values to merge with updates
-        row = await db.execute_fetchone("SELECT value_score, size_score, effort_score FROM epics WHERE id = ?", (epic_id,))
+        row = await db.execute_fetchone("SELECT value_score, size_score, effort_score FROM epics WHERE org_id = ? AND id = ?", (db.org_id, epic_id))
         if row:
             v = data.get("value_score", row["value_score"] or 3)
             s = data.get("size_score", row["size_score"] or 3)
@@ -142,8 +148,8 @@ async def update_epic(epic_id: int, data: dict, db=Depends(get_db)):
             values.append(round(priority, 2))
 
     if fields:
-        values.append(epic_id)
-        await db.execute(f"UPDATE epics SET {', '.join(fields)} WHERE id = ?", values)
+        values.extend([epic_id, db.org_id])
+        await db.execute(f"UPDATE epics SET {', '.join(fields)} WHERE id = ? AND org_id = ?", values)
         await db.commit()
     return {"updated": True}
 
@@ -151,9 +157,12 @@ async def update_epic(epic_id: int, data: dict, db=Depends(get_db)):
 @router.delete("/epics/{epic_id}")
 async def delete_epic(epic_id: int, db=Depends(get_db)):
     # Cascade delete: features -> epic_dependencies -> epic
-    await db.execute("DELETE FROM features WHERE epic_id = ?", (epic_id,))
-    await db.execute("DELETE FROM epic_dependencies WHERE epic_id = ? OR depends_on_epic_id = ?", (epic_id, epic_id))
-    await db.execute("DELETE FROM epics WHERE id = ?", (epic_id,))
+    await db.execute("DELETE FROM features WHERE epic_id = ? AND org_id = ?", (epic_id, db.org_id))
+    await db.execute(
+        "DELETE FROM epic_dependencies WHERE org_id = ? AND (epic_id = ? OR depends_on_epic_id = ?)",
+        (db.org_id, epic_id, epic_id),
+    )
+    await db.execute("DELETE FROM epics WHERE id = ? AND org_id = ?", (epic_id, db.org_id))
     await db.commit()
     return {"deleted": True}
 
@@ -166,7 +175,7 @@ async def list_dependencies(db=Depends(get_db)):
         "SELECT ed.*, e1.name as epic_name, e2.name as depends_on_name "
         "FROM epic_dependencies ed "
         "JOIN epics e1 ON ed.epic_id = e1.id "
-        "JOIN epics e2 ON ed.depends_on_epic_id = e2.id"
+        "JOIN epics e2 ON ed.depends_on_epic_id = e2.id WHERE ed.org_id = ?", (db.org_id,)
     )
     return [dict(r) for r in rows]
 
@@ -174,8 +183,8 @@ async def list_dependencies(db=Depends(get_db)):
 @router.post("/dependencies")
 async def create_dependency(data: dict, db=Depends(get_db)):
     cursor = await db.execute(
-        "INSERT INTO epic_dependencies (epic_id, depends_on_epic_id, dependency_type, notes) VALUES (?, ?, ?, ?)",
-        (data["epic_id"], data["depends_on_epic_id"], data.get("dependency_type", "blocks"), data.get("notes")),
+        "INSERT INTO epic_dependencies (org_id, epic_id, depends_on_epic_id, dependency_type, notes) VALUES (?, ?, ?, ?, ?)",
+        (db.org_id, data["epic_id"], data["depends_on_epic_id"], data.get("dependency_type", "blocks"), data.get("notes")),
     )
     await db.commit()
     return {"id": cursor.lastrowid}
@@ -183,7 +192,7 @@ async def create_dependency(data: dict, db=Depends(get_db)):
 
 @router.delete("/dependencies/{dep_id}")
 async def delete_dependency(dep_id: int, db=Depends(get_db)):
-    await db.execute("DELETE FROM epic_dependencies WHERE id = ?", (dep_id,))
+    await db.execute("DELETE FROM epic_dependencies WHERE id = ? AND org_id = ?", (dep_id, db.org_id))
     await db.commit()
     return {"deleted": True}
 
@@ -193,20 +202,20 @@ async def delete_dependency(dep_id: int, db=Depends(get_db)):
 @router.get("/summary")
 async def get_summary(db=Depends(get_db)):
     rows = await db.execute_fetchall(
-        "SELECT COUNT(*) as cnt FROM initiatives WHERE status IN ('approved', 'proposed')"
+        "SELECT COUNT(*) as cnt FROM initiatives WHERE org_id = ? AND status IN ('approved', 'proposed')", (db.org_id,)
     )
     init_count = rows[0]["cnt"] if rows else 0
 
-    rows = await db.execute_fetchall("SELECT COUNT(*) as cnt FROM epics")
+    rows = await db.execute_fetchall("SELECT COUNT(*) as cnt FROM epics WHERE org_id = ?", (db.org_id,))
     epic_count = rows[0]["cnt"] if rows else 0
 
-    rows = await db.execute_fetchall("SELECT COUNT(*) as cnt FROM product_okrs")
+    rows = await db.execute_fetchall("SELECT COUNT(*) as cnt FROM product_okrs WHERE org_id = ?", (db.org_id,))
     okr_count = rows[0]["cnt"] if rows else 0
 
-    rows = await db.execute_fetchall("SELECT COUNT(*) as cnt FROM teams")
+    rows = await db.execute_fetchall("SELECT COUNT(*) as cnt FROM teams WHERE org_id = ?", (db.org_id,))
     team_count = rows[0]["cnt"] if rows else 0
 
-    rows = await db.execute_fetchall("SELECT COUNT(*) as cnt FROM epic_dependencies")
+    rows = await db.execute_fetchall("SELECT COUNT(*) as cnt FROM epic_dependencies WHERE org_id = ?", (db.org_id,))
     dep_count = rows[0]["cnt"] if rows else 0
 
     return {
@@ -243,8 +252,8 @@ async def auto_generate(db=Depends(get_db)):
         "FROM initiatives i "
         "LEFT JOIN strategies s ON i.strategy_id = s.id "
         "LEFT JOIN digital_products dp ON i.digital_product_id = dp.id "
-        "WHERE i.status IN ('approved', 'proposed') "
-        "ORDER BY i.id"
+        "WHERE i.org_id = ? AND i.status IN ('approved', 'proposed') "
+        "ORDER BY i.id", (db.org_id,)
     )
     initiatives = [dict(r) for r in rows]
 
@@ -265,14 +274,14 @@ async def auto_generate(db=Depends(get_db)):
             init_copy = dict(init)
             if init.get("strategy_id"):
                 sokr_rows = await db.execute_fetchall(
-                    "SELECT so.* FROM strategic_okrs so WHERE so.strategy_id = ?",
-                    (init["strategy_id"],)
+                    "SELECT so.* FROM strategic_okrs so WHERE so.org_id = ? AND so.strategy_id = ?",
+                    (db.org_id, init["strategy_id"])
                 )
                 okrs = []
                 for sokr in sokr_rows:
                     sokr_dict = dict(sokr)
                     kr_rows = await db.execute_fetchall(
-                        "SELECT * FROM strategic_key_results WHERE okr_id = ?", (sokr_dict["id"],)
+                        "SELECT * FROM strategic_key_results WHERE org_id = ? AND okr_id = ?", (db.org_id, sokr_dict["id"])
                     )
                     sokr_dict["key_results"] = [dict(kr) for kr in kr_rows]
                     okrs.append(sokr_dict)
@@ -311,8 +320,8 @@ async def auto_generate(db=Depends(get_db)):
 
                 # Find strategic OKR to link to
                 sokr_rows = await db.execute_fetchall(
-                    "SELECT id FROM strategic_okrs WHERE strategy_id = ? LIMIT 1",
-                    (strat_row.get("strategy_id"),)
+                    "SELECT id FROM strategic_okrs WHERE org_id = ? AND strategy_id = ? LIMIT 1",
+                    (db.org_id, strat_row.get("strategy_id"))
                 )
                 if not sokr_rows:
                     continue
@@ -323,16 +332,16 @@ async def auto_generate(db=Depends(get_db)):
 
                 # Check if already exists
                 existing = await db.execute_fetchall(
-                    "SELECT id FROM product_okrs WHERE strategic_okr_id = ? AND digital_product_id = ? LIMIT 1",
-                    (sokr_id, product_id)
+                    "SELECT id FROM product_okrs WHERE org_id = ? AND strategic_okr_id = ? AND digital_product_id = ? LIMIT 1",
+                    (db.org_id, sokr_id, product_id)
                 )
                 if existing:
                     continue
 
                 cur = await db.execute(
-                    "INSERT INTO product_okrs (strategic_okr_id, digital_product_id, objective, ai_generated, status) "
-                    "VALUES (?, ?, ?, 1, 'draft')",
-                    (sokr_id, product_id, ai_pokr["objective"])
+                    "INSERT INTO product_okrs (org_id, strategic_okr_id, digital_product_id, objective, ai_generated, status) "
+                    "VALUES (?, ?, ?, ?, 1, 'draft')",
+                    (db.org_id, sokr_id, product_id, ai_pokr["objective"])
                 )
                 pokr_id = cur.lastrowid
                 created_okrs.append({"id": pokr_id, "objective": ai_pokr["objective"]})
@@ -340,9 +349,9 @@ async def auto_generate(db=Depends(get_db)):
                 # Create AI-generated key results
                 for kr in ai_pokr.get("key_results", []):
                     await db.execute(
-                        "INSERT INTO product_key_results (product_okr_id, key_result, metric, current_value, target_value, unit) "
-                        "VALUES (?, ?, ?, ?, ?, ?)",
-                        (pokr_id, kr.get("key_result", ""), kr.get("metric", ""),
+                        "INSERT INTO product_key_results (org_id, product_okr_id, key_result, metric, current_value, target_value, unit) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (db.org_id, pokr_id, kr.get("key_result", ""), kr.get("metric", ""),
                          kr.get("current_value", 0), kr.get("target_value", 0), kr.get("unit", ""))
                     )
 
@@ -366,8 +375,8 @@ async def auto_generate(db=Depends(get_db)):
 
                 # Idempotent
                 dup_rows = await db.execute_fetchall(
-                    "SELECT id FROM epics WHERE name = ? AND initiative_id = ? LIMIT 1",
-                    (epic_name, init_match["id"])
+                    "SELECT id FROM epics WHERE org_id = ? AND name = ? AND initiative_id = ? LIMIT 1",
+                    (db.org_id, epic_name, init_match["id"])
                 )
                 if dup_rows:
                     epic_name_to_id[epic_name] = dup_rows[0]["id"]
@@ -376,8 +385,8 @@ async def auto_generate(db=Depends(get_db)):
 
                 # Find product OKR to link
                 pokr_rows = await db.execute_fetchall(
-                    "SELECT id FROM product_okrs WHERE digital_product_id = ? LIMIT 1",
-                    (init_match.get("product_id"),)
+                    "SELECT id FROM product_okrs WHERE org_id = ? AND digital_product_id = ? LIMIT 1",
+                    (db.org_id, init_match.get("product_id"))
                 )
                 pokr_id = pokr_rows[0]["id"] if pokr_rows else None
 
@@ -387,11 +396,11 @@ async def auto_generate(db=Depends(get_db)):
                 priority = round((value * size) / effort, 2) if effort else 0
 
                 cur = await db.execute(
-                    "INSERT INTO epics (initiative_id, product_okr_id, name, description, status, "
+                    "INSERT INTO epics (org_id, initiative_id, product_okr_id, name, description, status, "
                     "value_score, size_score, effort_score, priority_score, risk_level, risks, "
                     "dependencies_text, roadmap_phase, ai_generated, estimated_effort_days, ai_rationale) "
-                    "VALUES (?, ?, ?, ?, 'backlog', ?, ?, ?, ?, ?, ?, ?, ?, 1, ?, ?)",
-                    (init_match["id"], pokr_id, epic_name, ai_epic.get("description", ""),
+                    "VALUES (?, ?, ?, ?, ?, 'backlog', ?, ?, ?, ?, ?, ?, ?, ?, 1, ?, ?)",
+                    (db.org_id, init_match["id"], pokr_id, epic_name, ai_epic.get("description", ""),
                      value, size, effort, priority,
                      ai_epic.get("risk_level", "medium"), ai_epic.get("risks", ""),
                      ai_epic.get("dependencies_text", ""), None,
@@ -408,21 +417,21 @@ async def auto_generate(db=Depends(get_db)):
                 found_epic_id = epic_name_to_id.get(dep.get("depends_on_epic_name"))
                 if dep_epic_id and found_epic_id and dep_epic_id != found_epic_id:
                     existing = await db.execute_fetchall(
-                        "SELECT id FROM epic_dependencies WHERE epic_id = ? AND depends_on_epic_id = ? LIMIT 1",
-                        (dep_epic_id, found_epic_id)
+                        "SELECT id FROM epic_dependencies WHERE org_id = ? AND epic_id = ? AND depends_on_epic_id = ? LIMIT 1",
+                        (db.org_id, dep_epic_id, found_epic_id)
                     )
                     if not existing:
                         cur = await db.execute(
-                            "INSERT INTO epic_dependencies (epic_id, depends_on_epic_id, dependency_type, notes) "
-                            "VALUES (?, ?, ?, ?)",
-                            (dep_epic_id, found_epic_id,
+                            "INSERT INTO epic_dependencies (org_id, epic_id, depends_on_epic_id, dependency_type, notes) "
+                            "VALUES (?, ?, ?, ?, ?)",
+                            (db.org_id, dep_epic_id, found_epic_id,
                              dep.get("dependency_type", "blocks"),
                              dep.get("notes", "AI-generated dependency"))
                         )
                         created_deps.append({"id": cur.lastrowid})
 
             # Team recommendations
-            teams = await db.execute_fetchall("SELECT * FROM teams ORDER BY name")
+            teams = await db.execute_fetchall("SELECT * FROM teams WHERE org_id = ? ORDER BY name", (db.org_id,))
             teams_list = [dict(t) for t in teams]
             if teams_list and ai_epics:
                 rec_result = await recommend_team_assignments(ai_epics, teams_list)
@@ -433,8 +442,8 @@ async def auto_generate(db=Depends(get_db)):
                         team_id = team_name_to_id.get(assignment.get("team_name"))
                         if epic_id and team_id:
                             await db.execute(
-                                "UPDATE epics SET team_id = ? WHERE id = ?",
-                                (team_id, epic_id)
+                                "UPDATE epics SET team_id = ? WHERE id = ? AND org_id = ?",
+                                (team_id, epic_id, db.org_id)
                             )
                             team_assignments.append({
                                 "epic_name": assignment["epic_name"],
@@ -456,42 +465,42 @@ async def auto_generate(db=Depends(get_db)):
             # Create product OKRs from strategic OKRs
             if init.get("strategy_id") and init.get("product_id"):
                 sokr_rows = await db.execute_fetchall(
-                    "SELECT so.* FROM strategic_okrs so WHERE so.strategy_id = ?",
-                    (init["strategy_id"],)
+                    "SELECT so.* FROM strategic_okrs so WHERE so.org_id = ? AND so.strategy_id = ?",
+                    (db.org_id, init["strategy_id"])
                 )
                 for sokr in sokr_rows:
                     sokr = dict(sokr)
                     existing = await db.execute_fetchall(
-                        "SELECT id FROM product_okrs WHERE strategic_okr_id = ? AND digital_product_id = ? LIMIT 1",
-                        (sokr["id"], init["product_id"])
+                        "SELECT id FROM product_okrs WHERE org_id = ? AND strategic_okr_id = ? AND digital_product_id = ? LIMIT 1",
+                        (db.org_id, sokr["id"], init["product_id"])
                     )
                     if existing:
                         continue
                     obj_text = f"{sokr['objective']} ({init.get('product_name', 'Product')})"
                     cur = await db.execute(
-                        "INSERT INTO product_okrs (strategic_okr_id, digital_product_id, objective, ai_generated, status) "
-                        "VALUES (?, ?, ?, 0, 'draft')",
-                        (sokr["id"], init["product_id"], obj_text)
+                        "INSERT INTO product_okrs (org_id, strategic_okr_id, digital_product_id, objective, ai_generated, status) "
+                        "VALUES (?, ?, ?, ?, 0, 'draft')",
+                        (db.org_id, sokr["id"], init["product_id"], obj_text)
                     )
                     pokr_id = cur.lastrowid
                     created_okrs.append({"id": pokr_id, "objective": obj_text})
 
                     kr_rows = await db.execute_fetchall(
-                        "SELECT * FROM strategic_key_results WHERE okr_id = ?", (sokr["id"],)
+                        "SELECT * FROM strategic_key_results WHERE org_id = ? AND okr_id = ?", (db.org_id, sokr["id"])
                     )
                     for kr in kr_rows:
                         kr = dict(kr)
                         await db.execute(
-                            "INSERT INTO product_key_results (product_okr_id, key_result, metric, current_value, target_value, unit) "
-                            "VALUES (?, ?, ?, ?, ?, ?)",
-                            (pokr_id, kr["key_result"], kr.get("metric"), kr.get("current_value", 0),
+                            "INSERT INTO product_key_results (org_id, product_okr_id, key_result, metric, current_value, target_value, unit) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            (db.org_id, pokr_id, kr["key_result"], kr.get("metric"), kr.get("current_value", 0),
                              kr.get("target_value", 0), kr.get("unit"))
                         )
 
             # Find product OKR to link
             pokr_rows = await db.execute_fetchall(
-                "SELECT id FROM product_okrs WHERE digital_product_id = ? LIMIT 1",
-                (init.get("product_id"),)
+                "SELECT id FROM product_okrs WHERE org_id = ? AND digital_product_id = ? LIMIT 1",
+                (db.org_id, init.get("product_id"))
             )
             pokr_id = pokr_rows[0]["id"] if pokr_rows else None
 
@@ -501,8 +510,8 @@ async def auto_generate(db=Depends(get_db)):
                 full_name = f"{epic_name_tpl}: {init['name']}"
 
                 dup_rows = await db.execute_fetchall(
-                    "SELECT id FROM epics WHERE name = ? AND initiative_id = ? LIMIT 1",
-                    (full_name, init["id"])
+                    "SELECT id FROM epics WHERE org_id = ? AND name = ? AND initiative_id = ? LIMIT 1",
+                    (db.org_id, full_name, init["id"])
                 )
                 if dup_rows:
                     if idx == 0 and layer not in layer_first_epics:
@@ -514,11 +523,11 @@ async def auto_generate(db=Depends(get_db)):
                 priority = round((init_value * init_size) / effort, 2) if effort else 0
 
                 cur = await db.execute(
-                    "INSERT INTO epics (initiative_id, product_okr_id, name, description, status, "
+                    "INSERT INTO epics (org_id, initiative_id, product_okr_id, name, description, status, "
                     "value_score, size_score, effort_score, priority_score, risk_level, risks, "
                     "dependencies_text, roadmap_phase, ai_generated) "
-                    "VALUES (?, ?, ?, ?, 'backlog', ?, ?, ?, ?, ?, ?, ?, ?, 0)",
-                    (init["id"], pokr_id, full_name, epic_desc_tpl,
+                    "VALUES (?, ?, ?, ?, ?, 'backlog', ?, ?, ?, ?, ?, ?, ?, ?, 0)",
+                    (db.org_id, init["id"], pokr_id, full_name, epic_desc_tpl,
                      init_value, init_size, effort, priority,
                      risk_level, init_risks, init.get("dependencies"),
                      None)
@@ -535,14 +544,14 @@ async def auto_generate(db=Depends(get_db)):
             found_epic = layer_first_epics.get(foundation_layer)
             if dep_epic and found_epic and dep_epic != found_epic:
                 existing = await db.execute_fetchall(
-                    "SELECT id FROM epic_dependencies WHERE epic_id = ? AND depends_on_epic_id = ? LIMIT 1",
-                    (dep_epic, found_epic)
+                    "SELECT id FROM epic_dependencies WHERE org_id = ? AND epic_id = ? AND depends_on_epic_id = ? LIMIT 1",
+                    (db.org_id, dep_epic, found_epic)
                 )
                 if not existing:
                     cur = await db.execute(
-                        "INSERT INTO epic_dependencies (epic_id, depends_on_epic_id, dependency_type, notes) "
-                        "VALUES (?, ?, 'blocks', ?)",
-                        (dep_epic, found_epic, f"Auto: {dep_layer} depends on {foundation_layer}")
+                        "INSERT INTO epic_dependencies (org_id, epic_id, depends_on_epic_id, dependency_type, notes) "
+                        "VALUES (?, ?, ?, 'blocks', ?)",
+                        (db.org_id, dep_epic, found_epic, f"Auto: {dep_layer} depends on {foundation_layer}")
                     )
                     created_deps.append({
                         "id": cur.lastrowid,
@@ -564,66 +573,67 @@ async def auto_generate(db=Depends(get_db)):
 
 # --- Epics Full (rich nested data) ---
 
-@router.get("/epics-full")
-async def get_epics_full(db=Depends(get_db)):
-    rows = await db.execute_fetchall(
-        "SELECT e.*, "
-        "i.name as initiative_name, i.rice_score, i.rice_override, i.status as initiative_status, "
-        "s.layer as strategy_layer, s.name as strategy_name, "
-        "dp.name as product_name, dp.id as product_id, "
-        "pg.name as product_group_name, "
-        "t.name as team_name, "
-        "po.objective as okr_objective "
-        "FROM epics e "
-        "JOIN initiatives i ON e.initiative_id = i.id "
-        "LEFT JOIN strategies s ON i.strategy_id = s.id "
-        "LEFT JOIN digital_products dp ON i.digital_product_id = dp.id "
-        "LEFT JOIN product_groups pg ON dp.product_group_id = pg.id "
-        "LEFT JOIN teams t ON e.team_id = t.id "
-        "LEFT JOIN product_okrs po ON e.product_okr_id = po.id "
-        "ORDER BY e.priority_score DESC, e.id"
-    )
-    epics = [dict(r) for r in rows]
+EPICS_FULL = ListQuery(
+    "epics", "e",
+    joins="JOIN initiatives i ON e.initiative_id = i.id "
+          "LEFT JOIN strategies s ON i.strategy_id = s.id "
+          "LEFT JOIN digital_products dp ON i.digital_product_id = dp.id "
+          "LEFT JOIN product_groups pg ON dp.product_group_id = pg.id "
+          "LEFT JOIN teams t ON e.team_id = t.id "
+          "LEFT JOIN product_okrs po ON e.product_okr_id = po.id",
+    computed={
+        "initiative_name": "i.name", "rice_score": "i.rice_score", "rice_override": "i.rice_override",
+        "initiative_status": "i.status", "strategy_layer": "s.layer", "strategy_name": "s.name",
+        "product_name": "dp.name", "product_id": "dp.id", "product_group_name": "pg.name",
+        "team_name": "t.name", "okr_objective": "po.objective",
+    },
+    sort=[("COALESCE(e.priority_score, 0)", "DESC", float), ("e.id", "ASC", int)],
+    nested={"depends_on": (), "blocks": (), "product_key_results": ("product_okr_id",)},
+)
 
-    # Attach dependency info (both directions) per epic
-    all_deps = await db.execute_fetchall(
-        "SELECT ed.*, e1.name as epic_name, e2.name as depends_on_name "
-        "FROM epic_dependencies ed "
-        "JOIN epics e1 ON ed.epic_id = e1.id "
-        "JOIN epics e2 ON ed.depends_on_epic_id = e2.id"
-    )
-    deps_list = [dict(d) for d in all_deps]
-
-    for epic in epics:
-        eid = epic["id"]
-        epic["depends_on"] = [
-            {"id": d["depends_on_epic_id"], "name": d["depends_on_name"], "dep_id": d["id"]}
-            for d in deps_list if d["epic_id"] == eid
-        ]
-        epic["blocks"] = [
-            {"id": d["epic_id"], "name": d["epic_name"], "dep_id": d["id"]}
-            for d in deps_list if d["depends_on_epic_id"] == eid
-        ]
-
-        # Attach product key results
-        if epic.get("product_okr_id"):
-            kr_rows = await db.execute_fetchall(
-                "SELECT * FROM product_key_results WHERE product_okr_id = ? ORDER BY id",
-                (epic["product_okr_id"],),
-            )
-            epic["product_key_results"] = [dict(kr) for kr in kr_rows]
-        else:
-            epic["product_key_results"] = []
 
-    return epics
+@router.get("/epics-full")
+async def get_epics_full(limit: int | None = None, cursor: str | None = None, fields: str | None = None,
+                         db=Depends(get_db)):
+    """Epics with joined context, dependencies and product key results, highest priority first.
+    Pass `limit`/`cursor` to page through them and `fields` to pick columns (see pagination.py).
+    """
+    page = await EPICS_FULL.fetch(db, "e.org_id = ?", [db.org_id], fields, limit, cursor)
+    epics = page.rows
+
+    # Attach dependency info (both directions) and product key results, one query each
+    if page.wants("depends_on") or page.wants("blocks"):
+        graph = await load_dependency_graph(
+            db, "epic", [e["id"] for e in epics] if page.paginated else None, with_names=True
+        )
+        for epic in epics:
+            eid = epic["id"]
+            if page.wants("depends_on"):
+                epic["depends_on"] = [
+                    {"id": d["depends_on_epic_id"], "name": d["depends_on_name"], "dep_id": d["id"]}
+                    for d in graph.depends_on.get(eid, ())
+                ]
+            if page.wants("blocks"):
+                epic["blocks"] = [
+                    {"id": d["epic_id"], "name": d["node_name"], "dep_id": d["id"]}
+                    for d in graph.blocks.get(eid, ())
+                ]
+
+    if page.wants("product_key_results"):
+        key_results = await fetch_children(
+            db, "product_key_results", "product_okr_id", [e.get("product_okr_id") for e in epics]
+        )
+        for epic in epics:
+            epic["product_key_results"] = key_results.get(epic.get("product_okr_id"), [])
+
+    return page.response()
 
 
 # --- Roadmap (epics grouped by quarterly timeline — 1 year) ---
 
 @router.get("/roadmap")
+@cached_response("epics", "initiatives", "digital_products", "strategies", "teams", "epic_dependencies")
 async def get_roadmap(db=Depends(get_db)):
-    from datetime import datetime
-
     rows = await db.execute_fetchall(
         "SELECT e.*, i.name as initiative_name, i.rice_score, i.rice_override, "
         "dp.name as product_name, s.layer as strategy_layer, t.name as team_name "
@@ -631,36 +641,24 @@ async def get_roadmap(db=Depends(get_db)):
         "JOIN initiatives i ON e.initiative_id = i.id "
         "JOIN digital_products dp ON i.digital_product_id = dp.id "
         "LEFT JOIN strategies s ON i.strategy_id = s.id "
-        "LEFT JOIN teams t ON e.team_id = t.id "
-        "ORDER BY e.priority_score DESC"
+        "LEFT JOIN teams t ON e.team_id = t.id WHERE e.org_id = ? "
+        "ORDER BY e.priority_score DESC", (db.org_id,)
     )
     epics = [dict(r) for r in rows]
 
-    # Count dependencies per epic
-    dep_rows = await db.execute_fetchall(
-        "SELECT epic_id, COUNT(*) as cnt FROM epic_dependencies GROUP BY epic_id"
-    )
-    dep_counts = {d["epic_id"]: d["cnt"] for d in dep_rows}
+    # One dependency read serves the counts, the scheduler and the edge list
+    graph = await load_dependency_graph(db, "epic")
 
-    now = datetime.now()
     # Build 4 quarter labels starting from current quarter
-    quarters = []
-    q_month = ((now.month - 1) // 3) * 3 + 1
-    q_year = now.year
-    for _ in range(4):
-        q_num = (q_month - 1) // 3 + 1
-        quarters.append({"label": f"Q{q_num} {q_year}", "year": q_year, "quarter": q_num, "items": []})
-        q_month += 3
-        if q_month > 12:
-            q_month -= 12
-            q_year += 1
+    quarters = build_quarters(4)
+    plan = await schedule_epics(db, epics, graph)
 
     quick_wins = []
     strategic = []
     long_term = []
 
     for e in epics:
-        e["dep_count"] = dep_counts.get(e["id"], 0)
+        e["dep_count"] = len(graph.depends_on.get(e["id"], ()))
         phase = e.get("roadmap_phase")
         if not phase:
             priority = e.get("priority_score") or 0
@@ -679,18 +677,18 @@ async def get_roadmap(db=Depends(get_db)):
         else:
             long_term.append(e)
 
-    # Distribute across all 4 quarters proportionally by priority
-    all_items = quick_wins + strategic + long_term
-    per_q = max(1, len(all_items) // 4)
-    for idx, it in enumerate(all_items):
-        q_idx = min(idx // per_q, 3)
+    # Place each epic in the quarter of its dependency- and capacity-levelled start;
+    # epics caught in a dependency cycle stay in the final quarter until it is broken
+    for it in quick_wins + strategic + long_term:
+        timing = plan["nodes"].get(it["id"], {})
+        it["schedule"] = timing
+        q_idx = quarter_index(timing["start_date"], quarters) if timing.get("scheduled") else len(quarters) - 1
         quarters[q_idx]["items"].append(it)
+    for q in quarters:
+        q["items"].sort(key=lambda it: it["schedule"].get("start_week", float("inf")))
 
     # Dependency edges
-    edge_rows = await db.execute_fetchall(
-        "SELECT epic_id, depends_on_epic_id FROM epic_dependencies"
-    )
-    edges = [{"from": r["epic_id"], "to": r["depends_on_epic_id"]} for r in edge_rows]
+    edges = [{"from": node, "to": target} for node, target in graph.edges()]
 
     return {
         "quarters": quarters,
@@ -701,4 +699,15 @@ async def get_roadmap(db=Depends(get_db)):
             "long_term": len(long_term),
         },
         "dependency_edges": edges,
+        "critical_path": plan["critical_path"],
+        "cycles": plan["cycles"],
+        "project_weeks": plan["project_weeks"],
+        "levelled_weeks": plan["levelled_weeks"],
     }
+
+
+@router.get("/schedule")
+async def get_epic_schedule(db=Depends(get_db)):
+    """Critical-path schedule of all epics, levelled against team capacity."""
+    plan = await schedule_epics(db)
+    return {**plan, "nodes": list(plan["nodes"].values())}
@@ -4,12 +4,15 @@ Step 6b: Target Operating Model & Governance (Enhancement #9).
 
 import json
 import logging
+from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from database import get_db
+from serialization import FastJSONRoute
+from ai_jobs import enqueue_generator
 from ai_research import is_openai_available, ensure_str
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 logger = logging.getLogger(__name__)
 
 TOM_DIMENSIONS = ["people", "process", "technology", "data", "governance", "partnerships"]
@@ -19,7 +22,7 @@ GOVERNANCE_DECISIONS = ["strategic_investment", "technology_selection", "vendor_
 
 @router.get("/operating-model")
 async def get_operating_model(db=Depends(get_db)):
-    org = await db.execute_fetchone("SELECT id FROM organization LIMIT 1")
+    org = await db.execute_fetchone("SELECT id FROM organization WHERE id = ?", (db.org_id,))
     if not org:
         return []
     rows = await db.execute_fetchall(
@@ -30,7 +33,7 @@ async def get_operating_model(db=Depends(get_db)):
 
 @router.post("/operating-model")
 async def upsert_operating_model(data: dict, db=Depends(get_db)):
-    org = await db.execute_fetchone("SELECT id FROM organization LIMIT 1")
+    org = await db.execute_fetchone("SELECT id FROM organization WHERE id = ?", (db.org_id,))
     if not org:
         return {"error": "No organization found"}
     org_id = org["id"]
@@ -59,7 +62,7 @@ async def upsert_operating_model(data: dict, db=Depends(get_db)):
 
 @router.get("/governance")
 async def get_governance(db=Depends(get_db)):
-    org = await db.execute_fetchone("SELECT id FROM organization LIMIT 1")
+    org = await db.execute_fetchone("SELECT id FROM organization WHERE id = ?", (db.org_id,))
     if not org:
         return []
     rows = await db.execute_fetchall(
@@ -70,7 +73,7 @@ async def get_governance(db=Depends(get_db)):
 
 @router.post("/governance")
 async def upsert_governance(data: dict, db=Depends(get_db)):
-    org = await db.execute_fetchone("SELECT id FROM organization LIMIT 1")
+    org = await db.execute_fetchone("SELECT id FROM organization WHERE id = ?", (db.org_id,))
     if not org:
         return {"error": "No organization found"}
     org_id = org["id"]
@@ -96,9 +99,11 @@ async def upsert_governance(data: dict, db=Depends(get_db)):
 
 
 @router.post("/operating-model/ai-generate")
-async def ai_generate_tom(db=Depends(get_db)):
+async def ai_generate_tom(db=Depends(get_db), run_async: Annotated[bool, Query(alias="async")] = False):
     """AI-generate target operating model and governance."""
-    org = await db.execute_fetchone("SELECT * FROM organization LIMIT 1")
+    if run_async:
+        return await enqueue_generator(db, "tom")
+    org = await db.execute_fetchone("SELECT * FROM organization WHERE id = ?", (db.org_id,))
     if not org:
         return {"error": "No organization found"}
     org_id = org["id"]
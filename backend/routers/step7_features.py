@@ -1,9 +1,14 @@
 from fastapi import APIRouter, Depends
 from database import get_db
+from serialization import FastJSONRoute
+from response_cache import cached_response
+from pagination import ListQuery
 from ai_initiatives import gather_initiative_context, generate_ai_features
 from ai_research import is_openai_available
+from portfolio_optimizer import build_quarters
+from roadmap_scheduler import quarter_index, schedule_features
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 # --- Layer-specific feature templates (3 features per epic) ---
 FEATURE_TEMPLATES = {
@@ -38,7 +43,7 @@ async def list_delivery_okrs(db=Depends(get_db)):
         "SELECT dokr.*, po.objective as product_objective, t.name as team_name "
         "FROM delivery_okrs dokr "
         "JOIN product_okrs po ON dokr.product_okr_id = po.id "
-        "JOIN teams t ON dokr.team_id = t.id"
+        "JOIN teams t ON dokr.team_id = t.id WHERE dokr.org_id = ?", (db.org_id,)
     )
     return [dict(r) for r in rows]
 
@@ -46,8 +51,8 @@ async def list_delivery_okrs(db=Depends(get_db)):
 @router.post("/delivery-okrs")
 async def create_delivery_okr(data: dict, db=Depends(get_db)):
     cursor = await db.execute(
-        "INSERT INTO delivery_okrs (product_okr_id, team_id, objective, status) VALUES (?, ?, ?, ?)",
-        (data["product_okr_id"], data["team_id"], data["objective"], data.get("status", "draft")),
+        "INSERT INTO delivery_okrs (org_id, product_okr_id, team_id, objective, status) VALUES (?, ?, ?, ?, ?)",
+        (db.org_id, data["product_okr_id"], data["team_id"], data["objective"], data.get("status", "draft")),
     )
     await db.commit()
     return {"id": cursor.lastrowid}
@@ -59,8 +64,8 @@ async def create_delivery_okr(data: dict, db=Depends(get_db)):
 async def list_features(db=Depends(get_db)):
     rows = await db.execute_fetchall(
         "SELECT f.*, e.name as epic_name FROM features f "
-        "JOIN epics e ON f.epic_id = e.id "
-        "ORDER BY f.priority_score DESC, f.status"
+        "JOIN epics e ON f.epic_id = e.id WHERE f.org_id = ? "
+        "ORDER BY f.priority_score DESC, f.status", (db.org_id,)
     )
     return [dict(r) for r in rows]
 
@@ -72,11 +77,11 @@ async def create_feature(data: dict, db=Depends(get_db)):
     effort = data.get("effort_score", 3)
     priority = round((value * size) / effort, 2) if effort else 0
     cursor = await db.execute(
-        "INSERT INTO features (epic_id, delivery_okr_id, name, description, priority, status, "
+        "INSERT INTO features (org_id, epic_id, delivery_okr_id, name, description, priority, status, "
         "estimated_effort, start_date, target_date, value_score, size_score, effort_score, "
         "priority_score, risk_level, risks, dependencies_text, roadmap_phase) "
-        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-        (data["epic_id"], data.get("delivery_okr_id"), data["name"], data.get("description"),
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (db.org_id, data["epic_id"], data.get("delivery_okr_id"), data["name"], data.get("description"),
          data.get("priority", "medium"), data.get("status", "backlog"),
          data.get("estimated_effort"), data.get("start_date"), data.get("target_date"),
          value, size, effort, priority,
@@ -106,8 +111,8 @@ async def update_feature(feature_id: int, data: dict, db=Depends(get_db)):
     scoring_fields = {"value_score", "size_score", "effort_score"}
     if scoring_fields & set(data.keys()):
         row = await db.execute_fetchone(
-            "SELECT value_score, size_score, effort_score FROM features WHERE id = ?",
-            (feature_id,),
+            "SELECT value_score, size_score, effort_score FROM features WHERE org_id = ? AND id = ?",
+            (db.org_id, feature_id),
         )
         if row:
             v = data.get("value_score", row["value_score"] or 3)
@@ -118,9 +123,9 @@ async def update_feature(feature_id: int, data: dict, db=Depends(get_db)):
             values.append(priority)
 
     if fields:
-        values.append(feature_id)
+        values.extend([feature_id, db.org_id])
         await db.execute(
-            f"UPDATE features SET {', '.join(fields)} WHERE id = ?", values
+            f"UPDATE features SET {', '.join(fields)} WHERE id = ? AND org_id = ?", values
         )
         await db.commit()
     return {"updated": True}
@@ -128,7 +133,7 @@ async def update_feature(feature_id: int, data: dict, db=Depends(get_db)):
 
 @router.delete("/features/{feature_id}")
 async def delete_feature(feature_id: int, db=Depends(get_db)):
-    await db.execute("DELETE FROM features WHERE id = ?", (feature_id,))
+    await db.execute("DELETE FROM features WHERE id = ? AND org_id = ?", (feature_id, db.org_id))
     await db.commit()
     return {"deleted": True}
 
@@ -137,16 +142,16 @@ async def delete_feature(feature_id: int, db=Depends(get_db)):
 
 @router.get("/summary")
 async def get_summary(db=Depends(get_db)):
-    rows = await db.execute_fetchall("SELECT COUNT(*) as cnt FROM epics")
+    rows = await db.execute_fetchall("SELECT COUNT(*) as cnt FROM epics WHERE org_id = ?", (db.org_id,))
     epic_count = rows[0]["cnt"] if rows else 0
 
-    rows = await db.execute_fetchall("SELECT COUNT(*) as cnt FROM features")
+    rows = await db.execute_fetchall("SELECT COUNT(*) as cnt FROM features WHERE org_id = ?", (db.org_id,))
     feat_count = rows[0]["cnt"] if rows else 0
 
-    rows = await db.execute_fetchall("SELECT COUNT(*) as cnt FROM delivery_okrs")
+    rows = await db.execute_fetchall("SELECT COUNT(*) as cnt FROM delivery_okrs WHERE org_id = ?", (db.org_id,))
     dokr_count = rows[0]["cnt"] if rows else 0
 
-    rows = await db.execute_fetchall("SELECT COUNT(*) as cnt FROM teams")
+    rows = await db.execute_fetchall("SELECT COUNT(*) as cnt FROM teams WHERE org_id = ?", (db.org_id,))
     team_count = rows[0]["cnt"] if rows else 0
 
     return {
@@ -189,8 +194,8 @@ async def auto_generate(db=Depends(get_db)):
         "LEFT JOIN digital_products dp ON i.digital_product_id = dp.id "
         "LEFT JOIN product_groups pg ON dp.product_group_id = pg.id "
         "LEFT JOIN teams t ON e.team_id = t.id "
-        "LEFT JOIN product_okrs po ON e.product_okr_id = po.id "
-        "ORDER BY e.id"
+        "LEFT JOIN product_okrs po ON e.product_okr_id = po.id WHERE e.org_id = ? "
+        "ORDER BY e.id", (db.org_id,)
     )
     epics = [dict(r) for r in rows]
 
@@ -223,13 +228,13 @@ async def auto_generate(db=Depends(get_db)):
 
                 # Find product OKR by objective match
                 pokr_rows = await db.execute_fetchall(
-                    "SELECT id FROM product_okrs WHERE objective = ? LIMIT 1",
-                    (pokr_obj,)
+                    "SELECT id FROM product_okrs WHERE org_id = ? AND objective = ? LIMIT 1",
+                    (db.org_id, pokr_obj)
                 )
                 if not pokr_rows:
                     # Try partial match
                     pokr_rows = await db.execute_fetchall(
-                        "SELECT id FROM product_okrs ORDER BY id DESC LIMIT 1"
+                        "SELECT id FROM product_okrs WHERE org_id = ? ORDER BY id DESC LIMIT 1", (db.org_id,)
                     )
                 if not pokr_rows:
                     continue
@@ -237,28 +242,28 @@ async def auto_generate(db=Depends(get_db)):
 
                 # Find team by name
                 team_rows = await db.execute_fetchall(
-                    "SELECT id FROM teams WHERE name = ? LIMIT 1",
-                    (team_name,)
+                    "SELECT id FROM teams WHERE org_id = ? AND name = ? LIMIT 1",
+                    (db.org_id, team_name)
                 )
                 if not team_rows:
                     # Use first available team
-                    team_rows = await db.execute_fetchall("SELECT id FROM teams LIMIT 1")
+                    team_rows = await db.execute_fetchall("SELECT id FROM teams WHERE org_id = ? LIMIT 1", (db.org_id,))
                 if not team_rows:
                     continue
                 team_id = team_rows[0]["id"]
 
                 # Check if exists
                 existing = await db.execute_fetchall(
-                    "SELECT id FROM delivery_okrs WHERE product_okr_id = ? AND team_id = ? LIMIT 1",
-                    (pokr_id, team_id)
+                    "SELECT id FROM delivery_okrs WHERE org_id = ? AND product_okr_id = ? AND team_id = ? LIMIT 1",
+                    (db.org_id, pokr_id, team_id)
                 )
                 if existing:
                     continue
 
                 cur = await db.execute(
-                    "INSERT INTO delivery_okrs (product_okr_id, team_id, objective, ai_generated, status) "
-                    "VALUES (?, ?, ?, 1, 'draft')",
-                    (pokr_id, team_id, ai_dokr["objective"])
+                    "INSERT INTO delivery_okrs (org_id, product_okr_id, team_id, objective, ai_generated, status) "
+                    "VALUES (?, ?, ?, ?, 1, 'draft')",
+                    (db.org_id, pokr_id, team_id, ai_dokr["objective"])
                 )
                 dokr_id = cur.lastrowid
                 created_dokrs.append({"id": dokr_id, "objective": ai_dokr["objective"]})
@@ -267,9 +272,9 @@ async def auto_generate(db=Depends(get_db)):
                 for kr in ai_dokr.get("key_results", []):
                     await db.execute(
                         "INSERT INTO delivery_key_results "
-                        "(delivery_okr_id, key_result, metric, current_value, target_value, unit) "
-                        "VALUES (?, ?, ?, ?, ?, ?)",
-                        (dokr_id, kr.get("key_result", ""), kr.get("metric", ""),
+                        "(org_id, delivery_okr_id, key_result, metric, current_value, target_value, unit) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (db.org_id, dokr_id, kr.get("key_result", ""), kr.get("metric", ""),
                          kr.get("current_value", 0), kr.get("target_value", 0), kr.get("unit", ""))
                     )
 
@@ -292,8 +297,8 @@ async def auto_generate(db=Depends(get_db)):
 
                 # Idempotent
                 dup_rows = await db.execute_fetchall(
-                    "SELECT id FROM features WHERE name = ? AND epic_id = ? LIMIT 1",
-                    (feat_name, epic_match["id"])
+                    "SELECT id FROM features WHERE org_id = ? AND name = ? AND epic_id = ? LIMIT 1",
+                    (db.org_id, feat_name, epic_match["id"])
                 )
                 if dup_rows:
                     skipped.append(feat_name)
@@ -303,8 +308,8 @@ async def auto_generate(db=Depends(get_db)):
                 dokr_link_id = None
                 if epic_match.get("product_okr_id") and epic_match.get("team_id"):
                     dokr_rows = await db.execute_fetchall(
-                        "SELECT id FROM delivery_okrs WHERE product_okr_id = ? AND team_id = ? LIMIT 1",
-                        (epic_match["product_okr_id"], epic_match["team_id"])
+                        "SELECT id FROM delivery_okrs WHERE org_id = ? AND product_okr_id = ? AND team_id = ? LIMIT 1",
+                        (db.org_id, epic_match["product_okr_id"], epic_match["team_id"])
                     )
                     if dokr_rows:
                         dokr_link_id = dokr_rows[0]["id"]
@@ -315,12 +320,12 @@ async def auto_generate(db=Depends(get_db)):
                 priority = round((value * size) / effort, 2) if effort else 0
 
                 cur = await db.execute(
-                    "INSERT INTO features (epic_id, delivery_okr_id, name, description, status, "
+                    "INSERT INTO features (org_id, epic_id, delivery_okr_id, name, description, status, "
                     "estimated_effort, value_score, size_score, effort_score, priority_score, "
                     "risk_level, risks, dependencies_text, roadmap_phase, "
                     "ai_generated, ai_rationale, acceptance_criteria) "
-                    "VALUES (?, ?, ?, ?, 'backlog', ?, ?, ?, ?, ?, ?, ?, ?, ?, 1, ?, ?)",
-                    (epic_match["id"], dokr_link_id, feat_name, ai_feat.get("description", ""),
+                    "VALUES (?, ?, ?, ?, ?, 'backlog', ?, ?, ?, ?, ?, ?, ?, ?, ?, 1, ?, ?)",
+                    (db.org_id, epic_match["id"], dokr_link_id, feat_name, ai_feat.get("description", ""),
                      ai_feat.get("estimated_effort"),
                      value, size, effort, priority,
                      ai_feat.get("risk_level", "medium"), ai_feat.get("risks", ""),
@@ -338,14 +343,14 @@ async def auto_generate(db=Depends(get_db)):
                 depends_on_id = feat_name_to_id.get(dep.get("depends_on_feature_name"))
                 if feat_id and depends_on_id and feat_id != depends_on_id:
                     existing = await db.execute_fetchall(
-                        "SELECT id FROM feature_dependencies WHERE feature_id = ? AND depends_on_feature_id = ? LIMIT 1",
-                        (feat_id, depends_on_id)
+                        "SELECT id FROM feature_dependencies WHERE org_id = ? AND feature_id = ? AND depends_on_feature_id = ? LIMIT 1",
+                        (db.org_id, feat_id, depends_on_id)
                     )
                     if not existing:
                         cur = await db.execute(
-                            "INSERT INTO feature_dependencies (feature_id, depends_on_feature_id, dependency_type, notes) "
-                            "VALUES (?, ?, 'blocks', ?)",
-                            (feat_id, depends_on_id, dep.get("notes", "AI-generated dependency"))
+                            "INSERT INTO feature_dependencies (org_id, feature_id, depends_on_feature_id, dependency_type, notes) "
+                            "VALUES (?, ?, ?, 'blocks', ?)",
+                            (db.org_id, feat_id, depends_on_id, dep.get("notes", "AI-generated dependency"))
                         )
                         created_feat_deps.append({"id": cur.lastrowid})
 
@@ -362,35 +367,35 @@ async def auto_generate(db=Depends(get_db)):
             # Create delivery OKR
             if epic.get("product_okr_id") and epic.get("team_id"):
                 existing_dokr = await db.execute_fetchall(
-                    "SELECT id FROM delivery_okrs WHERE product_okr_id = ? AND team_id = ? LIMIT 1",
-                    (epic["product_okr_id"], epic["team_id"]),
+                    "SELECT id FROM delivery_okrs WHERE org_id = ? AND product_okr_id = ? AND team_id = ? LIMIT 1",
+                    (db.org_id, epic["product_okr_id"], epic["team_id"]),
                 )
                 if not existing_dokr:
                     pokr_rows = await db.execute_fetchall(
-                        "SELECT objective FROM product_okrs WHERE id = ? LIMIT 1",
-                        (epic["product_okr_id"],),
+                        "SELECT objective FROM product_okrs WHERE org_id = ? AND id = ? LIMIT 1",
+                        (db.org_id, epic["product_okr_id"]),
                     )
                     if pokr_rows:
                         dokr_obj = f"Deliver: {pokr_rows[0]['objective']}"
                         dokr_cur = await db.execute(
-                            "INSERT INTO delivery_okrs (product_okr_id, team_id, objective, ai_generated, status) "
-                            "VALUES (?, ?, ?, 0, 'draft')",
-                            (epic["product_okr_id"], epic["team_id"], dokr_obj),
+                            "INSERT INTO delivery_okrs (org_id, product_okr_id, team_id, objective, ai_generated, status) "
+                            "VALUES (?, ?, ?, ?, 0, 'draft')",
+                            (db.org_id, epic["product_okr_id"], epic["team_id"], dokr_obj),
                         )
                         dokr_id = dokr_cur.lastrowid
                         created_dokrs.append({"id": dokr_id, "objective": dokr_obj})
 
                         pkr_rows = await db.execute_fetchall(
-                            "SELECT * FROM product_key_results WHERE product_okr_id = ?",
-                            (epic["product_okr_id"],),
+                            "SELECT * FROM product_key_results WHERE org_id = ? AND product_okr_id = ?",
+                            (db.org_id, epic["product_okr_id"]),
                         )
                         for pkr in pkr_rows:
                             pkr = dict(pkr)
                             await db.execute(
                                 "INSERT INTO delivery_key_results "
-                                "(delivery_okr_id, key_result, metric, current_value, target_value, unit) "
-                                "VALUES (?, ?, ?, ?, ?, ?)",
-                                (dokr_id, pkr["key_result"], pkr.get("metric"),
+                                "(org_id, delivery_okr_id, key_result, metric, current_value, target_value, unit) "
+                                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                (db.org_id, dokr_id, pkr["key_result"], pkr.get("metric"),
                                  pkr.get("current_value", 0), pkr.get("target_value", 0),
                                  pkr.get("unit")),
                             )
@@ -399,8 +404,8 @@ async def auto_generate(db=Depends(get_db)):
             dokr_link_id = None
             if epic.get("product_okr_id") and epic.get("team_id"):
                 dokr_rows = await db.execute_fetchall(
-                    "SELECT id FROM delivery_okrs WHERE product_okr_id = ? AND team_id = ? LIMIT 1",
-                    (epic["product_okr_id"], epic["team_id"]),
+                    "SELECT id FROM delivery_okrs WHERE org_id = ? AND product_okr_id = ? AND team_id = ? LIMIT 1",
+                    (db.org_id, epic["product_okr_id"], epic["team_id"]),
                 )
                 if dokr_rows:
                     dokr_link_id = dokr_rows[0]["id"]
@@ -411,8 +416,8 @@ async def auto_generate(db=Depends(get_db)):
                 full_name = f"{feat_name_tpl}: {epic['name']}"
 
                 dup_rows = await db.execute_fetchall(
-                    "SELECT id FROM features WHERE name = ? AND epic_id = ? LIMIT 1",
-                    (full_name, epic["id"]),
+                    "SELECT id FROM features WHERE org_id = ? AND name = ? AND epic_id = ? LIMIT 1",
+                    (db.org_id, full_name, epic["id"]),
                 )
                 if dup_rows:
                     skipped.append(full_name)
@@ -422,11 +427,11 @@ async def auto_generate(db=Depends(get_db)):
                 priority = round((epic_value * epic_size) / effort, 2) if effort else 0
 
                 cur = await db.execute(
-                    "INSERT INTO features (epic_id, delivery_okr_id, name, description, status, "
+                    "INSERT INTO features (org_id, epic_id, delivery_okr_id, name, description, status, "
                     "value_score, size_score, effort_score, priority_score, "
                     "risk_level, risks, dependencies_text, roadmap_phase, ai_generated) "
-                    "VALUES (?, ?, ?, ?, 'backlog', ?, ?, ?, ?, ?, ?, ?, ?, 0)",
-                    (epic["id"], dokr_link_id, full_name, feat_desc_tpl,
+                    "VALUES (?, ?, ?, ?, ?, 'backlog', ?, ?, ?, ?, ?, ?, ?, ?, 0)",
+                    (db.org_id, epic["id"], dokr_link_id, full_name, feat_desc_tpl,
                      epic_value, epic_size, effort, priority,
                      risk_level, epic_risks, epic.get("dependencies_text"),
                      None),
@@ -454,7 +459,7 @@ async def list_feature_dependencies(db=Depends(get_db)):
         "SELECT fd.*, f1.name as feature_name, f2.name as depends_on_name "
         "FROM feature_dependencies fd "
         "JOIN features f1 ON fd.feature_id = f1.id "
-        "JOIN features f2 ON fd.depends_on_feature_id = f2.id"
+        "JOIN features f2 ON fd.depends_on_feature_id = f2.id WHERE fd.org_id = ?", (db.org_id,)
     )
     return [dict(r) for r in rows]
 
@@ -462,9 +467,9 @@ async def list_feature_dependencies(db=Depends(get_db)):
 @router.post("/feature-dependencies")
 async def create_feature_dependency(data: dict, db=Depends(get_db)):
     cursor = await db.execute(
-        "INSERT INTO feature_dependencies (feature_id, depends_on_feature_id, dependency_type, notes) "
-        "VALUES (?, ?, ?, ?)",
-        (data["feature_id"], data["depends_on_feature_id"],
+        "INSERT INTO feature_dependencies (org_id, feature_id, depends_on_feature_id, dependency_type, notes) "
+        "VALUES (?, ?, ?, ?, ?)",
+        (db.org_id, data["feature_id"], data["depends_on_feature_id"],
          data.get("dependency_type", "blocks"), data.get("notes")),
     )
     await db.commit()
@@ -473,49 +478,51 @@ async def create_feature_dependency(data: dict, db=Depends(get_db)):
 
 @router.delete("/feature-dependencies/{dep_id}")
 async def delete_feature_dependency(dep_id: int, db=Depends(get_db)):
-    await db.execute("DELETE FROM feature_dependencies WHERE id = ?", (dep_id,))
+    await db.execute("DELETE FROM feature_dependencies WHERE id = ? AND org_id = ?", (dep_id, db.org_id))
     await db.commit()
     return {"deleted": True}
 
 
 # --- Features Full (rich nested data) ---
 
+FEATURES_FULL = ListQuery(
+    "features", "f",
+    joins="JOIN epics e ON f.epic_id = e.id "
+          "JOIN initiatives i ON e.initiative_id = i.id "
+          "LEFT JOIN strategies s ON i.strategy_id = s.id "
+          "LEFT JOIN digital_products dp ON i.digital_product_id = dp.id "
+          "LEFT JOIN product_groups pg ON dp.product_group_id = pg.id "
+          "LEFT JOIN teams t ON e.team_id = t.id "
+          "LEFT JOIN delivery_okrs dokr ON f.delivery_okr_id = dokr.id "
+          "LEFT JOIN product_okrs po ON e.product_okr_id = po.id",
+    computed={
+        "epic_name": "e.name", "epic_value": "e.value_score", "epic_size": "e.size_score",
+        "epic_effort": "e.effort_score", "epic_priority": "e.priority_score",
+        "epic_risk_level": "e.risk_level", "initiative_id": "e.initiative_id",
+        "initiative_name": "i.name", "rice_score": "i.rice_score", "rice_override": "i.rice_override",
+        "strategy_layer": "s.layer", "strategy_name": "s.name",
+        "product_name": "dp.name", "product_group_name": "pg.name", "team_name": "t.name",
+        "delivery_okr_objective": "dokr.objective", "product_okr_objective": "po.objective",
+    },
+    sort=[("COALESCE(f.priority_score, 0)", "DESC", float), ("f.id", "ASC", int)],
+)
+
+
 @router.get("/features-full")
-async def get_features_full(db=Depends(get_db)):
-    rows = await db.execute_fetchall(
-        "SELECT f.*, "
-        "e.name as epic_name, e.value_score as epic_value, e.size_score as epic_size, "
-        "e.effort_score as epic_effort, e.priority_score as epic_priority, "
-        "e.risk_level as epic_risk_level, e.initiative_id, "
-        "i.name as initiative_name, i.rice_score, i.rice_override, "
-        "s.layer as strategy_layer, s.name as strategy_name, "
-        "dp.name as product_name, "
-        "pg.name as product_group_name, "
-        "t.name as team_name, "
-        "dokr.objective as delivery_okr_objective, "
-        "po.objective as product_okr_objective "
-        "FROM features f "
-        "JOIN epics e ON f.epic_id = e.id "
-        "JOIN initiatives i ON e.initiative_id = i.id "
-        "LEFT JOIN strategies s ON i.strategy_id = s.id "
-        "LEFT JOIN digital_products dp ON i.digital_product_id = dp.id "
-        "LEFT JOIN product_groups pg ON dp.product_group_id = pg.id "
-        "LEFT JOIN teams t ON e.team_id = t.id "
-        "LEFT JOIN delivery_okrs dokr ON f.delivery_okr_id = dokr.id "
-        "LEFT JOIN product_okrs po ON e.product_okr_id = po.id "
-        "ORDER BY f.priority_score DESC, f.id"
-    )
-    return [dict(r) for r in rows]
+async def get_features_full(limit: int | None = None, cursor: str | None = None, fields: str | None = None,
+                            db=Depends(get_db)):
+    """Features with their epic, initiative, product and OKR context, highest priority first."""
+    page = await FEATURES_FULL.fetch(db, "f.org_id = ?", [db.org_id], fields, limit, cursor)
+    return page.response()
 
 
 # --- Roadmap (features grouped by quarterly timeline — 1 year) ---
 
 @router.get("/roadmap")
+@cached_response("features", "epics", "initiatives", "digital_products", "strategies", "teams", "feature_dependencies")
 async def get_roadmap(db=Depends(get_db)):
-    from datetime import datetime
-
     rows = await db.execute_fetchall(
-        "SELECT f.*, e.name as epic_name, "
+        "SELECT f.*, e.name as epic_name, e.team_id, "
         "i.name as initiative_name, i.rice_score, i.rice_override, "
         "dp.name as product_name, s.layer as strategy_layer, t.name as team_name "
         "FROM features f "
@@ -523,23 +530,14 @@ async def get_roadmap(db=Depends(get_db)):
         "JOIN initiatives i ON e.initiative_id = i.id "
         "JOIN digital_products dp ON i.digital_product_id = dp.id "
         "LEFT JOIN strategies s ON i.strategy_id = s.id "
-        "LEFT JOIN teams t ON e.team_id = t.id "
-        "ORDER BY f.priority_score DESC"
+        "LEFT JOIN teams t ON e.team_id = t.id WHERE f.org_id = ? "
+        "ORDER BY f.priority_score DESC", (db.org_id,)
     )
     features = [dict(r) for r in rows]
 
-    now = datetime.now()
     # Build 4 quarter labels starting from current quarter
-    quarters = []
-    q_month = ((now.month - 1) // 3) * 3 + 1
-    q_year = now.year
-    for _ in range(4):
-        q_num = (q_month - 1) // 3 + 1
-        quarters.append({"label": f"Q{q_num} {q_year}", "year": q_year, "quarter": q_num, "items": []})
-        q_month += 3
-        if q_month > 12:
-            q_month -= 12
-            q_year += 1
+    quarters = build_quarters(4)
+    plan = await schedule_features(db, features)
 
     quick_wins = []
     strategic = []
@@ -564,12 +562,14 @@ async def get_roadmap(db=Depends(get_db)):
         else:
             long_term.append(f)
 
-    # Distribute across all 4 quarters proportionally by priority
-    all_items = quick_wins + strategic + long_term
-    per_q = max(1, len(all_items) // 4)
-    for idx, it in enumerate(all_items):
-        q_idx = min(idx // per_q, 3)
+    # Place each feature in the quarter of its dependency- and capacity-levelled start
+    for it in quick_wins + strategic + long_term:
+        timing = plan["nodes"].get(it["id"], {})
+        it["schedule"] = timing
+        q_idx = quarter_index(timing["start_date"], quarters) if timing.get("scheduled") else len(quarters) - 1
         quarters[q_idx]["items"].append(it)
+    for q in quarters:
+        q["items"].sort(key=lambda it: it["schedule"].get("start_week", float("inf")))
 
     return {
         "quarters": quarters,
@@ -579,4 +579,15 @@ async def get_roadmap(db=Depends(get_db)):
             "strategic": len(strategic),
             "long_term": len(long_term),
         },
+        "critical_path": plan["critical_path"],
+        "cycles": plan["cycles"],
+        "project_weeks": plan["project_weeks"],
+        "levelled_weeks": plan["levelled_weeks"],
     }
+
+
+@router.get("/schedule")
+async def get_feature_schedule(db=Depends(get_db)):
+    """Critical-path schedule of all features, levelled against their epic team's capacity."""
+    plan = await schedule_features(db)
+    return {**plan, "nodes": list(plan["nodes"].values())}
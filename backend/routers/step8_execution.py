@@ -6,13 +6,16 @@ import json
 import logging
 
 from fastapi import APIRouter, Depends
-from database import get_db
+from database import get_db, timestamp_param
+from serialization import FastJSONRoute
+from response_cache import cached_response
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 logger = logging.getLogger(__name__)
 
 
 @router.get("/dashboard")
+@cached_response("strategic_key_results", "strategic_okrs", "strategies", "initiatives", "digital_products", "epics")
 async def execution_dashboard(db=Depends(get_db)):
     """Get comprehensive execution tracking data."""
 
@@ -21,8 +24,8 @@ async def execution_dashboard(db=Depends(get_db)):
         "SELECT skr.*, so.objective, s.name as strategy_name, s.layer "
         "FROM strategic_key_results skr "
         "JOIN strategic_okrs so ON skr.okr_id = so.id "
-        "JOIN strategies s ON so.strategy_id = s.id "
-        "ORDER BY s.layer, so.objective"
+        "JOIN strategies s ON so.strategy_id = s.id WHERE skr.org_id = ? "
+        "ORDER BY s.layer, so.objective", (db.org_id,)
     )
 
     # Initiative progress
@@ -31,8 +34,8 @@ async def execution_dashboard(db=Depends(get_db)):
         "dp.name as product_name, s.name as strategy_name "
         "FROM initiatives i "
         "JOIN digital_products dp ON i.digital_product_id = dp.id "
-        "LEFT JOIN strategies s ON i.strategy_id = s.id "
-        "ORDER BY i.completion_pct DESC"
+        "LEFT JOIN strategies s ON i.strategy_id = s.id WHERE i.org_id = ? "
+        "ORDER BY i.completion_pct DESC", (db.org_id,)
     )
 
     # Epic progress
@@ -40,8 +43,8 @@ async def execution_dashboard(db=Depends(get_db)):
         "SELECT e.id, e.name, e.status, e.completion_pct, e.actual_start_date, e.actual_end_date, "
         "i.name as initiative_name "
         "FROM epics e "
-        "JOIN initiatives i ON e.initiative_id = i.id "
-        "ORDER BY e.status, e.completion_pct DESC"
+        "JOIN initiatives i ON e.initiative_id = i.id WHERE e.org_id = ? "
+        "ORDER BY e.status, e.completion_pct DESC", (db.org_id,)
     )
 
     # Off-track items (below expected progress)
@@ -87,8 +90,8 @@ async def update_initiative_progress(item_id: int, data: dict, db=Depends(get_db
             fields.append(f"{col} = ?")
             values.append(data[col])
     if fields:
-        values.append(item_id)
-        await db.execute(f"UPDATE initiatives SET {', '.join(fields)} WHERE id = ?", values)
+        values.extend([item_id, db.org_id])
+        await db.execute(f"UPDATE initiatives SET {', '.join(fields)} WHERE id = ? AND org_id = ?", values)
         await db.commit()
     return {"success": True}
 
@@ -102,8 +105,8 @@ async def update_epic_progress(item_id: int, data: dict, db=Depends(get_db)):
             fields.append(f"{col} = ?")
             values.append(data[col])
     if fields:
-        values.append(item_id)
-        await db.execute(f"UPDATE epics SET {', '.join(fields)} WHERE id = ?", values)
+        values.extend([item_id, db.org_id])
+        await db.execute(f"UPDATE epics SET {', '.join(fields)} WHERE id = ? AND org_id = ?", values)
         await db.commit()
     return {"success": True}
 
@@ -115,8 +118,9 @@ async def update_kr_actual(item_id: int, data: dict, db=Depends(get_db)):
     if table not in ("strategic_key_results", "product_key_results", "delivery_key_results"):
         return {"error": "Invalid table"}
     await db.execute(
-        f"UPDATE {table} SET actual_value = ?, last_updated = datetime('now') WHERE id = ?",
-        [data.get("actual_value", 0), item_id],
+        f"UPDATE {table} SET actual_value = ?, last_updated = ? WHERE id = ? AND org_id = ?",
+        # last_updated is a TEXT column on both backends
+        [data.get("actual_value", 0), str(timestamp_param()), item_id, db.org_id],
     )
     await db.commit()
     return {"success": True}
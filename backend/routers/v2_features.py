@@ -5,14 +5,22 @@ Tech Recommendations, Multi-Scenario, Process Mining config, Multi-Model config.
 (Enhancements #6, #7, #11, #12, #13, #14, #15-25)
 """
 
+import asyncio
+import hashlib
 import json
 import logging
-
-from fastapi import APIRouter, Depends
-from database import get_db
+from datetime import datetime, timedelta, timezone
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+from database import get_db, timestamp_param
+from serialization import FastJSONRoute
+from response_cache import cached_response
+from ai_jobs import enqueue_generator
+from pagination import ListQuery
 from ai_research import is_openai_available, extract_list, ensure_str
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 logger = logging.getLogger(__name__)
 
 
@@ -132,20 +140,25 @@ async def seed_industry_profiles(db=Depends(get_db)):
 # ─── Enhancement #16: Risk Registry ─────────────────────────────────────
 
 
+RISKS_LIST = ListQuery(
+    "risk_registry", "r",
+    sort=[("COALESCE(r.risk_score, 0)", "DESC", int), ("r.id", "ASC", int)],
+)
+
+
 @router.get("/risks")
-async def get_risks(db=Depends(get_db)):
-    org = await db.execute_fetchone("SELECT id FROM organization LIMIT 1")
+async def get_risks(limit: int | None = None, cursor: str | None = None, fields: str | None = None,
+                    db=Depends(get_db)):
+    org = await db.execute_fetchone("SELECT id FROM organization WHERE id = ?", (db.org_id,))
     if not org:
         return []
-    rows = await db.execute_fetchall(
-        "SELECT * FROM risk_registry WHERE org_id = ? ORDER BY risk_score DESC", [org["id"]]
-    )
-    return [dict(r) for r in rows]
+    page = await RISKS_LIST.fetch(db, "r.org_id = ?", [org["id"]], fields, limit, cursor)
+    return page.response()
 
 
 @router.post("/risks")
 async def create_risk(data: dict, db=Depends(get_db)):
-    org = await db.execute_fetchone("SELECT id FROM organization LIMIT 1")
+    org = await db.execute_fetchone("SELECT id FROM organization WHERE id = ?", (db.org_id,))
     if not org:
         return {"error": "No organization found"}
     prob = data.get("probability", 3)
@@ -166,9 +179,9 @@ async def update_risk(item_id: int, data: dict, db=Depends(get_db)):
     impact = data.get("impact_score", 3)
     await db.execute(
         "UPDATE risk_registry SET risk_name=?, category=?, probability=?, impact_score=?, risk_score=?, "
-        "mitigation=?, owner=?, status=? WHERE id=?",
+        "mitigation=?, owner=?, status=? WHERE id=? AND org_id = ?",
         [data.get("risk_name"), data.get("category", ""), prob, impact, prob * impact,
-         data.get("mitigation", ""), data.get("owner", ""), data.get("status", "open"), item_id],
+         data.get("mitigation", ""), data.get("owner", ""), data.get("status", "open"), item_id, db.org_id],
     )
     await db.commit()
     return {"success": True}
@@ -176,21 +189,23 @@ async def update_risk(item_id: int, data: dict, db=Depends(get_db)):
 
 @router.delete("/risks/{item_id}")
 async def delete_risk(item_id: int, db=Depends(get_db)):
-    await db.execute("DELETE FROM risk_registry WHERE id = ?", [item_id])
+    await db.execute("DELETE FROM risk_registry WHERE id = ? AND org_id = ?", [item_id, db.org_id])
     await db.commit()
     return {"deleted": True}
 
 
 @router.post("/risks/ai-generate")
-async def ai_generate_risks(db=Depends(get_db)):
+async def ai_generate_risks(db=Depends(get_db), run_async: Annotated[bool, Query(alias="async")] = False):
     """AI-generate risk registry from strategies and initiatives."""
-    org = await db.execute_fetchone("SELECT * FROM organization LIMIT 1")
+    if run_async:
+        return await enqueue_generator(db, "risks")
+    org = await db.execute_fetchone("SELECT * FROM organization WHERE id = ?", (db.org_id,))
     if not org:
         return {"error": "No organization found"}
     org_id = org["id"]
 
-    strategies = await db.execute_fetchall("SELECT name, description, risks FROM strategies")
-    initiatives = await db.execute_fetchall("SELECT name, description, risks FROM initiatives")
+    strategies = await db.execute_fetchall("SELECT name, description, risks FROM strategies WHERE org_id = ?", (db.org_id,))
+    initiatives = await db.execute_fetchall("SELECT name, description, risks FROM initiatives WHERE org_id = ?", (db.org_id,))
 
     if not is_openai_available():
         risk_templates = [
@@ -252,9 +267,9 @@ Return JSON array."""
 @router.post("/feedback")
 async def submit_feedback(data: dict, db=Depends(get_db)):
     await db.execute(
-        "INSERT INTO ai_feedback (entity_type, entity_id, original_text, edited_text, feedback_type) "
-        "VALUES (?, ?, ?, ?, ?)",
-        [data.get("entity_type"), data.get("entity_id"), data.get("original_text", ""),
+        "INSERT INTO ai_feedback (org_id, entity_type, entity_id, original_text, edited_text, feedback_type) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        [db.org_id, data.get("entity_type"), data.get("entity_id"), data.get("original_text", ""),
          data.get("edited_text", ""), data.get("feedback_type", "edit")],
     )
     await db.commit()
@@ -263,10 +278,10 @@ async def submit_feedback(data: dict, db=Depends(get_db)):
 
 @router.get("/feedback/stats")
 async def feedback_stats(db=Depends(get_db)):
-    total = await db.execute_fetchone("SELECT COUNT(*) as c FROM ai_feedback")
-    edits = await db.execute_fetchone("SELECT COUNT(*) as c FROM ai_feedback WHERE feedback_type = 'edit'")
-    accepts = await db.execute_fetchone("SELECT COUNT(*) as c FROM ai_feedback WHERE feedback_type = 'accept'")
-    rejects = await db.execute_fetchone("SELECT COUNT(*) as c FROM ai_feedback WHERE feedback_type = 'reject'")
+    total = await db.execute_fetchone("SELECT COUNT(*) as c FROM ai_feedback WHERE org_id = ?", (db.org_id,))
+    edits = await db.execute_fetchone("SELECT COUNT(*) as c FROM ai_feedback WHERE org_id = ? AND feedback_type = 'edit'", (db.org_id,))
+    accepts = await db.execute_fetchone("SELECT COUNT(*) as c FROM ai_feedback WHERE org_id = ? AND feedback_type = 'accept'", (db.org_id,))
+    rejects = await db.execute_fetchone("SELECT COUNT(*) as c FROM ai_feedback WHERE org_id = ? AND feedback_type = 'reject'", (db.org_id,))
     return {
         "total": total["c"] if total else 0,
         "edits": edits["c"] if edits else 0,
@@ -284,8 +299,8 @@ async def feedback_stats(db=Depends(get_db)):
 @router.get("/comments")
 async def get_comments(entity_type: str, entity_id: int, db=Depends(get_db)):
     rows = await db.execute_fetchall(
-        "SELECT * FROM comments WHERE entity_type = ? AND entity_id = ? ORDER BY created_at DESC",
-        [entity_type, entity_id],
+        "SELECT * FROM comments WHERE org_id = ? AND entity_type = ? AND entity_id = ? ORDER BY created_at DESC",
+        [db.org_id, entity_type, entity_id],
     )
     return [dict(r) for r in rows]
 
@@ -293,8 +308,8 @@ async def get_comments(entity_type: str, entity_id: int, db=Depends(get_db)):
 @router.post("/comments")
 async def create_comment(data: dict, db=Depends(get_db)):
     await db.execute(
-        "INSERT INTO comments (entity_type, entity_id, user_name, comment_text) VALUES (?, ?, ?, ?)",
-        [data.get("entity_type"), data.get("entity_id"), data.get("user_name", "User"),
+        "INSERT INTO comments (org_id, entity_type, entity_id, user_name, comment_text) VALUES (?, ?, ?, ?, ?)",
+        [db.org_id, data.get("entity_type"), data.get("entity_id"), data.get("user_name", "User"),
          data.get("comment_text", "")],
     )
     await db.commit()
@@ -303,7 +318,7 @@ async def create_comment(data: dict, db=Depends(get_db)):
 
 @router.delete("/comments/{item_id}")
 async def delete_comment(item_id: int, db=Depends(get_db)):
-    await db.execute("DELETE FROM comments WHERE id = ?", [item_id])
+    await db.execute("DELETE FROM comments WHERE id = ? AND org_id = ?", [item_id, db.org_id])
     await db.commit()
     return {"deleted": True}
 
@@ -313,7 +328,7 @@ async def delete_comment(item_id: int, db=Depends(get_db)):
 
 @router.get("/pipeline-runs")
 async def get_pipeline_runs(db=Depends(get_db)):
-    org = await db.execute_fetchone("SELECT id FROM organization LIMIT 1")
+    org = await db.execute_fetchone("SELECT id FROM organization WHERE id = ?", (db.org_id,))
     if not org:
         return []
     rows = await db.execute_fetchall(
@@ -327,7 +342,7 @@ async def get_pipeline_runs(db=Depends(get_db)):
 
 @router.get("/competitive-alerts")
 async def get_competitive_alerts(db=Depends(get_db)):
-    org = await db.execute_fetchone("SELECT id FROM organization LIMIT 1")
+    org = await db.execute_fetchone("SELECT id FROM organization WHERE id = ?", (db.org_id,))
     if not org:
         return []
     rows = await db.execute_fetchall(
@@ -336,56 +351,121 @@ async def get_competitive_alerts(db=Depends(get_db)):
     return [dict(r) for r in rows]
 
 
+NEWS_CONCURRENCY = 4
+NEWS_FIRST_SYNC_DAYS = 30  # how far back a competitor's first refresh looks
+NEWS_ALERTS_PER_COMPETITOR = 20  # newest articles kept per competitor per refresh
+ALERT_INSERT_BATCH = 100
+
+
+def _alert_hash(competitor: str, article: dict) -> str:
+    """Identity of a news alert: the article URL, or its headline when there is no URL."""
+    key = (article.get("url") or "").strip() or " ".join((article.get("headline") or "").lower().split())
+    return hashlib.sha256(f"{competitor}\n{key}".encode()).hexdigest()
+
+
+async def _competitor_news(client, ticker: str, last_seen: int | None) -> list[dict]:
+    """Articles for `ticker` newer than the unix time `last_seen`, newest first."""
+    from data_ingestion import fetch_company_news
+
+    today = datetime.now(timezone.utc).date()
+    since = (datetime.fromtimestamp(last_seen, timezone.utc).date() if last_seen
+             else today - timedelta(days=NEWS_FIRST_SYNC_DAYS))
+    news = await fetch_company_news(ticker, since, today, client=client)
+    # Finnhub filters by day; drop what an earlier refresh already saw that day
+    fresh = [a for a in news if isinstance(a.get("datetime"), int) and a["datetime"] > (last_seen or 0)]
+    return sorted(fresh, key=lambda a: a["datetime"], reverse=True)[:NEWS_ALERTS_PER_COMPETITOR]
+
+
 @router.post("/competitive-alerts/refresh")
 async def refresh_competitive_alerts(db=Depends(get_db)):
-    """Fetch latest competitive news from Finnhub."""
-    org = await db.execute_fetchone("SELECT * FROM organization LIMIT 1")
+    """Fetch competitive news from Finnhub published since each competitor's last refresh.
+
+    Competitors are queried concurrently (within FINNHUB_LIMITER), and an article already
+    stored for a competitor is never added twice.
+    """
+    import httpx
+    import data_ingestion
+
+    org = await db.execute_fetchone("SELECT * FROM organization WHERE id = ?", (db.org_id,))
     if not org:
         return {"error": "No organization found"}
     org_id = org["id"]
-    org_dict = dict(org)
+    if not data_ingestion.FINNHUB_API_KEY:
+        return {"error": "FINNHUB_API_KEY not configured"}
+
+    competitors = {}
+    for comp in await db.execute_fetchall("SELECT name, ticker FROM competitors WHERE org_id = ?", (db.org_id,)):
+        if comp["ticker"]:
+            competitors.setdefault(comp["ticker"], comp["name"] or comp["ticker"])
+    sync_rows = await db.execute_fetchall(
+        "SELECT ticker, last_seen_ts FROM competitor_news_sync WHERE org_id = ?", (db.org_id,)
+    )
+    last_seen = {r["ticker"]: r["last_seen_ts"] for r in sync_rows}
 
-    competitors = await db.execute_fetchall("SELECT name, ticker FROM competitors")
-    count = 0
+    semaphore = asyncio.Semaphore(NEWS_CONCURRENCY)
+    async with httpx.AsyncClient(timeout=15) as http:
+        async def fetch(ticker):
+            async with semaphore:
+                return await _competitor_news(http, ticker, last_seen.get(ticker))
 
-    try:
-        import os, httpx
-        finnhub_key = os.getenv("FINNHUB_API_KEY")
-        if not finnhub_key:
-            return {"error": "FINNHUB_API_KEY not configured"}
-        async with httpx.AsyncClient() as http:
-            for comp in competitors:
-                cd = dict(comp)
-                ticker = cd.get("ticker")
-                if not ticker:
-                    continue
-                resp = await http.get(
-                    f"https://finnhub.io/api/v1/company-news",
-                    params={"symbol": ticker, "from": "2024-01-01", "to": "2025-12-31", "token": finnhub_key},
-                    timeout=15,
-                )
-                if resp.status_code == 200:
-                    news = resp.json()
-                    if isinstance(news, list):
-                        for article in news[:5]:
-                            await db.execute(
-                                "INSERT INTO competitive_alerts (org_id, competitor_name, alert_type, headline, summary, source_url, severity) "
-                                "VALUES (?, ?, 'news', ?, ?, ?, 'info')",
-                                [org_id, cd.get("name", ticker), article.get("headline", ""),
-                                 article.get("summary", ""), article.get("url", "")],
-                            )
-                            count += 1
-        await db.commit()
-    except Exception as e:
-        logger.warning("Competitive alert refresh failed: %s", e)
-        return {"error": str(e)}
+        fetched = await asyncio.gather(*(fetch(t) for t in competitors), return_exceptions=True)
+
+    alerts, newest, failed = {}, {}, []
+    for (ticker, name), news in zip(competitors.items(), fetched):
+        if isinstance(news, Exception):
+            logger.warning("Competitive news fetch failed for %s: %s", ticker, news)
+            failed.append(ticker)
+            continue
+        for article in news:
+            alerts.setdefault(_alert_hash(name, article), (name, article))
+        if news:
+            newest[ticker] = news[0]["datetime"]
+
+    if alerts:
+        hashes = list(alerts)
+        known = set()
+        for i in range(0, len(hashes), ALERT_INSERT_BATCH):
+            batch = hashes[i : i + ALERT_INSERT_BATCH]
+            rows = await db.execute_fetchall(
+                f"SELECT content_hash FROM competitive_alerts WHERE org_id = ? "
+                f"AND content_hash IN ({', '.join('?' for _ in batch)})",
+                [org_id, *batch],
+            )
+            known.update(r["content_hash"] for r in rows)
+        new = [h for h in hashes if h not in known]
+        for i in range(0, len(new), ALERT_INSERT_BATCH):
+            batch = new[i : i + ALERT_INSERT_BATCH]
+            params = []
+            for h in batch:
+                name, article = alerts[h]
+                params += [org_id, name, article.get("headline", ""), article.get("summary", ""), article.get("url", ""), h]
+            await db.execute(
+                "INSERT INTO competitive_alerts (org_id, competitor_name, alert_type, headline, summary, source_url, "
+                "severity, content_hash) VALUES "
+                + ", ".join("(?, ?, 'news', ?, ?, ?, 'info', ?)" for _ in batch)
+                + " ON CONFLICT (org_id, content_hash) DO NOTHING",
+                params,
+            )
+    else:
+        new = []
 
-    return {"alerts_added": count}
+    for ticker, ts in newest.items():
+        await db.execute(
+            "INSERT INTO competitor_news_sync (org_id, ticker, last_seen_ts, synced_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (org_id, ticker) DO UPDATE SET last_seen_ts = excluded.last_seen_ts, synced_at = excluded.synced_at",
+            [org_id, ticker, ts, timestamp_param()],
+        )
+    await db.commit()
+
+    result = {"alerts_added": len(new), "duplicates_skipped": len(alerts) - len(new), "competitors_checked": len(competitors)}
+    if failed:
+        result["failed"] = failed
+    return result
 
 
 @router.put("/competitive-alerts/{item_id}/read")
 async def mark_alert_read(item_id: int, db=Depends(get_db)):
-    await db.execute("UPDATE competitive_alerts SET is_read = 1 WHERE id = ?", [item_id])
+    await db.execute("UPDATE competitive_alerts SET is_read = 1 WHERE id = ? AND org_id = ?", [item_id, db.org_id])
     await db.commit()
     return {"success": True}
 
@@ -440,6 +520,7 @@ async def seed_benchmarks(db=Depends(get_db)):
 
 
 @router.get("/roi-portfolio")
+@cached_response("initiatives", "digital_products")
 async def roi_portfolio(db=Depends(get_db)):
     """Aggregate business cases across all initiatives."""
     rows = await db.execute_fetchall(
@@ -447,8 +528,8 @@ async def roi_portfolio(db=Depends(get_db)):
         "i.status, dp.name as product_name "
         "FROM initiatives i "
         "JOIN digital_products dp ON i.digital_product_id = dp.id "
-        "WHERE i.estimated_cost_k IS NOT NULL "
-        "ORDER BY i.roi_pct DESC NULLS LAST"
+        "WHERE i.org_id = ? AND i.estimated_cost_k IS NOT NULL "
+        "ORDER BY i.roi_pct DESC NULLS LAST", (db.org_id,)
     )
     items = [dict(r) for r in rows]
     total_cost = sum(r.get("estimated_cost_k") or 0 for r in items)
@@ -475,19 +556,19 @@ async def roi_portfolio(db=Depends(get_db)):
 async def get_pilot_scopes(initiative_id: int = None, db=Depends(get_db)):
     if initiative_id:
         rows = await db.execute_fetchall(
-            "SELECT * FROM pilot_scopes WHERE initiative_id = ?", [initiative_id]
+            "SELECT * FROM pilot_scopes WHERE org_id = ? AND initiative_id = ?", [db.org_id, initiative_id]
         )
     else:
-        rows = await db.execute_fetchall("SELECT * FROM pilot_scopes ORDER BY initiative_id")
+        rows = await db.execute_fetchall("SELECT * FROM pilot_scopes WHERE org_id = ? ORDER BY initiative_id", (db.org_id,))
     return [dict(r) for r in rows]
 
 
 @router.post("/pilot-scopes")
 async def create_pilot_scope(data: dict, db=Depends(get_db)):
     await db.execute(
-        "INSERT INTO pilot_scopes (initiative_id, mvp_description, success_criteria, duration_weeks, "
-        "team_size, go_nogo_criteria, scale_up_path) VALUES (?, ?, ?, ?, ?, ?, ?)",
-        [data.get("initiative_id"), data.get("mvp_description", ""), data.get("success_criteria", ""),
+        "INSERT INTO pilot_scopes (org_id, initiative_id, mvp_description, success_criteria, duration_weeks, "
+        "team_size, go_nogo_criteria, scale_up_path) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        [db.org_id, data.get("initiative_id"), data.get("mvp_description", ""), data.get("success_criteria", ""),
          data.get("duration_weeks", 8), data.get("team_size", 5),
          data.get("go_nogo_criteria", ""), data.get("scale_up_path", "")],
     )
@@ -496,13 +577,15 @@ async def create_pilot_scope(data: dict, db=Depends(get_db)):
 
 
 @router.post("/pilot-scopes/ai-generate")
-async def ai_generate_pilot_scopes(data: dict, db=Depends(get_db)):
+async def ai_generate_pilot_scopes(data: dict, db=Depends(get_db), run_async: Annotated[bool, Query(alias="async")] = False):
     """AI-generate pilot scope for initiatives."""
+    if run_async:
+        return await enqueue_generator(db, "pilot_scopes", data)
     initiative_id = data.get("initiative_id")
     if initiative_id:
-        initiatives = await db.execute_fetchall("SELECT * FROM initiatives WHERE id = ?", [initiative_id])
+        initiatives = await db.execute_fetchall("SELECT * FROM initiatives WHERE org_id = ? AND id = ?", [db.org_id, initiative_id])
     else:
-        initiatives = await db.execute_fetchall("SELECT * FROM initiatives LIMIT 10")
+        initiatives = await db.execute_fetchall("SELECT * FROM initiatives WHERE org_id = ? LIMIT 10", (db.org_id,))
 
     if not initiatives:
         return {"error": "No initiatives found"}
@@ -513,14 +596,14 @@ async def ai_generate_pilot_scopes(data: dict, db=Depends(get_db)):
         count = 0
         for init in init_list:
             existing = await db.execute_fetchone(
-                "SELECT id FROM pilot_scopes WHERE initiative_id = ?", [init["id"]]
+                "SELECT id FROM pilot_scopes WHERE org_id = ? AND initiative_id = ?", [db.org_id, init["id"]]
             )
             if not existing:
                 await db.execute(
-                    "INSERT INTO pilot_scopes (initiative_id, mvp_description, success_criteria, duration_weeks, "
+                    "INSERT INTO pilot_scopes (org_id, initiative_id, mvp_description, success_criteria, duration_weeks, "
                     "team_size, go_nogo_criteria, scale_up_path, ai_generated, ai_confidence) "
-                    "VALUES (?, 'MVP scope pending', 'Success criteria TBD', 8, 5, 'Go/No-Go TBD', 'Scale path TBD', 1, 50)",
-                    [init["id"]],
+                    "VALUES (?, ?, 'MVP scope pending', 'Success criteria TBD', 8, 5, 'Go/No-Go TBD', 'Scale path TBD', 1, 50)",
+                    [db.org_id, init["id"]],
                 )
                 count += 1
         await db.commit()
@@ -529,7 +612,7 @@ async def ai_generate_pilot_scopes(data: dict, db=Depends(get_db)):
     from ai_research import call_openai_json
     count = 0
     for init in init_list:
-        existing = await db.execute_fetchone("SELECT id FROM pilot_scopes WHERE initiative_id = ?", [init["id"]])
+        existing = await db.execute_fetchone("SELECT id FROM pilot_scopes WHERE org_id = ? AND initiative_id = ?", [db.org_id, init["id"]])
         if existing:
             continue
         prompt = f"""Design a pilot/MVP scope for this initiative:
@@ -542,10 +625,10 @@ Return JSON object."""
         result = await call_openai_json(prompt)
         if isinstance(result, dict):
             await db.execute(
-                "INSERT INTO pilot_scopes (initiative_id, mvp_description, success_criteria, duration_weeks, "
+                "INSERT INTO pilot_scopes (org_id, initiative_id, mvp_description, success_criteria, duration_weeks, "
                 "team_size, go_nogo_criteria, scale_up_path, ai_generated, ai_confidence) "
-                "VALUES (?, ?, ?, ?, ?, ?, ?, 1, ?)",
-                [init["id"], ensure_str(result.get("mvp_description", "")), ensure_str(result.get("success_criteria", "")),
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1, ?)",
+                [db.org_id, init["id"], ensure_str(result.get("mvp_description", "")), ensure_str(result.get("success_criteria", "")),
                  result.get("duration_weeks", 8), result.get("team_size", 5),
                  ensure_str(result.get("go_nogo_criteria", "")), ensure_str(result.get("scale_up_path", "")),
                  result.get("confidence", 70)],
@@ -562,21 +645,23 @@ Return JSON object."""
 async def get_tech_recommendations(initiative_id: int = None, db=Depends(get_db)):
     if initiative_id:
         rows = await db.execute_fetchall(
-            "SELECT * FROM tech_recommendations WHERE initiative_id = ?", [initiative_id]
+            "SELECT * FROM tech_recommendations WHERE org_id = ? AND initiative_id = ?", [db.org_id, initiative_id]
         )
     else:
-        rows = await db.execute_fetchall("SELECT * FROM tech_recommendations ORDER BY initiative_id")
+        rows = await db.execute_fetchall("SELECT * FROM tech_recommendations WHERE org_id = ? ORDER BY initiative_id", (db.org_id,))
     return [dict(r) for r in rows]
 
 
 @router.post("/tech-recommendations/ai-generate")
-async def ai_generate_tech(data: dict, db=Depends(get_db)):
+async def ai_generate_tech(data: dict, db=Depends(get_db), run_async: Annotated[bool, Query(alias="async")] = False):
     """AI-generate tech architecture recommendations."""
+    if run_async:
+        return await enqueue_generator(db, "tech_recommendations", data)
     initiative_id = data.get("initiative_id")
     if initiative_id:
-        initiatives = await db.execute_fetchall("SELECT * FROM initiatives WHERE id = ?", [initiative_id])
+        initiatives = await db.execute_fetchall("SELECT * FROM initiatives WHERE org_id = ? AND id = ?", [db.org_id, initiative_id])
     else:
-        initiatives = await db.execute_fetchall("SELECT * FROM initiatives LIMIT 10")
+        initiatives = await db.execute_fetchall("SELECT * FROM initiatives WHERE org_id = ? LIMIT 10", (db.org_id,))
 
     if not initiatives:
         return {"error": "No initiatives found"}
@@ -589,15 +674,15 @@ async def ai_generate_tech(data: dict, db=Depends(get_db)):
         for init in init_list:
             for comp in components:
                 existing = await db.execute_fetchone(
-                    "SELECT id FROM tech_recommendations WHERE initiative_id = ? AND component = ?",
-                    [init["id"], comp],
+                    "SELECT id FROM tech_recommendations WHERE org_id = ? AND initiative_id = ? AND component = ?",
+                    [db.org_id, init["id"], comp],
                 )
                 if not existing:
                     await db.execute(
-                        "INSERT INTO tech_recommendations (initiative_id, component, recommendation, platform_options, "
+                        "INSERT INTO tech_recommendations (org_id, initiative_id, component, recommendation, platform_options, "
                         "integration_pattern, cloud_model, tech_risks, ai_generated, ai_confidence) "
-                        "VALUES (?, ?, 'build', 'Options TBD', 'API-based', 'hybrid', 'Risks TBD', 1, 50)",
-                        [init["id"], comp],
+                        "VALUES (?, ?, ?, 'build', 'Options TBD', 'API-based', 'hybrid', 'Risks TBD', 1, 50)",
+                        [db.org_id, init["id"], comp],
                     )
                     count += 1
         await db.commit()
@@ -620,23 +705,23 @@ Return JSON array."""
         for item in extract_list(result):
                 comp = item.get("component", "")
                 existing = await db.execute_fetchone(
-                    "SELECT id FROM tech_recommendations WHERE initiative_id = ? AND component = ?",
-                    [init["id"], comp],
+                    "SELECT id FROM tech_recommendations WHERE org_id = ? AND initiative_id = ? AND component = ?",
+                    [db.org_id, init["id"], comp],
                 )
                 if existing:
                     await db.execute(
                         "UPDATE tech_recommendations SET recommendation=?, platform_options=?, integration_pattern=?, "
-                        "cloud_model=?, tech_risks=?, ai_generated=1, ai_confidence=? WHERE id=?",
+                        "cloud_model=?, tech_risks=?, ai_generated=1, ai_confidence=? WHERE id=? AND org_id = ?",
                         [ensure_str(item.get("recommendation", "build")), ensure_str(item.get("platform_options", "")),
                          ensure_str(item.get("integration_pattern", "")), ensure_str(item.get("cloud_model", "")),
-                         ensure_str(item.get("tech_risks", "")), item.get("confidence", 70), existing["id"]],
+                         ensure_str(item.get("tech_risks", "")), item.get("confidence", 70), existing["id"], db.org_id],
                     )
                 else:
                     await db.execute(
-                        "INSERT INTO tech_recommendations (initiative_id, component, recommendation, platform_options, "
+                        "INSERT INTO tech_recommendations (org_id, initiative_id, component, recommendation, platform_options, "
                         "integration_pattern, cloud_model, tech_risks, ai_generated, ai_confidence) "
-                        "VALUES (?, ?, ?, ?, ?, ?, ?, 1, ?)",
-                        [init["id"], comp, ensure_str(item.get("recommendation", "build")),
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1, ?)",
+                        [db.org_id, init["id"], comp, ensure_str(item.get("recommendation", "build")),
                          ensure_str(item.get("platform_options", "")), ensure_str(item.get("integration_pattern", "")),
                          ensure_str(item.get("cloud_model", "")), ensure_str(item.get("tech_risks", "")), item.get("confidence", 70)],
                     )
@@ -649,13 +734,15 @@ Return JSON array."""
 
 
 @router.post("/business-case/ai-generate")
-async def ai_generate_business_case(data: dict, db=Depends(get_db)):
+async def ai_generate_business_case(data: dict, db=Depends(get_db), run_async: Annotated[bool, Query(alias="async")] = False):
     """AI-generate business case for initiatives."""
+    if run_async:
+        return await enqueue_generator(db, "business_case", data)
     initiative_id = data.get("initiative_id")
     if initiative_id:
-        initiatives = await db.execute_fetchall("SELECT * FROM initiatives WHERE id = ?", [initiative_id])
+        initiatives = await db.execute_fetchall("SELECT * FROM initiatives WHERE org_id = ? AND id = ?", [db.org_id, initiative_id])
     else:
-        initiatives = await db.execute_fetchall("SELECT * FROM initiatives LIMIT 10")
+        initiatives = await db.execute_fetchall("SELECT * FROM initiatives WHERE org_id = ? LIMIT 10", (db.org_id,))
 
     if not initiatives:
         return {"error": "No initiatives found"}
@@ -670,8 +757,8 @@ async def ai_generate_business_case(data: dict, db=Depends(get_db)):
             await db.execute(
                 "UPDATE initiatives SET estimated_cost_k=500, annual_benefit_k=1200, npv_k=800, "
                 "payback_months=12, roi_pct=140, cost_assumptions='Template estimate', "
-                "benefit_assumptions='Template estimate' WHERE id=?",
-                [init["id"]],
+                "benefit_assumptions='Template estimate' WHERE id=? AND org_id = ?",
+                [init["id"], db.org_id],
             )
             count += 1
         await db.commit()
@@ -701,11 +788,11 @@ Return JSON object."""
         if isinstance(result, dict):
             await db.execute(
                 "UPDATE initiatives SET estimated_cost_k=?, annual_benefit_k=?, npv_k=?, "
-                "payback_months=?, roi_pct=?, cost_assumptions=?, benefit_assumptions=? WHERE id=?",
+                "payback_months=?, roi_pct=?, cost_assumptions=?, benefit_assumptions=? WHERE id=? AND org_id = ?",
                 [result.get("estimated_cost_k", 0), result.get("annual_benefit_k", 0),
                  result.get("npv_k", 0), result.get("payback_months", 12),
                  result.get("roi_pct", 0), ensure_str(result.get("cost_assumptions", "")),
-                 ensure_str(result.get("benefit_assumptions", "")), init["id"]],
+                 ensure_str(result.get("benefit_assumptions", "")), init["id"], db.org_id],
             )
             count += 1
     await db.commit()
@@ -716,13 +803,15 @@ Return JSON object."""
 
 
 @router.post("/feasibility/ai-generate")
-async def ai_generate_feasibility(data: dict, db=Depends(get_db)):
+async def ai_generate_feasibility(data: dict, db=Depends(get_db), run_async: Annotated[bool, Query(alias="async")] = False):
     """AI-generate feasibility scores for initiatives."""
+    if run_async:
+        return await enqueue_generator(db, "feasibility", data)
     initiative_id = data.get("initiative_id")
     if initiative_id:
-        initiatives = await db.execute_fetchall("SELECT * FROM initiatives WHERE id = ?", [initiative_id])
+        initiatives = await db.execute_fetchall("SELECT * FROM initiatives WHERE org_id = ? AND id = ?", [db.org_id, initiative_id])
     else:
-        initiatives = await db.execute_fetchall("SELECT * FROM initiatives LIMIT 10")
+        initiatives = await db.execute_fetchall("SELECT * FROM initiatives WHERE org_id = ? LIMIT 10", (db.org_id,))
 
     if not initiatives:
         return {"error": "No initiatives found"}
@@ -734,8 +823,8 @@ async def ai_generate_feasibility(data: dict, db=Depends(get_db)):
         for init in init_list:
             await db.execute(
                 "UPDATE initiatives SET technical_feasibility=3, org_feasibility=3, regulatory_feasibility=3, "
-                "financial_feasibility=3, talent_feasibility=3 WHERE id=?",
-                [init["id"]],
+                "financial_feasibility=3, talent_feasibility=3 WHERE id=? AND org_id = ?",
+                [init["id"], db.org_id],
             )
             count += 1
         await db.commit()
@@ -761,10 +850,10 @@ Return JSON object with these 5 fields and confidence (0-100)."""
         if isinstance(result, dict):
             await db.execute(
                 "UPDATE initiatives SET technical_feasibility=?, org_feasibility=?, regulatory_feasibility=?, "
-                "financial_feasibility=?, talent_feasibility=? WHERE id=?",
+                "financial_feasibility=?, talent_feasibility=? WHERE id=? AND org_id = ?",
                 [result.get("technical_feasibility", 3), result.get("org_feasibility", 3),
                  result.get("regulatory_feasibility", 3), result.get("financial_feasibility", 3),
-                 result.get("talent_feasibility", 3), init["id"]],
+                 result.get("talent_feasibility", 3), init["id"], db.org_id],
             )
             count += 1
     await db.commit()
@@ -775,11 +864,13 @@ Return JSON object with these 5 fields and confidence (0-100)."""
 
 
 @router.post("/scenarios/ai-generate")
-async def ai_generate_scenarios(db=Depends(get_db)):
+async def ai_generate_scenarios(db=Depends(get_db), run_async: Annotated[bool, Query(alias="async")] = False):
     """Generate strategies for conservative, balanced, and aggressive scenarios."""
+    if run_async:
+        return await enqueue_generator(db, "scenarios")
     from ai_swot_strategy import gather_full_context
 
-    bu_rows = await db.execute_fetchall("SELECT id FROM business_units LIMIT 1")
+    bu_rows = await db.execute_fetchall("SELECT id FROM business_units WHERE org_id = ? LIMIT 1", (db.org_id,))
     if not bu_rows:
         return {"error": "No business units found"}
     bu_id = bu_rows[0]["id"]
@@ -788,8 +879,14 @@ async def ai_generate_scenarios(db=Depends(get_db)):
 
     if not is_openai_available():
         # Just tag existing strategies with 'balanced' scenario
-        await db.execute("UPDATE strategies SET scenario = 'balanced' WHERE scenario IS NULL OR scenario = 'balanced'")
-        await db.execute("UPDATE strategic_okrs SET scenario = 'balanced' WHERE scenario IS NULL OR scenario = 'balanced'")
+        await db.execute(
+            "UPDATE strategies SET scenario = 'balanced' WHERE org_id = ? AND (scenario IS NULL OR scenario = 'balanced')",
+            (db.org_id,),
+        )
+        await db.execute(
+            "UPDATE strategic_okrs SET scenario = 'balanced' WHERE org_id = ? AND (scenario IS NULL OR scenario = 'balanced')",
+            (db.org_id,),
+        )
         await db.commit()
         return {"generated": 0, "ai": False, "message": "Existing strategies tagged as balanced"}
 
@@ -819,23 +916,23 @@ Return JSON: {{
         if isinstance(result, dict) and "strategies" in result:
             for s in result["strategies"]:
                 cursor = await db.execute(
-                    "INSERT INTO strategies (layer, name, description, risk_level, ai_confidence, scenario) "
-                    "VALUES (?, ?, ?, ?, ?, ?)",
-                    [ensure_str(s.get("layer", "digital")), ensure_str(s.get("name", "")), ensure_str(s.get("description", "")),
+                    "INSERT INTO strategies (org_id, layer, name, description, risk_level, ai_confidence, scenario) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [db.org_id, ensure_str(s.get("layer", "digital")), ensure_str(s.get("name", "")), ensure_str(s.get("description", "")),
                      ensure_str(s.get("risk_level", "medium")), s.get("confidence", 70), scenario],
                 )
                 strategy_id = cursor.lastrowid
                 for okr in s.get("okrs", []):
                     okr_cursor = await db.execute(
-                        "INSERT INTO strategic_okrs (strategy_id, objective, scenario) VALUES (?, ?, ?)",
-                        [strategy_id, ensure_str(okr.get("objective", "")), scenario],
+                        "INSERT INTO strategic_okrs (org_id, strategy_id, objective, scenario) VALUES (?, ?, ?, ?)",
+                        [db.org_id, strategy_id, ensure_str(okr.get("objective", "")), scenario],
                     )
                     okr_id = okr_cursor.lastrowid
                     for kr in okr.get("key_results", []):
                         await db.execute(
-                            "INSERT INTO strategic_key_results (okr_id, key_result, metric, target_value, unit, scenario) "
-                            "VALUES (?, ?, ?, ?, ?, ?)",
-                            [okr_id, ensure_str(kr.get("key_result", "")), ensure_str(kr.get("metric", "")),
+                            "INSERT INTO strategic_key_results (org_id, okr_id, key_result, metric, target_value, unit, scenario) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            [db.org_id, okr_id, ensure_str(kr.get("key_result", "")), ensure_str(kr.get("metric", "")),
                              kr.get("target_value", 0), ensure_str(kr.get("unit", "")), scenario],
                         )
                 scenarios_generated += 1
@@ -0,0 +1,298 @@
+"""
+Scenario Engine — Deterministic, vectorized Monte Carlo for what-if scenarios.
+Builds a financial baseline from revenue_splits, ops_efficiency, competitors and the
+initiative portfolio (estimated_cost_k / annual_benefit_k), then simulates
+revenue_change, cost_change and market_entry scenarios with NumPy and returns
+percentile bands of their effect against business-as-usual. Same inputs + parameters
+always give the same numbers.
+
+Units: revenue and competitor revenue are treated as millions (as entered in Step 1);
+initiative business-case figures are in thousands and converted to millions.
+"""
+
+import hashlib
+import json
+import logging
+import re
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DRAWS = 20000
+MAX_DRAWS = 200000
+PERCENTILES = (5, 25, 50, 75, 95)
+SUPPORTED_SCENARIOS = ("revenue_change", "cost_change", "market_entry")
+
+DEFAULT_MARGIN = 0.15
+DEFAULT_GROWTH_VOLATILITY = 0.05
+DEFAULT_FIXED_COST_SHARE = 0.6
+# Years an initiative's one-off cost is spread over, matching the annual benefit it buys
+DEFAULT_BENEFIT_HORIZON_YEARS = 3
+
+
+# ─── Baseline ────────────────────────────────────────────────────────────────
+
+
+def _as_ratio(value) -> float | None:
+    """Margins are stored as decimals (0.15); tolerate percentages (15) from manual entry."""
+    try:
+        v = float(value)
+    except (TypeError, ValueError):
+        return None
+    return v / 100.0 if abs(v) > 1 else v
+
+
+async def load_baseline(db) -> dict:
+    """Collect the numeric inputs the simulation needs in a handful of aggregate queries."""
+    # Revenue per period: each dimension (product/region/segment) is a full partition,
+    # so take the largest dimension total per period instead of summing across dimensions.
+    rev_rows = await db.execute_fetchall(
+        "SELECT period, dimension, SUM(revenue) AS total FROM revenue_splits WHERE org_id = ? "
+        "GROUP BY period, dimension ORDER BY period", (db.org_id,)
+    )
+    by_period = {}
+    for r in rev_rows:
+        total = float(r["total"] or 0)
+        by_period[r["period"]] = max(by_period.get(r["period"], 0.0), total)
+    periods = sorted(by_period)
+    revenue_series = [by_period[p] for p in periods]
+
+    margin_rows = await db.execute_fetchall(
+        "SELECT metric_name, metric_value FROM ops_efficiency "
+        "WHERE org_id = ? AND LOWER(metric_name) LIKE '%margin%' ORDER BY period DESC", (db.org_id,)
+    )
+    org_margin = None
+    for preferred in ("operating margin", "net profit margin", "profit margin"):
+        for r in margin_rows:
+            if (r["metric_name"] or "").lower() == preferred:
+                org_margin = _as_ratio(r["metric_value"])
+                break
+        if org_margin is not None:
+            break
+    if org_margin is None and margin_rows:
+        org_margin = _as_ratio(margin_rows[0]["metric_value"])
+
+    comp_rows = await db.execute_fetchall(
+        "SELECT name, revenue, profit_margin, operating_margin, market_share FROM competitors WHERE org_id = ?", (db.org_id,)
+    )
+    competitors = [dict(r) for r in comp_rows]
+    comp_margins = [
+        m for m in (_as_ratio(c.get("operating_margin") or c.get("profit_margin")) for c in competitors)
+        if m is not None
+    ]
+
+    init_row = await db.execute_fetchone(
+        "SELECT COUNT(*) AS n, COALESCE(SUM(estimated_cost_k), 0) AS cost_k, "
+        "COALESCE(SUM(annual_benefit_k), 0) AS benefit_k FROM initiatives "
+        "WHERE org_id = ? AND status NOT IN ('completed', 'deferred')", (db.org_id,)
+    )
+
+    return {
+        "periods": periods,
+        "revenue_series": revenue_series,
+        "base_revenue": revenue_series[-1] if revenue_series else 0.0,
+        "org_margin": org_margin,
+        "competitor_margins": comp_margins,
+        "competitor_revenue_total": sum(float(c.get("revenue") or 0) for c in competitors),
+        "competitor_count": len(competitors),
+        "initiative_count": int(init_row["n"] or 0) if init_row else 0,
+        "initiative_cost_m": float(init_row["cost_k"] or 0) / 1000.0 if init_row else 0.0,
+        "initiative_benefit_m": float(init_row["benefit_k"] or 0) / 1000.0 if init_row else 0.0,
+    }
+
+
+def _growth_stats(series: list) -> tuple[float, float]:
+    """Mean and volatility of period-over-period log growth (defaults when history is short)."""
+    values = np.asarray([v for v in series if v and v > 0], dtype=float)
+    if values.size < 2:
+        return 0.0, DEFAULT_GROWTH_VOLATILITY
+    growth = np.diff(np.log(values))
+    vol = float(growth.std(ddof=1)) if growth.size > 1 else abs(float(growth[0])) / 2
+    return float(growth.mean()), max(vol, 0.01)
+
+
+# ─── Parameters ──────────────────────────────────────────────────────────────
+
+
+_NEGATIVE_WORDS = ("decline", "drop", "decrease", "fall", "lose", "loss", "cut", "reduce", "down", "shrink")
+
+
+def _pct_from_description(description: str) -> float | None:
+    """Pull a signed percentage out of free text like 'revenue drops 10%'."""
+    if not description:
+        return None
+    match = re.search(r"([+-]?\d+(?:\.\d+)?)\s*%", description)
+    if not match:
+        return None
+    pct = float(match.group(1))
+    if pct > 0 and not match.group(1).startswith("+") and any(w in description.lower() for w in _NEGATIVE_WORDS):
+        pct = -pct
+    return pct
+
+
+def _param(params: dict, key: str, default: float) -> float:
+    try:
+        return float(params.get(key, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _seed(scenario_type: str, params: dict, baseline: dict) -> int:
+    raw = json.dumps({"t": scenario_type, "p": params, "b": baseline}, sort_keys=True, default=str)
+    return int(hashlib.sha256(raw.encode()).hexdigest()[:16], 16)
+
+
+# ─── Simulation ──────────────────────────────────────────────────────────────
+
+
+def _bands(values: np.ndarray, decimals: int = 2) -> dict:
+    pcts = np.percentile(values, PERCENTILES)
+    bands = {f"p{p}": round(float(v), decimals) for p, v in zip(PERCENTILES, pcts)}
+    bands["mean"] = round(float(values.mean()), decimals)
+    return bands
+
+
+def _default_pct(params: dict, default: float) -> float:
+    pct = _pct_from_description(params.get("description", ""))
+    return default if pct is None else pct
+
+
+def simulate(scenario_type: str, params: dict, baseline: dict, draws: int = DEFAULT_DRAWS) -> dict:
+    """Run the Monte Carlo simulation for one scenario. Pure function of its inputs.
+
+    Changes are reported against business-as-usual (organic growth plus the initiative
+    portfolio) simulated with the same draws, so they isolate the scenario's own effect.
+    Raises ValueError for an unknown scenario type or an org without revenue data.
+    """
+    if scenario_type not in SUPPORTED_SCENARIOS:
+        raise ValueError(f"Unsupported scenario_type '{scenario_type}'")
+    base_rev = float(baseline["base_revenue"] or 0)
+    if base_rev <= 0:
+        raise ValueError("Insufficient data: add revenue figures in Step 1 before simulating scenarios.")
+    try:
+        draws = int(max(1000, min(MAX_DRAWS, int(draws))))
+    except (TypeError, ValueError):
+        draws = DEFAULT_DRAWS
+    rng = np.random.default_rng(_seed(scenario_type, params, baseline))
+
+    margin = baseline["org_margin"]
+    if margin is None:
+        margin = float(np.median(baseline["competitor_margins"])) if baseline["competitor_margins"] else DEFAULT_MARGIN
+    base_cost = base_rev * (1.0 - margin)
+    growth_mu, growth_sigma = _growth_stats(baseline["revenue_series"])
+    fixed_share = min(max(_param(params, "fixed_cost_share", DEFAULT_FIXED_COST_SHARE), 0.0), 1.0)
+    horizon = max(_param(params, "benefit_horizon_years", DEFAULT_BENEFIT_HORIZON_YEARS), 1.0)
+
+    # Business-as-usual: organic growth plus the active initiative portfolio, with benefit
+    # realization and cost overrun uncertainty.
+    organic = np.exp(rng.normal(growth_mu, growth_sigma, draws))
+    benefit_realization = rng.beta(4, 2, draws)
+    cost_overrun = rng.lognormal(0.0, 0.2, draws)
+    portfolio_benefit = baseline["initiative_benefit_m"] * benefit_realization
+    portfolio_cost = baseline["initiative_cost_m"] * cost_overrun / horizon
+
+    bau_revenue = base_rev * organic + portfolio_benefit
+    bau_cost = base_cost * (1.0 - fixed_share) * organic + base_cost * fixed_share + portfolio_cost
+    bau_profit = bau_revenue - bau_cost
+
+    revenue = base_rev * organic
+    variable_cost = base_cost * (1.0 - fixed_share) * organic
+    fixed_cost = np.full(draws, base_cost * fixed_share)
+    extra_revenue = np.zeros(draws)
+    extra_cost = np.zeros(draws)
+    assumptions = {
+        "baseline_revenue": round(base_rev, 2),
+        "baseline_margin_pct": round(margin * 100, 2),
+        "organic_growth_mean_pct": round((np.exp(growth_mu) - 1) * 100, 2),
+        "organic_growth_volatility_pct": round(growth_sigma * 100, 2),
+        "fixed_cost_share": fixed_share,
+        "initiative_portfolio_cost": round(baseline["initiative_cost_m"], 2),
+        "initiative_portfolio_annual_benefit": round(baseline["initiative_benefit_m"], 2),
+        "benefit_horizon_years": horizon,
+    }
+
+    if scenario_type == "revenue_change":
+        change = _param(params, "change_pct", _default_pct(params, -10.0)) / 100.0
+        uncertainty = _param(params, "uncertainty_pct", abs(change) * 40 or 2.0) / 100.0
+        shock = rng.normal(change, uncertainty, draws)
+        revenue = revenue * (1.0 + shock)
+        variable_cost = base_cost * (1.0 - fixed_share) * (revenue / base_rev)
+        assumptions.update({"change_pct": round(change * 100, 2), "uncertainty_pct": round(uncertainty * 100, 2)})
+
+    elif scenario_type == "cost_change":
+        change = _param(params, "change_pct", _default_pct(params, 10.0)) / 100.0
+        uncertainty = _param(params, "uncertainty_pct", abs(change) * 30 or 2.0) / 100.0
+        shock = rng.normal(change, uncertainty, draws)
+        variable_cost = variable_cost * (1.0 + shock)
+        fixed_cost = fixed_cost * (1.0 + shock)
+        assumptions.update({"change_pct": round(change * 100, 2), "uncertainty_pct": round(uncertainty * 100, 2)})
+
+    elif scenario_type == "market_entry":
+        market_size = _param(params, "market_size", baseline["competitor_revenue_total"] + base_rev)
+        target_share = _param(params, "target_share_pct", 2.0) / 100.0
+        success_p = min(max(_param(params, "success_probability", 0.6), 0.0), 1.0)
+        investment = _param(params, "investment", max(base_rev * 0.02, baseline["initiative_cost_m"] * 0.25))
+        ramp = rng.triangular(0.2, 0.5, 1.0, draws)  # share of target reached in year one
+        success = rng.random(draws) < success_p
+        extra_revenue = success * market_size * target_share * ramp * rng.lognormal(0.0, 0.25, draws)
+        extra_cost = investment * rng.lognormal(0.0, 0.15, draws) + extra_revenue * (1.0 - margin)
+        assumptions.update({
+            "market_size": round(market_size, 2),
+            "target_share_pct": round(target_share * 100, 2),
+            "success_probability": success_p,
+            "entry_investment": round(investment, 2),
+        })
+
+    total_revenue = revenue + extra_revenue + portfolio_benefit
+    total_cost = variable_cost + fixed_cost + extra_cost + portfolio_cost
+    profit = total_revenue - total_cost
+    margin_pct = np.divide(profit, total_revenue, out=np.zeros(draws), where=total_revenue != 0) * 100
+    bau_margin_pct = np.divide(bau_profit, bau_revenue, out=np.zeros(draws), where=bau_revenue != 0) * 100
+
+    revenue_change_pct = np.divide(total_revenue - bau_revenue, bau_revenue, out=np.zeros(draws),
+                                   where=bau_revenue != 0) * 100
+    margin_impact_pct = margin_pct - bau_margin_pct
+
+    return {
+        "scenario_type": scenario_type,
+        "draws": draws,
+        "assumptions": assumptions,
+        "revenue": _bands(total_revenue),
+        "revenue_change_pct": _bands(revenue_change_pct),
+        "operating_profit": _bands(profit),
+        "profit_change": _bands(profit - bau_profit),
+        "margin_pct": _bands(margin_pct),
+        "margin_impact_pct": _bands(margin_impact_pct),
+        "business_as_usual": {"revenue": _bands(bau_revenue), "margin_pct": _bands(bau_margin_pct)},
+        "probabilities": {
+            "revenue_decline": round(float((revenue_change_pct < 0).mean()), 4),
+            "margin_decline": round(float((margin_impact_pct < 0).mean()), 4),
+            "loss_making": round(float((profit < 0).mean()), 4),
+        },
+    }
+
+
+def to_impact_analysis(sim: dict) -> dict:
+    """Map simulation output onto the impact_analysis shape the dashboard renders."""
+    rev_p50 = sim["revenue_change_pct"]["p50"]
+    margin_p50 = sim["margin_impact_pct"]["p50"]
+    rev_band = sim["revenue_change_pct"]
+    return {
+        "financial_impact": {
+            "revenue_change_pct": rev_p50,
+            "margin_impact_pct": margin_p50,
+            "narrative": (
+                f"Median revenue change {rev_p50:+.1f}% (90% band {rev_band['p5']:+.1f}% to {rev_band['p95']:+.1f}%); "
+                f"median margin impact {margin_p50:+.1f} pts across {sim['draws']:,} simulations."
+            ),
+        },
+        "competitive_impact": {
+            "market_position_change": "improves" if rev_p50 > 2 else "weakens" if rev_p50 < -2 else "stable",
+            "narrative": "",
+        },
+        "operational_impact": {
+            "complexity_change": "increases" if sim["scenario_type"] == "market_entry" else "stable",
+            "narrative": "",
+        },
+    }
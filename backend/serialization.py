@@ -0,0 +1,84 @@
+"""
+Serialization — orjson-backed JSON helpers and the app's default response class.
+dumps/loads replace the stdlib json.dumps(..., default=str) / json.loads pairs used for
+caches, history rows and embeddings; FastJSONResponse renders API responses and routers
+built with FastJSONRoute skip jsonable_encoder. Everything falls back to the stdlib json
+module when orjson isn't installed.
+"""
+
+import inspect
+import json
+import logging
+from decimal import Decimal
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(obj):
+    """Values neither serializer handles natively: Decimal (asyncpg NUMERIC), sets, anything else as str."""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, "tolist"):  # numpy arrays/scalars on the stdlib path
+        return obj.tolist()
+    return str(obj)
+
+
+def dumps_bytes(obj, sort_keys: bool = False) -> bytes:
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=_default, option=option)
+    return json.dumps(obj, default=_default, sort_keys=sort_keys, ensure_ascii=False,
+                      separators=(",", ":")).encode()
+
+
+def dumps(obj, sort_keys: bool = False) -> str:
+    """Compact JSON text; unknown types are stringified like json.dumps(default=str)."""
+    return dumps_bytes(obj, sort_keys).decode()
+
+
+def loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONResponse(JSONResponse):
+    """Default response class: orjson rendering with the same type coercions as dumps()."""
+
+    def render(self, content) -> bytes:
+        return dumps_bytes(content)
+
+
+class FastJSONRoute(APIRoute):
+    """Route class that renders plain dict/list results straight with FastJSONResponse.
+
+    FastAPI otherwise runs every result through jsonable_encoder first, which costs far more
+    than rendering on large payloads. Routes with a response_model keep the normal path.
+    """
+
+    def get_route_handler(self):
+        call = self.dependant.call
+        if self.response_model is None and inspect.iscoroutinefunction(call):
+            status_code = self.status_code or 200
+
+            async def render_directly(*args, **kwargs):
+                result = await call(*args, **kwargs)
+                if isinstance(result, Response):
+                    return result
+                return FastJSONResponse(result, status_code=status_code)
+
+            self.dependant.call = render_directly
+        return super().get_route_handler()
@@ -17,19 +17,19 @@ from data_ingestion import search_ticker, fetch_peers, fetch_company_profile, fe
 async def gather_app_data(db) -> dict:
     """Query organization table and existing value streams with metrics."""
     try:
-        org_rows = await db.execute_fetchall("SELECT * FROM organization LIMIT 1")
+        org_rows = await db.execute_fetchall("SELECT * FROM organization WHERE id = ?", (db.org_id,))
         org = dict(org_rows[0]) if org_rows else {}
 
         vs_rows = await db.execute_fetchall(
             "SELECT vs.*, bu.name as business_unit_name FROM value_streams vs "
-            "JOIN business_units bu ON vs.business_unit_id = bu.id"
+            "JOIN business_units bu ON vs.business_unit_id = bu.id WHERE vs.org_id = ?", (db.org_id,)
         )
         value_streams = []
         for vs in vs_rows:
             vs_dict = dict(vs)
             metrics_rows = await db.execute_fetchall(
-                "SELECT * FROM value_stream_metrics WHERE value_stream_id = ?",
-                (vs_dict["id"],),
+                "SELECT * FROM value_stream_metrics WHERE org_id = ? AND value_stream_id = ?",
+                (db.org_id, vs_dict["id"]),
             )
             vs_dict["metrics"] = dict(metrics_rows[0]) if metrics_rows else None
             value_streams.append(vs_dict)
@@ -181,16 +181,13 @@ async def gather_finnhub_data(org_name: str, industry: str, competitors: list[st
 async def gather_web_search(segment: str, industry: str) -> dict:
     """Search the web for real industry benchmarks and case studies."""
     try:
-        from web_search import search_web
+        from web_search import search_many
 
         queries = [
             f"{segment} value stream benchmarks {industry}",
             f"{segment} process improvement case study",
         ]
-        all_results = []
-        for q in queries:
-            results = await search_web(q, num_results=3)
-            all_results.extend(results)
+        all_results = [r for results in await search_many(queries, num_results=3) for r in results]
 
         return {
             "source": "web_search",
@@ -230,18 +227,18 @@ async def gather_competitor_operations(
         try:
             vs_rows = await db.execute_fetchall(
                 "SELECT vs.id, vs.name FROM value_streams vs "
-                "WHERE LOWER(vs.name) LIKE ?",
-                (f"%{segment.lower()[:20]}%",),
+                "WHERE vs.org_id = ? AND LOWER(vs.name) LIKE ?",
+                (db.org_id, f"%{segment.lower()[:20]}%",),
             )
             if vs_rows:
                 vs_id = dict(vs_rows[0])["id"]
                 steps = [dict(r) for r in await db.execute_fetchall(
                     "SELECT step_name, process_time_hours, wait_time_hours "
-                    "FROM value_stream_steps WHERE value_stream_id = ? ORDER BY step_order",
-                    (vs_id,),
+                    "FROM value_stream_steps WHERE org_id = ? AND value_stream_id = ? ORDER BY step_order",
+                    (db.org_id, vs_id),
                 )]
                 metrics_rows = await db.execute_fetchall(
-                    "SELECT * FROM value_stream_metrics WHERE value_stream_id = ?", (vs_id,),
+                    "SELECT * FROM value_stream_metrics WHERE org_id = ? AND value_stream_id = ?", (db.org_id, vs_id),
                 )
                 org_vs_data = {
                     "steps": steps,
@@ -253,16 +250,14 @@ async def gather_competitor_operations(
         # Get RAG context if in live mode
         rag_context = ""
         try:
-            from rag_engine import build_rag_context, is_live_mode
+            from rag_engine import build_rag_context, context_query, is_live_mode
             if await is_live_mode(db):
-                org_row = await db.execute_fetchone("SELECT id FROM organization LIMIT 1")
+                org_row = await db.execute_fetchone("SELECT id FROM organization WHERE id = ?", (db.org_id,))
                 if org_row:
                     rag_context = await build_rag_context(
                         db,
-                        f"{segment} competitor operations benchmarks {industry}",
                         org_id=org_row["id"],
-                        top_k=5,
-                        doc_category="competitor",
+                        **context_query("competitor_operations", segment=segment, industry=industry),
                     )
         except Exception:
             pass
@@ -270,7 +265,7 @@ async def gather_competitor_operations(
         # Ensure we have competitor names
         if not competitors:
             # Get from org table
-            org_row = await db.execute_fetchall("SELECT * FROM organization LIMIT 1")
+            org_row = await db.execute_fetchall("SELECT * FROM organization WHERE id = ?", (db.org_id,))
             if org_row:
                 org = dict(org_row[0])
                 competitors = [c for c in [
@@ -302,14 +297,14 @@ async def gather_competitor_operations(
 # 7. Jira Connector
 # ──────────────────────────────────────────────
 
-async def gather_jira(segment: str, industry: str) -> dict:
-    """Pull workflow data from Jira Cloud."""
+async def gather_jira(segment: str, industry: str, org_id: int | None = None) -> dict:
+    """Pull workflow data from Jira Cloud, via the organization's synced issue store."""
     try:
         from connectors import fetch_jira_workflows, is_jira_configured
 
-        if not is_jira_configured():
+        if org_id is None or not is_jira_configured():
             return {}
-        return await fetch_jira_workflows()
+        return await fetch_jira_workflows(org_id)
     except Exception:
         return {}
 
@@ -0,0 +1,168 @@
+"""
+Static Assets — Build and serve the frontend as a small HTML shell plus hashed assets.
+`python static_assets.py` moves the large inline <style>/<script> blocks of
+frontend/index.html into content-hashed files under frontend/dist/assets, writes gzip and
+brotli variants next to every file, and rewrites the shell to reference them. The assets
+never change under a given name, so they are served as immutable; only the shell is
+revalidated. Without a current build the app serves frontend/ as-is.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+from mimetypes import guess_type
+
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse
+
+from compression import negotiate
+
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "frontend")
+DIST_DIR = os.path.join(FRONTEND_DIR, "dist")
+ASSETS_PREFIX = "assets"
+MANIFEST = "build-manifest.json"
+
+# Inline blocks smaller than this stay in the shell (e.g. the early window.onerror hook)
+INLINE_LIMIT = 4096
+PRECOMPRESS_MIN_BYTES = 1024
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+VARIANT_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+_INLINE_BLOCK = re.compile(r"<(style|script)>(.*?)</\1>", re.S | re.I)
+
+
+# ─── Build ───────────────────────────────────────────────────────────────────
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _precompress(path: str):
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < PRECOMPRESS_MIN_BYTES:
+        return
+    with open(path + ".gz", "wb") as f:
+        f.write(gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        with open(path + ".br", "wb") as f:
+            f.write(brotli.compress(data, quality=11))
+
+
+def build(source_dir: str = FRONTEND_DIR, dist_dir: str = DIST_DIR) -> dict:
+    """Write the shell, hashed assets and their precompressed variants; returns the manifest."""
+    with open(os.path.join(source_dir, "index.html"), "rb") as f:
+        source = f.read()
+
+    shutil.rmtree(dist_dir, ignore_errors=True)
+    os.makedirs(os.path.join(dist_dir, ASSETS_PREFIX))
+    assets = {}
+
+    def extract(match):
+        tag, body = match.group(1).lower(), match.group(2)
+        if len(body.encode()) < INLINE_LIMIT:
+            return match.group(0)
+        ext = "css" if tag == "style" else "js"
+        data = body.strip("\n").encode() + b"\n"
+        stem = "app" if not any(n.endswith("." + ext) for n in assets) else f"app-{len(assets) + 1}"
+        name = f"{stem}.{_sha256(data)[:12]}.{ext}"
+        with open(os.path.join(dist_dir, ASSETS_PREFIX, name), "wb") as f:
+            f.write(data)
+        assets[name] = len(data)
+        url = f"/{ASSETS_PREFIX}/{name}"
+        return f'<link rel="stylesheet" href="{url}">' if ext == "css" else f'<script src="{url}"></script>'
+
+    shell = _INLINE_BLOCK.sub(extract, source.decode())
+    with open(os.path.join(dist_dir, "index.html"), "w", encoding="utf-8") as f:
+        f.write(shell)
+
+    for root, _, files in os.walk(dist_dir):
+        for name in files:
+            _precompress(os.path.join(root, name))
+
+    manifest = {"source_sha256": _sha256(source), "shell_bytes": len(shell.encode()), "assets": assets}
+    with open(os.path.join(dist_dir, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def frontend_directory(source_dir: str = FRONTEND_DIR, dist_dir: str = DIST_DIR) -> tuple[str, bool]:
+    """(directory to serve, is_built). Falls back to the source when the build is missing or stale."""
+    try:
+        with open(os.path.join(dist_dir, MANIFEST)) as f:
+            manifest = json.load(f)
+        with open(os.path.join(source_dir, "index.html"), "rb") as f:
+            current = _sha256(f.read())
+    except (OSError, ValueError):
+        return source_dir, False
+    if manifest.get("source_sha256") != current:
+        logger.warning("frontend/dist is out of date with index.html; serving the unbuilt source "
+                       "(run `python static_assets.py` to rebuild)")
+        return source_dir, False
+    return dist_dir, True
+
+
+# ─── Serving ─────────────────────────────────────────────────────────────────
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles that answers with a file's .br/.gz sibling when the client accepts it.
+
+    Variants are indexed once at startup, since build output doesn't change while the app
+    runs. `cache_control` is added to every file response (and its 304).
+    """
+
+    def __init__(self, *args, cache_control: str | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache_control = cache_control
+        self.variants = {}  # realpath -> {encoding: (variant path, stat)}
+        for directory in self.all_directories:
+            for root, _, files in os.walk(directory):
+                for name in files:
+                    for encoding, suffix in VARIANT_SUFFIXES.items():
+                        if name.endswith(suffix):
+                            variant = os.path.join(root, name)
+                            original = os.path.realpath(variant[: -len(suffix)])
+                            self.variants.setdefault(original, {})[encoding] = (variant, os.stat(variant))
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200):
+        headers = {}
+        if self.cache_control:
+            headers["Cache-Control"] = self.cache_control
+        path, media_type = full_path, None
+        variants = self.variants.get(os.path.realpath(full_path))
+        if variants:
+            headers["Vary"] = "Accept-Encoding"
+            encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""), variants)
+            if encoding:
+                path, stat_result = variants[encoding]
+                media_type = guess_type(str(full_path))[0]
+                headers["Content-Encoding"] = encoding
+
+        response = FileResponse(path, status_code=status_code, headers=headers, media_type=media_type,
+                                stat_result=stat_result)
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    result = build()
+    logger.info("Built frontend: %d-byte shell, assets %s%s", result["shell_bytes"], result["assets"],
+                "" if brotli is not None else " (Brotli not installed: gzip variants only)")
@@ -0,0 +1,141 @@
+"""
+Tenancy — Organization scoping for a multi-tenant deployment.
+Every step table carries an org_id; the request's organization is resolved once from the
+authenticated user (users.org_id) and stored on the DBConnection as db.org_id, which every
+query filters by. Single-tenant installs (MULTI_TENANT unset) fall back to the first
+organization so anonymous access keeps working as before.
+"""
+
+import logging
+import os
+
+from fastapi import HTTPException, Request, status
+
+logger = logging.getLogger(__name__)
+
+MULTI_TENANT = os.getenv("MULTI_TENANT", "").lower() in ("1", "true", "yes")
+
+# Routes reachable before a user has an organization (registration and login)
+PUBLIC_PATH_PREFIXES = ("/api/auth",)
+
+# Tenant-scoped tables -> columns following org_id in their composite index.
+# Shared reference data (users, organization, transformation_patterns, industry_profiles,
+# benchmarks) is deliberately absent; tables created with org_id already only need indexes.
+TENANT_TABLES = {
+    "business_units": ("name",),
+    "revenue_splits": ("business_unit_id", "period"),
+    "ops_efficiency": ("business_unit_id",),
+    "competitors": ("name",),
+    "value_streams": ("business_unit_id",),
+    "value_stream_levers": ("value_stream_id",),
+    "value_stream_steps": ("value_stream_id", "step_order"),
+    "value_stream_metrics": ("value_stream_id",),
+    "value_stream_benchmarks": ("value_stream_id",),
+    "swot_entries": ("category",),
+    "tows_actions": ("strategy_type",),
+    "strategy_inputs": ("input_type",),
+    "strategies": ("layer",),
+    "strategic_okrs": ("strategy_id",),
+    "strategic_key_results": ("okr_id",),
+    "product_groups": ("name",),
+    "digital_products": ("product_group_id",),
+    "initiatives": ("status",),
+    "teams": ("name",),
+    "product_okrs": ("strategic_okr_id",),
+    "product_key_results": ("product_okr_id",),
+    "epics": ("initiative_id",),
+    "epic_dependencies": ("epic_id",),
+    "delivery_okrs": ("product_okr_id",),
+    "delivery_key_results": ("delivery_okr_id",),
+    "features": ("epic_id",),
+    "feature_dependencies": ("feature_id",),
+    "review_gates": ("step_number", "gate_number"),
+    "step1_data_urls": ("url",),
+    "ai_analysis_cache": ("analysis_type", "input_hash"),
+    "ai_scenarios": ("created_at",),
+    "nlq_history": ("created_at",),
+    "document_chunks": ("document_id",),
+    "regulatory_impacts": ("strategy_id",),
+    "pilot_scopes": ("initiative_id",),
+    "change_plans": ("initiative_id",),
+    "tech_recommendations": ("initiative_id",),
+    "customer_journeys": ("persona_id",),
+    "ai_feedback": ("entity_type", "entity_id"),
+    "comments": ("entity_type", "entity_id"),
+}
+
+# Tables that were created with org_id; they only get composite indexes
+ORG_NATIVE_TABLES = {
+    "generation_runs": ("started_at",),
+    "org_readiness": ("dimension",),
+    "digital_maturity": ("dimension",),
+    "customer_personas": ("name",),
+    "operating_model": ("dimension",),
+    "governance_model": ("decision_type",),
+    "risk_registry": ("status",),
+    "pipeline_runs": ("started_at",),
+    "competitive_alerts": ("created_at",),
+}
+
+
+def tenant_index_statements() -> list[str]:
+    """CREATE INDEX IF NOT EXISTS statements for every (org_id, ...) composite index."""
+    stmts = []
+    for table, cols in {**TENANT_TABLES, **ORG_NATIVE_TABLES}.items():
+        stmts.append(
+            f"CREATE INDEX IF NOT EXISTS idx_{table}_org ON {table}(org_id, {', '.join(cols)})"
+        )
+    return stmts
+
+
+# ─── Request Resolution ──────────────────────────────────────────────────────
+
+
+def _bearer_user_id(request: Request) -> int | None:
+    from auth import decode_user_id
+
+    header = request.headers.get("Authorization", "")
+    if not header.startswith("Bearer "):
+        return None
+    return decode_user_id(header.split(" ", 1)[1])
+
+
+async def resolve_org_id(request: Request, db) -> int | None:
+    """Organization for this request, resolved once and cached on request.state."""
+    if hasattr(request.state, "org_id"):
+        return request.state.org_id
+
+    org_id = None
+    user_id = _bearer_user_id(request)
+    if user_id is not None:
+        row = await db.execute_fetchone("SELECT org_id FROM users WHERE id = ?", [user_id])
+        if row:
+            org_id = row["org_id"]
+            request.state.user_id = user_id
+    if org_id is None:
+        if MULTI_TENANT:
+            # Authenticated users without an org may only create one; everyone else is rejected
+            if user_id is None and not request.url.path.startswith(PUBLIC_PATH_PREFIXES):
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Authentication required",
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+        else:
+            row = await db.execute_fetchone("SELECT id FROM organization ORDER BY id LIMIT 1")
+            org_id = row["id"] if row else None
+
+    request.state.org_id = org_id
+    return org_id
+
+
+async def attach_user_to_org(db, request: Request | None, org_id: int):
+    """Make a newly created organization the authenticated user's tenant."""
+    user_id = getattr(request.state, "user_id", None) if request is not None else None
+    if user_id is None and request is not None:
+        user_id = _bearer_user_id(request)
+    if user_id is not None:
+        await db.execute("UPDATE users SET org_id = ? WHERE id = ? AND org_id IS NULL", [org_id, user_id])
+    db.org_id = org_id
+    if request is not None:
+        request.state.org_id = org_id
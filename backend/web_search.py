@@ -1,39 +1,159 @@
 """
 Web Search — Real web search via DuckDuckGo HTML scraping or Brave Search API.
 Falls back gracefully: Brave -> DuckDuckGo -> empty list.
+Results are cached in web_search_cache for a TTL, so repeated generation for the same
+industry/segment skips the network; several queries fan out concurrently while each
+provider is held to its own request rate. fetch_page keeps fetched pages in
+web_page_cache and revalidates them with If-None-Match / If-Modified-Since.
 """
 
-import os
+import asyncio
+import hashlib
 import logging
+import os
+import time
 
 import httpx
 from bs4 import BeautifulSoup
 
+from database import get_db_connection, timestamp_param
+from serialization import dumps, loads
+
 logger = logging.getLogger(__name__)
 
 BRAVE_API_KEY = os.getenv("BRAVE_SEARCH_API_KEY", "")
+WEB_SEARCH_ENABLED = os.getenv("WEB_SEARCH_ENABLED", "1").lower() in ("1", "true", "yes")
 
 USER_AGENT = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
     "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 )
 
+SEARCH_CACHE_TTL_SECONDS = float(os.getenv("WEB_SEARCH_CACHE_TTL_HOURS", "24")) * 3600
+SEARCH_CONCURRENCY = 4
+PAGE_CACHE_MAX_CHARS = 2_000_000
+
+
+def web_search_available() -> bool:
+    return WEB_SEARCH_ENABLED
+
+
+# ─── Rate Limiting ───────────────────────────────────────────────────────────
+
+
+class RateLimiter:
+    """Spaces out request starts to one provider: at most one per `interval` seconds.
+
+    Each caller reserves the next free slot and sleeps until it; reserving happens without
+    an await, so concurrent tasks on the event loop never share a slot.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._next_slot = 0.0
+
+    async def wait(self):
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
 
-async def search_web(query: str, num_results: int = 5) -> list[dict]:
+
+# Brave's free plan allows 1 request/second; DuckDuckGo serves CAPTCHAs to rapid bursts
+RATE_LIMITERS = {
+    "brave": RateLimiter(float(os.getenv("BRAVE_MIN_INTERVAL", "1.0"))),
+    "duckduckgo": RateLimiter(float(os.getenv("DUCKDUCKGO_MIN_INTERVAL", "0.5"))),
+}
+
+
+# ─── Search ──────────────────────────────────────────────────────────────────
+
+
+def _search_key(query: str, num_results: int) -> str:
+    normalized = " ".join(query.lower().split())
+    return hashlib.sha256(f"{normalized}|{num_results}".encode()).hexdigest()
+
+
+async def search_web(query: str, num_results: int = 5, db=None) -> list[dict]:
     """Search the web. Tries Brave Search API first, falls back to DuckDuckGo scraping."""
+    return (await search_many([query], num_results, db))[0]
+
+
+async def search_many(queries: list[str], num_results: int = 5, db=None) -> list[list[dict]]:
+    """Results for each query, in order. Cached queries are answered without the network and
+    the rest are searched concurrently. Opens its own connection when `db` is not given."""
+    own_db = db is None
+    if own_db:
+        db = await get_db_connection()
+    try:
+        keys = [_search_key(q, num_results) for q in queries]
+        cached = await _cached_results(db, keys)
+        missing = [i for i, key in enumerate(keys) if key not in cached]
+        if missing:
+            semaphore = asyncio.Semaphore(SEARCH_CONCURRENCY)
+
+            async def search(query):
+                async with semaphore:
+                    return await _search_uncached(query, num_results)
+
+            fetched = await asyncio.gather(*(search(queries[i]) for i in missing))
+            for i, (provider, results) in zip(missing, fetched):
+                cached[keys[i]] = results
+                if results:  # empty usually means blocked or failed; try again next time
+                    await _store_results(db, keys[i], queries[i], provider, results)
+            await db.commit()
+        logger.info("Web search: %d queries, %d from cache", len(queries), len(queries) - len(missing))
+        return [cached[key] for key in keys]
+    finally:
+        if own_db:
+            await db.close()
+
+
+async def _cached_results(db, keys: list[str]) -> dict:
+    if not keys:
+        return {}
+    try:
+        rows = await db.execute_fetchall(
+            f"SELECT query_hash, results_json FROM web_search_cache "
+            f"WHERE query_hash IN ({', '.join('?' for _ in keys)}) AND expires_at > ?",
+            [*keys, timestamp_param()],
+        )
+    except Exception as e:  # cache table missing (database not migrated yet)
+        logger.debug("Web search cache unavailable: %s", e)
+        return {}
+    return {r["query_hash"]: loads(r["results_json"]) for r in rows}
+
+
+async def _store_results(db, key: str, query: str, provider: str, results: list[dict]):
+    try:
+        await db.execute(
+            "INSERT INTO web_search_cache (query_hash, query, provider, results_json, fetched_at, expires_at) "
+            "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (query_hash) DO UPDATE SET provider = excluded.provider, "
+            "results_json = excluded.results_json, fetched_at = excluded.fetched_at, expires_at = excluded.expires_at",
+            [key, query, provider, dumps(results), timestamp_param(), timestamp_param(SEARCH_CACHE_TTL_SECONDS)],
+        )
+    except Exception as e:
+        logger.debug("Could not cache web search results: %s", e)
+
+
+async def _search_uncached(query: str, num_results: int) -> tuple[str, list[dict]]:
+    """(provider, results) from the first provider that answers."""
     if BRAVE_API_KEY:
         try:
+            await RATE_LIMITERS["brave"].wait()
             results = await _brave_search(query, num_results)
             if results:
-                return results
+                return "brave", results
         except Exception as e:
             logger.warning("Brave Search failed, falling back to DuckDuckGo: %s", e)
 
     try:
-        return await _duckduckgo_search(query, num_results)
+        await RATE_LIMITERS["duckduckgo"].wait()
+        return "duckduckgo", await _duckduckgo_search(query, num_results)
     except Exception as e:
         logger.warning("DuckDuckGo search failed: %s", e)
-        return []
+        return "duckduckgo", []
 
 
 async def _brave_search(query: str, num_results: int) -> list[dict]:
@@ -101,3 +221,62 @@ async def _duckduckgo_search(query: str, num_results: int) -> list[dict]:
                 break
 
     return results
+
+
+# ─── Page Fetching ───────────────────────────────────────────────────────────
+
+
+async def fetch_page(url: str, db=None, client: httpx.AsyncClient = None, timeout: float = 30) -> dict:
+    """GET a page, revalidating a cached copy with its ETag / Last-Modified.
+
+    Returns {"url", "text", "content_hash", "from_cache"}; a 304 answers from web_page_cache.
+    Pages are cached only when the server sends a validator. Raises httpx errors like a
+    plain GET with raise_for_status().
+    """
+    own_db = db is None
+    if own_db:
+        db = await get_db_connection()
+    try:
+        cached = None
+        try:
+            cached = await db.execute_fetchone(
+                "SELECT etag, last_modified, content_hash, body FROM web_page_cache WHERE url = ?", [url]
+            )
+        except Exception as e:
+            logger.debug("Page cache unavailable: %s", e)
+
+        headers = {"User-Agent": USER_AGENT}
+        if cached and cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached and cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+        if client is None:
+            async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as own_client:
+                resp = await own_client.get(url, headers=headers)
+        else:
+            resp = await client.get(url, headers=headers)
+
+        if resp.status_code == 304 and cached:
+            return {"url": url, "text": cached["body"], "content_hash": cached["content_hash"], "from_cache": True}
+        resp.raise_for_status()
+
+        text = resp.text
+        digest = hashlib.sha256(text.encode()).hexdigest()
+        etag, last_modified = resp.headers.get("etag"), resp.headers.get("last-modified")
+        if (etag or last_modified) and len(text) <= PAGE_CACHE_MAX_CHARS:
+            try:
+                await db.execute(
+                    "INSERT INTO web_page_cache (url, etag, last_modified, content_hash, body, fetched_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (url) DO UPDATE SET etag = excluded.etag, "
+                    "last_modified = excluded.last_modified, content_hash = excluded.content_hash, "
+                    "body = excluded.body, fetched_at = excluded.fetched_at",
+                    [url, etag, last_modified, digest, text, timestamp_param()],
+                )
+                await db.commit()
+            except Exception as e:
+                logger.debug("Could not cache page %s: %s", url, e)
+        return {"url": url, "text": text, "content_hash": digest, "from_cache": False}
+    finally:
+        if own_db:
+            await db.close()
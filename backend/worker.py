@@ -0,0 +1,42 @@
+"""
+Worker — Standalone job queue worker process.
+Run next to the API (`cd backend && python worker.py`) and set JOB_WORKER_EMBEDDED=0 on the
+API service so long LLM generation never competes with request handling. Any number of
+workers can run against the same database; each leases jobs independently.
+"""
+
+from dotenv import load_dotenv
+load_dotenv()
+
+import asyncio
+import logging
+import signal
+
+logger = logging.getLogger(__name__)
+
+
+async def main():
+    from database import close_pg_pool, init_pg_pool
+    from job_queue import JobWorker
+    from main import run_migrations
+
+    await init_pg_pool()
+    await run_migrations()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:  # Windows
+            pass
+
+    try:
+        await JobWorker().run(stop)
+    finally:
+        await close_pg_pool()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    asyncio.run(main())
@@ -0,0 +1,54 @@
+"""
+Benchmark — Embedding throughput of each available provider on synthetic chunks.
+
+Fits the local TF-IDF + SVD model on N Zipf-distributed 300-word chunks and reports the
+fit time and chunks/second; OpenAI is timed on a small sample when OPENAI_API_KEY is set.
+
+    python benchmarks/embeddings.py [chunks]
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from embeddings import LocalEmbeddingModel, openai_embeddings  # noqa: E402
+
+logger = logging.getLogger("benchmarks.embeddings")
+
+
+def synthetic_chunks(n: int, words: int = 300, seed: int = 0) -> list[str]:
+    rng = np.random.default_rng(seed)
+    vocab = np.array([f"term{i}" for i in range(20000)])
+    zipf = 1.0 / np.arange(1, len(vocab) + 1)
+    picks = rng.choice(len(vocab), size=(n, words), p=zipf / zipf.sum())
+    return [" ".join(vocab[row]) for row in picks]
+
+
+async def benchmark(n: int = 2000, openai_sample: int = 100) -> dict:
+    """Chunks/second of each available provider (OpenAI only when a key is configured)."""
+    texts = synthetic_chunks(n)
+    results = {}
+    started = time.perf_counter()
+    model = LocalEmbeddingModel.fit(texts)
+    results["local_fit_s"] = round(time.perf_counter() - started, 2)
+    started = time.perf_counter()
+    model.transform(texts)
+    results["local_chunks_per_s"] = round(n / (time.perf_counter() - started))
+    if os.getenv("OPENAI_API_KEY"):
+        sample = texts[:openai_sample]
+        started = time.perf_counter()
+        await openai_embeddings(sample)
+        results["openai_chunks_per_s"] = round(len(sample) / (time.perf_counter() - started))
+    return results
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    logger.info("Embedding throughput on %d synthetic 300-word chunks: %s", count, asyncio.run(benchmark(count)))
@@ -0,0 +1,132 @@
+"""
+Benchmark — GET /api/step6/epics-full before and after the graph assembler.
+
+Seeds a scratch SQLite database (built from database/schema.sql) with N epics, M epic
+dependencies and their product key results, then times the current router function
+against the pre-assembler code path: one pass over every dependency per epic, and one
+product_key_results query per epic. Both run on the same connection and page, and their
+responses are checked to be equal.
+
+    python benchmarks/epics_full.py [epics] [dependencies]
+"""
+
+import asyncio
+import logging
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend")
+sys.path.insert(0, BACKEND_DIR)
+
+from database import DBConnection  # noqa: E402
+from routers.step6_epics_teams import EPICS_FULL, get_epics_full  # noqa: E402
+
+logger = logging.getLogger("benchmarks.epics_full")
+
+SCHEMA_PATH = os.path.join(BACKEND_DIR, "..", "database", "schema.sql")
+INITIATIVES = 50
+KEY_RESULTS_PER_OKR = 3
+
+
+def seed(path: str, epics: int, dependencies: int):
+    rng = random.Random(0)
+    okrs = max(epics // 10, 1)
+    conn = sqlite3.connect(path)
+    with open(SCHEMA_PATH) as f:
+        conn.executescript(f.read())
+    conn.execute("PRAGMA foreign_keys = OFF")  # products and OKRs behind the joins aren't needed
+    conn.execute("INSERT INTO organization (id, name, industry) VALUES (1, 'Bench', 'Banking')")
+    conn.executemany("INSERT INTO initiatives (id, org_id, digital_product_id, name) VALUES (?, 1, 1, ?)",
+                     [(i, f"Initiative {i}") for i in range(1, INITIATIVES + 1)])
+    conn.executemany(
+        "INSERT INTO epics (id, org_id, initiative_id, product_okr_id, name, priority_score) VALUES (?, 1, ?, ?, ?, ?)",
+        [(i, i % INITIATIVES + 1, i % okrs + 1, f"Epic {i}", rng.random() * 100) for i in range(1, epics + 1)],
+    )
+    pairs = set()
+    while len(pairs) < dependencies:
+        a, b = rng.randint(1, epics), rng.randint(1, epics)
+        if a != b:
+            pairs.add((a, b))
+    conn.executemany("INSERT INTO epic_dependencies (org_id, epic_id, depends_on_epic_id) VALUES (1, ?, ?)",
+                     sorted(pairs))
+    conn.executemany(
+        "INSERT INTO product_key_results (org_id, product_okr_id, key_result, target_value) VALUES (1, ?, 'KR', 100)",
+        [(i % okrs + 1,) for i in range(okrs * KEY_RESULTS_PER_OKR)],
+    )
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.close()
+
+
+async def old_get_epics_full(db):
+    """get_epics_full as it was before the graph assembler (full list, all fields)."""
+    page = await EPICS_FULL.fetch(db, "e.org_id = ?", [db.org_id], None, None, None)
+    epics = page.rows
+
+    all_deps = await db.execute_fetchall(
+        "SELECT ed.*, e1.name as epic_name, e2.name as depends_on_name "
+        "FROM epic_dependencies ed "
+        "JOIN epics e1 ON ed.epic_id = e1.id "
+        "JOIN epics e2 ON ed.depends_on_epic_id = e2.id WHERE ed.org_id = ?", (db.org_id,)
+    )
+    deps_list = [dict(d) for d in all_deps]
+    for epic in epics:
+        eid = epic["id"]
+        epic["depends_on"] = [
+            {"id": d["depends_on_epic_id"], "name": d["depends_on_name"], "dep_id": d["id"]}
+            for d in deps_list if d["epic_id"] == eid
+        ]
+        epic["blocks"] = [
+            {"id": d["epic_id"], "name": d["epic_name"], "dep_id": d["id"]}
+            for d in deps_list if d["depends_on_epic_id"] == eid
+        ]
+
+    for epic in epics:
+        if epic.get("product_okr_id"):
+            kr_rows = await db.execute_fetchall(
+                "SELECT * FROM product_key_results WHERE org_id = ? AND product_okr_id = ? ORDER BY id",
+                (db.org_id, epic["product_okr_id"]),
+            )
+            epic["product_key_results"] = [dict(kr) for kr in kr_rows]
+        else:
+            epic["product_key_results"] = []
+    return page.response()
+
+
+async def _timed(fn) -> tuple[float, list]:
+    started = time.perf_counter()
+    result = await fn()
+    return time.perf_counter() - started, result
+
+
+async def benchmark(epics: int = 5000, dependencies: int = 20000) -> dict:
+    import aiosqlite
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        seed(path, epics, dependencies)
+        async with aiosqlite.connect(path) as conn:
+            conn.row_factory = aiosqlite.Row
+            db = DBConnection(conn, org_id=1)
+            new_s, new = await _timed(lambda: get_epics_full(limit=None, cursor=None, fields=None, db=db))
+            old_s, old = await _timed(lambda: old_get_epics_full(db))
+
+    assert new == old, "assembled response differs from the old code path"
+    return {
+        "epics": len(new),
+        "dependencies": sum(len(e["depends_on"]) for e in new),
+        "old_s": round(old_s, 2),
+        "assembled_s": round(new_s, 3),
+        "speedup": round(old_s / new_s, 1),
+    }
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    epic_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    dependency_count = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    logger.info("epics-full: %s", asyncio.run(benchmark(epic_count, dependency_count)))
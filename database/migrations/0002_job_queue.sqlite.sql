@@ -0,0 +1,24 @@
+-- Durable job queue (backend/job_queue.py)
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER REFERENCES organization(id),
+    kind TEXT NOT NULL,
+    payload_json TEXT DEFAULT '{}',
+    dedupe_key TEXT,
+    status TEXT NOT NULL DEFAULT 'queued' CHECK (status IN ('queued', 'running', 'succeeded', 'failed', 'cancelled')),
+    attempts INTEGER DEFAULT 0,
+    max_attempts INTEGER DEFAULT 3,
+    run_after TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    lease_token TEXT,
+    locked_by TEXT,
+    heartbeat_at TIMESTAMP,
+    cancel_requested INTEGER DEFAULT 0,
+    result_json TEXT,
+    error_message TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_queue ON jobs(status, run_after);
+CREATE INDEX IF NOT EXISTS idx_jobs_org ON jobs(org_id, dedupe_key);
+CREATE INDEX IF NOT EXISTS idx_jobs_lease ON jobs(lease_token);
@@ -0,0 +1,8 @@
+-- Keyset pagination sort keys (backend/pagination.py); expressions match the ORDER BY exactly
+CREATE INDEX IF NOT EXISTS idx_epics_org_priority ON epics(org_id, (COALESCE(priority_score, 0)) DESC, id);
+CREATE INDEX IF NOT EXISTS idx_features_org_priority ON features(org_id, (COALESCE(priority_score, 0)) DESC, id);
+CREATE INDEX IF NOT EXISTS idx_initiatives_org_rice ON initiatives(org_id, (COALESCE(rice_override, rice_score, 0)) DESC, id);
+CREATE INDEX IF NOT EXISTS idx_risk_registry_org_score ON risk_registry(org_id, (COALESCE(risk_score, 0)) DESC, id);
+CREATE INDEX IF NOT EXISTS idx_swot_entries_org_category ON swot_entries(org_id, category, id);
+CREATE INDEX IF NOT EXISTS idx_competitors_org_name ON competitors(org_id, name, id);
+CREATE INDEX IF NOT EXISTS idx_org_documents_org_id ON org_documents(org_id, id);
@@ -0,0 +1,6 @@
+-- Per-table write counters behind the response cache ETags (backend/response_cache.py)
+CREATE TABLE IF NOT EXISTS table_versions (
+    table_name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
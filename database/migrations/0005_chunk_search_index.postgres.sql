@@ -0,0 +1,5 @@
+-- Keyword index over document_chunks (backend/rag_engine.py keyword_search).
+-- A stored generated column stays in sync with chunk_text on every insert/update.
+ALTER TABLE document_chunks ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (to_tsvector('english', chunk_text)) STORED;
+CREATE INDEX IF NOT EXISTS idx_document_chunks_search ON document_chunks USING GIN (search_vector);
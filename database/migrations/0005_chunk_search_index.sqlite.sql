@@ -0,0 +1,20 @@
+-- BM25 keyword index over document_chunks (backend/rag_engine.py keyword_search).
+-- External-content FTS5 table: stores only the index, kept in sync by triggers.
+CREATE VIRTUAL TABLE IF NOT EXISTS document_chunks_fts USING fts5(
+    chunk_text, content='document_chunks', content_rowid='id', tokenize='porter unicode61'
+);
+
+CREATE TRIGGER IF NOT EXISTS document_chunks_fts_insert AFTER INSERT ON document_chunks BEGIN
+    INSERT INTO document_chunks_fts(rowid, chunk_text) VALUES (new.id, new.chunk_text);
+END;
+
+CREATE TRIGGER IF NOT EXISTS document_chunks_fts_delete AFTER DELETE ON document_chunks BEGIN
+    INSERT INTO document_chunks_fts(document_chunks_fts, rowid, chunk_text) VALUES ('delete', old.id, old.chunk_text);
+END;
+
+CREATE TRIGGER IF NOT EXISTS document_chunks_fts_update AFTER UPDATE OF chunk_text ON document_chunks BEGIN
+    INSERT INTO document_chunks_fts(document_chunks_fts, rowid, chunk_text) VALUES ('delete', old.id, old.chunk_text);
+    INSERT INTO document_chunks_fts(rowid, chunk_text) VALUES (new.id, new.chunk_text);
+END;
+
+INSERT INTO document_chunks_fts(document_chunks_fts) VALUES ('rebuild');
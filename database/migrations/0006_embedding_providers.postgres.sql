@@ -0,0 +1,18 @@
+-- Which embedding provider/model produced each chunk vector (backend/embeddings.py).
+-- Vectors stored before providers existed all came from OpenAI.
+ALTER TABLE document_chunks ADD COLUMN IF NOT EXISTS embedding_provider TEXT;
+UPDATE document_chunks SET embedding_provider = 'openai:text-embedding-3-small'
+    WHERE embedding_json IS NOT NULL AND embedding_provider IS NULL;
+CREATE INDEX IF NOT EXISTS idx_document_chunks_provider ON document_chunks(org_id, embedding_provider);
+
+-- Fitted local embedding models, one row per (re)fit
+CREATE TABLE IF NOT EXISTS embedding_models (
+    id SERIAL PRIMARY KEY,
+    org_id INTEGER NOT NULL REFERENCES organization(id),
+    provider TEXT NOT NULL,
+    dimensions INTEGER NOT NULL,
+    chunk_count INTEGER NOT NULL,
+    model_data BYTEA NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_embedding_models_org ON embedding_models(org_id, provider, id);
@@ -0,0 +1,6 @@
+-- Where each chunk came from in its document (rag_engine.iter_chunks): character offsets
+-- into the extracted text, PDF page and the markdown heading it falls under.
+ALTER TABLE document_chunks ADD COLUMN IF NOT EXISTS char_start INTEGER;
+ALTER TABLE document_chunks ADD COLUMN IF NOT EXISTS char_end INTEGER;
+ALTER TABLE document_chunks ADD COLUMN IF NOT EXISTS page_number INTEGER;
+ALTER TABLE document_chunks ADD COLUMN IF NOT EXISTS section TEXT;
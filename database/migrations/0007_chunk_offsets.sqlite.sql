@@ -0,0 +1,6 @@
+-- Where each chunk came from in its document (rag_engine.iter_chunks): character offsets
+-- into the extracted text, PDF page and the markdown heading it falls under.
+ALTER TABLE document_chunks ADD COLUMN char_start INTEGER;
+ALTER TABLE document_chunks ADD COLUMN char_end INTEGER;
+ALTER TABLE document_chunks ADD COLUMN page_number INTEGER;
+ALTER TABLE document_chunks ADD COLUMN section TEXT;
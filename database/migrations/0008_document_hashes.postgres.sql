@@ -0,0 +1,5 @@
+-- sha256 of each uploaded file (rag_engine.index_document), so re-uploads of the same file
+-- are recognised; documents indexed before this have no hash and are matched by filename.
+ALTER TABLE org_documents ADD COLUMN IF NOT EXISTS content_hash TEXT;
+CREATE INDEX IF NOT EXISTS idx_org_documents_hash ON org_documents(org_id, content_hash);
+CREATE INDEX IF NOT EXISTS idx_org_documents_filename ON org_documents(org_id, filename, doc_category);
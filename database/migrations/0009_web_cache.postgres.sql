@@ -0,0 +1,20 @@
+-- Shared caches for backend/web_search.py (public web data, so not tenant-scoped)
+CREATE TABLE IF NOT EXISTS web_search_cache (
+    id SERIAL PRIMARY KEY,
+    query_hash TEXT NOT NULL UNIQUE,
+    query TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    results_json TEXT NOT NULL,
+    fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    expires_at TIMESTAMP NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS web_page_cache (
+    id SERIAL PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    etag TEXT,
+    last_modified TEXT,
+    content_hash TEXT NOT NULL,
+    body TEXT NOT NULL,
+    fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
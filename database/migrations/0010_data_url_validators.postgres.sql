@@ -0,0 +1,7 @@
+-- HTTP validators and page-text hash of each saved Step 1 URL, so unchanged pages are
+-- revalidated instead of re-downloaded and never re-extracted; plus the last fetch timings.
+ALTER TABLE step1_data_urls ADD COLUMN IF NOT EXISTS etag TEXT;
+ALTER TABLE step1_data_urls ADD COLUMN IF NOT EXISTS last_modified TEXT;
+ALTER TABLE step1_data_urls ADD COLUMN IF NOT EXISTS content_hash TEXT;
+ALTER TABLE step1_data_urls ADD COLUMN IF NOT EXISTS fetch_ms INTEGER;
+ALTER TABLE step1_data_urls ADD COLUMN IF NOT EXISTS extract_ms INTEGER;
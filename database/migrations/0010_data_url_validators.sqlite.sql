@@ -0,0 +1,7 @@
+-- HTTP validators and page-text hash of each saved Step 1 URL, so unchanged pages are
+-- revalidated instead of re-downloaded and never re-extracted; plus the last fetch timings.
+ALTER TABLE step1_data_urls ADD COLUMN etag TEXT;
+ALTER TABLE step1_data_urls ADD COLUMN last_modified TEXT;
+ALTER TABLE step1_data_urls ADD COLUMN content_hash TEXT;
+ALTER TABLE step1_data_urls ADD COLUMN fetch_ms INTEGER;
+ALTER TABLE step1_data_urls ADD COLUMN extract_ms INTEGER;
@@ -0,0 +1,10 @@
+-- Per-source progress of POST /api/step1/refresh-all runs (see GET /api/step1/refresh-all/status)
+CREATE TABLE IF NOT EXISTS source_refresh_runs (
+    id SERIAL PRIMARY KEY,
+    org_id INTEGER REFERENCES organization(id),
+    status TEXT NOT NULL DEFAULT 'running' CHECK (status IN ('running', 'completed')),
+    sources_json TEXT DEFAULT '{}',
+    started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    completed_at TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_source_refresh_runs_org ON source_refresh_runs(org_id, id);
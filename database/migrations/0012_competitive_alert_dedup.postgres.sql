@@ -0,0 +1,14 @@
+-- Incremental competitive news refresh: each alert carries a hash of its article URL (or
+-- headline) that is unique per organization, and each competitor ticker remembers the
+-- publish time (unix seconds) of the newest article seen so far.
+ALTER TABLE competitive_alerts ADD COLUMN IF NOT EXISTS content_hash TEXT;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_competitive_alerts_hash ON competitive_alerts(org_id, content_hash);
+
+CREATE TABLE IF NOT EXISTS competitor_news_sync (
+    id SERIAL PRIMARY KEY,
+    org_id INTEGER NOT NULL REFERENCES organization(id),
+    ticker TEXT NOT NULL,
+    last_seen_ts BIGINT,
+    synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (org_id, ticker)
+);
@@ -0,0 +1,32 @@
+"""Hash competitive alerts stored before 0012 and drop the duplicates repeated refreshes left.
+
+Of each set of duplicates the oldest alert is kept, marked read if any copy was.
+"""
+
+import hashlib
+
+
+def _alert_hash(competitor: str, headline: str | None, url: str | None) -> str:
+    """The alert identity as of this migration (frozen copy of v2_features._alert_hash)."""
+    key = (url or "").strip() or " ".join((headline or "").lower().split())
+    return hashlib.sha256(f"{competitor}\n{key}".encode()).hexdigest()
+
+
+async def upgrade(db):
+    rows = await db.execute_fetchall(
+        "SELECT id, org_id, competitor_name, headline, source_url, is_read FROM competitive_alerts "
+        "WHERE content_hash IS NULL ORDER BY id"
+    )
+    kept = {}  # (org_id, hash) -> (id, is_read)
+    for r in rows:
+        digest = _alert_hash(r["competitor_name"], r["headline"], r["source_url"])
+        key = (r["org_id"], digest)
+        if key in kept:
+            keep_id, keep_read = kept[key]
+            if r["is_read"] and not keep_read:
+                await db.execute("UPDATE competitive_alerts SET is_read = 1 WHERE id = ?", [keep_id])
+                kept[key] = (keep_id, 1)
+            await db.execute("DELETE FROM competitive_alerts WHERE id = ?", [r["id"]])
+            continue
+        kept[key] = (r["id"], r["is_read"])
+        await db.execute("UPDATE competitive_alerts SET content_hash = ? WHERE id = ?", [digest, r["id"]])
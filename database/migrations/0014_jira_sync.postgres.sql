@@ -0,0 +1,40 @@
+-- Local Jira issue store (see backend/jira_sync.py): issues, their status transitions
+-- with the hours spent in the status each one left, and the newest `updated` timestamp
+-- (as Jira reported it) synced per scope, a project key or '*' for all projects.
+CREATE TABLE IF NOT EXISTS jira_issues (
+    id SERIAL PRIMARY KEY,
+    org_id INTEGER NOT NULL REFERENCES organization(id),
+    issue_key TEXT NOT NULL,
+    project_key TEXT,
+    issue_type TEXT,
+    summary TEXT,
+    status TEXT,
+    status_category TEXT,
+    created_at TIMESTAMP,
+    updated_at TIMESTAMP,
+    resolved_at TIMESTAMP,
+    cycle_hours DOUBLE PRECISION,
+    UNIQUE (org_id, issue_key)
+);
+CREATE INDEX IF NOT EXISTS idx_jira_issues_project ON jira_issues(org_id, project_key);
+
+CREATE TABLE IF NOT EXISTS jira_issue_transitions (
+    id SERIAL PRIMARY KEY,
+    org_id INTEGER NOT NULL REFERENCES organization(id),
+    issue_key TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    from_status TEXT,
+    to_status TEXT,
+    transitioned_at TIMESTAMP,
+    hours_in_status DOUBLE PRECISION
+);
+CREATE INDEX IF NOT EXISTS idx_jira_issue_transitions_issue ON jira_issue_transitions(org_id, issue_key);
+
+CREATE TABLE IF NOT EXISTS jira_sync_state (
+    id SERIAL PRIMARY KEY,
+    org_id INTEGER NOT NULL REFERENCES organization(id),
+    scope TEXT NOT NULL,
+    last_updated TEXT,
+    last_synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (org_id, scope)
+);
@@ -0,0 +1,4 @@
+-- Foreign-key checks when deleting a TOWS action or a strategy; without these each delete
+-- scans strategies / initiatives (found by tests/test_query_plans.py)
+CREATE INDEX IF NOT EXISTS idx_strategies_tows_action ON strategies(tows_action_id);
+CREATE INDEX IF NOT EXISTS idx_initiatives_strategy ON initiatives(strategy_id);
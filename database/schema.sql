@@ -7,6 +7,23 @@
 
 PRAGMA foreign_keys = ON;
 
+-- ============================================================
+-- Schema Versioning (see backend/migrations.py)
+-- ============================================================
+
+CREATE TABLE schema_migrations (
+    version INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Per-table write counters; response cache ETags are derived from them
+CREATE TABLE table_versions (
+    table_name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- ============================================================
 -- Users (Authentication)
 -- ============================================================
@@ -16,6 +33,7 @@ CREATE TABLE users (
     email TEXT UNIQUE NOT NULL,
     name TEXT NOT NULL,
     hashed_password TEXT NOT NULL,
+    org_id INTEGER,
     is_active INTEGER DEFAULT 1,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
@@ -49,13 +67,16 @@ CREATE TABLE organization (
 
 CREATE TABLE business_units (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
-    name TEXT NOT NULL UNIQUE,
+    org_id INTEGER REFERENCES organization(id),
+    name TEXT NOT NULL,
     description TEXT,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (org_id, name)
 );
 
 CREATE TABLE revenue_splits (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER REFERENCES organization(id),
     business_unit_id INTEGER NOT NULL REFERENCES business_units(id),
     dimension TEXT NOT NULL CHECK (dimension IN ('product', 'region', 'segment')),
     dimension_value TEXT NOT NULL,
@@ -66,6 +87,7 @@ CREATE TABLE revenue_splits (
 
 CREATE TABLE ops_efficiency (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER REFERENCES organization(id),
     business_unit_id INTEGER NOT NULL REFERENCES business_units(id),
     metric_name TEXT NOT NULL,
     metric_value REAL NOT NULL,
@@ -76,6 +98,7 @@ CREATE TABLE ops_efficiency (
 
 CREATE TABLE competitors (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER REFERENCES organization(id),
     name TEXT NOT NULL,
     ticker TEXT,
     market_share REAL,
@@ -99,6 +122,7 @@ CREATE TABLE competitors (
 
 CREATE TABLE value_streams (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER REFERENCES organization(id),
     business_unit_id INTEGER NOT NULL REFERENCES business_units(id),
     name TEXT NOT NULL,
     description TEXT,
@@ -107,6 +131,7 @@ CREATE TABLE value_streams (
 
 CREATE TABLE value_stream_levers (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER REFERENCES organization(id),
     value_stream_id INTEGER NOT NULL REFERENCES value_streams(id),
     lever_type TEXT NOT NULL CHECK (lever_type IN ('growth', 'efficiency', 'experience', 'effectiveness')),
     opportunity TEXT NOT NULL,
@@ -118,6 +143,7 @@ CREATE TABLE value_stream_levers (
 
 CREATE TABLE value_stream_steps (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER REFERENCES organization(id),
     value_stream_id INTEGER NOT NULL REFERENCES value_streams(id),
     step_order INTEGER NOT NULL,
     step_name TEXT NOT NULL,
@@ -134,6 +160,7 @@ CREATE TABLE value_stream_steps (
 
 CREATE TABLE value_stream_metrics (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER REFERENCES organization(id),
     value_stream_id INTEGER NOT NULL UNIQUE REFERENCES value_streams(id),
     total_lead_time_hours REAL DEFAULT 0,
     total_process_time_hours REAL DEFAULT 0,
@@ -147,6 +174,7 @@ CREATE TABLE value_stream_metrics (
 
 CREATE TABLE value_stream_benchmarks (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER REFERENCES organization(id),
     value_stream_id INTEGER NOT NULL REFERENCES value_streams(id),
     competitor_name TEXT NOT NULL,
     total_lead_time_hours REAL,
@@ -163,6 +191,7 @@ CREATE TABLE value_stream_benchmarks (
 
 CREATE TABLE swot_entries (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER REFERENCES organization(id),
     business_unit_id INTEGER NOT NULL REFERENCES business_units(id),
     category TEXT NOT NULL CHECK (category IN ('strength', 'weakness', 'opportunity', 'threat')),
     description TEXT NOT NULL,
@@ -175,6 +204,7 @@ CREATE TABLE swot_entries (
 
 CREATE TABLE tows_actions (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER REFERENCES organization(id),
     strategy_type TEXT NOT NULL CHECK (strategy_type IN ('SO', 'WO', 'ST', 'WT')),
     swot_entry_1_id INTEGER NOT NULL REFERENCES swot_entries(id),
     swot_entry_2_id INTEGER NOT NULL REFERENCES swot_entries(id),
@@ -192,6 +222,7 @@ CREATE TABLE tows_actions (
 
 CREATE TABLE strategy_inputs (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER REFERENCES organization(id),
     input_type TEXT NOT NULL CHECK (input_type IN (
         'business_strategy', 'digital_strategy', 'data_strategy', 'gen_ai_strategy',
         'competitor_strategy', 'ongoing_initiatives', 'document_reference'
@@ -204,6 +235,7 @@ CREATE TABLE strategy_inputs (
 
 CREATE TABLE strategies (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER REFERENCES organization(id),
     layer TEXT NOT NULL CHECK (layer IN ('business', 'digital', 'data', 'gen_ai')),
     name TEXT NOT NULL,
     description TEXT,
@@ -218,6 +250,7 @@ CREATE TABLE strategies (
 
 CREATE TABLE strategic_okrs (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER REFERENCES organization(id),
     strategy_id INTEGER NOT NULL REFERENCES strategies(id),
     objective TEXT NOT NULL,
     time_horizon TEXT,
@@ -229,6 +262,7 @@ CREATE TABLE strategic_okrs (
 
 CREATE TABLE strategic_key_results (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER REFERENCES organization(id),
     okr_id INTEGER NOT NULL REFERENCES strategic_okrs(id),
     key_result TEXT NOT NULL,
     metric TEXT,
@@ -250,6 +284,7 @@ CREATE TABLE strategic_key_results (
 
 CREATE TABLE product_groups (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER REFERENCES organization(id),
     name TEXT NOT NULL,
     description TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
@@ -257,6 +292,7 @@ CREATE TABLE product_groups (
 
 CREATE TABLE digital_products (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER REFERENCES organization(id),
     product_group_id INTEGER NOT NULL REFERENCES product_groups(id),
     name TEXT NOT NULL,
     description TEXT,
@@ -265,6 +301,7 @@ CREATE TABLE digital_products (
 
 CREATE TABLE initiatives (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER REFERENCES organization(id),
     digital_product_id INTEGER NOT NULL REFERENCES digital_products(id),
     strategy_id INTEGER REFERENCES strategies(id),
     name TEXT NOT NULL,
@@ -316,13 +353,16 @@ CREATE TABLE initiatives (
 
 CREATE TABLE teams (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
-    name TEXT NOT NULL UNIQUE,
+    org_id INTEGER REFERENCES organization(id),
+    name TEXT NOT NULL,
     capacity INTEGER,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (org_id, name)
 );
 
 CREATE TABLE product_okrs (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER REFERENCES organization(id),
     strategic_okr_id INTEGER NOT NULL REFERENCES strategic_okrs(id),
     digital_product_id INTEGER NOT NULL REFERENCES digital_products(id),
     objective TEXT NOT NULL,
@@ -334,6 +374,7 @@ CREATE TABLE product_okrs (
 
 CREATE TABLE product_key_results (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER REFERENCES organization(id),
     product_okr_id INTEGER NOT NULL REFERENCES product_okrs(id),
     key_result TEXT NOT NULL,
     metric TEXT,
@@ -347,6 +388,7 @@ CREATE TABLE product_key_results (
 
 CREATE TABLE epics (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER REFERENCES organization(id),
     initiative_id INTEGER NOT NULL REFERENCES initiatives(id),
     team_id INTEGER REFERENCES teams(id),
     product_okr_id INTEGER REFERENCES product_okrs(id),
@@ -375,6 +417,7 @@ CREATE TABLE epics (
 
 CREATE TABLE epic_dependencies (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER REFERENCES organization(id),
     epic_id INTEGER NOT NULL REFERENCES epics(id),
     depends_on_epic_id INTEGER NOT NULL REFERENCES epics(id),
     dependency_type TEXT DEFAULT 'blocks' CHECK (dependency_type IN ('blocks', 'relates_to')),
@@ -388,6 +431,7 @@ CREATE TABLE epic_dependencies (
 
 CREATE TABLE delivery_okrs (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER REFERENCES organization(id),
     product_okr_id INTEGER NOT NULL REFERENCES product_okrs(id),
     team_id INTEGER NOT NULL REFERENCES teams(id),
     objective TEXT NOT NULL,
@@ -399,6 +443,7 @@ CREATE TABLE delivery_okrs (
 
 CREATE TABLE delivery_key_results (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER REFERENCES organization(id),
     delivery_okr_id INTEGER NOT NULL REFERENCES delivery_okrs(id),
     key_result TEXT NOT NULL,
     metric TEXT,
@@ -412,6 +457,7 @@ CREATE TABLE delivery_key_results (
 
 CREATE TABLE features (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER REFERENCES organization(id),
     epic_id INTEGER NOT NULL REFERENCES epics(id),
     delivery_okr_id INTEGER REFERENCES delivery_okrs(id),
     name TEXT NOT NULL,
@@ -446,6 +492,7 @@ CREATE TABLE features (
 
 CREATE TABLE review_gates (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER REFERENCES organization(id),
     step_number INTEGER NOT NULL CHECK (step_number BETWEEN 1 AND 7),
     gate_number INTEGER NOT NULL,
     gate_name TEXT NOT NULL,
@@ -462,6 +509,7 @@ CREATE TABLE review_gates (
 
 CREATE TABLE step1_data_urls (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER REFERENCES organization(id),
     url TEXT NOT NULL,
     label TEXT,
     url_type TEXT DEFAULT 'external',
@@ -469,6 +517,11 @@ CREATE TABLE step1_data_urls (
     last_result_json TEXT,
     status TEXT DEFAULT 'pending',
     error_message TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    content_hash TEXT,
+    fetch_ms INTEGER,
+    extract_ms INTEGER,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
@@ -478,6 +531,7 @@ CREATE TABLE step1_data_urls (
 
 CREATE TABLE ai_analysis_cache (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER REFERENCES organization(id),
     analysis_type TEXT NOT NULL,
     input_hash TEXT NOT NULL,
     result_json TEXT NOT NULL,
@@ -488,6 +542,7 @@ CREATE TABLE ai_analysis_cache (
 
 CREATE TABLE ai_scenarios (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER REFERENCES organization(id),
     scenario_name TEXT NOT NULL,
     scenario_type TEXT NOT NULL CHECK (scenario_type IN ('revenue_change', 'market_entry', 'cost_change', 'custom')),
     parameters_json TEXT NOT NULL,
@@ -497,14 +552,19 @@ CREATE TABLE ai_scenarios (
 
 CREATE TABLE nlq_history (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER REFERENCES organization(id),
     question TEXT NOT NULL,
     answer_json TEXT NOT NULL,
     data_tables_queried TEXT,
+    question_embedding_json TEXT,
+    data_version TEXT,
+    hit_count INTEGER DEFAULT 0,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
 CREATE TABLE feature_dependencies (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER REFERENCES organization(id),
     feature_id INTEGER NOT NULL REFERENCES features(id),
     depends_on_feature_id INTEGER NOT NULL REFERENCES features(id),
     dependency_type TEXT DEFAULT 'blocks' CHECK (dependency_type IN ('blocks', 'relates_to')),
@@ -529,6 +589,31 @@ CREATE TABLE generation_runs (
     completed_at TIMESTAMP
 );
 
+-- ============================================================
+-- Job Queue (durable background work, see backend/job_queue.py)
+-- ============================================================
+
+CREATE TABLE jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER REFERENCES organization(id),
+    kind TEXT NOT NULL,
+    payload_json TEXT DEFAULT '{}',
+    dedupe_key TEXT,
+    status TEXT NOT NULL DEFAULT 'queued' CHECK (status IN ('queued', 'running', 'succeeded', 'failed', 'cancelled')),
+    attempts INTEGER DEFAULT 0,
+    max_attempts INTEGER DEFAULT 3,
+    run_after TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    lease_token TEXT,
+    locked_by TEXT,
+    heartbeat_at TIMESTAMP,
+    cancel_requested INTEGER DEFAULT 0,
+    result_json TEXT,
+    error_message TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP
+);
+
 -- ============================================================
 -- RAG: Organization Knowledge Base
 -- ============================================================
@@ -543,19 +628,126 @@ CREATE TABLE org_documents (
     upload_source TEXT DEFAULT 'manual' CHECK (upload_source IN ('manual', 'step1_upload', 'step2_upload', 'url_fetch', 'api_ingest')),
     step_number INTEGER,
     metadata_json TEXT,
+    content_hash TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
 CREATE TABLE document_chunks (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER REFERENCES organization(id),
     document_id INTEGER NOT NULL REFERENCES org_documents(id) ON DELETE CASCADE,
     chunk_index INTEGER NOT NULL,
     chunk_text TEXT NOT NULL,
     embedding_json TEXT,
+    embedding_provider TEXT,
     token_count INTEGER,
+    char_start INTEGER,
+    char_end INTEGER,
+    page_number INTEGER,
+    section TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Fitted local embedding models (backend/embeddings.py), one row per (re)fit
+CREATE TABLE embedding_models (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER NOT NULL REFERENCES organization(id),
+    provider TEXT NOT NULL,
+    dimensions INTEGER NOT NULL,
+    chunk_count INTEGER NOT NULL,
+    model_data BLOB NOT NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Shared web search / fetched page caches (backend/web_search.py)
+CREATE TABLE web_search_cache (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    query_hash TEXT NOT NULL UNIQUE,
+    query TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    results_json TEXT NOT NULL,
+    fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    expires_at TIMESTAMP NOT NULL
+);
+
+CREATE TABLE web_page_cache (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL UNIQUE,
+    etag TEXT,
+    last_modified TEXT,
+    content_hash TEXT NOT NULL,
+    body TEXT NOT NULL,
+    fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Per-source progress of POST /api/step1/refresh-all runs
+CREATE TABLE source_refresh_runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER REFERENCES organization(id),
+    status TEXT NOT NULL DEFAULT 'running' CHECK (status IN ('running', 'completed')),
+    sources_json TEXT DEFAULT '{}',
+    started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    completed_at TIMESTAMP
+);
+CREATE INDEX idx_source_refresh_runs_org ON source_refresh_runs(org_id, id);
+
+-- Local Jira issue store, synced incrementally by backend/jira_sync.py
+CREATE TABLE jira_issues (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER NOT NULL REFERENCES organization(id),
+    issue_key TEXT NOT NULL,
+    project_key TEXT,
+    issue_type TEXT,
+    summary TEXT,
+    status TEXT,
+    status_category TEXT,
+    created_at TIMESTAMP,
+    updated_at TIMESTAMP,
+    resolved_at TIMESTAMP,
+    cycle_hours REAL,
+    UNIQUE (org_id, issue_key)
+);
+CREATE INDEX idx_jira_issues_project ON jira_issues(org_id, project_key);
+
+CREATE TABLE jira_issue_transitions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER NOT NULL REFERENCES organization(id),
+    issue_key TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    from_status TEXT,
+    to_status TEXT,
+    transitioned_at TIMESTAMP,
+    hours_in_status REAL
+);
+CREATE INDEX idx_jira_issue_transitions_issue ON jira_issue_transitions(org_id, issue_key);
+
+CREATE TABLE jira_sync_state (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER NOT NULL REFERENCES organization(id),
+    scope TEXT NOT NULL,
+    last_updated TEXT,
+    last_synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (org_id, scope)
+);
+
+-- BM25 keyword index over chunk text, kept in sync by triggers (see rag_engine.keyword_search)
+CREATE VIRTUAL TABLE document_chunks_fts USING fts5(
+    chunk_text, content='document_chunks', content_rowid='id', tokenize='porter unicode61'
+);
+
+CREATE TRIGGER document_chunks_fts_insert AFTER INSERT ON document_chunks BEGIN
+    INSERT INTO document_chunks_fts(rowid, chunk_text) VALUES (new.id, new.chunk_text);
+END;
+
+CREATE TRIGGER document_chunks_fts_delete AFTER DELETE ON document_chunks BEGIN
+    INSERT INTO document_chunks_fts(document_chunks_fts, rowid, chunk_text) VALUES ('delete', old.id, old.chunk_text);
+END;
+
+CREATE TRIGGER document_chunks_fts_update AFTER UPDATE OF chunk_text ON document_chunks BEGIN
+    INSERT INTO document_chunks_fts(document_chunks_fts, rowid, chunk_text) VALUES ('delete', old.id, old.chunk_text);
+    INSERT INTO document_chunks_fts(rowid, chunk_text) VALUES (new.id, new.chunk_text);
+END;
+
 -- ============================================================
 -- V2.0 Enhancement Tables
 -- ============================================================
@@ -589,6 +781,7 @@ CREATE TABLE digital_maturity (
 -- Enhancement #4: Regulatory Impact Assessment
 CREATE TABLE regulatory_impacts (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER REFERENCES organization(id),
     strategy_id INTEGER REFERENCES strategies(id),
     regulation TEXT NOT NULL,
     impact_level TEXT DEFAULT 'medium' CHECK (impact_level IN ('high', 'medium', 'low')),
@@ -602,6 +795,7 @@ CREATE TABLE regulatory_impacts (
 -- Enhancement #6: Pilot/MVP Scoping
 CREATE TABLE pilot_scopes (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER REFERENCES organization(id),
     initiative_id INTEGER NOT NULL REFERENCES initiatives(id),
     mvp_description TEXT,
     success_criteria TEXT,
@@ -617,6 +811,7 @@ CREATE TABLE pilot_scopes (
 -- Enhancement #10: Change Management Plans
 CREATE TABLE change_plans (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER REFERENCES organization(id),
     initiative_id INTEGER NOT NULL REFERENCES initiatives(id),
     stakeholder_group TEXT NOT NULL,
     impact_level TEXT DEFAULT 'medium' CHECK (impact_level IN ('high', 'medium', 'low')),
@@ -633,6 +828,7 @@ CREATE TABLE change_plans (
 -- Enhancement #13: Tech Architecture Recommendations
 CREATE TABLE tech_recommendations (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER REFERENCES organization(id),
     initiative_id INTEGER NOT NULL REFERENCES initiatives(id),
     component TEXT NOT NULL,
     recommendation TEXT DEFAULT 'build' CHECK (recommendation IN ('build', 'buy', 'partner')),
@@ -660,6 +856,7 @@ CREATE TABLE customer_personas (
 
 CREATE TABLE customer_journeys (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER REFERENCES organization(id),
     persona_id INTEGER NOT NULL REFERENCES customer_personas(id),
     stage TEXT NOT NULL,
     touchpoint TEXT,
@@ -745,6 +942,7 @@ CREATE TABLE risk_registry (
 -- Enhancement #17: AI Feedback Loop
 CREATE TABLE ai_feedback (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER REFERENCES organization(id),
     entity_type TEXT NOT NULL,
     entity_id INTEGER NOT NULL,
     original_text TEXT,
@@ -756,6 +954,7 @@ CREATE TABLE ai_feedback (
 -- Enhancement #20: Collaboration Comments
 CREATE TABLE comments (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER REFERENCES organization(id),
     entity_type TEXT NOT NULL,
     entity_id INTEGER NOT NULL,
     user_name TEXT,
@@ -785,9 +984,20 @@ CREATE TABLE competitive_alerts (
     source_url TEXT,
     severity TEXT DEFAULT 'info' CHECK (severity IN ('critical', 'warning', 'info')),
     is_read INTEGER DEFAULT 0,
+    content_hash TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Newest article seen per competitor ticker (unix seconds), for incremental news refresh
+CREATE TABLE competitor_news_sync (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER NOT NULL REFERENCES organization(id),
+    ticker TEXT NOT NULL,
+    last_seen_ts INTEGER,
+    synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (org_id, ticker)
+);
+
 -- Enhancement #23: Benchmarking Data
 CREATE TABLE benchmarks (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -808,6 +1018,8 @@ CREATE TABLE benchmarks (
 
 CREATE INDEX idx_org_documents_org ON org_documents(org_id);
 CREATE INDEX idx_document_chunks_doc ON document_chunks(document_id);
+CREATE INDEX idx_document_chunks_provider ON document_chunks(org_id, embedding_provider);
+CREATE INDEX idx_embedding_models_org ON embedding_models(org_id, provider, id);
 CREATE INDEX idx_value_stream_steps_vs ON value_stream_steps(value_stream_id, step_order);
 CREATE INDEX idx_value_stream_benchmarks_vs ON value_stream_benchmarks(value_stream_id);
 CREATE INDEX idx_revenue_splits_period ON revenue_splits(period);
@@ -818,3 +1030,86 @@ CREATE INDEX idx_features_status ON features(status);
 CREATE INDEX idx_features_epic ON features(epic_id);
 CREATE INDEX idx_review_gates_step ON review_gates(step_number, gate_number);
 CREATE INDEX idx_users_email ON users(email);
+
+-- Foreign-key indexes for hot joins and cascade deletes
+CREATE INDEX idx_epics_initiative ON epics(initiative_id);
+CREATE INDEX idx_epic_dependencies_pair ON epic_dependencies(epic_id, depends_on_epic_id);
+CREATE INDEX idx_epic_dependencies_depends_on ON epic_dependencies(depends_on_epic_id);
+CREATE INDEX idx_feature_dependencies_depends_on ON feature_dependencies(depends_on_feature_id);
+CREATE INDEX idx_strategic_okrs_strategy ON strategic_okrs(strategy_id);
+CREATE INDEX idx_strategic_key_results_okr ON strategic_key_results(okr_id);
+CREATE INDEX idx_product_key_results_okr ON product_key_results(product_okr_id);
+CREATE INDEX idx_swot_entries_bu ON swot_entries(business_unit_id);
+CREATE INDEX idx_tows_actions_swot1 ON tows_actions(swot_entry_1_id);
+CREATE INDEX idx_tows_actions_swot2 ON tows_actions(swot_entry_2_id);
+CREATE INDEX idx_strategies_tows_action ON strategies(tows_action_id);
+CREATE INDEX idx_initiatives_strategy ON initiatives(strategy_id);
+CREATE INDEX idx_comments_entity ON comments(entity_type, entity_id);
+
+-- Job queue leasing and lookups
+CREATE INDEX idx_jobs_queue ON jobs(status, run_after);
+CREATE INDEX idx_jobs_org ON jobs(org_id, dedupe_key);
+CREATE INDEX idx_jobs_lease ON jobs(lease_token);
+
+-- Keyset pagination sort keys (expressions match the list endpoints' ORDER BY)
+CREATE INDEX idx_epics_org_priority ON epics(org_id, (COALESCE(priority_score, 0)) DESC, id);
+CREATE INDEX idx_features_org_priority ON features(org_id, (COALESCE(priority_score, 0)) DESC, id);
+CREATE INDEX idx_initiatives_org_rice ON initiatives(org_id, (COALESCE(rice_override, rice_score, 0)) DESC, id);
+CREATE INDEX idx_risk_registry_org_score ON risk_registry(org_id, (COALESCE(risk_score, 0)) DESC, id);
+CREATE INDEX idx_swot_entries_org_category ON swot_entries(org_id, category, id);
+CREATE INDEX idx_competitors_org_name ON competitors(org_id, name, id);
+CREATE INDEX idx_org_documents_org_id ON org_documents(org_id, id);
+CREATE INDEX idx_org_documents_hash ON org_documents(org_id, content_hash);
+CREATE INDEX idx_org_documents_filename ON org_documents(org_id, filename, doc_category);
+
+-- Tenant-partitioned composite indexes (org_id first)
+CREATE INDEX idx_business_units_org ON business_units(org_id, name);
+CREATE INDEX idx_revenue_splits_org ON revenue_splits(org_id, business_unit_id, period);
+CREATE INDEX idx_ops_efficiency_org ON ops_efficiency(org_id, business_unit_id);
+CREATE INDEX idx_competitors_org ON competitors(org_id, name);
+CREATE INDEX idx_value_streams_org ON value_streams(org_id, business_unit_id);
+CREATE INDEX idx_value_stream_levers_org ON value_stream_levers(org_id, value_stream_id);
+CREATE INDEX idx_value_stream_steps_org ON value_stream_steps(org_id, value_stream_id, step_order);
+CREATE INDEX idx_value_stream_metrics_org ON value_stream_metrics(org_id, value_stream_id);
+CREATE INDEX idx_value_stream_benchmarks_org ON value_stream_benchmarks(org_id, value_stream_id);
+CREATE INDEX idx_swot_entries_org ON swot_entries(org_id, category);
+CREATE INDEX idx_tows_actions_org ON tows_actions(org_id, strategy_type);
+CREATE INDEX idx_strategy_inputs_org ON strategy_inputs(org_id, input_type);
+CREATE INDEX idx_strategies_org ON strategies(org_id, layer);
+CREATE INDEX idx_strategic_okrs_org ON strategic_okrs(org_id, strategy_id);
+CREATE INDEX idx_strategic_key_results_org ON strategic_key_results(org_id, okr_id);
+CREATE INDEX idx_product_groups_org ON product_groups(org_id, name);
+CREATE INDEX idx_digital_products_org ON digital_products(org_id, product_group_id);
+CREATE INDEX idx_initiatives_org ON initiatives(org_id, status);
+CREATE INDEX idx_teams_org ON teams(org_id, name);
+CREATE INDEX idx_product_okrs_org ON product_okrs(org_id, strategic_okr_id);
+CREATE INDEX idx_product_key_results_org ON product_key_results(org_id, product_okr_id);
+CREATE INDEX idx_epics_org ON epics(org_id, initiative_id);
+CREATE INDEX idx_epic_dependencies_org ON epic_dependencies(org_id, epic_id);
+CREATE INDEX idx_delivery_okrs_org ON delivery_okrs(org_id, product_okr_id);
+CREATE INDEX idx_delivery_key_results_org ON delivery_key_results(org_id, delivery_okr_id);
+CREATE INDEX idx_features_org ON features(org_id, epic_id);
+CREATE INDEX idx_feature_dependencies_org ON feature_dependencies(org_id, feature_id);
+CREATE INDEX idx_review_gates_org ON review_gates(org_id, step_number, gate_number);
+CREATE INDEX idx_step1_data_urls_org ON step1_data_urls(org_id, url);
+CREATE INDEX idx_ai_analysis_cache_org ON ai_analysis_cache(org_id, analysis_type, input_hash);
+CREATE INDEX idx_ai_scenarios_org ON ai_scenarios(org_id, created_at);
+CREATE INDEX idx_nlq_history_org ON nlq_history(org_id, created_at);
+CREATE INDEX idx_document_chunks_org ON document_chunks(org_id, document_id);
+CREATE INDEX idx_regulatory_impacts_org ON regulatory_impacts(org_id, strategy_id);
+CREATE INDEX idx_pilot_scopes_org ON pilot_scopes(org_id, initiative_id);
+CREATE INDEX idx_change_plans_org ON change_plans(org_id, initiative_id);
+CREATE INDEX idx_tech_recommendations_org ON tech_recommendations(org_id, initiative_id);
+CREATE INDEX idx_customer_journeys_org ON customer_journeys(org_id, persona_id);
+CREATE INDEX idx_ai_feedback_org ON ai_feedback(org_id, entity_type, entity_id);
+CREATE INDEX idx_comments_org ON comments(org_id, entity_type, entity_id);
+CREATE INDEX idx_generation_runs_org ON generation_runs(org_id, started_at);
+CREATE INDEX idx_org_readiness_org ON org_readiness(org_id, dimension);
+CREATE INDEX idx_digital_maturity_org ON digital_maturity(org_id, dimension);
+CREATE INDEX idx_customer_personas_org ON customer_personas(org_id, name);
+CREATE INDEX idx_operating_model_org ON operating_model(org_id, dimension);
+CREATE INDEX idx_governance_model_org ON governance_model(org_id, decision_type);
+CREATE INDEX idx_risk_registry_org ON risk_registry(org_id, status);
+CREATE INDEX idx_pipeline_runs_org ON pipeline_runs(org_id, started_at);
+CREATE INDEX idx_competitive_alerts_org ON competitive_alerts(org_id, created_at);
+CREATE UNIQUE INDEX idx_competitive_alerts_hash ON competitive_alerts(org_id, content_hash);
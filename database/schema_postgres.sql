@@ -5,6 +5,23 @@
 --   Initiative -> Product -> Epic -> Feature
 -- ============================================================
 
+-- ============================================================
+-- Schema Versioning (see backend/migrations.py)
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Per-table write counters; response cache ETags are derived from them
+CREATE TABLE IF NOT EXISTS table_versions (
+    table_name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- ============================================================
 -- Users (Authentication)
 -- ============================================================
@@ -14,6 +31,7 @@ CREATE TABLE IF NOT EXISTS users (
     email TEXT UNIQUE NOT NULL,
     name TEXT NOT NULL,
     hashed_password TEXT NOT NULL,
+    org_id INTEGER,
     is_active BOOLEAN DEFAULT TRUE,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
@@ -47,13 +65,16 @@ CREATE TABLE IF NOT EXISTS organization (
 
 CREATE TABLE IF NOT EXISTS business_units (
     id SERIAL PRIMARY KEY,
-    name TEXT NOT NULL UNIQUE,
+    org_id INTEGER REFERENCES organization(id),
+    name TEXT NOT NULL,
     description TEXT,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (org_id, name)
 );
 
 CREATE TABLE IF NOT EXISTS revenue_splits (
     id SERIAL PRIMARY KEY,
+    org_id INTEGER REFERENCES organization(id),
     business_unit_id INTEGER NOT NULL REFERENCES business_units(id),
     dimension TEXT NOT NULL CHECK (dimension IN ('product', 'region', 'segment')),
     dimension_value TEXT NOT NULL,
@@ -64,6 +85,7 @@ CREATE TABLE IF NOT EXISTS revenue_splits (
 
 CREATE TABLE IF NOT EXISTS ops_efficiency (
     id SERIAL PRIMARY KEY,
+    org_id INTEGER REFERENCES organization(id),
     business_unit_id INTEGER NOT NULL REFERENCES business_units(id),
     metric_name TEXT NOT NULL,
     metric_value DOUBLE PRECISION NOT NULL,
@@ -74,6 +96,7 @@ CREATE TABLE IF NOT EXISTS ops_efficiency (
 
 CREATE TABLE IF NOT EXISTS competitors (
     id SERIAL PRIMARY KEY,
+    org_id INTEGER REFERENCES organization(id),
     name TEXT NOT NULL,
     ticker TEXT,
     market_share DOUBLE PRECISION,
@@ -97,6 +120,7 @@ CREATE TABLE IF NOT EXISTS competitors (
 
 CREATE TABLE IF NOT EXISTS value_streams (
     id SERIAL PRIMARY KEY,
+    org_id INTEGER REFERENCES organization(id),
     business_unit_id INTEGER NOT NULL REFERENCES business_units(id),
     name TEXT NOT NULL,
     description TEXT,
@@ -105,6 +129,7 @@ CREATE TABLE IF NOT EXISTS value_streams (
 
 CREATE TABLE IF NOT EXISTS value_stream_levers (
     id SERIAL PRIMARY KEY,
+    org_id INTEGER REFERENCES organization(id),
     value_stream_id INTEGER NOT NULL REFERENCES value_streams(id),
     lever_type TEXT NOT NULL CHECK (lever_type IN ('growth', 'efficiency', 'experience', 'effectiveness')),
     opportunity TEXT NOT NULL,
@@ -116,6 +141,7 @@ CREATE TABLE IF NOT EXISTS value_stream_levers (
 
 CREATE TABLE IF NOT EXISTS value_stream_steps (
     id SERIAL PRIMARY KEY,
+    org_id INTEGER REFERENCES organization(id),
     value_stream_id INTEGER NOT NULL REFERENCES value_streams(id),
     step_order INTEGER NOT NULL,
     step_name TEXT NOT NULL,
@@ -132,6 +158,7 @@ CREATE TABLE IF NOT EXISTS value_stream_steps (
 
 CREATE TABLE IF NOT EXISTS value_stream_metrics (
     id SERIAL PRIMARY KEY,
+    org_id INTEGER REFERENCES organization(id),
     value_stream_id INTEGER NOT NULL UNIQUE REFERENCES value_streams(id),
     total_lead_time_hours DOUBLE PRECISION DEFAULT 0,
     total_process_time_hours DOUBLE PRECISION DEFAULT 0,
@@ -145,6 +172,7 @@ CREATE TABLE IF NOT EXISTS value_stream_metrics (
 
 CREATE TABLE IF NOT EXISTS value_stream_benchmarks (
     id SERIAL PRIMARY KEY,
+    org_id INTEGER REFERENCES organization(id),
     value_stream_id INTEGER NOT NULL REFERENCES value_streams(id),
     competitor_name TEXT NOT NULL,
     total_lead_time_hours DOUBLE PRECISION,
@@ -161,6 +189,7 @@ CREATE TABLE IF NOT EXISTS value_stream_benchmarks (
 
 CREATE TABLE IF NOT EXISTS swot_entries (
     id SERIAL PRIMARY KEY,
+    org_id INTEGER REFERENCES organization(id),
     business_unit_id INTEGER NOT NULL REFERENCES business_units(id),
     category TEXT NOT NULL CHECK (category IN ('strength', 'weakness', 'opportunity', 'threat')),
     description TEXT NOT NULL,
@@ -173,6 +202,7 @@ CREATE TABLE IF NOT EXISTS swot_entries (
 
 CREATE TABLE IF NOT EXISTS tows_actions (
     id SERIAL PRIMARY KEY,
+    org_id INTEGER REFERENCES organization(id),
     strategy_type TEXT NOT NULL CHECK (strategy_type IN ('SO', 'WO', 'ST', 'WT')),
     swot_entry_1_id INTEGER NOT NULL REFERENCES swot_entries(id),
     swot_entry_2_id INTEGER NOT NULL REFERENCES swot_entries(id),
@@ -190,6 +220,7 @@ CREATE TABLE IF NOT EXISTS tows_actions (
 
 CREATE TABLE IF NOT EXISTS strategy_inputs (
     id SERIAL PRIMARY KEY,
+    org_id INTEGER REFERENCES organization(id),
     input_type TEXT NOT NULL CHECK (input_type IN (
         'business_strategy', 'digital_strategy', 'data_strategy', 'gen_ai_strategy',
         'competitor_strategy', 'ongoing_initiatives', 'document_reference'
@@ -202,6 +233,7 @@ CREATE TABLE IF NOT EXISTS strategy_inputs (
 
 CREATE TABLE IF NOT EXISTS strategies (
     id SERIAL PRIMARY KEY,
+    org_id INTEGER REFERENCES organization(id),
     layer TEXT NOT NULL CHECK (layer IN ('business', 'digital', 'data', 'gen_ai')),
     name TEXT NOT NULL,
     description TEXT,
@@ -216,6 +248,7 @@ CREATE TABLE IF NOT EXISTS strategies (
 
 CREATE TABLE IF NOT EXISTS strategic_okrs (
     id SERIAL PRIMARY KEY,
+    org_id INTEGER REFERENCES organization(id),
     strategy_id INTEGER NOT NULL REFERENCES strategies(id),
     objective TEXT NOT NULL,
     time_horizon TEXT,
@@ -227,6 +260,7 @@ CREATE TABLE IF NOT EXISTS strategic_okrs (
 
 CREATE TABLE IF NOT EXISTS strategic_key_results (
     id SERIAL PRIMARY KEY,
+    org_id INTEGER REFERENCES organization(id),
     okr_id INTEGER NOT NULL REFERENCES strategic_okrs(id),
     key_result TEXT NOT NULL,
     metric TEXT,
@@ -248,6 +282,7 @@ CREATE TABLE IF NOT EXISTS strategic_key_results (
 
 CREATE TABLE IF NOT EXISTS product_groups (
     id SERIAL PRIMARY KEY,
+    org_id INTEGER REFERENCES organization(id),
     name TEXT NOT NULL,
     description TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
@@ -255,6 +290,7 @@ CREATE TABLE IF NOT EXISTS product_groups (
 
 CREATE TABLE IF NOT EXISTS digital_products (
     id SERIAL PRIMARY KEY,
+    org_id INTEGER REFERENCES organization(id),
     product_group_id INTEGER NOT NULL REFERENCES product_groups(id),
     name TEXT NOT NULL,
     description TEXT,
@@ -263,6 +299,7 @@ CREATE TABLE IF NOT EXISTS digital_products (
 
 CREATE TABLE IF NOT EXISTS initiatives (
     id SERIAL PRIMARY KEY,
+    org_id INTEGER REFERENCES organization(id),
     digital_product_id INTEGER NOT NULL REFERENCES digital_products(id),
     strategy_id INTEGER REFERENCES strategies(id),
     name TEXT NOT NULL,
@@ -311,13 +348,16 @@ CREATE TABLE IF NOT EXISTS initiatives (
 
 CREATE TABLE IF NOT EXISTS teams (
     id SERIAL PRIMARY KEY,
-    name TEXT NOT NULL UNIQUE,
+    org_id INTEGER REFERENCES organization(id),
+    name TEXT NOT NULL,
     capacity INTEGER,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (org_id, name)
 );
 
 CREATE TABLE IF NOT EXISTS product_okrs (
     id SERIAL PRIMARY KEY,
+    org_id INTEGER REFERENCES organization(id),
     strategic_okr_id INTEGER NOT NULL REFERENCES strategic_okrs(id),
     digital_product_id INTEGER NOT NULL REFERENCES digital_products(id),
     objective TEXT NOT NULL,
@@ -329,6 +369,7 @@ CREATE TABLE IF NOT EXISTS product_okrs (
 
 CREATE TABLE IF NOT EXISTS product_key_results (
     id SERIAL PRIMARY KEY,
+    org_id INTEGER REFERENCES organization(id),
     product_okr_id INTEGER NOT NULL REFERENCES product_okrs(id),
     key_result TEXT NOT NULL,
     metric TEXT,
@@ -342,6 +383,7 @@ CREATE TABLE IF NOT EXISTS product_key_results (
 
 CREATE TABLE IF NOT EXISTS epics (
     id SERIAL PRIMARY KEY,
+    org_id INTEGER REFERENCES organization(id),
     initiative_id INTEGER NOT NULL REFERENCES initiatives(id),
     team_id INTEGER REFERENCES teams(id),
     product_okr_id INTEGER REFERENCES product_okrs(id),
@@ -370,6 +412,7 @@ CREATE TABLE IF NOT EXISTS epics (
 
 CREATE TABLE IF NOT EXISTS epic_dependencies (
     id SERIAL PRIMARY KEY,
+    org_id INTEGER REFERENCES organization(id),
     epic_id INTEGER NOT NULL REFERENCES epics(id),
     depends_on_epic_id INTEGER NOT NULL REFERENCES epics(id),
     dependency_type TEXT DEFAULT 'blocks' CHECK (dependency_type IN ('blocks', 'relates_to')),
@@ -383,6 +426,7 @@ CREATE TABLE IF NOT EXISTS epic_dependencies (
 
 CREATE TABLE IF NOT EXISTS delivery_okrs (
     id SERIAL PRIMARY KEY,
+    org_id INTEGER REFERENCES organization(id),
     product_okr_id INTEGER NOT NULL REFERENCES product_okrs(id),
     team_id INTEGER NOT NULL REFERENCES teams(id),
     objective TEXT NOT NULL,
@@ -394,6 +438,7 @@ CREATE TABLE IF NOT EXISTS delivery_okrs (
 
 CREATE TABLE IF NOT EXISTS delivery_key_results (
     id SERIAL PRIMARY KEY,
+    org_id INTEGER REFERENCES organization(id),
     delivery_okr_id INTEGER NOT NULL REFERENCES delivery_okrs(id),
     key_result TEXT NOT NULL,
     metric TEXT,
@@ -407,6 +452,7 @@ CREATE TABLE IF NOT EXISTS delivery_key_results (
 
 CREATE TABLE IF NOT EXISTS features (
     id SERIAL PRIMARY KEY,
+    org_id INTEGER REFERENCES organization(id),
     epic_id INTEGER NOT NULL REFERENCES epics(id),
     delivery_okr_id INTEGER REFERENCES delivery_okrs(id),
     name TEXT NOT NULL,
@@ -441,6 +487,7 @@ CREATE TABLE IF NOT EXISTS features (
 
 CREATE TABLE IF NOT EXISTS review_gates (
     id SERIAL PRIMARY KEY,
+    org_id INTEGER REFERENCES organization(id),
     step_number INTEGER NOT NULL CHECK (step_number BETWEEN 1 AND 7),
     gate_number INTEGER NOT NULL,
     gate_name TEXT NOT NULL,
@@ -457,6 +504,7 @@ CREATE TABLE IF NOT EXISTS review_gates (
 
 CREATE TABLE IF NOT EXISTS step1_data_urls (
     id SERIAL PRIMARY KEY,
+    org_id INTEGER REFERENCES organization(id),
     url TEXT NOT NULL,
     label TEXT,
     url_type TEXT DEFAULT 'external',
@@ -464,6 +512,11 @@ CREATE TABLE IF NOT EXISTS step1_data_urls (
     last_result_json TEXT,
     status TEXT DEFAULT 'pending',
     error_message TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    content_hash TEXT,
+    fetch_ms INTEGER,
+    extract_ms INTEGER,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
@@ -473,6 +526,7 @@ CREATE TABLE IF NOT EXISTS step1_data_urls (
 
 CREATE TABLE IF NOT EXISTS ai_analysis_cache (
     id SERIAL PRIMARY KEY,
+    org_id INTEGER REFERENCES organization(id),
     analysis_type TEXT NOT NULL,
     input_hash TEXT NOT NULL,
     result_json TEXT NOT NULL,
@@ -483,6 +537,7 @@ CREATE TABLE IF NOT EXISTS ai_analysis_cache (
 
 CREATE TABLE IF NOT EXISTS ai_scenarios (
     id SERIAL PRIMARY KEY,
+    org_id INTEGER REFERENCES organization(id),
     scenario_name TEXT NOT NULL,
     scenario_type TEXT NOT NULL CHECK (scenario_type IN ('revenue_change', 'market_entry', 'cost_change', 'custom')),
     parameters_json TEXT NOT NULL,
@@ -492,14 +547,19 @@ CREATE TABLE IF NOT EXISTS ai_scenarios (
 
 CREATE TABLE IF NOT EXISTS nlq_history (
     id SERIAL PRIMARY KEY,
+    org_id INTEGER REFERENCES organization(id),
     question TEXT NOT NULL,
     answer_json TEXT NOT NULL,
     data_tables_queried TEXT,
+    question_embedding_json TEXT,
+    data_version TEXT,
+    hit_count INTEGER DEFAULT 0,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
 CREATE TABLE IF NOT EXISTS feature_dependencies (
     id SERIAL PRIMARY KEY,
+    org_id INTEGER REFERENCES organization(id),
     feature_id INTEGER NOT NULL REFERENCES features(id),
     depends_on_feature_id INTEGER NOT NULL REFERENCES features(id),
     dependency_type TEXT DEFAULT 'blocks' CHECK (dependency_type IN ('blocks', 'relates_to')),
@@ -524,6 +584,31 @@ CREATE TABLE IF NOT EXISTS generation_runs (
     completed_at TIMESTAMP
 );
 
+-- ============================================================
+-- Job Queue (durable background work, see backend/job_queue.py)
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS jobs (
+    id SERIAL PRIMARY KEY,
+    org_id INTEGER REFERENCES organization(id),
+    kind TEXT NOT NULL,
+    payload_json TEXT DEFAULT '{}',
+    dedupe_key TEXT,
+    status TEXT NOT NULL DEFAULT 'queued' CHECK (status IN ('queued', 'running', 'succeeded', 'failed', 'cancelled')),
+    attempts INTEGER DEFAULT 0,
+    max_attempts INTEGER DEFAULT 3,
+    run_after TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    lease_token TEXT,
+    locked_by TEXT,
+    heartbeat_at TIMESTAMP,
+    cancel_requested INTEGER DEFAULT 0,
+    result_json TEXT,
+    error_message TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP
+);
+
 -- ============================================================
 -- RAG: Organization Knowledge Base
 -- ============================================================
@@ -538,19 +623,109 @@ CREATE TABLE IF NOT EXISTS org_documents (
     upload_source TEXT DEFAULT 'manual' CHECK (upload_source IN ('manual', 'step1_upload', 'step2_upload', 'url_fetch', 'api_ingest')),
     step_number INTEGER,
     metadata_json TEXT,
+    content_hash TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
 CREATE TABLE IF NOT EXISTS document_chunks (
     id SERIAL PRIMARY KEY,
+    org_id INTEGER REFERENCES organization(id),
     document_id INTEGER NOT NULL REFERENCES org_documents(id) ON DELETE CASCADE,
     chunk_index INTEGER NOT NULL,
     chunk_text TEXT NOT NULL,
     embedding_json TEXT,
+    embedding_provider TEXT,
     token_count INTEGER,
+    char_start INTEGER,
+    char_end INTEGER,
+    page_number INTEGER,
+    section TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    search_vector tsvector GENERATED ALWAYS AS (to_tsvector('english', chunk_text)) STORED
+);
+
+-- Fitted local embedding models (backend/embeddings.py), one row per (re)fit
+CREATE TABLE IF NOT EXISTS embedding_models (
+    id SERIAL PRIMARY KEY,
+    org_id INTEGER NOT NULL REFERENCES organization(id),
+    provider TEXT NOT NULL,
+    dimensions INTEGER NOT NULL,
+    chunk_count INTEGER NOT NULL,
+    model_data BYTEA NOT NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Shared web search / fetched page caches (backend/web_search.py)
+CREATE TABLE IF NOT EXISTS web_search_cache (
+    id SERIAL PRIMARY KEY,
+    query_hash TEXT NOT NULL UNIQUE,
+    query TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    results_json TEXT NOT NULL,
+    fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    expires_at TIMESTAMP NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS web_page_cache (
+    id SERIAL PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    etag TEXT,
+    last_modified TEXT,
+    content_hash TEXT NOT NULL,
+    body TEXT NOT NULL,
+    fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Per-source progress of POST /api/step1/refresh-all runs
+CREATE TABLE IF NOT EXISTS source_refresh_runs (
+    id SERIAL PRIMARY KEY,
+    org_id INTEGER REFERENCES organization(id),
+    status TEXT NOT NULL DEFAULT 'running' CHECK (status IN ('running', 'completed')),
+    sources_json TEXT DEFAULT '{}',
+    started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    completed_at TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_source_refresh_runs_org ON source_refresh_runs(org_id, id);
+
+-- Local Jira issue store, synced incrementally by backend/jira_sync.py
+CREATE TABLE IF NOT EXISTS jira_issues (
+    id SERIAL PRIMARY KEY,
+    org_id INTEGER NOT NULL REFERENCES organization(id),
+    issue_key TEXT NOT NULL,
+    project_key TEXT,
+    issue_type TEXT,
+    summary TEXT,
+    status TEXT,
+    status_category TEXT,
+    created_at TIMESTAMP,
+    updated_at TIMESTAMP,
+    resolved_at TIMESTAMP,
+    cycle_hours DOUBLE PRECISION,
+    UNIQUE (org_id, issue_key)
+);
+CREATE INDEX IF NOT EXISTS idx_jira_issues_project ON jira_issues(org_id, project_key);
+
+CREATE TABLE IF NOT EXISTS jira_issue_transitions (
+    id SERIAL PRIMARY KEY,
+    org_id INTEGER NOT NULL REFERENCES organization(id),
+    issue_key TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    from_status TEXT,
+    to_status TEXT,
+    transitioned_at TIMESTAMP,
+    hours_in_status DOUBLE PRECISION
+);
+CREATE INDEX IF NOT EXISTS idx_jira_issue_transitions_issue ON jira_issue_transitions(org_id, issue_key);
+
+CREATE TABLE IF NOT EXISTS jira_sync_state (
+    id SERIAL PRIMARY KEY,
+    org_id INTEGER NOT NULL REFERENCES organization(id),
+    scope TEXT NOT NULL,
+    last_updated TEXT,
+    last_synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (org_id, scope)
+);
+
 -- ============================================================
 -- V2.0 Enhancement Tables
 -- ============================================================
@@ -584,6 +759,7 @@ CREATE TABLE IF NOT EXISTS digital_maturity (
 -- Enhancement #4: Regulatory Impact Assessment
 CREATE TABLE IF NOT EXISTS regulatory_impacts (
     id SERIAL PRIMARY KEY,
+    org_id INTEGER REFERENCES organization(id),
     strategy_id INTEGER REFERENCES strategies(id),
     regulation TEXT NOT NULL,
     impact_level TEXT DEFAULT 'medium' CHECK (impact_level IN ('high', 'medium', 'low')),
@@ -597,6 +773,7 @@ CREATE TABLE IF NOT EXISTS regulatory_impacts (
 -- Enhancement #6: Pilot/MVP Scoping
 CREATE TABLE IF NOT EXISTS pilot_scopes (
     id SERIAL PRIMARY KEY,
+    org_id INTEGER REFERENCES organization(id),
     initiative_id INTEGER NOT NULL REFERENCES initiatives(id),
     mvp_description TEXT,
     success_criteria TEXT,
@@ -612,6 +789,7 @@ CREATE TABLE IF NOT EXISTS pilot_scopes (
 -- Enhancement #10: Change Management Plans
 CREATE TABLE IF NOT EXISTS change_plans (
     id SERIAL PRIMARY KEY,
+    org_id INTEGER REFERENCES organization(id),
     initiative_id INTEGER NOT NULL REFERENCES initiatives(id),
     stakeholder_group TEXT NOT NULL,
     impact_level TEXT DEFAULT 'medium' CHECK (impact_level IN ('high', 'medium', 'low')),
@@ -628,6 +806,7 @@ CREATE TABLE IF NOT EXISTS change_plans (
 -- Enhancement #13: Tech Architecture Recommendations
 CREATE TABLE IF NOT EXISTS tech_recommendations (
     id SERIAL PRIMARY KEY,
+    org_id INTEGER REFERENCES organization(id),
     initiative_id INTEGER NOT NULL REFERENCES initiatives(id),
     component TEXT NOT NULL,
     recommendation TEXT DEFAULT 'build' CHECK (recommendation IN ('build', 'buy', 'partner')),
@@ -655,6 +834,7 @@ CREATE TABLE IF NOT EXISTS customer_personas (
 
 CREATE TABLE IF NOT EXISTS customer_journeys (
     id SERIAL PRIMARY KEY,
+    org_id INTEGER REFERENCES organization(id),
     persona_id INTEGER NOT NULL REFERENCES customer_personas(id),
     stage TEXT NOT NULL,
     touchpoint TEXT,
@@ -740,6 +920,7 @@ CREATE TABLE IF NOT EXISTS risk_registry (
 -- Enhancement #17: AI Feedback Loop
 CREATE TABLE IF NOT EXISTS ai_feedback (
     id SERIAL PRIMARY KEY,
+    org_id INTEGER REFERENCES organization(id),
     entity_type TEXT NOT NULL,
     entity_id INTEGER NOT NULL,
     original_text TEXT,
@@ -751,6 +932,7 @@ CREATE TABLE IF NOT EXISTS ai_feedback (
 -- Enhancement #20: Collaboration Comments
 CREATE TABLE IF NOT EXISTS comments (
     id SERIAL PRIMARY KEY,
+    org_id INTEGER REFERENCES organization(id),
     entity_type TEXT NOT NULL,
     entity_id INTEGER NOT NULL,
     user_name TEXT,
@@ -780,9 +962,20 @@ CREATE TABLE IF NOT EXISTS competitive_alerts (
     source_url TEXT,
     severity TEXT DEFAULT 'info' CHECK (severity IN ('critical', 'warning', 'info')),
     is_read INTEGER DEFAULT 0,
+    content_hash TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Newest article seen per competitor ticker (unix seconds), for incremental news refresh
+CREATE TABLE IF NOT EXISTS competitor_news_sync (
+    id SERIAL PRIMARY KEY,
+    org_id INTEGER NOT NULL REFERENCES organization(id),
+    ticker TEXT NOT NULL,
+    last_seen_ts BIGINT,
+    synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (org_id, ticker)
+);
+
 -- Enhancement #23: Benchmarking Data
 CREATE TABLE IF NOT EXISTS benchmarks (
     id SERIAL PRIMARY KEY,
@@ -803,6 +996,9 @@ CREATE TABLE IF NOT EXISTS benchmarks (
 
 CREATE INDEX IF NOT EXISTS idx_org_documents_org ON org_documents(org_id);
 CREATE INDEX IF NOT EXISTS idx_document_chunks_doc ON document_chunks(document_id);
+CREATE INDEX IF NOT EXISTS idx_document_chunks_search ON document_chunks USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS idx_document_chunks_provider ON document_chunks(org_id, embedding_provider);
+CREATE INDEX IF NOT EXISTS idx_embedding_models_org ON embedding_models(org_id, provider, id);
 CREATE INDEX IF NOT EXISTS idx_value_stream_steps_vs ON value_stream_steps(value_stream_id, step_order);
 CREATE INDEX IF NOT EXISTS idx_value_stream_benchmarks_vs ON value_stream_benchmarks(value_stream_id);
 CREATE INDEX IF NOT EXISTS idx_revenue_splits_period ON revenue_splits(period);
@@ -813,3 +1009,86 @@ CREATE INDEX IF NOT EXISTS idx_features_status ON features(status);
 CREATE INDEX IF NOT EXISTS idx_features_epic ON features(epic_id);
 CREATE INDEX IF NOT EXISTS idx_review_gates_step ON review_gates(step_number, gate_number);
 CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
+
+-- Foreign-key indexes for hot joins and cascade deletes
+CREATE INDEX IF NOT EXISTS idx_epics_initiative ON epics(initiative_id);
+CREATE INDEX IF NOT EXISTS idx_epic_dependencies_pair ON epic_dependencies(epic_id, depends_on_epic_id);
+CREATE INDEX IF NOT EXISTS idx_epic_dependencies_depends_on ON epic_dependencies(depends_on_epic_id);
+CREATE INDEX IF NOT EXISTS idx_feature_dependencies_depends_on ON feature_dependencies(depends_on_feature_id);
+CREATE INDEX IF NOT EXISTS idx_strategic_okrs_strategy ON strategic_okrs(strategy_id);
+CREATE INDEX IF NOT EXISTS idx_strategic_key_results_okr ON strategic_key_results(okr_id);
+CREATE INDEX IF NOT EXISTS idx_product_key_results_okr ON product_key_results(product_okr_id);
+CREATE INDEX IF NOT EXISTS idx_swot_entries_bu ON swot_entries(business_unit_id);
+CREATE INDEX IF NOT EXISTS idx_tows_actions_swot1 ON tows_actions(swot_entry_1_id);
+CREATE INDEX IF NOT EXISTS idx_tows_actions_swot2 ON tows_actions(swot_entry_2_id);
+CREATE INDEX IF NOT EXISTS idx_strategies_tows_action ON strategies(tows_action_id);
+CREATE INDEX IF NOT EXISTS idx_initiatives_strategy ON initiatives(strategy_id);
+CREATE INDEX IF NOT EXISTS idx_comments_entity ON comments(entity_type, entity_id);
+
+-- Job queue leasing and lookups
+CREATE INDEX IF NOT EXISTS idx_jobs_queue ON jobs(status, run_after);
+CREATE INDEX IF NOT EXISTS idx_jobs_org ON jobs(org_id, dedupe_key);
+CREATE INDEX IF NOT EXISTS idx_jobs_lease ON jobs(lease_token);
+
+-- Keyset pagination sort keys (expressions match the list endpoints' ORDER BY)
+CREATE INDEX IF NOT EXISTS idx_epics_org_priority ON epics(org_id, (COALESCE(priority_score, 0)) DESC, id);
+CREATE INDEX IF NOT EXISTS idx_features_org_priority ON features(org_id, (COALESCE(priority_score, 0)) DESC, id);
+CREATE INDEX IF NOT EXISTS idx_initiatives_org_rice ON initiatives(org_id, (COALESCE(rice_override, rice_score, 0)) DESC, id);
+CREATE INDEX IF NOT EXISTS idx_risk_registry_org_score ON risk_registry(org_id, (COALESCE(risk_score, 0)) DESC, id);
+CREATE INDEX IF NOT EXISTS idx_swot_entries_org_category ON swot_entries(org_id, category, id);
+CREATE INDEX IF NOT EXISTS idx_competitors_org_name ON competitors(org_id, name, id);
+CREATE INDEX IF NOT EXISTS idx_org_documents_org_id ON org_documents(org_id, id);
+CREATE INDEX IF NOT EXISTS idx_org_documents_hash ON org_documents(org_id, content_hash);
+CREATE INDEX IF NOT EXISTS idx_org_documents_filename ON org_documents(org_id, filename, doc_category);
+
+-- Tenant-partitioned composite indexes (org_id first)
+CREATE INDEX IF NOT EXISTS idx_business_units_org ON business_units(org_id, name);
+CREATE INDEX IF NOT EXISTS idx_revenue_splits_org ON revenue_splits(org_id, business_unit_id, period);
+CREATE INDEX IF NOT EXISTS idx_ops_efficiency_org ON ops_efficiency(org_id, business_unit_id);
+CREATE INDEX IF NOT EXISTS idx_competitors_org ON competitors(org_id, name);
+CREATE INDEX IF NOT EXISTS idx_value_streams_org ON value_streams(org_id, business_unit_id);
+CREATE INDEX IF NOT EXISTS idx_value_stream_levers_org ON value_stream_levers(org_id, value_stream_id);
+CREATE INDEX IF NOT EXISTS idx_value_stream_steps_org ON value_stream_steps(org_id, value_stream_id, step_order);
+CREATE INDEX IF NOT EXISTS idx_value_stream_metrics_org ON value_stream_metrics(org_id, value_stream_id);
+CREATE INDEX IF NOT EXISTS idx_value_stream_benchmarks_org ON value_stream_benchmarks(org_id, value_stream_id);
+CREATE INDEX IF NOT EXISTS idx_swot_entries_org ON swot_entries(org_id, category);
+CREATE INDEX IF NOT EXISTS idx_tows_actions_org ON tows_actions(org_id, strategy_type);
+CREATE INDEX IF NOT EXISTS idx_strategy_inputs_org ON strategy_inputs(org_id, input_type);
+CREATE INDEX IF NOT EXISTS idx_strategies_org ON strategies(org_id, layer);
+CREATE INDEX IF NOT EXISTS idx_strategic_okrs_org ON strategic_okrs(org_id, strategy_id);
+CREATE INDEX IF NOT EXISTS idx_strategic_key_results_org ON strategic_key_results(org_id, okr_id);
+CREATE INDEX IF NOT EXISTS idx_product_groups_org ON product_groups(org_id, name);
+CREATE INDEX IF NOT EXISTS idx_digital_products_org ON digital_products(org_id, product_group_id);
+CREATE INDEX IF NOT EXISTS idx_initiatives_org ON initiatives(org_id, status);
+CREATE INDEX IF NOT EXISTS idx_teams_org ON teams(org_id, name);
+CREATE INDEX IF NOT EXISTS idx_product_okrs_org ON product_okrs(org_id, strategic_okr_id);
+CREATE INDEX IF NOT EXISTS idx_product_key_results_org ON product_key_results(org_id, product_okr_id);
+CREATE INDEX IF NOT EXISTS idx_epics_org ON epics(org_id, initiative_id);
+CREATE INDEX IF NOT EXISTS idx_epic_dependencies_org ON epic_dependencies(org_id, epic_id);
+CREATE INDEX IF NOT EXISTS idx_delivery_okrs_org ON delivery_okrs(org_id, product_okr_id);
+CREATE INDEX IF NOT EXISTS idx_delivery_key_results_org ON delivery_key_results(org_id, delivery_okr_id);
+CREATE INDEX IF NOT EXISTS idx_features_org ON features(org_id, epic_id);
+CREATE INDEX IF NOT EXISTS idx_feature_dependencies_org ON feature_dependencies(org_id, feature_id);
+CREATE INDEX IF NOT EXISTS idx_review_gates_org ON review_gates(org_id, step_number, gate_number);
+CREATE INDEX IF NOT EXISTS idx_step1_data_urls_org ON step1_data_urls(org_id, url);
+CREATE INDEX IF NOT EXISTS idx_ai_analysis_cache_org ON ai_analysis_cache(org_id, analysis_type, input_hash);
+CREATE INDEX IF NOT EXISTS idx_ai_scenarios_org ON ai_scenarios(org_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_nlq_history_org ON nlq_history(org_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_document_chunks_org ON document_chunks(org_id, document_id);
+CREATE INDEX IF NOT EXISTS idx_regulatory_impacts_org ON regulatory_impacts(org_id, strategy_id);
+CREATE INDEX IF NOT EXISTS idx_pilot_scopes_org ON pilot_scopes(org_id, initiative_id);
+CREATE INDEX IF NOT EXISTS idx_change_plans_org ON change_plans(org_id, initiative_id);
+CREATE INDEX IF NOT EXISTS idx_tech_recommendations_org ON tech_recommendations(org_id, initiative_id);
+CREATE INDEX IF NOT EXISTS idx_customer_journeys_org ON customer_journeys(org_id, persona_id);
+CREATE INDEX IF NOT EXISTS idx_ai_feedback_org ON ai_feedback(org_id, entity_type, entity_id);
+CREATE INDEX IF NOT EXISTS idx_comments_org ON comments(org_id, entity_type, entity_id);
+CREATE INDEX IF NOT EXISTS idx_generation_runs_org ON generation_runs(org_id, started_at);
+CREATE INDEX IF NOT EXISTS idx_org_readiness_org ON org_readiness(org_id, dimension);
+CREATE INDEX IF NOT EXISTS idx_digital_maturity_org ON digital_maturity(org_id, dimension);
+CREATE INDEX IF NOT EXISTS idx_customer_personas_org ON customer_personas(org_id, name);
+CREATE INDEX IF NOT EXISTS idx_operating_model_org ON operating_model(org_id, dimension);
+CREATE INDEX IF NOT EXISTS idx_governance_model_org ON governance_model(org_id, decision_type);
+CREATE INDEX IF NOT EXISTS idx_risk_registry_org ON risk_registry(org_id, status);
+CREATE INDEX IF NOT EXISTS idx_pipeline_runs_org ON pipeline_runs(org_id, started_at);
+CREATE INDEX IF NOT EXISTS idx_competitive_alerts_org ON competitive_alerts(org_id, created_at);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_competitive_alerts_hash ON competitive_alerts(org_id, content_hash);
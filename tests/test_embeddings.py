@@ -0,0 +1,87 @@
+"""
+Local embedding model and chunk-matrix retrieval — a small fitted corpus, and a scratch
+SQLite store holding chunks from several providers.
+"""
+
+import asyncio
+import os
+import sqlite3
+
+import numpy as np
+import pytest
+
+from embeddings import LocalEmbeddingModel
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), "..", "database", "schema.sql")
+
+CORPUS = [
+    f"{topic} report {i}: {topic} revenue grew while {topic} costs were reviewed by the {team} team"
+    for i, (topic, team) in enumerate(
+        (t, m) for t in ("payments", "lending", "cards", "treasury", "mortgages") for m in ("risk", "finance", "ops", "data")
+    )
+]
+
+
+@pytest.fixture(scope="module")
+def model():
+    return LocalEmbeddingModel.fit(CORPUS, dim=8)
+
+
+def test_fit_caps_dimensions_at_the_requested_size(model):
+    vectors = model.transform(CORPUS)
+    assert vectors.shape == (len(CORPUS), 8)
+    assert vectors.dtype == np.float32
+
+
+def test_small_corpus_caps_dimensions_below_its_size():
+    assert LocalEmbeddingModel.fit(CORPUS[:5]).transform(CORPUS[:5]).shape == (5, 4)
+
+
+def test_embeddings_are_unit_length(model):
+    norms = np.linalg.norm(model.transform(CORPUS + ["payments revenue"]), axis=1)
+    assert np.allclose(norms, 1.0, atol=1e-5)
+
+
+def test_round_trip_through_bytes_keeps_the_projection(model):
+    restored = LocalEmbeddingModel.from_bytes(model.to_bytes(), model_id=7)
+    assert restored.provider_id == "local:7"
+    # Components are stored as float16
+    assert np.allclose(restored.transform(CORPUS), model.transform(CORPUS), atol=1e-2)
+
+
+def test_chunk_matrix_only_reads_the_exact_provider(tmp_path):
+    import aiosqlite
+
+    from database import DBConnection
+    from rag_engine import _chunk_matrix
+
+    path = str(tmp_path / "chunks.db")
+    conn = sqlite3.connect(path)
+    with open(SCHEMA_PATH) as f:
+        conn.executescript(f.read())
+    conn.execute("INSERT INTO organization (id, name, industry) VALUES (1, 'Acme', 'Banking')")
+    conn.execute("INSERT INTO org_documents (id, org_id, filename, doc_category) VALUES (1, 1, 'a.txt', 'strategy')")
+    chunks = [
+        ("local:1", [1.0, 0.0]),
+        ("local:1", [0.0, 2.0]),
+        ("local:12", [1.0, 1.0]),  # shares the "local:1" prefix
+        ("openai:text-embedding-3-small", [0.5, 0.5]),
+        ("local:1", [1.0, 0.0, 0.0]),  # wrong dimension
+    ]
+    for i, (provider, vector) in enumerate(chunks):
+        conn.execute(
+            "INSERT INTO document_chunks (org_id, document_id, chunk_index, chunk_text, embedding_json, "
+            "embedding_provider) VALUES (1, 1, ?, ?, ?, ?)",
+            [i, f"chunk {i}", str(vector), provider],
+        )
+    conn.commit()
+    conn.close()
+
+    async def load():
+        async with aiosqlite.connect(path) as raw:
+            raw.row_factory = aiosqlite.Row
+            return await _chunk_matrix(DBConnection(raw, org_id=1), 1, "local:1", 2)
+
+    matrix = asyncio.run(load())
+    assert [r["chunk_text"] for r in matrix.rows] == ["chunk 0", "chunk 1"]
+    assert np.allclose(matrix.matrix, [[1.0, 0.0], [0.0, 1.0]])
@@ -0,0 +1,227 @@
+"""
+Query-plan regression suite — every SQL statement the routers execute, planned against a
+seeded database. The app runs on a temporary SQLite file built by its own startup; each
+table is seeded and ANALYZEd, then every GET route (and every DELETE route, last) is driven
+through TestClient while DBConnection records the statements it executes. Each distinct
+statement is run through EXPLAIN QUERY PLAN, and a step that reads a whole table
+(`SCAN <table>` with no index) fails the test. With DATABASE_URL set, the same statements
+are also planned by PostgreSQL with sequential scans disabled, so any `Seq Scan` left in a
+plan is one no index can serve.
+"""
+
+import asyncio
+import os
+import re
+import sqlite3
+
+import pytest
+
+ROWS_PER_TABLE = 2000
+ORGS = 20
+PATH_PARAM_VALUE = "1"
+
+# Whole-table reads that are intended: tables that are tiny by construction, or queries
+# that really do read every row.
+EXPECTED_SCANS = {
+    "organization",  # single-tenant installs resolve their org as the first row
+    "schema_migrations",
+    "table_versions",
+    "users",
+    "transformation_patterns",  # shared reference data, a few dozen rows
+    "industry_profiles",
+    "benchmarks",
+}
+
+_FULL_SCAN = re.compile(r"^SCAN (\w+)(?: AS \w+)?$")
+_CHECK_IN = re.compile(r"CHECK\s*\(\s*(\w+)\s+IN\s*\(([^)]*)\)\s*\)", re.I)
+_PLANNED = re.compile(r"^\s*(SELECT|WITH|UPDATE|DELETE|INSERT)\b", re.I)
+
+
+# ─── Seeding ─────────────────────────────────────────────────────────────────
+
+
+def _seed_value(column: dict, choices: dict, n: int, position: int):
+    if column["name"] in choices:
+        options = choices[column["name"]]
+        return options[n % len(options)]
+    if column["type"].upper().startswith(("INT", "REAL", "NUM", "FLOAT", "DOUBLE")):
+        # Low-cardinality ids so foreign-key columns look like real parent references
+        # (offset by position so paired columns like epic_id/depends_on_epic_id differ)
+        return n % ORGS + 1 if column["name"] == "org_id" else (n + position) % (ROWS_PER_TABLE // 10) + 1
+    return f"{column['name']}-{n % (ROWS_PER_TABLE // 4)}"
+
+
+def _seed(conn: sqlite3.Connection, table: str, table_sql: str):
+    columns = [
+        {"name": r[1], "type": r[2] or "", "default": r[4], "pk": r[5]}
+        for r in conn.execute(f"PRAGMA table_info({table})")
+    ]
+    choices = {
+        name: [v.strip().strip("'") for v in values.split(",")]
+        for name, values in _CHECK_IN.findall(table_sql)
+    }
+    # Defaulted columns keep their defaults unless a CHECK lists the values to spread over
+    filled = [c for c in columns if not c["pk"] and (c["default"] is None or c["name"] in choices)]
+    if not filled:
+        return
+    sql = (f"INSERT OR IGNORE INTO {table} ({', '.join(c['name'] for c in filled)}) "
+           f"VALUES ({', '.join('?' for _ in filled)})")
+    conn.executemany(sql, [[_seed_value(c, choices, n, i) for i, c in enumerate(filled)] for n in range(ROWS_PER_TABLE)])
+
+
+def _seed_database(path: str):
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA foreign_keys = OFF")  # parents are seeded independently of children
+    tables = conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' "
+        "AND name NOT LIKE '%_fts_%' AND sql NOT LIKE '%VIRTUAL%' "
+        "AND name NOT IN ('schema_migrations', 'table_versions', 'jobs')"
+    ).fetchall()
+    for table, table_sql in tables:
+        _seed(conn, table, table_sql)
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.close()
+
+
+# ─── Capture ─────────────────────────────────────────────────────────────────
+
+
+def _drive_routes(app, client):
+    from fastapi.routing import APIRoute
+
+    routes = [r for r in app.routes if isinstance(r, APIRoute)]
+    for method in ("GET", "DELETE"):  # deletes last, so reads see the full seed
+        for route in routes:
+            if method in route.methods:
+                client.request(method, re.sub(r"\{[^}]+\}", PATH_PARAM_VALUE, route.path))
+
+
+@pytest.fixture(scope="module")
+def captured(tmp_path_factory):
+    """(database path, {statement: params}) for every statement the routes executed."""
+    db_path = str(tmp_path_factory.mktemp("plans") / "plans.db")
+    statements = {}
+
+    with pytest.MonkeyPatch.context() as mp:
+        for key in ("DATABASE_URL", "OPENAI_API_KEY", "MULTI_TENANT"):
+            mp.delenv(key, raising=False)
+        mp.setenv("JOB_WORKER_EMBEDDED", "0")
+
+        import database
+        from fastapi.testclient import TestClient
+
+        mp.setattr(database, "USE_POSTGRES", False)
+        mp.setattr(database, "DB_PATH", db_path)
+
+        def recording(method):
+            async def wrapper(self, query, params=None, *args, **kwargs):
+                statements.setdefault(query, list(params or []))
+                return await method(self, query, params, *args, **kwargs)
+            return wrapper
+
+        for name in ("execute", "execute_fetchall", "execute_fetchone"):
+            mp.setattr(database.DBConnection, name, recording(getattr(database.DBConnection, name)))
+
+        from main import app
+
+        with TestClient(app, raise_server_exceptions=False) as client:
+            _seed_database(db_path)
+            statements.clear()  # startup's own schema work is not what's under test
+            _drive_routes(app, client)
+
+    return db_path, {q: p for q, p in statements.items() if _PLANNED.match(q)}
+
+
+# ─── SQLite ──────────────────────────────────────────────────────────────────
+
+
+def _full_scans(conn: sqlite3.Connection, query: str, params: list) -> list[str]:
+    tables = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", params)]
+    return [
+        step for step in plan
+        if (m := _FULL_SCAN.match(step)) and m.group(1) in tables and m.group(1) not in EXPECTED_SCANS
+    ]
+
+
+def test_routes_were_exercised(captured):
+    _, statements = captured
+    assert len(statements) > 100
+
+
+def test_no_router_query_scans_a_whole_table(captured):
+    db_path, statements = captured
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA foreign_keys = ON")  # as the app runs, so cascade checks are planned too
+    try:
+        failures = {}
+        for query, params in statements.items():
+            try:
+                scans = _full_scans(conn, query, params)
+            except sqlite3.Error as e:
+                scans = [f"error: {e}"]  # a statement SQLite can't even plan is broken
+            if scans:
+                failures[query] = scans
+    finally:
+        conn.close()
+    assert failures == {}
+
+
+def test_foreign_key_indexes_are_in_schema(captured):
+    db_path, _ = captured
+    conn = sqlite3.connect(db_path)
+    indexes = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    conn.close()
+    from main import FOREIGN_KEY_INDEXES
+
+    for stmt in FOREIGN_KEY_INDEXES:
+        assert re.search(r"INDEX IF NOT EXISTS (\w+)", stmt).group(1) in indexes
+
+
+# ─── PostgreSQL ──────────────────────────────────────────────────────────────
+
+
+@pytest.mark.skipif(not os.getenv("DATABASE_URL"), reason="DATABASE_URL not set")
+def test_no_router_query_seq_scans_on_postgres(captured):
+    """Plans each statement generically (PostgreSQL 16+) in a scratch schema built from
+    schema_postgres.sql, rolled back afterwards."""
+    asyncpg = pytest.importorskip("asyncpg")
+    from database import _sqlite_to_pg_query
+
+    _, statements = captured
+    schema_path = os.path.join(os.path.dirname(__file__), "..", "database", "schema_postgres.sql")
+    with open(schema_path) as f:
+        schema_sql = f.read()
+
+    async def plan_all():
+        conn = await asyncpg.connect(os.environ["DATABASE_URL"].replace("postgres://", "postgresql://", 1))
+        failures = {}
+        try:
+            if conn.get_server_version().major < 16:
+                pytest.skip("EXPLAIN (GENERIC_PLAN) needs PostgreSQL 16")
+            transaction = conn.transaction()
+            await transaction.start()
+            try:
+                await conn.execute("CREATE SCHEMA query_plans; SET LOCAL search_path TO query_plans")
+                await conn.execute(schema_sql)
+                await conn.execute("SET LOCAL enable_seqscan = off")
+                for query, params in statements.items():
+                    pg_query, _ = _sqlite_to_pg_query(query, params)
+                    try:
+                        plan = await conn.fetch(f"EXPLAIN (GENERIC_PLAN) {pg_query}")
+                    except asyncpg.PostgresError:
+                        continue  # SQLite-only syntax; the app's PostgreSQL branch differs
+                    scans = [
+                        line for (line,) in plan
+                        if (m := re.search(r"Seq Scan on (\w+)", line)) and m.group(1) not in EXPECTED_SCANS
+                    ]
+                    if scans:
+                        failures[query] = scans
+            finally:
+                await transaction.rollback()
+        finally:
+            await conn.close()
+        return failures
+
+    assert asyncio.run(plan_all()) == {}
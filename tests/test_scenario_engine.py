@@ -0,0 +1,78 @@
+"""
+Scenario engine — direction of each scenario type against business-as-usual, on a fixed
+baseline (revenue 100, margin 15%, portfolio cost 20 for an annual benefit of 8).
+"""
+
+import pytest
+
+from scenario_engine import simulate
+
+BASELINE = {
+    "periods": ["2024"],
+    "revenue_series": [100.0],
+    "base_revenue": 100.0,
+    "org_margin": 0.15,
+    "competitor_margins": [],
+    "competitor_revenue_total": 300.0,
+    "competitor_count": 2,
+    "initiative_count": 3,
+    "initiative_cost_m": 20.0,
+    "initiative_benefit_m": 8.0,
+}
+
+
+def _median(sim: dict, key: str) -> float:
+    return sim[key]["p50"]
+
+
+def test_same_inputs_give_same_numbers():
+    params = {"description": "revenue drops 10%"}
+    assert simulate("revenue_change", params, BASELINE) == simulate("revenue_change", params, BASELINE)
+
+
+def test_revenue_drop_lowers_revenue_profit_and_margin():
+    sim = simulate("revenue_change", {"description": "revenue drops 10%"}, BASELINE)
+    assert sim["assumptions"]["change_pct"] == -10.0
+    assert -10.5 < _median(sim, "revenue_change_pct") < -8.5
+    assert _median(sim, "profit_change") < 0
+    assert _median(sim, "margin_impact_pct") < 0
+
+
+def test_revenue_increase_raises_revenue_profit_and_margin():
+    sim = simulate("revenue_change", {"description": "revenue increases 5%"}, BASELINE)
+    assert 4 < _median(sim, "revenue_change_pct") < 5.5
+    assert _median(sim, "profit_change") > 0
+    assert _median(sim, "margin_impact_pct") > 0
+
+
+def test_zero_percent_is_not_replaced_by_the_default():
+    sim = simulate("revenue_change", {"description": "flat revenue 0%"}, BASELINE)
+    assert sim["assumptions"]["change_pct"] == 0.0
+    assert abs(_median(sim, "revenue_change_pct")) < 0.5
+    assert abs(_median(sim, "margin_impact_pct")) < 0.5
+
+
+@pytest.mark.parametrize("change, sign", [(10, -1), (-10, 1)])
+def test_cost_change_moves_margin_not_revenue(change, sign):
+    sim = simulate("cost_change", {"change_pct": change}, BASELINE)
+    assert _median(sim, "revenue_change_pct") == 0
+    assert sign * _median(sim, "margin_impact_pct") > 0
+    assert sign * _median(sim, "profit_change") > 0
+
+
+def test_market_entry_adds_revenue():
+    sim = simulate("market_entry", {"success_probability": 1.0}, BASELINE)
+    assert _median(sim, "revenue_change_pct") > 0
+    assert sim["probabilities"]["revenue_decline"] == 0
+
+
+def test_portfolio_cost_is_spread_over_the_benefit_horizon():
+    sim = simulate("revenue_change", {"change_pct": 0}, BASELINE)
+    # 100 * 15% - 20 / 3 years + benefit: business-as-usual stays profitable
+    assert sim["business_as_usual"]["margin_pct"]["p50"] > 5
+    assert sim["assumptions"]["benefit_horizon_years"] == 3
+
+
+def test_zero_revenue_is_rejected():
+    with pytest.raises(ValueError, match="Insufficient data"):
+        simulate("revenue_change", {"change_pct": -10}, {**BASELINE, "base_revenue": 0.0, "revenue_series": []})